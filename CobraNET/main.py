@@ -29,12 +29,16 @@ try:
     from CobraRouter import CobraRouter 
     from colors import *
     from CobraNET._helius_api import get_token_info
+    from CobraRouter.CobraRouter.router.libutils.limiter import lane
+    from CobraNET.prefetch import HoldingsPrefetcher
 except ImportError:
     from .db_hook import TGDBHook
     from ..CobraWallets import CobraWallets
     from ..CobraRouter.CobraRouter import CobraRouter
     from .colors import *
     from ._helius_api import get_token_info
+    from ..CobraRouter.CobraRouter.router.libutils.limiter import lane
+    from .prefetch import HoldingsPrefetcher
 
 logging.basicConfig(
     level=logging.INFO,
@@ -85,6 +89,7 @@ class CobraNET:
         self.router = router
         self.cleaner = router.cleaner
         self.exclude_pools = []
+        self.prefetcher = HoldingsPrefetcher(router)
 
     async def guard(self, u: Update, c: ContextTypes.DEFAULT_TYPE):
         m = u.effective_message
@@ -148,6 +153,7 @@ class CobraNET:
             await self.stop()
 
     async def stop(self):
+        await self.prefetcher.close()
         await self.application.stop()
         await self.application.shutdown()
 
@@ -296,6 +302,7 @@ class CobraNET:
             return
         
         await self.update_token_balances(uid)
+        await self.prefetch_holdings(uid)
 
         await self.send_banner(uid, "imgs/cobra_banner.png")
         text = await self.build_menu_text(uid)
@@ -332,6 +339,12 @@ class CobraNET:
         for mint, balance in balances.items():
             await self.db_hook.update_tokens(str(uid), [{"name": str(mint), "balance": str(balance)}])
 
+    async def prefetch_holdings(self, uid: int):
+        # the sell usually follows; warm the routes / fees of what the user holds in the background
+        wallet = await self.db_hook.get_wallet(str(uid))
+        if wallet:
+            self.prefetcher.schedule(uid, wallet.get("tokens") or [])
+
     async def update_menu(self, uid: int):
         # fetch and update balance
         if uid not in self.menu_msg:
@@ -343,6 +356,7 @@ class CobraNET:
         if ok == "no_wallet":
             await self.send_message(uid, "<b>No wallet found. Please create a wallet first.</b>")
             return
+        await self.prefetch_holdings(uid)
 
         text = await self.build_menu_text(uid)
         kb   = self.build_menu_kb()
@@ -449,6 +463,7 @@ class CobraNET:
         
     async def handle_sell(self, uid: int):
         self.awaiting[uid] = "sell"
+        await self.prefetch_holdings(uid)
         await self.send_message(
             uid,
             "<b>Enter mint address and percentage of token balance to sell.</b>\n"
@@ -480,6 +495,7 @@ class CobraNET:
             # tokens: list[{"name":mint, "balance":float}]
             rows = []
             toks = s.get("tokens") or []
+            self.prefetcher.schedule(uid, toks)
             for i, tok in enumerate(toks, 1):
                 mint  = str(tok["name"])
                 info = await self.sf_get_token_info(mint)
@@ -489,7 +505,8 @@ class CobraNET:
                 symbol = info.get("symbol", "Unknown")
                 bal   = float(tok["balance"])
                 bal = f"{bal}"
-                price = await self.get_price(mint, tok["pool"], tok["dex"])
+                with lane("display"):
+                    price = await self.get_price(mint, tok["pool"], tok["dex"])
                 if price:
                     price = f"Price: <code>{price:.10f} SOL</code>"
                 else:
@@ -636,7 +653,8 @@ class CobraNET:
                 await self.send_message(uid, "<b>Invalid input. Please enter a valid mint address and amount.</b>")
                 return
             
-            dex, pool = await self.router.detect(mint, exclude_pools=self.exclude_pools)
+            route = await self.router.detect_route(mint, exclude_pools=self.exclude_pools, lane="trade")
+            dex, pool = route
             if not dex or not pool:
                 await self.send_message(uid, "<b>No pool found. Please try again.</b>")
                 return
@@ -666,6 +684,7 @@ class CobraNET:
                 priority_level=priority_level,
                 dex=dex,
                 keypair=keypair,
+                route=route,
             )
             if ok:
                 await self.send_message(uid, f"<b>Transaction confirmed.</b>\n\n<b>Signature:</b> <a href='https://solscan.io/tx/{sig}'>{sig}</a>")
@@ -707,15 +726,25 @@ class CobraNET:
                 await self.send_message(uid, "<b>Invalid input. Please enter a valid percentage (0-100).</b>")
                 return
             
-            dex, pool = await self.router.detect(mint, exclude_pools=self.exclude_pools)
-            if not dex or not pool:
-                await self.send_message(uid, "<b>No pool found. Please try again.</b>")
-                return
-
             wallet = await self.db_hook.get_wallet(str(uid))
             if not wallet:
                 await self.send_message(uid, "<b>Wallet not found. Please try again.</b>")
                 return
+
+            # a route prefetched when the menu opened is used as is; otherwise the buy stored the route it used,
+            # and one account read confirms it still holds before falling back to detection
+            route = self.prefetcher.route(mint)
+            if route is not None and route.pool in self.exclude_pools:
+                route = None
+            stored = next((t for t in wallet.get("tokens") or [] if t.get("name") == mint), None)
+            if route is None and stored and stored.get("dex") and stored.get("pool") and stored["pool"] not in self.exclude_pools:
+                route = await self.router.validate_route(mint, stored["dex"], stored["pool"], lane="trade")
+            if route is None or not route.found:
+                route = await self.router.detect_route(mint, exclude_pools=self.exclude_pools, lane="trade")
+            dex, pool = route
+            if not dex or not pool:
+                await self.send_message(uid, "<b>No pool found. Please try again.</b>")
+                return
             
             slippage = wallet["sell_slip"]
             priority_level = wallet["priority_level"]
@@ -730,12 +759,14 @@ class CobraNET:
                 priority_level=priority_level,
                 dex=dex,
                 keypair=keypair,
+                route=route,
             )
             if ok:
                 await self.send_message(uid, f"<b>Transaction confirmed.</b>\n\n<b>Signature:</b> <a href='https://solscan.io/tx/{sig}'>{sig}</a>")
             elif sig == "replay":
                 self.exclude_pools.append(pool)
                 logging.info(f"Replaying sell with excluded pools: {self.exclude_pools}")
+                self.prefetcher.forget(mint)
                 await self.process_sell(uid, cmd)
             else:
                 await self.send_message(uid, f"<b>Failure\n\n<i>{FAILURE_MSG}</i>\nSignature: <a href='https://solscan.io/tx/{sig}'>{sig}</a></b>")
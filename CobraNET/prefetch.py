@@ -0,0 +1,131 @@
+"""
+    Background prefetch of the routes users are likely to sell next: when a user opens the menu, the token list or
+    the sell prompt, the routes of the tokens they hold are validated (or detected) and the priority fees of their
+    pools warmed, so the sell that follows starts from a ready RouteResult.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+
+ROUTE_TTL = 60.0        # seconds a prefetched route is used without validating it again
+USER_INTERVAL = 30.0    # a user's holdings are prefetched at most this often
+MAX_TOKENS_PER_USER = 8 # tokens warmed per prefetch, first ones in the basket first
+MAX_ROUTES = 4096       # shared by every user, least recently used dropped first
+MAX_USERS = 10_000
+CONCURRENCY = 4         # tokens warmed at once across all users
+PREFETCH_DEADLINE = 10.0
+
+class HoldingsPrefetcher:
+    def __init__(
+        self,
+        router,
+        route_ttl: float = ROUTE_TTL,
+        user_interval: float = USER_INTERVAL,
+        max_tokens_per_user: int = MAX_TOKENS_PER_USER,
+        max_routes: int = MAX_ROUTES,
+        concurrency: int = CONCURRENCY,
+    ):
+        """
+        Args:
+            router: CobraRouter
+            route_ttl: float <- seconds a prefetched route is handed to a sell without another check
+            user_interval: float <- minimum seconds between two prefetches of the same user
+            max_tokens_per_user: int <- per-user budget of tokens warmed per prefetch
+            max_routes: int <- size of the shared route LRU
+            concurrency: int <- tokens warmed at once across all users
+        """
+        self.router = router
+        self.route_ttl = route_ttl
+        self.user_interval = user_interval
+        self.max_tokens_per_user = max_tokens_per_user
+        self.max_routes = max_routes
+        self._routes: OrderedDict = OrderedDict()  # mint -> RouteResult
+        self._users: OrderedDict = OrderedDict()   # uid -> last prefetch (monotonic)
+        self._running: dict = {}                   # uid -> task
+        self._slots = asyncio.Semaphore(concurrency)
+        self.stats = {"scheduled": 0, "throttled": 0, "warmed": 0, "validated": 0, "detected": 0, "failed": 0, "hits": 0, "misses": 0}
+
+    def route(self, mint: str):
+        """
+        The prefetched RouteResult of a mint while younger than `route_ttl`, else None.
+        """
+        hit = self._routes.get(str(mint))
+        if hit is None or hit.age() > self.route_ttl:
+            self.stats["misses"] += 1
+            return None
+        self._routes.move_to_end(str(mint))
+        self.stats["hits"] += 1
+        return hit
+
+    def forget(self, mint: str):
+        self._routes.pop(str(mint), None)
+
+    def _remember(self, route):
+        self._routes[route.mint] = route
+        self._routes.move_to_end(route.mint)
+        while len(self._routes) > self.max_routes:
+            self._routes.popitem(last=False)
+
+    def schedule(self, uid: int, tokens: list[dict]):
+        """
+        Warm the routes of `tokens` ([{"name": mint, "dex": str, "pool": str}, ...]) in the background.
+        Returns right away; a user prefetched less than `user_interval` ago, or still being prefetched, is skipped.
+        """
+        now = time.monotonic()
+        last = self._users.get(uid)
+        if uid in self._running or (last is not None and now - last < self.user_interval):
+            self.stats["throttled"] += 1
+            return None
+        tokens = [t for t in tokens or [] if t.get("name")][: self.max_tokens_per_user]
+        if not tokens:
+            return None
+
+        self._users[uid] = now
+        self._users.move_to_end(uid)
+        while len(self._users) > MAX_USERS:
+            self._users.popitem(last=False)
+
+        self.stats["scheduled"] += 1
+        task = asyncio.create_task(self._prefetch(tokens), name=f"prefetch_{uid}")
+        self._running[uid] = task
+        task.add_done_callback(lambda _t: self._running.pop(uid, None))
+        return task
+
+    async def _prefetch(self, tokens: list[dict]):
+        try:
+            await asyncio.gather(*(self._warm(t) for t in tokens))
+        except Exception as e:
+            logging.error(f"Error prefetching holdings: {e}")
+
+    async def _warm(self, token: dict):
+        mint, dex, pool = str(token["name"]), token.get("dex"), token.get("pool")
+        hit = self._routes.get(mint)
+        if hit is not None and hit.age() <= self.route_ttl:
+            return
+        async with self._slots:
+            try:
+                route = None
+                if dex and pool:
+                    route = await self.router.validate_route(mint, dex, pool, lane="display", deadline=PREFETCH_DEADLINE)
+                    self.stats["validated"] += 1
+                if route is None or not route.found:
+                    route = await self.router.detect_route(mint, use_cache=True, lane="display", deadline=PREFETCH_DEADLINE)
+                    self.stats["detected"] += 1
+                if not route.found:
+                    self.forget(mint)
+                    return
+                self._remember(route)
+                await self.router.warm_priority_fees(route.pool, lane="display", deadline=PREFETCH_DEADLINE)
+                self.stats["warmed"] += 1
+            except Exception as e:
+                self.stats["failed"] += 1
+                logging.info(f"Prefetch of {mint} failed: {e}")
+
+    def snapshot(self) -> dict:
+        return {"routes": len(self._routes), "users": len(self._users), "running": len(self._running), **self.stats}
+
+    async def close(self):
+        for task in list(self._running.values()):
+            task.cancel()
+        await asyncio.gather(*self._running.values(), return_exceptions=True)
@@ -30,4 +30,29 @@ class CobraDetector:
             tuple: (dex, pool)
         """
         dex, pool = await self.router.find_best_market_for_mint_race(mint, exclude_pools=exclude_pools, use_cache=use_cache)
-        return (dex, pool)
\ No newline at end of file
+        return (dex, pool)
+
+    async def _detect_route(self, mint: str, exclude_pools: list[str] = [], use_cache: bool = False, timeout: float | None = None):
+        """
+        Detect the best market for a mint, keeping the pool snapshot detection read.
+        Args:
+            mint: str
+            exclude_pools: list[str]
+            use_cache: bool
+            timeout: float | None
+        Returns:
+            RouteResult
+        """
+        return await self.router.find_route(mint, exclude_pools=exclude_pools, use_cache=use_cache, timeout=timeout)
+
+    async def _detect_many(self, mints: list[str], use_cache: bool = True, timeout: float | None = None):
+        """
+        Detect the best market for many mints at once.
+        Args:
+            mints: list[str]
+            use_cache: bool
+            timeout: float | None
+        Returns:
+            dict: {mint: (dex, pool)}
+        """
+        return await self.router.find_best_markets_for_mints(mints, use_cache=use_cache, timeout=timeout)
\ No newline at end of file
@@ -7,6 +7,8 @@ try: from CobraRouter.CobraRouter.router import Router # type: ignore
 except: from .router import Router
 try: from CobraRouter.CobraRouter.router import Cleaner # type: ignore
 except: from .router import Cleaner
+try: from CobraRouter.CobraRouter.router import RouteCache, PoolIndex, MintFilter, RouteResult, RpcGateway, AccountCache # type: ignore
+except: from .router import RouteCache, PoolIndex, MintFilter, RouteResult, RpcGateway, AccountCache
 from solders.keypair import Keypair # type: ignore
 from solders.message import VersionedMessage # type: ignore
 from solana.rpc.async_api import AsyncClient
@@ -17,6 +19,10 @@ except: from .detect import CobraDetector
 from solders.pubkey import Pubkey # type: ignore
 from solana.rpc.types import TokenAccountOpts # type: ignore
 from solana.rpc.commitment import Processed # type: ignore
+try: from CobraRouter.CobraRouter.router.libutils.deadline import deadline # type: ignore
+except: from .router.libutils.deadline import deadline
+try: from CobraRouter.CobraRouter.router.libutils.limiter import RpcLimiter, lane # type: ignore
+except: from .router.libutils.limiter import RpcLimiter, lane
 try: from CobraRouter.CobraRouter.router.libutils._common import TOKEN_2022, TOKEN_PROGRAM_ID # type: ignore
 except: from .router.libutils._common import TOKEN_2022, TOKEN_PROGRAM_ID # type: ignore
 
@@ -31,14 +37,122 @@ logging.basicConfig(
 )
 
 class CobraRouter:
-    def __init__(self, rpc_url: str, session: aiohttp.ClientSession):
+    def __init__(
+        self,
+        rpc_url: str,
+        session: aiohttp.ClientSession,
+        route_cache: RouteCache | None = None,
+        limiter: RpcLimiter | None = None,
+        rpc_urls: list[str] | None = None,
+        send_urls: list[str] | None = None,
+        gateway: RpcGateway | None = None,
+        rate_limits: dict | None = None,
+        reserves_ms: float | None = None,
+    ):
+        """
+        Args:
+            rpc_url: str <- primary HTTP RPC endpoint
+            session: aiohttp.ClientSession
+            route_cache: RouteCache | None <- shared / persistent route cache, None = in-memory
+            limiter: RpcLimiter | None <- shared RPC limiter, None = one per router
+            rpc_urls: list[str] | None <- more read endpoints next to rpc_url, slow reads are hedged across them
+            send_urls: list[str] | None <- endpoints for sendTransaction only, None = the read endpoints
+            gateway: RpcGateway | None <- prebuilt gateway, overrides rpc_urls / send_urls / rate_limits
+            rate_limits: dict | None <- RpcGovernor kwargs per endpoint, e.g. {"credits_per_sec": 50, "method_rates": {"GetProgramAccounts": 5}}
+            reserves_ms: float | None <- how long pool / curve reads are served from the shared account cache, None = 400 ms
+        """
         self.async_client = AsyncClient(rpc_url)
-        self.router = Router(self.async_client, session)
+        self.gateway = gateway if gateway is not None else RpcGateway([rpc_url, *(rpc_urls or [])], send_urls, limits=rate_limits)
+        account_cache = AccountCache(reserves_ms) if reserves_ms is not None else None
+        self.router = Router(self.async_client, session, route_cache=route_cache, limiter=limiter, gateway=self.gateway, account_cache=account_cache)
         self.detector = CobraDetector(self.router, self.async_client)
         self.swaps = CobraSwaps(self.router, self.async_client, session, rpc_url)
         self.cleaner = Cleaner()
         self.warmed_up = False # warming up RPC cache to avoid cold-start overhead
 
+    def enable_pool_index(self, ws_url: str, programs: list[str] | None = None) -> PoolIndex:
+        """
+        Start the optional mint -> pool indexer (getProgramAccounts snapshot + programSubscribe deltas)
+        and let the pool scanners answer from it. Must be called from a running event loop.
+
+        Args:
+            ws_url: str <- websocket RPC endpoint
+            programs: list[str] | None <- "cpmm" | "damm_v1" | "damm_v2" | "dbc" | "launchlab" | "pumpswap", None = all
+        Returns:
+            PoolIndex
+        """
+        pool_index = PoolIndex(self.async_client, ws_url, programs)
+        self.router.attach_pool_index(pool_index)
+        pool_index.start()
+        return pool_index
+
+    def enable_mint_filter(self, ws_url: str, path: str, programs: list[str] | None = None) -> MintFilter:
+        """
+        Start the optional per-program mint filters (Bloom filters in memory-mapped files under `path`,
+        caught up with a getProgramAccounts snapshot and kept current with programSubscribe) and let the
+        route race skip the scans they rule out. A smaller alternative to enable_pool_index. Must be called
+        from a running event loop.
+
+        Args:
+            ws_url: str <- websocket RPC endpoint
+            path: str <- directory of the filter files, reused across restarts
+            programs: list[str] | None <- "cpmm" | "damm_v1" | "damm_v2" | "dbc" | "launchlab" | "pumpswap", None = all
+        Returns:
+            MintFilter
+        """
+        mint_filter = MintFilter(self.async_client, ws_url, path, programs)
+        self.router.attach_mint_filter(mint_filter)
+        mint_filter.start()
+        return mint_filter
+
+    def probe_stats(self) -> dict:
+        """
+        Route race probe statistics: per mint-feature group hit rates / latencies and the wave counters
+        (probes_skipped = expensive probes that never had to run, probes_filtered = scans a mint filter ruled out),
+        plus the platform guess counters under "classifier" and the filter state under "mint_filter" when enabled.
+        """
+        stats = {**self.router.probe_stats.snapshot(), "classifier": self.router.classifier.snapshot()}
+        if self.router.mint_filter is not None:
+            stats["mint_filter"] = self.router.mint_filter.snapshot()
+        return stats
+
+    def rpc_limits(self) -> dict:
+        """
+        RPC limiter state: per-method caps / in-flight / queued calls and per-lane queueing times.
+        """
+        return self.router.limiter.snapshot()
+
+    def breaker_states(self) -> dict:
+        """
+        Circuit breakers per route probe ("probe:ray_cpmm") and per guarded RPC method ("rpc:GetProgramAccounts/RayCPMM"):
+        state (closed | open | half_open), seconds until the next trial, last error and trip / skip counts.
+        """
+        return self.router.breakers.snapshot()
+
+    def migration_stats(self) -> dict:
+        """
+        pump.fun curves watched for migration: curves watched now, migrations seen (route flipped to PumpSwap),
+        polls, expired watches and trades redirected from a PumpFun route to the migrated pool.
+        """
+        return self.router.migrations.snapshot()
+
+    def rpc_endpoints(self) -> dict:
+        """
+        RPC gateway state: latency EWMA, health, win / error / 429 counts and rate governor buckets (rate, queued
+        requests, wait times, throttle events) per read and send endpoint (query strings stripped), the current
+        hedge delay per method and the hedge / failover / throttle / commitment rewrite counters, plus the
+        JSON-RPC batching counters under "batching".
+        """
+        return {**self.gateway.snapshot(), "batching": self.router.batcher.snapshot()}
+
+    def account_cache_stats(self) -> dict:
+        """
+        Shared account cache: accounts held, hits / misses, reads that joined one already in flight, copies that
+        had expired for their freshness class and writes dropped for an older slot, plus the mint info memo
+        (mints known, hits, fetched, missing) under "mints".
+        """
+        return {**self.router.accounts.snapshot(), "mints": self.router.mints.snapshot()}
+
     async def list_mints(self, pubkey: str | Pubkey) -> list[str]:
         """
         List all mints owned by a given address.
@@ -171,13 +285,53 @@ class CobraRouter:
                 break
         use_cache = kwargs.get("use_cache", False)
         exclude_pools = kwargs.get("exclude_pools", [])
-        dex, pool = await self.detector._detect(mint, exclude_pools=exclude_pools, use_cache=use_cache)
+        with deadline(kwargs.get("deadline"), "detect"), lane(kwargs.get("lane")):
+            dex, pool = await self.detector._detect(mint, exclude_pools=exclude_pools, use_cache=use_cache)
         return dex, pool
     
-    async def swap(self, action: str, mint: str, pool: str, slippage: float, priority_level: str, dex: str, keypair: Keypair, sell_pct: int = 100, sol_amount_in: float = 0.0001):
+    async def detect_route(self, mint: str, **kwargs) -> RouteResult:
         """
+        Like detect, but returns a RouteResult carrying the decoded pool snapshot, decimals, token program
+        and read slot. It unpacks as (dex, pool); pass it to `swap(..., route=...)` to skip the refetch.
             Returns:
-                tuple: (sig: str, ok: str)
+              RouteResult
+        """
+        while not self.warmed_up:
+            logging.info("Warming up RPC cache...")
+            if not await self.ping():
+                await asyncio.sleep(0.5)
+                continue
+            else:
+                break
+        use_cache = kwargs.get("use_cache", False)
+        exclude_pools = kwargs.get("exclude_pools", [])
+        timeout = kwargs.get("timeout", None)
+        with deadline(kwargs.get("deadline"), "detect"), lane(kwargs.get("lane")):
+            return await self.detector._detect_route(mint, exclude_pools=exclude_pools, use_cache=use_cache, timeout=timeout)
+
+    async def validate_route(self, mint: str, dex: str, pool: str, **kwargs) -> RouteResult:
+        """
+        Re-check a stored (dex, pool) with one account read (pool exists, right program, not migrated)
+        instead of running detection again. Kwargs: `deadline`, `lane`.
+            Returns:
+              RouteResult: found=False when the stored route no longer holds
+        """
+        with deadline(kwargs.get("deadline"), "validate_route"), lane(kwargs.get("lane")):
+            return await self.router.validate_route(mint, dex, pool)
+
+    async def warm_priority_fees(self, pool: str | Pubkey, **kwargs) -> dict:
+        """
+        Fetch the priority fee levels of `pool` ahead of a trade; a swap on it within a few seconds reuses them.
+        Kwargs: `deadline`, `lane`.
+        """
+        with deadline(kwargs.get("deadline"), "warm_priority_fees"), lane(kwargs.get("lane")):
+            return await self.swaps.warm_priority_fees(pool)
+
+    async def detect_many(self, mints: list[str], **kwargs) -> dict:
+        """
+        Detect routes for many mints with batched account reads (see Router.find_best_markets_for_mints).
+            Returns:
+              dict: {mint: (dex, pool)}, (None, None) when no route was found
         """
         while not self.warmed_up:
             logging.info("Warming up RPC cache...")
@@ -186,14 +340,36 @@ class CobraRouter:
                 continue
             else:
                 break
-        if action == "buy":
-            sig, ok = await self.swaps.buy(mint, pool, keypair, sol_amount_in, slippage, priority_level, dex)
-            return (sig, ok)
-        elif action == "sell":
-            sig, ok = await self.swaps.sell(mint, pool, keypair, sell_pct, slippage, priority_level, dex)
-            return (sig, ok)
-        else:
-            raise ValueError(f"Invalid action: {action}")
+        use_cache = kwargs.get("use_cache", True)
+        timeout = kwargs.get("timeout", None)
+        with deadline(kwargs.get("deadline"), "detect_many"), lane(kwargs.get("lane")):
+            return await self.detector._detect_many(mints, use_cache=use_cache, timeout=timeout)
+
+    async def swap(self, action: str, mint: str, pool: str, slippage: float, priority_level: str, dex: str, keypair: Keypair, sell_pct: int = 100, sol_amount_in: float = 0.0001, route: RouteResult | None = None, deadline: float | None = None):
+        """
+        Runs in the "trade" RPC lane, ahead of detection and price lookups in other lanes.
+            Args:
+                route: RouteResult | None <- from detect_route, reused when it matches (mint, pool, dex)
+                deadline: float | None <- latency budget in seconds, the trade fails fast with the step it was in
+            Returns:
+                tuple: (sig: str, ok: str)
+        """
+        with lane("trade"):
+            while not self.warmed_up:
+                logging.info("Warming up RPC cache...")
+                if not await self.ping():
+                    await asyncio.sleep(0.5)
+                    continue
+                else:
+                    break
+            if action == "buy":
+                sig, ok = await self.swaps.buy(mint, pool, keypair, sol_amount_in, slippage, priority_level, dex, route=route, deadline=deadline)
+                return (sig, ok)
+            elif action == "sell":
+                sig, ok = await self.swaps.sell(mint, pool, keypair, sell_pct, slippage, priority_level, dex, route=route, deadline=deadline)
+                return (sig, ok)
+            else:
+                raise ValueError(f"Invalid action: {action}")
 
     async def close(self):
         """
@@ -202,8 +378,6 @@ class CobraRouter:
         try:
             cprint(f"Closing CobraRouter...")
             await self.router.close()
-            await self.async_client.close()
-            await self.detector.async_client.close()
             await self.swaps.close()
             return True
         except Exception as e:
@@ -6,6 +6,10 @@ from solana.rpc.types import TxOpts, TokenAccountOpts
 from solders.compute_budget import set_compute_unit_price, set_compute_unit_limit # type: ignore
 from solders.keypair import Keypair # type: ignore
 from solders.pubkey import Pubkey # type: ignore
+try: from ..libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
+try: from ..libutils.account_cache import accounts_of, RESERVES
+except: from libutils.account_cache import accounts_of, RESERVES
 from solders.transaction import VersionedTransaction # type: ignore
 from solders.message import MessageV0 # type: ignore
 from solana.rpc.commitment import Processed, Confirmed
@@ -24,6 +28,8 @@ except:
     from .fetch_reserves import fetch_pool_base_price
 
 import logging
+try: from ..libutils.deadline import deadline_sleep
+except: from libutils.deadline import deadline_sleep
 
 def compute_unit_price_from_total_fee(
     total_lams: int,
@@ -68,7 +74,7 @@ def _get_price(base_balance_tokens: float, quote_balance_sol: float, reversed: b
 CREATOR_VAULT_SEED  = b"creator_vault"
 
 def derive_creator_vault(creator: Pubkey, quote_mint: Pubkey) -> tuple[Pubkey, Pubkey]:
-    vault_auth, bump = Pubkey.find_program_address(
+    vault_auth, bump = find_program_address(
         [CREATOR_VAULT_SEED, bytes(creator)],
         PUMPSWAP_PROGRAM_ID
     )
@@ -180,11 +186,19 @@ async def fetch_pool_state(pool: str | Pubkey, async_client: AsyncClient):
     """
     pool = pool if isinstance(pool, Pubkey) else Pubkey.from_string(pool)
 
-    resp = await async_client.get_account_info_json_parsed(pool, commitment=Processed)
-    if not resp or not resp.value or not resp.value.data:
+    acc = await accounts_of(async_client).get(pool, RESERVES)
+    if acc is None or not acc.data:
         raise Exception("Invalid account response")
 
-    raw_data = resp.value.data
+    return parse_pool_state(acc.data)
+
+def parse_pool_state(raw_data: bytes):
+    """
+    Decode raw pool account data, same output as fetch_pool_state.
+        Returns:
+            tuple: (pool_keys, pool_type) | (None, None)
+    """
+    raw_data = bytes(raw_data)
     pool_type = NEW_POOL_TYPE
     try:
         parsed = PumpSwapPoolStateNew.parse(raw_data[8:])
@@ -208,7 +222,7 @@ class PumpSwap:
         await self.async_client.close()
 
     def _derive_uva_pda(self, user: Pubkey):
-        user_acc, _ = Pubkey.find_program_address(
+        user_acc, _ = find_program_address(
             [b"user_volume_accumulator", bytes(user)],
             PUMPSWAP_PROGRAM_ID
         )
@@ -308,7 +322,11 @@ class PumpSwap:
             instructions.append(set_compute_unit_limit(UNIT_COMPUTE_BUDGET))
             instructions.append(set_compute_unit_price(micro_lamports))
 
-        wsol_ata_ix = await self.create_ata_if_needed(user_pubkey, token_quote)
+        # both ATA checks go out together (one RPC batch)
+        wsol_ata_ix, base_ata_ix = await asyncio.gather(
+            self.create_ata_if_needed(user_pubkey, token_quote),
+            self.create_ata_if_needed(user_pubkey, token_base),
+        )
         if wsol_ata_ix:
             instructions.append(wsol_ata_ix)
 
@@ -320,7 +338,6 @@ class PumpSwap:
         )
         instructions.append(system_transfer_ix)
 
-        base_ata_ix = await self.create_ata_if_needed(user_pubkey, token_base)
         if base_ata_ix:
             instructions.append(base_ata_ix)
 
@@ -902,7 +919,11 @@ class PumpSwap:
             instructions.append(set_compute_unit_limit(UNIT_COMPUTE_BUDGET))
             instructions.append(set_compute_unit_price(micro_lamports))
         
-        wsol_ata_ix = await self.create_ata_if_needed(user_pubkey, token_base)
+        # both ATA checks go out together (one RPC batch)
+        wsol_ata_ix, base_ata_ix = await asyncio.gather(
+            self.create_ata_if_needed(user_pubkey, token_base),
+            self.create_ata_if_needed(user_pubkey, token_quote),
+        )
         if wsol_ata_ix:
             instructions.append(wsol_ata_ix)
 
@@ -914,7 +935,6 @@ class PumpSwap:
         )
         instructions.append(system_transfer_ix)
 
-        base_ata_ix = await self.create_ata_if_needed(user_pubkey, token_quote)
         if base_ata_ix:
             instructions.append(base_ata_ix)
 
@@ -1139,7 +1159,7 @@ class PumpSwap:
                     return True
                 else:
                     return False
-            await asyncio.sleep(delay)
+            await deadline_sleep(delay)
         return False
     
     def _build_pumpswap_create_pool_ix(
@@ -1219,7 +1239,7 @@ class PumpSwap:
         quote_amount_in = int(quote_amount_sol * LAMPORTS_PER_SOL)
 
         pool_seed_prefix = b"pool"
-        pool_pda, _ = Pubkey.find_program_address(
+        pool_pda, _ = find_program_address(
             [
                 pool_seed_prefix,
                 index.to_bytes(2, "little"),
@@ -1229,7 +1249,7 @@ class PumpSwap:
             ],
             PUMPSWAP_PROGRAM_ID,
         )
-        lp_mint_pda, _ = Pubkey.find_program_address(
+        lp_mint_pda, _ = find_program_address(
             [b"pool_lp_mint", bytes(pool_pda)],
             PUMPSWAP_PROGRAM_ID,
         )
@@ -1679,7 +1699,7 @@ class PumpSwap:
             bytes(base_mint),
             bytes(quote_mint),
         ]
-        return Pubkey.find_program_address(seed, PUMPSWAP_PROGRAM_ID)[0]
+        return find_program_address(seed, PUMPSWAP_PROGRAM_ID)[0]
 
     async def _simulate_and_show(self, tx: VersionedTransaction, debug_prints: bool = False):
         sim = await self.async_client.simulate_transaction(
@@ -1,2 +1,2 @@
-from .PumpSwapAMM import PumpSwap, fetch_pool_state, convert_pool_keys, WSOL_MINT, LAMPORTS_PER_SOL  # re-export
-__all__ = ["PumpSwap", "fetch_pool_state", "convert_pool_keys", "WSOL_MINT", "LAMPORTS_PER_SOL"]
\ No newline at end of file
+from .PumpSwapAMM import PumpSwap, fetch_pool_state, parse_pool_state, fetch_pool_base_price, convert_pool_keys, WSOL_MINT, LAMPORTS_PER_SOL  # re-export
+__all__ = ["PumpSwap", "fetch_pool_state", "parse_pool_state", "fetch_pool_base_price", "convert_pool_keys", "WSOL_MINT", "LAMPORTS_PER_SOL"]
\ No newline at end of file
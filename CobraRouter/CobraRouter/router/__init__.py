@@ -1,4 +1,4 @@
 from ._main import Router
 from .libutils import *
 
-__all__ = ['Router', 'Cleaner']
\ No newline at end of file
+__all__ = ['Router', 'Cleaner', 'RouteCache', 'PoolIndex', 'MintFilter', 'RouteResult', 'RpcLimiter', 'BreakerBoard', 'RpcGateway', 'RpcBatcher', 'AccountCache', 'MintInfoService']
\ No newline at end of file
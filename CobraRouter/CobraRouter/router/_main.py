@@ -5,9 +5,9 @@ from solders.keypair import Keypair # type: ignore
 from solders.pubkey import Pubkey # type: ignore
 try:
     from .meteoraDBC import MeteoraDBC
-    from .pump_fun import PumpFun, check_has_migrated, get_associated_bonding_curve_address, find_migration_source, get_creator, find_pumpswap_pools
+    from .pump_fun import PumpFun, check_has_migrated, get_associated_bonding_curve_address, find_migration_source, get_creator, find_pumpswap_pools, parse_bonding_curve_state, derive_canonical_pumpswap_pool, MigrationTracker
     from .raydiumswap.amm_v4 import RaydiumSwap
-    from .PumpSwapAMM import PumpSwap, fetch_pool_state
+    from .PumpSwapAMM import PumpSwap, fetch_pool_state, parse_pool_state, fetch_pool_base_price
     from .raydiumswap.cpmm.cpmm_swap import RaydiumCpmmSwap
     from .raydiumswap.launchlab.launchlab_swap import RaydiumLaunchpadSwap
     from .raydiumswap.clmm.clmm_swap import RaydiumClmmSwap
@@ -15,11 +15,13 @@ try:
     from .meteora_damm_v1.damm_swap import MeteoraDamm1
     from .meteora_damm_v2.damm2_swap import MeteoraDamm2
     from .meteora_dlmm.dlmm_swap import MeteoraDLMM
+    from ._quotes import Quoter, rank_key
+    from ._multihop import MultiHop, TWO_HOP
 except:
     from meteoraDBC import MeteoraDBC
-    from pump_fun import PumpFun, check_has_migrated, get_associated_bonding_curve_address, find_migration_source, get_creator, find_pumpswap_pools
+    from pump_fun import PumpFun, check_has_migrated, get_associated_bonding_curve_address, find_migration_source, get_creator, find_pumpswap_pools, parse_bonding_curve_state, derive_canonical_pumpswap_pool, MigrationTracker
     from raydiumswap.amm_v4 import RaydiumSwap
-    from PumpSwapAMM import PumpSwap, fetch_pool_state
+    from PumpSwapAMM import PumpSwap, fetch_pool_state, parse_pool_state, fetch_pool_base_price
     from raydiumswap.cpmm.cpmm_swap import RaydiumCpmmSwap
     from raydiumswap.launchlab.launchlab_swap import RaydiumLaunchpadSwap
     from raydiumswap.clmm.clmm_swap import RaydiumClmmSwap
@@ -27,24 +29,77 @@ except:
     from meteora_damm_v1.damm_swap import MeteoraDamm1
     from meteora_damm_v2.damm2_swap import MeteoraDamm2
     from meteora_dlmm.dlmm_swap import MeteoraDLMM    
+    from _quotes import Quoter, rank_key
+    from _multihop import MultiHop, TWO_HOP
     
 from solana.rpc.commitment import Processed
 
 try:
-    from libutils import SUPPORTED_DEXES, ADDR_TO_DEX, WSOL_MINT
+    from libutils import SUPPORTED_DEXES, ADDR_TO_DEX, WSOL_MINT, METADATA_PROGRAM_ID, RouteCache, SingleFlight, PoolIndex, MintFilter, ProbeStats, RouteResult, find_program_address, enforce_deadlines, RpcLimiter, BreakerBoard, CircuitOpen, MintClassifier, RpcGateway, RpcBatcher, AccountCache, accounts_of, mints_of
+    from libutils.deadline import budget
     from libutils.colors import *
 except:
-    from .libutils import SUPPORTED_DEXES, ADDR_TO_DEX, WSOL_MINT
+    from .libutils import SUPPORTED_DEXES, ADDR_TO_DEX, WSOL_MINT, METADATA_PROGRAM_ID, RouteCache, SingleFlight, PoolIndex, MintFilter, ProbeStats, RouteResult, find_program_address, enforce_deadlines, RpcLimiter, BreakerBoard, CircuitOpen, MintClassifier, RpcGateway, RpcBatcher, AccountCache, accounts_of, mints_of
+    from .libutils.deadline import budget
     from .libutils.colors import *
 
+# program owning the `pool` account of a route, where that is not the dex address itself
+_POOL_PROGRAMS = {
+    SUPPORTED_DEXES["PumpFun"]: "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P",  # bonding curve
+    SUPPORTED_DEXES["Launchpad"]: "LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj",
+    SUPPORTED_DEXES["Believe"]: SUPPORTED_DEXES["MeteoraDBC"],
+}
+
 async def _check_exists(client: AsyncClient, account: Pubkey) -> bool:
     resp = await client.get_account_info(account, commitment=Processed)
     return resp is not None and resp.value is not None and resp.value.data is not None
 
+async def _fetch_accounts(client: AsyncClient, accounts: list[Pubkey], chunk: int = 100) -> dict:
+    """
+    Resolve many accounts with chunked getMultipleAccounts.
+    Returns:
+        dict: {Pubkey: Account | None}
+    """
+    out, _ = await _fetch_accounts_at(client, accounts, chunk)
+    return out
+
+async def _fetch_accounts_at(client: AsyncClient, accounts: list[Pubkey], chunk: int = 100) -> tuple[dict, int | None]:
+    """
+    Same as _fetch_accounts, plus the lowest context slot of the chunks.
+    Returns:
+        tuple: ({Pubkey: Account | None}, slot)
+    """
+    accounts = list(dict.fromkeys(accounts))
+    chunks = [accounts[i : i + chunk] for i in range(0, len(accounts), chunk)]
+    resps = await asyncio.gather(*(client.get_multiple_accounts(c, commitment=Processed) for c in chunks))
+    out, slot = {}, None
+    cache = accounts_of(client)
+    for c, resp in zip(chunks, resps):
+        slot = resp.context.slot if slot is None else min(slot, resp.context.slot)
+        for pk, acc in zip(c, resp.value):
+            out[pk] = acc
+            # detection reads seed the shared cache, so get_price / buy right after it do not read them again
+            cache.store(pk, acc, resp.context.slot)
+    return out, slot
+
 class Router:
-    def __init__(self, ctx: AsyncClient, session: aiohttp.ClientSession):
+    def __init__(self, ctx: AsyncClient, session: aiohttp.ClientSession, route_cache: RouteCache | None = None, pool_index: PoolIndex | None = None, limiter: RpcLimiter | None = None, breakers: BreakerBoard | None = None, mint_filter: MintFilter | None = None, gateway: RpcGateway | None = None, batcher: RpcBatcher | None = None, account_cache: AccountCache | None = None):
         self.session = session
-        self.async_client = ctx
+        # gateway innermost (a hedged read holds one slot), batcher over it (a batch is one hedged read), then the
+        # limiter (an open breaker never takes a slot), deadlines outermost (time queued counts against them)
+        self.gateway = gateway
+        if gateway is not None:
+            gateway.attach(ctx)
+        self.batcher = batcher if batcher is not None else RpcBatcher()
+        self.batcher.attach(ctx)
+        self.limiter = limiter if limiter is not None else RpcLimiter()
+        self.breakers = breakers if breakers is not None else BreakerBoard()
+        self.async_client = enforce_deadlines(self.breakers.attach(self.limiter.attach(ctx)))
+        # one account cache for every venue below, they all read through async_client
+        if account_cache is not None:
+            account_cache.attach(self.async_client)
+        self.accounts = accounts_of(self.async_client)
+        self.mints = mints_of(self.async_client)
 
         self.pump_fun = PumpFun(session=self.session, async_client=self.async_client)
         self.get_pump_fun_creator = get_creator
@@ -54,12 +109,47 @@ class Router:
         self.launchlab_swap = RaydiumLaunchpadSwap(client=self.async_client)
         self.pump_swap = PumpSwap(async_client=self.async_client)
         self.pump_swap_fetch_state = fetch_pool_state
+        self.pump_swap_parse_state = parse_pool_state
+        self.pump_swap_fetch_reserves = fetch_pool_base_price
         self.meteora_dbc = MeteoraDBC(async_client=self.async_client)
         self.raydiumswap_v4 = RaydiumSwapV4(async_client=self.async_client)
         self.damm_v1 = MeteoraDamm1(async_client=self.async_client)
         self.damm_v2 = MeteoraDamm2(async_client=self.async_client)
         self.dlmm = MeteoraDLMM(async_client=self.async_client)
-        self.local_cache = {}
+        self.route_cache = route_cache if route_cache is not None else RouteCache()
+        self.migrations = MigrationTracker(self.async_client, self.route_cache)
+        self.inflight = SingleFlight()
+        self.probe_stats = ProbeStats()
+        self.classifier = MintClassifier()
+        self._platform_checks = {
+            "pump": self.check_route_pump,
+            "launchpad": self.check_route_launchpad,
+            "believe": self.check_route_believe,
+        }
+        self.quoter = Quoter(self)
+        self.multihop = MultiHop(self)
+        self.pool_index = None
+        if pool_index is not None:
+            self.attach_pool_index(pool_index)
+        self.mint_filter = mint_filter
+
+    def attach_pool_index(self, pool_index: PoolIndex | None):
+        """
+        Let the find_*_by_mint helpers answer from a PoolIndex (None detaches it).
+        Lookups fall back to getProgramAccounts scans while the index is cold.
+        """
+        self.pool_index = pool_index
+        self.cpmm_swap.core.pool_index = pool_index
+        self.launchlab_swap.core.pool_index = pool_index
+        self.meteora_dbc.pool_index = pool_index
+        self.damm_v1.core.pool_index = pool_index
+        self.damm_v2.core.pool_index = pool_index
+
+    def attach_mint_filter(self, mint_filter: MintFilter | None):
+        """
+        Let the race and collect_pools skip the scan probes a live MintFilter rules out (None detaches it).
+        """
+        self.mint_filter = mint_filter
 
     async def get_mint_authority(self, mint: str):
         """
@@ -70,104 +160,104 @@ class Router:
                 out_info: dict | None
         """
         try:
-            mint_pk = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            mint_resp = await self.async_client.get_account_info_json_parsed(mint_pk, commitment=Processed)
-            if not mint_resp or not mint_resp.value or not mint_resp.value.data:
-                return (None, None)
-
-            parsed = mint_resp.value.data.parsed
-            info = parsed.get('info', {}) if parsed else {}
-            freeze_authority = info.get('freezeAuthority')
-            mint_authority = info.get('mintAuthority')
-            decimals = info.get('decimals')
-            supply = info.get('supply')
-
-            try:
-                METADATA_PROGRAM_ID = Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s")
-                seeds = [b"metadata", bytes(METADATA_PROGRAM_ID), bytes(mint_pk)]
-                metadata_pda, _bump = Pubkey.find_program_address(seeds, METADATA_PROGRAM_ID)
-
-                meta_resp = await self.async_client.get_account_info(metadata_pda, commitment=Processed)
-                update_authority = None
-                if meta_resp and meta_resp.value and meta_resp.value.data:
-                    try:
-                        data_b64 = meta_resp.value.data[0]
-                        data_bytes = base64.b64decode(data_b64)
-                        if len(data_bytes) >= 1 + 32:
-                            ua_bytes = data_bytes[1:33]
-                            try:
-                                ua_pk = Pubkey(ua_bytes)
-                            except Exception:
-                                import base58
-                                ua_b58 = base58.b58encode(ua_bytes).decode()
-                                update_authority = ua_b58
-                            else:
-                                update_authority = str(ua_pk)
-                    except Exception as pe:
-                        logging.debug("Failed to parse metadata account: %s", pe, exc_info=True)
-                        update_authority = None
-                else:
-                    update_authority = None
-            except Exception as me:
-                logging.debug("Metadata PDA/read error: %s", me, exc_info=True)
-                update_authority = None
-
-            out_info = {
-                "info": {
-                    "decimals": decimals,
-                    "freezeAuthority": freeze_authority,
-                    "isInitialized": info.get("isInitialized"),
-                    "mintAuthority": mint_authority,
-                    "supply": supply,
-                },
-                "updateAuthority": update_authority,
-                "mint": str(mint_pk),
-            }
-
-            return (update_authority, out_info)
+            return await self._mint_authority(mint)
         except Exception as e:
             logging.error(f"Error getting mint authority: {e}")
             traceback.print_exc()
             return (None, None)
 
+    async def _mint_authority(self, mint: str):
+        """
+        get_mint_authority that raises on RPC errors, so (None, None) always means the mint does not exist.
+        """
+        info = await self.mints.authorities(mint)
+        if info is None:
+            return (None, None)
+        return (info.update_authority, info.authority_info())
+
     async def get_decimals(self, mint: str | Pubkey) -> int:
         """
         Get the decimals of a mint.
         """
         try:
             mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            mint_info = await self.async_client.get_account_info_json_parsed(
-                mint,
-                commitment=Processed
-            )
+            mint_info = await self.mints.get(mint)
             if not mint_info:
                 logging.info("Error: Failed to fetch mint info (tried to fetch token decimals).")
                 return None
-            dec_base = mint_info.value.data.parsed['info']['decimals']
+            dec_base = mint_info.decimals
             return int(dec_base)
         except Exception as e:
             logging.error(f"Error getting decimals for mint: {e}")
             traceback.print_exc()
             return None
 
-    async def check_route_pump(self, mint: str):
+    async def _route_candidates(self, mint: str | Pubkey) -> dict:
+        """
+        Every pool PDA the probes would check one by one for a mint, per probe.
+        Returns:
+            dict: {probe: [Pubkey, ...]}
+        """
+        mint_pk = Pubkey.from_string(mint) if isinstance(mint, str) else mint
+        return {
+            "pump": [get_associated_bonding_curve_address(mint_pk)[0]],
+            "pumpswap": [derive_canonical_pumpswap_pool(mint_pk)],
+            "launchpad": [self.launchlab_swap.core.derive_pool_address(mint_pk)],
+            "ray_clmm": self.clmm_swap.core.derive_pool_candidates(mint_pk),
+            "dlmm": await self.dlmm.core.derive_pool_candidates(mint_pk),
+            "dbc": self.meteora_dbc.derive_pool_candidates(mint_pk),
+            "damm_v2": self.damm_v2.core.derive_pool_candidates(mint_pk),
+        }
+
+    async def prefetch_route_accounts(self, mint: str) -> dict:
+        """
+        Derive every pool PDA the probes would check one by one (PumpFun bonding curve, canonical
+        PumpSwap pool, Launchpad pool, CLMM pools for all AMM configs, DLMM pair candidates,
+        DBC pools for known configs, DAMM v2 pools) and resolve them in one batch.
+        Args:
+            mint: str
+        Returns:
+            dict: {Pubkey: Account | None}, pass to the probes as `prefetched`
+        """
+        try:
+            candidates = await self._route_candidates(mint)
+            return await _fetch_accounts(self.async_client, [pk for pks in candidates.values() for pk in pks])
+        except Exception as e:
+            logging.error(f"Error prefetching route accounts: {e}")
+            traceback.print_exc()
+            return {}
+
+    async def check_route_pump(self, mint: str, prefetched: dict | None = None):
         """
         Check if a mint is a PumpFun mint.
         Args:
             mint: str
+            prefetched: dict | None <- result of prefetch_route_accounts
         Returns:
             tuple: (dex, pool)
         """
         try:
-            bc = get_associated_bonding_curve_address(Pubkey.from_string(mint))[0]
-            if not await _check_exists(self.async_client, bc):
+            bc = get_associated_bonding_curve_address(Pubkey.from_string(str(mint)))[0]
+            if prefetched is not None and bc in prefetched:
+                bc_acc = prefetched[bc]
+            else:
+                bc_acc = (await self.async_client.get_account_info(bc, commitment=Processed)).value
+            if bc_acc is None or bc_acc.data is None:
                 return (None, None)
-            
-            has_migrated = await check_has_migrated(self.async_client, bc)
+            bc_state = parse_bonding_curve_state(bc_acc.data)
+            has_migrated = bc_state.complete if bc_state else False
+            self.migrations.observe(mint, bc_state)
+
             if has_migrated:
-                best_pool = await find_migration_source(self.async_client, mint)
+                self.route_cache.invalidate(mint, SUPPORTED_DEXES["PumpFun"])
+                migrated = self.migrations.migrated_pool(mint)
+                if migrated is not None:
+                    return (SUPPORTED_DEXES["PumpSwap"], migrated)
+                best_pool = await find_migration_source(self.async_client, mint, index=self.pool_index, prefetched=prefetched, session=self.session)
                 if best_pool["source"] == "pumpswap":
-                    return (SUPPORTED_DEXES["PumpSwap"], best_pool["result"][0]["pubkey"])
+                    pool = best_pool["result"][0]["pubkey"]
+                    self.migrations.mark_migrated(mint, pool)
+                    return (SUPPORTED_DEXES["PumpSwap"], pool)
                 elif best_pool["source"] == "raydium":
                     return (SUPPORTED_DEXES["RaydiumAMM"], best_pool["result"])
                 else:
@@ -179,11 +269,12 @@ class Router:
             traceback.print_exc()
             return (None, None)
         
-    async def check_route_pumpswap(self, mint: str):
+    async def check_route_pumpswap(self, mint: str, prefetched: dict | None = None):
         """
         Check if a mint is a PumpSwap mint.
         Args:
             mint: str
+            prefetched: dict | None <- result of prefetch_route_accounts
         Returns:
             tuple: (dex, pool)
         """
@@ -192,16 +283,20 @@ class Router:
             pool1 = await find_pumpswap_pools(
                 self.async_client,
                 mint,
-                WSOL_MINT
+                WSOL_MINT,
+                index=self.pool_index,
+                prefetched=prefetched,
             )
+            if pool1:
+                return (True, pool1[0]["pubkey"])
             pool2 = await find_pumpswap_pools(
                 self.async_client,
                 WSOL_MINT,
-                mint
+                mint,
+                index=self.pool_index,
+                prefetched=prefetched,
             )
-            if pool1:
-                return (True, pool1[0]["pubkey"])
-            elif pool2:
+            if pool2:
                 return (True, pool2[0]["pubkey"])
             else:
                 return (False, None)
@@ -211,19 +306,21 @@ class Router:
             traceback.print_exc()
             return (None, None)
 
-    async def check_route_launchpad(self, mint: str):
+    async def check_route_launchpad(self, mint: str, prefetched: dict | None = None):
         """
         Check if a mint is a Launchpad mint.
         Args:
             mint: str
+            prefetched: dict | None <- result of prefetch_route_accounts
         Returns:
             tuple: (dex, pool)
         """
         try:
-            pool = await self.launchlab_swap.core.find_launchpad_pool_by_mint(mint)
+            pool = await self.launchlab_swap.core.find_launchpad_pool_by_mint(mint, prefetched=prefetched)
             if pool:
                 has_migrated = await self.launchlab_swap.core.launchpad_check_has_migrated(pool)
                 if has_migrated:
+                    self.route_cache.invalidate(mint, SUPPORTED_DEXES["Launchpad"])
                     ok, pool = await self.check_ray_cpmm_for_mint(mint)
                     if ok:
                         return (SUPPORTED_DEXES["RayCPMM"], pool)
@@ -238,19 +335,22 @@ class Router:
             traceback.print_exc()
             return (None, None)
         
-    async def check_route_believe(self, mint: str):
+    async def check_route_believe(self, mint: str, prefetched: dict | None = None):
         """
         Check if a mint is a Believe mint.
         Args:
             mint: str
+            prefetched: dict | None <- result of prefetch_route_accounts
         Returns:
             tuple: (dex, pool)
         """
         try:
-            pool, state = await self.meteora_dbc.fetch_state(mint)
+            pool, state = await self.meteora_dbc.fetch_state(mint, prefetched=prefetched)
             if pool:
                 if state["is_migrated"] == 1:
-                    ok, pool = await self.check_damm_v2_for_mint(mint)
+                    self.route_cache.invalidate(mint, SUPPORTED_DEXES["Believe"])
+                    self.route_cache.invalidate(mint, SUPPORTED_DEXES["MeteoraDBC"])
+                    ok, pool = await self.check_damm_v2_for_mint(mint, prefetched=prefetched)
                     if ok:
                         return (SUPPORTED_DEXES["MeteoraDamm2"], pool)
                     else:
@@ -288,17 +388,18 @@ class Router:
             traceback.print_exc()
             return (False, None)
         
-    async def check_ray_clmm_for_mint(self, mint: str | Pubkey):
+    async def check_ray_clmm_for_mint(self, mint: str | Pubkey, prefetched: dict | None = None):
         """
         Check if a mint is a RaydiumCLMM mint.
         Args:
             mint: str | Pubkey
+            prefetched: dict | None <- result of prefetch_route_accounts
         Returns:
             tuple: (bool, pool)
         """
         try:
             mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            pool = await self.clmm_swap.core.find_pool_by_mint_with_min_liquidity(mint, min_liquidity=10000)
+            pool = await self.clmm_swap.core.find_pool_by_mint_with_min_liquidity(mint, min_liquidity=10000, prefetched=prefetched)
             if pool:
                 return (True, pool)
             else:
@@ -328,21 +429,23 @@ class Router:
             traceback.print_exc()
             return (False, None)
         
-    async def check_dbc_for_mint(self, mint: str | Pubkey):
+    async def check_dbc_for_mint(self, mint: str | Pubkey, prefetched: dict | None = None):
         """
         Check if a mint is a MeteoraDBC mint.
         Args:
             mint: str | Pubkey
+            prefetched: dict | None <- result of prefetch_route_accounts
         Returns:
             tuple: (bool, pool)
         """
         try:
             mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            pool, state = await self.meteora_dbc.fetch_state(mint)
+            pool, state = await self.meteora_dbc.fetch_state(mint, prefetched=prefetched)
             if not pool or not state:
                 return (False, None)
             is_migrated = state["is_migrated"]
             if is_migrated == 1:
+                self.route_cache.invalidate(mint, SUPPORTED_DEXES["MeteoraDBC"])
                 return (False, "migrated")
             else:
                 return (True, pool)
@@ -373,17 +476,18 @@ class Router:
             traceback.print_exc()
             return (False, None)
         
-    async def check_damm_v2_for_mint(self, mint: str | Pubkey):
+    async def check_damm_v2_for_mint(self, mint: str | Pubkey, prefetched: dict | None = None):
         """
         Check if a mint is a MeteoraDAMM2 mint.
         Args:
             mint: str | Pubkey
+            prefetched: dict | None <- result of prefetch_route_accounts
         Returns:
             tuple: (bool, pool)
         """
         try:
             mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            pool = await self.damm_v2.core.find_pools_by_mint(mint, limit=50)
+            pool = await self.damm_v2.core.find_pools_by_mint(mint, limit=50, prefetched=prefetched)
             if pool:
                 return (True, pool)
             else:
@@ -393,18 +497,19 @@ class Router:
             traceback.print_exc()
             return (False, None)
         
-    async def check_dlmm_for_mint(self, mint: str | Pubkey, exclude_pools: list[str] = []):
+    async def check_dlmm_for_mint(self, mint: str | Pubkey, exclude_pools: list[str] = [], prefetched: dict | None = None):
         """
         Check if a mint is a MeteoraDLMM mint.
         Args:
             mint: str | Pubkey
             exclude_pools: list[str]
+            prefetched: dict | None <- result of prefetch_route_accounts
         Returns:
             tuple: (bool, pool)
         """
         try:
             mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            pools = await self.dlmm.core.find_dlmm_pools_by_mint(mint)
+            pools = await self.dlmm.core.find_dlmm_pools_by_mint(mint, prefetched=prefetched)
             pool, _, _ = await self.dlmm.core.find_suitable_pool(pools, mint, 0.001, exclude_pools=exclude_pools)
             if pool:
                 return (True, pool)
@@ -487,6 +592,22 @@ class Router:
             traceback.print_exc()
             return (None, None)
 
+    def _remember_route(self, mint: str, route: tuple):
+        """
+        Store a resolved (dex, pool) in the route cache and hand it back.
+        """
+        dex_addr, pool = route
+        if dex_addr is not None and pool is not None:
+            logging.info("Caching %s -> %s", mint, (dex_addr, pool))
+            self.route_cache.put(mint, dex_addr, pool)
+        return route
+
+    def invalidate_route(self, mint: str, dex: str | None = None) -> bool:
+        """
+        Drop the cached route for a mint (optionally only if it points at `dex`).
+        """
+        return self.route_cache.invalidate(mint, dex)
+
     async def find_best_market_for_mint_race(
         self,
         mint: str,
@@ -502,47 +623,307 @@ class Router:
                 prefer_authority: bool
                 timeout: float | None
                 exclude_pools: list[str]
-                use_cache: bool <- if True, will use local cache to avoid duplicate RPC calls
+                use_cache: bool <- if True, answers from `route_cache` (including negative entries) without RPC calls
 
         Race all known DEX route probes concurrently and return the first that yields
         a usable (dex_addr, pool). Optional `prefer_authority` short-circuits when
         mint authority already maps to a known DEX (PumpFun / Launchpad / Believe).
-        `timeout` caps total wait (seconds). None = wait until all done.
+        `timeout` caps total wait (seconds). None = wait until all done, or until the
+        current deadline (libutils.deadline) passes.
+        Resolved routes are always written to `route_cache`.
+        Concurrent calls for the same mint (and options) share one in-flight race.
+        """
+        if use_cache:
+            cached = self.route_cache.get(mint)
+            if cached is not None:
+                return cached
+
+        key = (str(mint), prefer_authority, timeout, tuple(exclude_pools or ()))
+        return await self.inflight.do(
+            key,
+            self._find_best_market_for_mint_race,
+            mint,
+            prefer_authority=prefer_authority,
+            timeout=timeout,
+            exclude_pools=exclude_pools,
+        )
+
+    def _decode_snapshot(self, dex: str, pool: str, account):
+        """
+        Decode the pool account of a route into the RouteResult `state` of its venue.
+        Returns:
+            state | None for venues whose trades do not take a snapshot
         """
         try:
-            if use_cache and str(mint) in self.local_cache:
-                return self.local_cache[str(mint)]
-            
-            # 0. authority hint (fast, low RPC cost)
-            authority, info = await self.get_mint_authority(mint)
+            if account is None:
+                return None
+            if dex == SUPPORTED_DEXES["PumpFun"]:
+                return parse_bonding_curve_state(account.data)
+            if dex == SUPPORTED_DEXES["PumpSwap"]:
+                pool_keys, pool_type = self.pump_swap_parse_state(account.data)
+                return {"pool_keys": pool_keys, "pool_type": pool_type} if pool_keys else None
+            if dex in (SUPPORTED_DEXES["MeteoraDBC"], SUPPORTED_DEXES["Believe"]):
+                state = self.meteora_dbc.parse_virtual_pool(bytes(account.data))
+                state["_pubkey"] = str(pool)
+                return state
+            return None
+        except Exception as e:
+            logging.info(f"Could not decode {pool} snapshot: {e}")
+            return None
+
+    def _route_migrated(self, dex: str, pool_account, state) -> bool:
+        """
+        Whether the launch curve behind a route has completed (PumpFun, Launchpad, DBC / Believe).
+        """
+        if dex == SUPPORTED_DEXES["PumpFun"]:
+            return state is None or bool(state.complete)
+        if dex == SUPPORTED_DEXES["Launchpad"]:
+            return self.launchlab_swap.core.status_has_migrated(pool_account.data)
+        if dex in (SUPPORTED_DEXES["MeteoraDBC"], SUPPORTED_DEXES["Believe"]):
+            return state is None or state["is_migrated"] == 1
+        return False
+
+    async def validate_route(self, mint: str, dex: str, pool: str) -> RouteResult:
+        """
+        Re-check a stored route with one getMultipleAccounts (mint + pool) instead of detecting again:
+        the pool still exists, is owned by the venue's program and, for launch curves, has not migrated.
+
+        Args:
+            mint: str
+            dex: str <- dex address of the stored route
+            pool: str
+        Returns:
+            RouteResult: the route with a fresh snapshot, or an empty one (dex / pool None) when it no longer holds
+        """
+        mint = str(mint)
+        try:
+            if not dex or not pool:
+                return RouteResult(mint, None, None)
+            mint_pk, pool_pk = Pubkey.from_string(mint), Pubkey.from_string(str(pool))
+            accounts, slot = await _fetch_accounts_at(self.async_client, [mint_pk, pool_pk])
+            now = time.monotonic()
+            mint_acc, pool_acc = accounts.get(mint_pk), accounts.get(pool_pk)
+
+            state, stale = None, None
+            if mint_acc is None:
+                stale = "mint not found"
+            elif pool_acc is None:
+                stale = "pool closed"
+            elif str(pool_acc.owner) != _POOL_PROGRAMS.get(dex, dex):
+                stale = f"pool owned by {pool_acc.owner}"
+            else:
+                state = self._decode_snapshot(dex, pool, pool_acc)
+                if dex == SUPPORTED_DEXES["PumpFun"]:
+                    self.migrations.observe(mint, state)
+                if self._route_migrated(dex, pool_acc, state):
+                    stale = "migrated"
+            if stale is not None:
+                logging.info(f"Stored route {ADDR_TO_DEX.get(dex, dex)} -> {pool} for {mint} no longer holds: {stale}")
+                self.route_cache.invalidate(mint, dex)
+                return RouteResult(mint, None, None, slot=slot)
+
+            return RouteResult(
+                mint,
+                dex,
+                str(pool),
+                state=state,
+                decimals=bytes(mint_acc.data)[44],
+                token_program=mint_acc.owner,
+                slot=slot,
+                fetched_at=now,
+            )
+        except Exception as e:
+            logging.error(f"Error validating route: {e}")
+            traceback.print_exc()
+            return RouteResult(mint, None, None)
+
+    async def find_route(
+        self,
+        mint: str,
+        *,
+        timeout: float | None = None,
+        exclude_pools: list[str] = [],
+        use_cache: bool = False,
+    ) -> RouteResult:
+        """
+        find_best_market_for_mint_race, returning a RouteResult that keeps the accounts detection read.
+        The mint account and every derivable pool PDA go out in one batch that also feeds the race,
+        so a pool found among them (PumpFun curve, canonical PumpSwap pool, DBC pool, ...) is decoded
+        without another call. Cached routes and pools found by scans cost one getMultipleAccounts
+        for the mint and pool accounts.
+
+        Args:
+            mint: str
+            timeout: float | None
+            exclude_pools: list[str]
+            use_cache: bool
+        Returns:
+            RouteResult: unpacks as (dex, pool); pass it to CobraSwaps.buy / sell as `route=`
+        """
+        mint = str(mint)
+        try:
+            mint_pk = Pubkey.from_string(mint)
+            accounts, slots, read_at = {}, {}, {}
+
+            cached = self.route_cache.get(mint) if use_cache else None
+            if cached is not None:
+                dex_addr, pool = cached
+            else:
+                candidates = await self._route_candidates(mint_pk)
+                batch, slot = await _fetch_accounts_at(
+                    self.async_client, [mint_pk] + [pk for pks in candidates.values() for pk in pks]
+                )
+                now = time.monotonic()
+                accounts.update(batch)
+                slots.update(dict.fromkeys(batch, slot))
+                read_at.update(dict.fromkeys(batch, now))
+                if batch.get(mint_pk) is None:
+                    self.route_cache.put_negative(mint)
+                    return RouteResult(mint, None, None, slot=slot)
+
+                prefetched = {pk: acc for pk, acc in batch.items() if pk != mint_pk}
+                key = (mint, True, timeout, tuple(exclude_pools or ()))
+                dex_addr, pool = await self.inflight.do(
+                    key,
+                    self._find_best_market_for_mint_race,
+                    mint,
+                    timeout=timeout,
+                    exclude_pools=exclude_pools,
+                    prefetched=prefetched,
+                )
+
+            if dex_addr is None or pool is None:
+                return RouteResult(mint, dex_addr, pool)
+
+            pool_pk = Pubkey.from_string(str(pool))
+            missing = [pk for pk in (mint_pk, pool_pk) if pk not in accounts]
+            if missing:
+                batch, slot = await _fetch_accounts_at(self.async_client, missing)
+                now = time.monotonic()
+                accounts.update(batch)
+                slots.update(dict.fromkeys(batch, slot))
+                read_at.update(dict.fromkeys(batch, now))
+
+            mint_acc = accounts.get(mint_pk)
+            return RouteResult(
+                mint,
+                dex_addr,
+                str(pool),
+                state=self._decode_snapshot(dex_addr, pool, accounts.get(pool_pk)),
+                decimals=bytes(mint_acc.data)[44] if mint_acc is not None else None,
+                token_program=mint_acc.owner if mint_acc is not None else None,
+                slot=slots.get(pool_pk),
+                fetched_at=read_at.get(pool_pk, time.monotonic()),
+            )
+        except Exception as e:
+            logging.error(f"Error finding route: {e}")
+            traceback.print_exc()
+            return RouteResult(mint, None, None)
+
+    async def _find_best_market_for_mint_race(
+        self,
+        mint: str,
+        *,
+        prefer_authority: bool = True,
+        timeout: float | None = None,
+        exclude_pools: list[str] = [],
+        prefetched: dict | None = None,
+    ):
+        speculative = None
+        spec_run = {}  # start / end of the speculative probe's own run, for its probe stats
+        try:
+            # 0. zero-RPC guess of the launch platform (remembered authority, mint suffix): its probe runs on the
+            #    prefetched accounts while the authority lookup is still in flight, and is confirmed once it lands
+            prefetch = asyncio.ensure_future(self.prefetch_route_accounts(mint)) if prefetched is None else None
+
+            def speculate(probe: str, accounts: dict | None = None) -> asyncio.Task:
+                async def run():
+                    acc = accounts if accounts is not None else (prefetched if prefetch is None else await asyncio.shield(prefetch))
+                    spec_run["start"] = time.monotonic()
+                    try:
+                        return await self.breakers.guard(f"probe:{probe}", self._platform_checks[probe], mint, prefetched=acc)
+                    finally:
+                        spec_run["end"] = time.monotonic()
+                return asyncio.create_task(run(), name=f"speculative_{probe}")
+
+            guess = self.classifier.predict(mint)
+            if guess is not None:
+                speculative = speculate(guess)
+
+            # 1. authority hint (one getMultipleAccounts, or the account cache) + batched existence check of every
+            #    derivable pool PDA
+            try:
+                authority, info = await self._mint_authority(mint)
+                self.classifier.remember(mint, authority)
+            except Exception as e:
+                # the lookup failed, the mint is not known missing: race without the authority, cache no miss
+                logging.info(f"find_best_market_for_mint_race: authority lookup failed for {mint}: {e}")
+                authority, info = "INVALID", None
+            if prefetch is not None:
+                prefetched = await prefetch
             if authority == "INVALID":
                 pass
             elif authority is None and info is None:
                 logging.error("find_best_market_for_mint_race: mint not found on-chain.")
+                self.route_cache.put_negative(mint)
                 return (None, None)
 
+            curve = get_associated_bonding_curve_address(Pubkey.from_string(str(mint)))[0]
+            feature_key = self.probe_stats.features(mint, authority, prefetched.get(curve) is not None)
+
+            def settle_speculative(task: asyncio.Task):
+                # the guessed probe runs outside the staged waves: count its outcome for the classifier, and its run
+                # in the probe stats like timed() below does for the waves
+                if not task.done() or task.cancelled():
+                    return
+                e = task.exception()
+                hit = e is None and task.result()[0] is not None and task.result()[1] is not None
+                self.classifier.counters["confirmed" if hit else "discarded"] += 1
+                if not isinstance(e, CircuitOpen) and "end" in spec_run:
+                    self.probe_stats.record(feature_key, guess, hit, spec_run["end"] - spec_run["start"], error=e is not None)
+
+            if speculative is not None and self.classifier.verdict(guess, authority) == "conflict":
+                self.classifier.counters["conflicts"] += 1
+                self.classifier.counters["discarded"] += 1
+                speculative.cancel()
+                speculative = None
+
             if prefer_authority:
+                shortcut = None
                 if authority in SUPPORTED_DEXES.values():
-                    dex_name = ADDR_TO_DEX[authority]
-                    if dex_name == "PumpFun":
-                        return await self.check_route_pump(mint)
-                    elif dex_name == "Launchpad":
-                        return await self.check_route_launchpad(mint)
+                    shortcut = {"PumpFun": "pump", "Launchpad": "launchpad"}.get(ADDR_TO_DEX[authority])
                 elif "BLV" in mint:
-                    return await self.check_route_believe(mint)
+                    shortcut = "believe"
+                if shortcut is not None:
+                    if speculative is not None and guess == shortcut:
+                        task, speculative = speculative, None
+                        try:
+                            route = await task
+                        except CircuitOpen:
+                            route = (None, None)
+                        finally:
+                            settle_speculative(task)
+                        return self._remember_route(mint, route)
+                    return self._remember_route(mint, await self._platform_checks[shortcut](mint, prefetched=prefetched))
 
-            # 1. task runners
+            # an update authority learned as a launch platform: start that probe now, ahead of the staged waves
+            if speculative is None and authority not in (None, "INVALID"):
+                guess = self.classifier.predict(mint, authority)
+                if guess is not None:
+                    speculative = speculate(guess, prefetched)
+
+            # 2. task runners
             async def run_pump():
-                return await self.check_route_pump(mint)
+                return await self.check_route_pump(mint, prefetched=prefetched)
 
             async def run_launchpad():
-                return await self.check_route_launchpad(mint)
+                return await self.check_route_launchpad(mint, prefetched=prefetched)
 
             async def run_believe():
-                return await self.check_route_believe(mint)
+                return await self.check_route_believe(mint, prefetched=prefetched)
 
             async def run_pumpswap():
-                ok, pool = await self.check_route_pumpswap(mint)
+                ok, pool = await self.check_route_pumpswap(mint, prefetched=prefetched)
                 return (SUPPORTED_DEXES["PumpSwap"], pool) if ok and pool else (None, None)
 
             async def run_ray_cpmm():
@@ -554,17 +935,17 @@ class Router:
                 return (SUPPORTED_DEXES["RaydiumAMM"], pool) if ok and pool else (None, None)
 
             async def run_ray_clmm():
-                ok, pool = await self.check_ray_clmm_for_mint(mint)
+                ok, pool = await self.check_ray_clmm_for_mint(mint, prefetched=prefetched)
                 return (SUPPORTED_DEXES["RayCLMM"], pool) if ok and pool else (None, None)
 
             async def run_dbc():
-                ok, pool = await self.check_dbc_for_mint(mint)
+                ok, pool = await self.check_dbc_for_mint(mint, prefetched=prefetched)
                 if ok and pool not in (None, "migrated"):
                     return (SUPPORTED_DEXES["MeteoraDBC"], pool)
                 return (None, None)
 
             async def run_damm_v2():
-                ok, pool = await self.check_damm_v2_for_mint(mint)
+                ok, pool = await self.check_damm_v2_for_mint(mint, prefetched=prefetched)
                 return (SUPPORTED_DEXES["MeteoraDamm2"], pool) if ok and pool else (None, None)
 
             async def run_damm_v1():
@@ -572,7 +953,7 @@ class Router:
                 return (SUPPORTED_DEXES["MeteoraDamm1"], pool) if ok and pool else (None, None)
 
             async def run_dlmm():
-                ok, pool = await self.check_dlmm_for_mint(mint, exclude_pools=exclude_pools)
+                ok, pool = await self.check_dlmm_for_mint(mint, exclude_pools=exclude_pools, prefetched=prefetched)
                 return (SUPPORTED_DEXES["MeteoraDLMM"], pool) if ok and pool else (None, None)
 
             runners = {
@@ -589,36 +970,100 @@ class Router:
                 "dlmm": run_dlmm,
             }
 
-            tasks = {name: asyncio.create_task(fn(), name=name) for name, fn in runners.items()}
+            # 3. staged launch: cheap / likely probes first, the expensive scans once that wave misses or its budget runs out
+            #    (a still-standing guess joins the race as its probe instead of running twice)
+            # scans of programs whose live filter has no pool for the mint cannot hit, and a miss stays a real miss
+            filtered = self.mint_filter.ruled_out(runners, mint) if self.mint_filter is not None else []
+            first_wave, second_wave = self.probe_stats.plan(feature_key, [n for n in runners if n not in filtered and (speculative is None or n != guess)])
+            self.probe_stats.counters["races"] += 1
+            self.probe_stats.counters["probes_filtered"] += len(filtered)
+            if second_wave:
+                self.probe_stats.counters["staged_races"] += 1
+
+            async def timed(name):
+                start = time.monotonic()
+                try:
+                    dex_addr, pool = await self.breakers.guard(f"probe:{name}", runners[name])
+                except (asyncio.CancelledError, CircuitOpen):
+                    raise
+                except Exception:
+                    self.probe_stats.record(feature_key, name, False, time.monotonic() - start, error=True)
+                    raise
+                self.probe_stats.record(feature_key, name, dex_addr is not None and pool is not None, time.monotonic() - start)
+                return dex_addr, pool
+
+            tasks = {}
+            if speculative is not None:
+                tasks[guess] = speculative
+                speculative = None
+            def launch(names):
+                for name in names:
+                    tasks[name] = asyncio.create_task(timed(name), name=name)
+                self.probe_stats.counters["probes_launched"] += len(names)
+
+            loop = asyncio.get_running_loop()
+            timeout = budget(timeout)
+            deadline = loop.time() + timeout if timeout is not None else None
+            second_at = loop.time() + self.probe_stats.wave_budget
+            launch(first_wave)
+            pending = set(tasks.values())
+            probe_timeouts = 0
+            probes_open = 0
 
             try:
-                if timeout is not None:
-                    iter_ = asyncio.as_completed(tasks.values(), timeout=timeout)
-                else:
-                    iter_ = asyncio.as_completed(tasks.values())
+                while pending or second_wave:
+                    if second_wave and (not pending or loop.time() >= second_at):
+                        self.probe_stats.counters["second_waves"] += 1
+                        launch(second_wave)
+                        pending |= {tasks[name] for name in second_wave}
+                        second_wave = []
 
-                for fut in iter_:
-                    try:
-                        dex_addr, pool = await fut
-                    except asyncio.CancelledError:
-                        continue
-                    except Exception as e:
-                        logging.debug("route task error: %s", e, exc_info=True)
-                        continue
-
-                    if dex_addr is not None and pool is not None:
-                        logging.info(f"Route found: {ADDR_TO_DEX[dex_addr]} -> {pool}")
-                        for t in tasks.values():
-                            if t is not fut and not t.done():
-                                t.cancel()
-                        await asyncio.gather(*tasks.values(), return_exceptions=True)
-                        if use_cache and mint not in self.local_cache:
-                            logging.info("Caching %s -> %s", mint, (dex_addr, pool))
-                            self.local_cache[str(mint)] = (dex_addr, pool)
-                        return (dex_addr, pool)
+                    waits = [t - loop.time() for t in (deadline, second_at if second_wave else None) if t is not None]
+                    if deadline is not None and loop.time() >= deadline:
+                        raise asyncio.TimeoutError()
+                    done, pending = await asyncio.wait(
+                        pending,
+                        timeout=max(0.0, min(waits)) if waits else None,
+                        return_when=asyncio.FIRST_COMPLETED,
+                    )
 
+                    for fut in done:
+                        if fut.get_name().startswith("speculative_"):
+                            settle_speculative(fut)
+                        try:
+                            dex_addr, pool = fut.result()
+                        except asyncio.CancelledError:
+                            continue
+                        except asyncio.TimeoutError as e:
+                            probe_timeouts += 1
+                            logging.debug("route task timed out: %s", e)
+                            continue
+                        except CircuitOpen as e:
+                            probes_open += 1
+                            logging.debug("route task skipped: %s", e)
+                            continue
+                        except Exception as e:
+                            logging.debug("route task error: %s", e, exc_info=True)
+                            continue
+
+                        if dex_addr is not None and pool is not None:
+                            if authority not in (None, "INVALID"):
+                                self.classifier.learn(authority, fut.get_name().removeprefix("speculative_"))
+                            logging.info(f"Route found: {ADDR_TO_DEX[dex_addr]} -> {pool}")
+                            self.probe_stats.counters["probes_skipped"] += len(second_wave)
+                            return self._remember_route(mint, (dex_addr, pool))
+
+                if probe_timeouts:
+                    # probes cut short by the deadline prove nothing, do not cache a miss
+                    raise asyncio.TimeoutError()
+                if probes_open:
+                    # neither do venues skipped by an open breaker
+                    logging.warning("find_best_market_for_mint_race: no route for %s, %d degraded venue(s) skipped: %s", mint, probes_open, ", ".join(self.breakers.degraded()))
+                else:
+                    # every probe finished without a route, remember the miss for a short while
+                    self.route_cache.put_negative(mint)
             except asyncio.TimeoutError:
-                logging.warning("find_best_market_for_mint_race: timeout (%.2fs) for %s", timeout, mint)
+                logging.warning("find_best_market_for_mint_race: timeout (%.2fs) for %s", timeout or 0.0, mint)
             finally:
                 for t in tasks.values():
                     if not t.done():
@@ -632,27 +1077,269 @@ class Router:
             logging.error("find_best_market_for_mint_race: %s", e)
             traceback.print_exc()
             return (None, None)
+        finally:
+            if speculative is not None and not speculative.done():
+                speculative.cancel()
 
-    async def close(self):
+    async def find_best_markets_for_mints(
+        self,
+        mints: list[str],
+        *,
+        timeout: float | None = None,
+        use_cache: bool = True,
+        concurrency: int = 8,
+    ) -> dict:
         """
-        Close the router.
+        Resolve routes for many mints with as few RPC calls as possible.
+        Cached routes are answered first. For the rest, the mint accounts and every derivable pool PDA
+        (PumpFun curves, canonical PumpSwap pools, Launchpad pools, CLMM pools, DLMM pairs, DBC and
+        DAMM v2 pools) of all mints go out in one chunked getMultipleAccounts;
+        only mints those accounts cannot place fall back to the per-mint race.
+
+        Args:
+            mints: list[str]
+            timeout: float | None <- per fallback race
+            use_cache: bool
+            concurrency: int <- mints resolved at once, from the batch and by fallback race
+        Returns:
+            dict: {mint: (dex, pool)}, (None, None) for mints without a route
         """
+        out = {}
         try:
-            await self.pump_fun.close()
-            await self.raydiumswap.close()
-            await self.pump_swap.close()
-            await self.meteora_dbc.close()
-            await self.session.close()
-            return True
+            todo, mint_pks = [], {}
+            for mint in dict.fromkeys(str(m) for m in mints):
+                cached = self.route_cache.get(mint) if use_cache else None
+                if cached is not None:
+                    out[mint] = cached
+                    continue
+                try:
+                    mint_pks[mint] = Pubkey.from_string(mint)
+                    todo.append(mint)
+                except Exception:
+                    out[mint] = (None, None)
+            if not todo:
+                return out
+
+            # 1. one batch for the mint accounts and every candidate pool of every mint
+            candidates = dict(zip(todo, await asyncio.gather(*(self._route_candidates(mint_pks[m]) for m in todo))))
+            accounts = await _fetch_accounts(
+                self.async_client,
+                list(mint_pks.values()) + [pk for c in candidates.values() for pks in c.values() for pk in pks],
+            )
+
+            def prefetched_for(mint):
+                return {pk: accounts.get(pk) for pks in candidates[mint].values() for pk in pks}
+
+            def exists(prefetched, mint, probe):
+                return any(prefetched.get(pk) is not None for pk in candidates[mint].get(probe, []))
+
+            # 2. routes the batch already answers (live curve, canonical PumpSwap / Launchpad pool,
+            #    funded CLMM pool, existing DLMM pair); their checks may still read, so only `concurrency` at once
+            sem = asyncio.Semaphore(max(1, concurrency))
+            async def from_batch(mint):
+                async with sem:
+                    return await resolve_from_batch(mint)
+
+            async def resolve_from_batch(mint):
+                if accounts.get(mint_pks[mint]) is None:
+                    self.route_cache.put_negative(mint)
+                    return (None, None)
+                prefetched = prefetched_for(mint)
+                if exists(prefetched, mint, "pump"):
+                    route = await self.check_route_pump(mint, prefetched=prefetched)
+                    if route[0] is not None:
+                        return route
+                if exists(prefetched, mint, "pumpswap"):
+                    ok, pool = await self.check_route_pumpswap(mint, prefetched=prefetched)
+                    if ok:
+                        return (SUPPORTED_DEXES["PumpSwap"], pool)
+                if exists(prefetched, mint, "launchpad"):
+                    route = await self.check_route_launchpad(mint, prefetched=prefetched)
+                    if route[1] is not None:
+                        return route
+                ok, pool = await self.check_ray_clmm_for_mint(mint, prefetched=prefetched)
+                if ok:
+                    return (SUPPORTED_DEXES["RayCLMM"], pool)
+                if exists(prefetched, mint, "dlmm"):
+                    ok, pool = await self.check_dlmm_for_mint(mint, prefetched=prefetched)
+                    if ok:
+                        return (SUPPORTED_DEXES["MeteoraDLMM"], pool)
+                return None
+
+            resolved = await asyncio.gather(*(from_batch(m) for m in todo))
+            fallback = []
+            for mint, route in zip(todo, resolved):
+                if route is None:
+                    fallback.append(mint)
+                else:
+                    out[mint] = self._remember_route(mint, route)
+
+            # 3. per-mint race for the rest, reusing the batch instead of prefetching again
+            async def race(mint):
+                async with sem:
+                    prefetched = prefetched_for(mint)
+                    key = (mint, True, timeout, ())
+                    return await self.inflight.do(
+                        key, self._find_best_market_for_mint_race, mint, timeout=timeout, prefetched=prefetched
+                    )
+
+            for mint, route in zip(fallback, await asyncio.gather(*(race(m) for m in fallback))):
+                out[mint] = route
+
+            logging.info(f"Routes for {len(out)} mints: {len(out) - len(todo)} cached, {len(todo) - len(fallback)} from batch, {len(fallback)} raced")
+            return out
         except Exception as e:
-            logging.error(f"Error closing router: {e}")
-            return False
+            logging.error(f"Error resolving routes for mints: {e}")
+            traceback.print_exc()
+            for mint in mints:
+                out.setdefault(str(mint), (None, None))
+            return out
+
+    async def collect_pools(self, mint: str, timeout: float | None = None) -> list[tuple]:
+        """
+        Every SOL pool the probes can find for a mint, not just the first one.
+        Probes still running after `timeout` seconds are cancelled and their venues skipped.
+        Returns:
+            list[tuple]: [(dex, pool), ...]
+        """
+        try:
+            mint_pk = Pubkey.from_string(mint) if isinstance(mint, str) else mint
+            prefetched = await self.prefetch_route_accounts(mint)
+
+            async def run_single(dex_key, check):
+                ok, pool = await check
+                return [(SUPPORTED_DEXES[dex_key], str(pool))] if ok and pool not in (None, "migrated") else []
 
+            async def run_pump():
+                dex_addr, pool = await self.check_route_pump(mint, prefetched=prefetched)
+                return [(dex_addr, str(pool))] if dex_addr and pool else []
 
+            async def run_launchpad():
+                dex_addr, pool = await self.check_route_launchpad(mint, prefetched=prefetched)
+                return [(dex_addr, str(pool))] if dex_addr and pool else []
 
+            async def run_pumpswap():
+                pools = await find_pumpswap_pools(self.async_client, mint, WSOL_MINT, index=self.pool_index, derive=False)
+                pools += await find_pumpswap_pools(self.async_client, WSOL_MINT, mint, index=self.pool_index, derive=False)
+                return [(SUPPORTED_DEXES["PumpSwap"], p["pubkey"]) for p in pools]
 
+            async def run_ray_cpmm():
+                pools = await self.cpmm_swap.core.find_cpmm_pools_by_mint(mint_pk, limit=500)
+                return [(SUPPORTED_DEXES["RayCPMM"], p) for p in dict.fromkeys(pools)]
 
+            async def run_ray_clmm():
+                out = []
+                for pool in self.clmm_swap.core.derive_pool_candidates(mint_pk):
+                    acc = prefetched.get(pool)
+                    if acc is not None and int.from_bytes(bytes(acc.data)[237:253], "little") > 0:
+                        out.append((SUPPORTED_DEXES["RayCLMM"], str(pool)))
+                return out
+
+            async def run_dlmm():
+                pools = await self.dlmm.core.find_dlmm_pools_by_mint(mint_pk, prefetched=prefetched)
+                return [(SUPPORTED_DEXES["MeteoraDLMM"], p) for p in pools]
 
+            probes = {
+                "pump": run_pump,
+                "launchpad": run_launchpad,
+                "pumpswap": run_pumpswap,
+                "ray_cpmm": run_ray_cpmm,
+                "ray_clmm": run_ray_clmm,
+                "dlmm": run_dlmm,
+                "ray_v4": lambda: run_single("RaydiumAMM", self.check_ray_v4_for_mint(mint)),
+                "dbc": lambda: run_single("MeteoraDBC", self.check_dbc_for_mint(mint, prefetched=prefetched)),
+                "damm_v1": lambda: run_single("MeteoraDamm1", self.check_damm_v1_for_mint(mint)),
+                "damm_v2": lambda: run_single("MeteoraDamm2", self.check_damm_v2_for_mint(mint)),
+            }
+            if self.mint_filter is not None:
+                for name in self.mint_filter.ruled_out(probes, mint):
+                    del probes[name]
+            # same breakers as the race: a venue that keeps failing is skipped here too
+            tasks = [asyncio.create_task(self.breakers.guard(f"probe:{name}", fn)) for name, fn in probes.items()]
+            done, pending = await asyncio.wait(tasks, timeout=timeout)
+            for t in pending:
+                t.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
 
+            venues = []
+            for t in done:
+                if t.exception() is None:
+                    venues.extend(t.result())
+            return list(dict.fromkeys(venues))
+        except Exception as e:
+            logging.error(f"Error collecting pools: {e}")
+            traceback.print_exc()
+            return []
 
+    async def best_quote(
+        self,
+        mint: str,
+        side: str,
+        amount: float,
+        *,
+        owner: str | Pubkey | None = None,
+        deadline: float = 3.0,
+        multihop: bool = False,
+    ) -> list[dict]:
+        """
+        Rank every venue for a trade by what it actually returns at this size.
+        Args:
+            mint: str
+            side: str <- "buy" (amount in SOL) | "sell" (amount in tokens)
+            amount: float
+            owner: str | Pubkey | None <- if set, a buy into a missing ATA is charged its rent
+            deadline: float <- seconds for discovery and quoting together
+            multihop: bool <- also rank two-hop routes through USDC / USDT (MultiHop), by combined output
+        Returns:
+            list[dict]: best first, each:
+                dex, pool, side, amount_in, amount_out, price_impact_pct, fee_pct, ata_rent, approx
+                (two-hop entries: dex == TWO_HOP, pool None, plus via, via_mint, legs; pass them to CobraSwaps.two_hop)
+        """
+        try:
+            if side not in ("buy", "sell"):
+                raise ValueError(f"best_quote: invalid side {side}")
+            end = time.monotonic() + deadline
+            hops = asyncio.create_task(self.multihop.quote(mint, side, amount, deadline=end)) if multihop else None
+            try:
+                # leave part of the budget for quoting
+                venues = await self.collect_pools(mint, timeout=deadline * 0.6)
+                quotes = await self.quoter.rank(mint, side, amount, venues, owner=owner, deadline=end)
+                if hops is not None:
+                    quotes += await hops
+                    quotes.sort(key=rank_key)
+            finally:
+                if hops is not None and not hops.done():
+                    hops.cancel()
+            for q in quotes:
+                venue = f"{q['via']} two-hop" if q["dex"] == TWO_HOP else f"{ADDR_TO_DEX[q['dex']]} {q['pool']}"
+                logging.info(f"Quote: {venue} -> {q['amount_out']:.6f} (impact {q['price_impact_pct']:.2f}%)")
+            return quotes
+        except Exception as e:
+            logging.error(f"Error quoting {mint}: {e}")
+            traceback.print_exc()
+            return []
 
+    async def close(self):
+        """
+        Close the router.
+        """
+        try:
+            if self.pool_index is not None:
+                await self.pool_index.close()
+            if self.mint_filter is not None:
+                await self.mint_filter.close()
+            await self.migrations.close()
+            await self.batcher.close()
+            await self.accounts.close()
+            # the route cache may be shared with another router: write it out, leave it open
+            self.route_cache.flush()
+            # every venue shares async_client, so it is closed once here instead of through each venue's close()
+            await self.async_client.close()
+            if self.gateway is not None:
+                await self.gateway.close()
+            self.route_cache.close()
+            await self.session.close()
+            return True
+        except Exception as e:
+            logging.error(f"Error closing router: {e}")
+            return False
@@ -0,0 +1,312 @@
+import asyncio, base64, logging, os, time
+from collections import OrderedDict
+from solders.pubkey import Pubkey # type: ignore
+from solders.system_program import CreateAccountWithSeedParams, create_account_with_seed
+from solana.rpc.commitment import Processed, Confirmed
+from solana.rpc.types import DataSliceOpts, MemcmpOpts
+from spl.token.instructions import (
+    create_associated_token_account,
+    get_associated_token_address,
+    initialize_account,
+    InitializeAccountParams,
+    close_account,
+    CloseAccountParams,
+)
+try:
+    from libutils import SUPPORTED_DEXES, TOKEN_PROGRAM_ID, WSOL_MINT
+    from raydiumswap.cpmm.cpmm_core import CPMM_PROGRAM_ID
+    from _quotes import VENUE_FEE_PCT
+except:
+    from .libutils import SUPPORTED_DEXES, TOKEN_PROGRAM_ID, WSOL_MINT
+    from .raydiumswap.cpmm.cpmm_core import CPMM_PROGRAM_ID
+    from ._quotes import VENUE_FEE_PCT
+
+# intermediate quote tokens a two-hop route may go through
+HOP_MINTS = {
+    "USDC": "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v",
+    "USDT": "Es9vMFrzaCERmJfrF4H2FYD4KCoNkY11McCe8BenwNYB",
+}
+
+TWO_HOP = "two_hop"          # `dex` of a two-hop quote
+HOP_POOL_TTL = 600           # seconds the SOL/X pools of a hop token are reused
+MAX_POOL_KEYS = 1024
+CPMM_MINT_OFFSETS = (168, 200)
+RENT_EXEMPT = 2039280
+ACCOUNT_SIZE = 165
+
+_WSOL = Pubkey.from_string(WSOL_MINT)
+
+def _cp_out(reserve_in: float, reserve_out: float, amount_in: float, fee_pct: float) -> float:
+    if amount_in <= 0 or reserve_in <= 0 or reserve_out <= 0:
+        return 0.0
+    x = amount_in * (1 - fee_pct / 100)
+    return reserve_out * x / (reserve_in + x)
+
+class MultiHop:
+    def __init__(self, router, hop_mints: dict[str, str] | None = None, pool_ttl: float = HOP_POOL_TTL):
+        """
+        Two-hop routes SOL -> X -> token (and back) through Raydium CPMM pools, X being one of `hop_mints`.
+        CPMM is the venue whose swap builder takes any input / output mint, so both legs go into one transaction.
+
+        Args:
+            router: Router
+            hop_mints: dict[str, str] | None <- {symbol: mint}, HOP_MINTS when None
+            pool_ttl: float <- seconds the SOL/X pools of a hop token are reused
+        """
+        self.router = router
+        self.client = router.async_client
+        self.core = router.cpmm_swap.core
+        self.hop_mints = dict(hop_mints or HOP_MINTS)
+        self.pool_ttl = pool_ttl
+        self.fee_pct = VENUE_FEE_PCT[SUPPORTED_DEXES["RayCPMM"]]
+        self._sol_pools: dict[str, tuple[float, list[str]]] = {}  # hop mint -> (fetched at, pools)
+        self._keys: OrderedDict[str, object] = OrderedDict()     # pool -> CpmmPoolKeys, they never change
+
+    async def pair_pools(self, mint_x: str | Pubkey, mint_y: str | Pubkey) -> list[str]:
+        """
+        CPMM pools of the pair (x, y). Answered by the PoolIndex when it is warm (from the side with fewer pools,
+        never the whole USDC / wSOL set), else one getProgramAccounts filtered on both mints (CPMM stores them sorted).
+        """
+        x, y = str(mint_x), str(mint_y)
+        index = self.router.pool_index
+        if index is not None:
+            pools = index.lookup_pair("cpmm", x, y)
+            if pools is not None:
+                return pools
+        a, b = sorted((Pubkey.from_string(x), Pubkey.from_string(y)), key=bytes)
+        resp = await self.client.get_program_accounts(
+            CPMM_PROGRAM_ID,
+            commitment=Confirmed,
+            encoding="base64",
+            data_slice=DataSliceOpts(offset=0, length=0),
+            filters=[
+                MemcmpOpts(offset=CPMM_MINT_OFFSETS[0], bytes=str(a)),
+                MemcmpOpts(offset=CPMM_MINT_OFFSETS[1], bytes=str(b)),
+            ],
+        )
+        return [str(acc.pubkey) for acc in resp.value]
+
+    async def sol_pools(self, hop_mint: str) -> list[str]:
+        hit = self._sol_pools.get(hop_mint)
+        if hit is not None and time.monotonic() - hit[0] < self.pool_ttl:
+            return hit[1]
+        pools = await self.pair_pools(WSOL_MINT, hop_mint)
+        self._sol_pools[hop_mint] = (time.monotonic(), pools)
+        return pools
+
+    async def _pool_keys(self, pool: str):
+        keys = self._keys.get(pool)
+        if keys is None:
+            keys = await self.core.async_fetch_pool_keys(pool)
+            if keys is None:
+                return None
+            self._keys[pool] = keys
+            while len(self._keys) > MAX_POOL_KEYS:
+                self._keys.popitem(last=False)
+        self._keys.move_to_end(pool)
+        return keys
+
+    async def _leg_state(self, pool: str) -> dict | None:
+        """
+        Returns:
+            dict | None: {"pool", "reserves": {mint: ui amount}, "decimals": {mint: int}}
+        """
+        try:
+            keys = await self._pool_keys(pool)
+            if keys is None:
+                return None
+            res_a, res_b = await self.core.async_get_pool_reserves(keys)
+            if res_a <= 0 or res_b <= 0:
+                return None
+            a, b = str(keys.mint_a), str(keys.mint_b)
+            return {
+                "pool": pool,
+                "reserves": {a: res_a, b: res_b},
+                "decimals": {a: keys.decimals_a, b: keys.decimals_b},
+            }
+        except Exception as e:
+            logging.info(f"MultiHop | Failed to read CPMM pool {pool}: {e}")
+            return None
+
+    def _best_leg(self, states: list[dict], mint_in: str, mint_out: str, amount_in: float) -> dict | None:
+        best = None
+        for s in states:
+            r_in, r_out = s["reserves"].get(mint_in), s["reserves"].get(mint_out)
+            if r_in is None or r_out is None:
+                continue
+            out = _cp_out(r_in, r_out, amount_in, self.fee_pct)
+            if best is None or out > best["amount_out"]:
+                best = {
+                    "dex": SUPPORTED_DEXES["RayCPMM"],
+                    "pool": s["pool"],
+                    "mint_in": mint_in,
+                    "mint_out": mint_out,
+                    "amount_in": amount_in,
+                    "amount_out": out,
+                    "reserve_in": r_in,
+                    "reserve_out": r_out,
+                    "decimals_in": s["decimals"][mint_in],
+                    "decimals_out": s["decimals"][mint_out],
+                }
+        return best
+
+    async def quote(self, mint: str, side: str, amount: float, deadline: float | None = None) -> list[dict]:
+        """
+        Best two-hop route per hop token for a trade, quoted locally on both legs' reserves.
+        Each leg is the pool giving the most out of its input, which also maximises the second leg.
+
+        Args:
+            mint: str
+            side: str <- "buy" (amount in SOL) | "sell" (amount in tokens)
+            amount: float
+            deadline: float | None <- monotonic time after which unanswered hops are dropped
+        Returns:
+            list[dict]: best first, each shaped like a Router.best_quote entry with dex = TWO_HOP, pool None,
+                        plus via (symbol), via_mint and legs [{dex, pool, mint_in, mint_out, amount_in, amount_out, ...}]
+        """
+        mint = str(mint)
+
+        async def hop(symbol, hop_mint):
+            token_pools, sol_pools = await asyncio.gather(self.pair_pools(mint, hop_mint), self.sol_pools(hop_mint))
+            if not token_pools or not sol_pools:
+                return None
+            token_states, sol_states = await asyncio.gather(
+                asyncio.gather(*(self._leg_state(p) for p in token_pools)),
+                asyncio.gather(*(self._leg_state(p) for p in sol_pools)),
+            )
+            token_states = [s for s in token_states if s is not None]
+            sol_states = [s for s in sol_states if s is not None]
+            if side == "buy":
+                first = self._best_leg(sol_states, WSOL_MINT, hop_mint, amount)
+                second = self._best_leg(token_states, hop_mint, mint, first["amount_out"]) if first else None
+            else:
+                first = self._best_leg(token_states, mint, hop_mint, amount)
+                second = self._best_leg(sol_states, hop_mint, WSOL_MINT, first["amount_out"]) if first else None
+            if second is None or second["amount_out"] <= 0:
+                return None
+            spot = amount
+            for leg in (first, second):
+                spot *= leg["reserve_out"] / leg["reserve_in"]
+            return {
+                "dex": TWO_HOP,
+                "pool": None,
+                "via": symbol,
+                "via_mint": hop_mint,
+                "legs": [first, second],
+                "mint": mint,
+                "side": side,
+                "amount_in": amount,
+                "amount_out": second["amount_out"],
+                "price_impact_pct": (1 - second["amount_out"] / spot) * 100 if spot > 0 else 100.0,
+                "fee_pct": (1 - (1 - self.fee_pct / 100) ** 2) * 100,
+                "ata_rent": 0.0,
+                "approx": False,
+            }
+
+        if side not in ("buy", "sell"):
+            raise ValueError(f"MultiHop | invalid side {side}")
+        tasks = [asyncio.create_task(hop(symbol, hop_mint)) for symbol, hop_mint in self.hop_mints.items() if hop_mint != mint]
+        if not tasks:
+            return []
+        timeout = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+        done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for t in pending:
+            t.cancel()
+        quotes = []
+        for t in done:
+            if t.exception() is not None:
+                logging.info(f"MultiHop | Hop failed for {mint}: {t.exception()}")
+            elif t.result() is not None:
+                quotes.append(t.result())
+        quotes.sort(key=lambda q: q["amount_out"], reverse=True)
+        return quotes
+
+    def _swap_ix(self, keys, mint_in: str, amount_in: int, min_out: int, user_in: Pubkey, user_out: Pubkey, owner: Pubkey):
+        if str(keys.mint_a) == mint_in:
+            ins = (keys.vault_a, keys.vault_b, keys.mint_prog_a, keys.mint_prog_b, keys.mint_a, keys.mint_b)
+        else:
+            ins = (keys.vault_b, keys.vault_a, keys.mint_prog_b, keys.mint_prog_a, keys.mint_b, keys.mint_a)
+        input_vault, output_vault, input_prog, output_prog, input_mint, output_mint = ins
+        return self.core.create_swap_instruction_base_in(
+            amount_in=amount_in,
+            min_amount_out=min_out,
+            user_input_ata=user_in,
+            user_output_ata=user_out,
+            input_vault=input_vault,
+            output_vault=output_vault,
+            input_prog=input_prog,
+            output_prog=output_prog,
+            input_mint=input_mint,
+            output_mint=output_mint,
+            keys=keys,
+            owner=owner,
+        )
+
+    @staticmethod
+    def _mint_program(keys, mint: str) -> Pubkey:
+        return keys.mint_prog_a if str(keys.mint_a) == mint else keys.mint_prog_b
+
+    async def build(self, quote: dict, owner: Pubkey, slippage: float) -> list:
+        """
+        Instructions of a two-hop quote in one list: wSOL wrap / unwrap, missing ATAs and both CPMM swaps.
+        The slippage budget is split over the legs. The second leg spends the first leg's minimum output, so
+        it can never run short; whatever the first leg returns above that stays in the hop token account.
+
+        Args:
+            quote: dict <- entry of MultiHop.quote / Router.best_quote with dex == TWO_HOP
+            owner: Pubkey
+            slippage: float <- percent, for the whole route
+        Returns:
+            list[Instruction]
+        """
+        first, second = quote["legs"]
+        keys1, keys2 = await asyncio.gather(self._pool_keys(first["pool"]), self._pool_keys(second["pool"]))
+        if keys1 is None or keys2 is None:
+            raise RuntimeError("MultiHop | cannot decode a leg's pool")
+        leg_slip = slippage / 200
+        mint, hop_mint = quote["mint"], quote["via_mint"]
+        hop_pk, mint_pk = Pubkey.from_string(hop_mint), Pubkey.from_string(mint)
+
+        amount_in = int(first["amount_in"] * 10 ** first["decimals_in"])
+        min_hop = int(first["amount_out"] * (1 - leg_slip) * 10 ** first["decimals_out"])
+        if amount_in <= 0 or min_hop <= 0:
+            raise RuntimeError("MultiHop | trade too small")
+        second_out = _cp_out(second["reserve_in"], second["reserve_out"], min_hop / 10 ** second["decimals_in"], self.fee_pct)
+        min_out = int(second_out * (1 - leg_slip) * 10 ** second["decimals_out"])
+
+        hop_prog = self._mint_program(keys1, hop_mint)
+        mint_prog = self._mint_program(keys2 if quote["side"] == "buy" else keys1, mint)
+        hop_ata = get_associated_token_address(owner, hop_pk, hop_prog)
+        mint_ata = get_associated_token_address(owner, mint_pk, mint_prog)
+        existing = (await self.client.get_multiple_accounts([hop_ata, mint_ata], commitment=Processed)).value
+
+        ixs = []
+        if existing[0] is None:
+            ixs.append(create_associated_token_account(owner, owner, hop_pk, token_program_id=hop_prog))
+        if existing[1] is None:
+            if quote["side"] == "sell":
+                raise RuntimeError("MultiHop | no token account to sell from")
+            ixs.append(create_associated_token_account(owner, owner, mint_pk, token_program_id=mint_prog))
+
+        seed = base64.urlsafe_b64encode(os.urandom(12)).decode("utf-8")
+        temp_wsol = Pubkey.create_with_seed(owner, seed, TOKEN_PROGRAM_ID)
+        wrap = amount_in if quote["side"] == "buy" else 0
+        ixs.append(create_account_with_seed(CreateAccountWithSeedParams(
+            from_pubkey=owner, to_pubkey=temp_wsol, base=owner, seed=seed,
+            lamports=RENT_EXEMPT + wrap, space=ACCOUNT_SIZE, owner=TOKEN_PROGRAM_ID,
+        )))
+        ixs.append(initialize_account(InitializeAccountParams(
+            program_id=TOKEN_PROGRAM_ID, account=temp_wsol, mint=_WSOL, owner=owner,
+        )))
+
+        if quote["side"] == "buy":
+            ixs.append(self._swap_ix(keys1, WSOL_MINT, amount_in, min_hop, temp_wsol, hop_ata, owner))
+            ixs.append(self._swap_ix(keys2, hop_mint, min_hop, min_out, hop_ata, mint_ata, owner))
+        else:
+            ixs.append(self._swap_ix(keys1, mint, amount_in, min_hop, mint_ata, hop_ata, owner))
+            ixs.append(self._swap_ix(keys2, hop_mint, min_hop, min_out, hop_ata, temp_wsol, owner))
+
+        ixs.append(close_account(CloseAccountParams(
+            program_id=TOKEN_PROGRAM_ID, account=temp_wsol, dest=owner, owner=owner,
+        )))
+        return ixs
@@ -0,0 +1,240 @@
+import asyncio, logging, traceback, time
+from solders.pubkey import Pubkey # type: ignore
+from solana.rpc.commitment import Processed
+from spl.token.instructions import get_associated_token_address
+try:
+    from libutils import SUPPORTED_DEXES, ADDR_TO_DEX, TOKEN_PROGRAM_ID, TOKEN_2022, WSOL_MINT
+    from PumpSwapAMM.fetch_reserves import fetch_pool_base_price as pump_swap_pool_reserves
+except:
+    from .libutils import SUPPORTED_DEXES, ADDR_TO_DEX, TOKEN_PROGRAM_ID, TOKEN_2022, WSOL_MINT
+    from .PumpSwapAMM.fetch_reserves import fetch_pool_base_price as pump_swap_pool_reserves
+
+ATA_RENT_SOL = 0.00203928
+
+# Nominal swap fee per venue (percent). Pools with configurable fee tiers are quoted at their common tier.
+VENUE_FEE_PCT = {
+    SUPPORTED_DEXES["PumpFun"]: 1.25,
+    SUPPORTED_DEXES["PumpSwap"]: 0.30,
+    SUPPORTED_DEXES["RaydiumAMM"]: 0.25,
+    SUPPORTED_DEXES["RayCPMM"]: 0.25,
+    SUPPORTED_DEXES["RayCLMM"]: 0.25,
+    SUPPORTED_DEXES["Launchpad"]: 1.0,
+    SUPPORTED_DEXES["MeteoraDBC"]: 1.0,
+    SUPPORTED_DEXES["Believe"]: 1.0,
+    SUPPORTED_DEXES["MeteoraDamm1"]: 0.25,
+    SUPPORTED_DEXES["MeteoraDamm2"]: 0.25,
+    SUPPORTED_DEXES["MeteoraDLMM"]: 0.25,
+}
+
+def _sol_side(mint_a, mint_b, res_a: float, res_b: float):
+    """
+    (token_reserve, sol_reserve) for a pool with mints (a, b), None if neither side is wSOL.
+    """
+    if str(mint_a) == WSOL_MINT:
+        return res_b, res_a
+    if str(mint_b) == WSOL_MINT:
+        return res_a, res_b
+    return None
+
+def quote_out(curve: dict, side: str, amount: float) -> float:
+    """
+    Output amount for `amount` in (SOL for buy, tokens for sell) on a pool curve.
+    Constant product on (token_reserve, sol_reserve) when known, spot price otherwise.
+    """
+    if amount <= 0:
+        return 0.0
+    fee = curve["fee_pct"] / 100
+    x = amount * (1 - fee)
+    token_res, sol_res = curve.get("token_reserve"), curve.get("sol_reserve")
+    if token_res and sol_res:
+        if side == "buy":
+            return token_res * x / (sol_res + x)
+        return sol_res * x / (token_res + x)
+    price = curve.get("price")
+    if not price:
+        return 0.0
+    return x / price if side == "buy" else x * price
+
+def split_amount(curves: list[dict], side: str, amount: float, steps: int = 20) -> list[float]:
+    """
+    Split `amount` across pool curves so the summed output is maximised.
+    The amount is handed out in `steps` equal chunks, each to the pool with the best marginal output.
+    Returns:
+        list[float]: input per curve, same order as `curves`
+    """
+    alloc = [0.0] * len(curves)
+    if not curves or amount <= 0 or steps <= 0:
+        return alloc
+    chunk = amount / steps
+    for _ in range(steps):
+        best, best_gain = None, 0.0
+        for i, curve in enumerate(curves):
+            gain = quote_out(curve, side, alloc[i] + chunk) - quote_out(curve, side, alloc[i])
+            if gain > best_gain:
+                best, best_gain = i, gain
+        if best is None:
+            break
+        alloc[best] += chunk
+    return alloc
+
+def rank_key(quote: dict):
+    """
+    Sort key of quotes: exact ones first, then by output.
+    """
+    return (quote["approx"], -quote["amount_out"])
+
+class Quoter:
+    def __init__(self, router):
+        """
+        Reads pool reserves per venue and quotes trade sizes on them.
+
+        Args:
+            router: Router
+        """
+        self.router = router
+        self.client = router.async_client
+
+    async def pool_curve(self, dex: str, pool: str | Pubkey, mint: str | Pubkey) -> dict | None:
+        """
+        Reserves of a SOL pool in ui units.
+        Returns:
+            dict | None:
+                dex: str
+                pool: str
+                token_reserve: float | None
+                sol_reserve: float | None
+                price: float <- SOL per token
+                fee_pct: float
+                approx: bool <- True when only the spot price is known (concentrated liquidity pools, DBC):
+                                the quote has no price impact and is ranked after the exact ones
+        """
+        try:
+            r = self.router
+            pool = str(pool)
+            reserves = None
+            price = None
+
+            if dex == SUPPORTED_DEXES["PumpFun"]:
+                state, _ = await r.pump_fun.fetch_pool_state(pool)
+                if not isinstance(state, dict) or state["complete"]:
+                    return None
+                reserves = (state["virtual_token_reserves"] / 1e6, state["virtual_sol_reserves"] / 1e9)
+            elif dex == SUPPORTED_DEXES["PumpSwap"]:
+                pool_keys, _ = await r.pump_swap_fetch_state(pool, self.client)
+                _, base_bal, quote_bal = await pump_swap_pool_reserves(pool_keys, self.client)
+                if base_bal is None:
+                    return None
+                reserves = _sol_side(pool_keys["base_mint"], pool_keys["quote_mint"], float(base_bal), float(quote_bal))
+            elif dex == SUPPORTED_DEXES["RayCPMM"]:
+                keys = await r.cpmm_swap.core.async_fetch_pool_keys(pool)
+                res_a, res_b = await r.cpmm_swap.core.async_get_pool_reserves(keys)
+                reserves = _sol_side(keys.mint_a, keys.mint_b, res_a, res_b)
+            elif dex == SUPPORTED_DEXES["RaydiumAMM"]:
+                keys = await r.raydiumswap_v4.raydium_core.async_fetch_pool_keys(pool)
+                token_res, sol_res, _ = await r.raydiumswap_v4.raydium_core.async_get_pool_reserves(keys)
+                reserves = (token_res, sol_res) if token_res is not None else None
+            elif dex == SUPPORTED_DEXES["RayCLMM"]:
+                info = await r.clmm_swap.core.get_price(pool, strict_mint=mint)
+                price = info["price"] if info else None
+            elif dex == SUPPORTED_DEXES["Launchpad"]:
+                keys = await r.launchlab_swap.core.async_fetch_pool_keys(pool)
+                token_res = (keys.virtual_a - keys.real_a) / (10 ** keys.decimals_a)
+                sol_res = (keys.virtual_b + keys.real_b) / (10 ** keys.decimals_b)
+                reserves = (token_res, sol_res)
+            elif dex == SUPPORTED_DEXES["MeteoraDBC"] or dex == SUPPORTED_DEXES["Believe"]:
+                price = await r.meteora_dbc.get_price(pool, self.client)
+            elif dex == SUPPORTED_DEXES["MeteoraDamm1"]:
+                info = await r.damm_v1.core.get_price(mint, pool_addr=pool)
+                if info:
+                    reserves = (info["token_reserve"], info["sol_reserve"])
+            elif dex == SUPPORTED_DEXES["MeteoraDamm2"]:
+                info = await r.damm_v2.core.get_price(mint, pool_addr=pool)
+                price = info["price"] if info else None
+            elif dex == SUPPORTED_DEXES["MeteoraDLMM"]:
+                info = await r.dlmm.core.get_price(pool_addr=pool, strict_mint=mint)
+                price = info["price"] if info else None
+            else:
+                raise ValueError(f"Quoter | Unsupported DEX: {dex}")
+
+            if reserves is not None:
+                token_res, sol_res = reserves
+                if not token_res or not sol_res or token_res <= 0 or sol_res <= 0:
+                    return None
+                price = sol_res / token_res
+            elif price is None or price <= 0:
+                return None
+
+            return {
+                "dex": dex,
+                "pool": pool,
+                "token_reserve": reserves[0] if reserves else None,
+                "sol_reserve": reserves[1] if reserves else None,
+                "price": float(price),
+                "fee_pct": VENUE_FEE_PCT.get(dex, 0.25),
+                "approx": reserves is None,
+            }
+        except Exception as e:
+            logging.info(f"Quoter | Failed to read {ADDR_TO_DEX.get(dex, dex)} pool {pool}: {e}")
+            return None
+
+    async def needs_ata(self, owner: str | Pubkey, mint: str | Pubkey) -> bool:
+        """
+        True when `owner` has no token account for `mint` yet (a buy pays its rent).
+        """
+        try:
+            owner = Pubkey.from_string(owner) if isinstance(owner, str) else owner
+            mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
+            atas = [
+                get_associated_token_address(owner, mint, TOKEN_PROGRAM_ID),
+                get_associated_token_address(owner, mint, TOKEN_2022),
+            ]
+            resp = await self.client.get_multiple_accounts(atas, commitment=Processed)
+            return all(acc is None for acc in resp.value)
+        except Exception as e:
+            logging.info(f"Quoter | ATA check failed: {e}")
+            return False
+
+    def quote(self, curve: dict, side: str, amount: float, ata_rent: float = 0.0) -> dict:
+        """
+        Quote one pool. For buys `ata_rent` (SOL) comes off the input before the swap.
+        """
+        amount_in = amount - ata_rent if side == "buy" else amount
+        amount_out = quote_out(curve, side, amount_in)
+        spot_out = amount_in / curve["price"] if side == "buy" else amount_in * curve["price"]
+        return {
+            "dex": curve["dex"],
+            "pool": curve["pool"],
+            "side": side,
+            "amount_in": amount,
+            "amount_out": amount_out,
+            "price_impact_pct": (1 - amount_out / spot_out) * 100 if spot_out > 0 else 100.0,
+            "fee_pct": curve["fee_pct"],
+            "ata_rent": ata_rent,
+            "approx": curve["approx"],
+        }
+
+    async def rank(self, mint: str, side: str, amount: float, venues: list[tuple], owner: str | Pubkey | None = None, deadline: float | None = None) -> list[dict]:
+        """
+        Quote every (dex, pool) in `venues` and sort by output, best first. Approximate quotes (spot price only)
+        come after every exact one, so they are never picked as the best route over a pool with known depth.
+        Pools that do not answer before `deadline` (monotonic time) are dropped.
+        """
+        ata_task = asyncio.create_task(self.needs_ata(owner, mint)) if owner is not None and side == "buy" else None
+        tasks = [asyncio.create_task(self.pool_curve(dex, pool, mint)) for dex, pool in venues]
+        if not tasks:
+            if ata_task:
+                ata_task.cancel()
+            return []
+
+        timeout = max(0.0, deadline - time.monotonic()) if deadline is not None else None
+        done, pending = await asyncio.wait(tasks + ([ata_task] if ata_task else []), timeout=timeout)
+        for t in pending:
+            t.cancel()
+
+        ata_rent = ATA_RENT_SOL if ata_task in done and ata_task.result() else 0.0
+        quotes = []
+        for t in tasks:
+            if t in done and t.result() is not None:
+                quotes.append(self.quote(t.result(), side, amount, ata_rent))
+        quotes.sort(key=rank_key)
+        return quotes
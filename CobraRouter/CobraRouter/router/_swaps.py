@@ -1,22 +1,35 @@
 try: from _main import Router
 except: from ._main import Router
-try: from libutils import SUPPORTED_DEXES, ADDR_TO_DEX
-except: from .libutils import SUPPORTED_DEXES, ADDR_TO_DEX
+try: from libutils import SUPPORTED_DEXES, ADDR_TO_DEX, WSOL_MINT, SingleFlight, RouteResult, SNAPSHOT_MAX_AGE
+except: from .libutils import SUPPORTED_DEXES, ADDR_TO_DEX, WSOL_MINT, SingleFlight, RouteResult, SNAPSHOT_MAX_AGE
+try: from libutils.deadline import deadline, deadline_sleep, within, explain, DeadlineExceeded
+except: from .libutils.deadline import deadline, deadline_sleep, within, explain, DeadlineExceeded
+try: from libutils.mint_info import mints_of
+except: from .libutils.mint_info import mints_of
+try: from libutils.gateway import raw_request
+except: from .libutils.gateway import raw_request
+try: from pump_fun import curve_price, curve_creator
+except: from .pump_fun import curve_price, curve_creator
+try: from _quotes import quote_out, split_amount
+except: from ._quotes import quote_out, split_amount
 import traceback
 from solders.keypair import Keypair # type: ignore
 from solders.pubkey import Pubkey # type: ignore
 from solana.rpc.async_api import AsyncClient
-import asyncio, logging
+import asyncio, logging, time
 import aiohttp
+from collections import OrderedDict
 from solders.message import VersionedMessage, MessageV0 # type: ignore
 from solana.rpc.commitment import Processed
+from solana.rpc.core import RPCException
 import statistics as _st
 from solders.transaction import VersionedTransaction # type: ignore
 from solana.rpc.types import TxOpts, TokenAccountOpts
 from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price # type: ignore
 from solana.rpc.commitment import Confirmed
 from solders.system_program import TransferParams, transfer
-from spl.token.instructions import transfer_checked, TransferCheckedParams, get_associated_token_address, create_associated_token_account
+from spl.token.instructions import transfer_checked, TransferCheckedParams, get_associated_token_address, create_associated_token_account, create_idempotent_associated_token_account
+from spl.token.constants import ASSOCIATED_TOKEN_PROGRAM_ID
 
 def compute_unit_price_from_total_fee(
     total_lams: int,
@@ -26,12 +39,45 @@ def compute_unit_price_from_total_fee(
     micro_lamports_per_cu = lamports_per_cu * 1_000_000
     return int(micro_lamports_per_cu)
 
+def independent_legs(ix_lists: list, owner: Pubkey) -> list:
+    """
+    Make the instruction lists of a split trade land in any order. Each venue builder checks the owner's ATAs
+    on its own and adds a plain (failing when the account exists) create for the missing ones, and PumpSwap
+    legs close the wSOL ATA they funded. Every create becomes idempotent, and every leg creates (idempotently)
+    each ATA another leg creates or the wSOL ATA before its first use, so no leg depends on another.
+    Returns:
+        list: ix_lists, edited in place
+    """
+    wsol_ata = get_associated_token_address(owner, Pubkey.from_string(WSOL_MINT))
+    creates = {wsol_ata: create_idempotent_associated_token_account(owner, owner, Pubkey.from_string(WSOL_MINT))}
+    for ixs in ix_lists:
+        if not isinstance(ixs, list):
+            continue
+        for i, ix in enumerate(ixs):
+            if ix.program_id == ASSOCIATED_TOKEN_PROGRAM_ID and bytes(ix.data) in (b"", b"\x00"):
+                payer, ata, ata_owner, mint, _, token_program = (a.pubkey for a in ix.accounts[:6])
+                ixs[i] = creates[ata] = create_idempotent_associated_token_account(payer, ata_owner, mint, token_program)
+
+    for ixs in ix_lists:
+        if not isinstance(ixs, list):
+            continue
+        created = {ix.accounts[1].pubkey for ix in ixs if ix.program_id == ASSOCIATED_TOKEN_PROGRAM_ID}
+        for ata, create in creates.items():
+            if ata in created:
+                continue
+            first_use = next((i for i, ix in enumerate(ixs) if any(a.pubkey == ata and a.is_writable for a in ix.accounts)), None)
+            if first_use is not None:
+                ixs.insert(first_use, create)
+    return ix_lists
+
 logging.basicConfig(level=logging.INFO)
 
 LAMPORTS_PER_SOL = 1_000_000_000
 _MICRO = 1_000_000
 _DEFAULT_CU = 300_000
 TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+FEE_ESTIMATE_TTL = 15.0 # seconds a warmed per-pool fee estimate stands in for a fresh getRecentPrioritizationFees
+MAX_FEE_ESTIMATES = 4096
 
 class CobraSwaps:
     def __init__(self, router: Router, ctx: AsyncClient, session: aiohttp.ClientSession, rpc_url: str):
@@ -39,16 +85,28 @@ class CobraSwaps:
         self.router = router
         self.session = session
         self.rpc_url = rpc_url
+        self.inflight = SingleFlight()
+        self.fee_estimates: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    def _blockhash_soon(self) -> asyncio.Task:
+        """
+        Start the latest blockhash read without waiting for it, so it is issued together with the venue's first
+        state reads (one RPC batch) instead of taking a round trip of its own before them.
+        """
+        task = asyncio.ensure_future(self.ctx.get_latest_blockhash())
+        # a swap that fails before needing the blockhash never awaits it
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        return task
 
     async def _mint_owner(self, mint: Pubkey) -> Pubkey:
         """
         Get the token program id of a mint.
         """
         try:
-            info = await self.ctx.get_account_info(mint, commitment=Confirmed)
-            if info.value is None:
+            info = await mints_of(self.ctx).get(mint)
+            if info is None:
                 raise RuntimeError("mint account missing")
-            return info.value.owner
+            return info.token_program
         except Exception as e:
             traceback.print_exc()
             logging.info(f"Failed to get token program id: {e}")
@@ -93,9 +151,12 @@ class CobraSwaps:
         """
         pubkey = Pubkey.from_string(pubkey) if isinstance(pubkey, str) else pubkey
         mints = [Pubkey.from_string(m) if isinstance(m, str) else m for m in mints]
-        atas = [get_associated_token_address(pubkey, m, token_program_id=await self._mint_owner(m)) for m in mints]
         balances = {}
         try:
+            # token programs of every mint in one read instead of one _mint_owner round trip per mint
+            infos = await self.router.mints.get_many(mints)
+            programs = {m: info.token_program for m, info in infos.items() if info is not None}
+            atas = [get_associated_token_address(pubkey, m, token_program_id=programs.get(str(m), TOKEN_PROGRAM_ID)) for m in mints]
             infos = await self.ctx.get_multiple_accounts_json_parsed(
                 atas, commitment=Processed
             )
@@ -117,9 +178,13 @@ class CobraSwaps:
     async def priority_fee_levels(
         self,
         msg: VersionedMessage | None = None,
-        cu: int = _DEFAULT_CU
+        cu: int = _DEFAULT_CU,
+        accounts: list[str] | None = None,
     ) -> dict[str, float]:
         """
+        Args:
+            msg: VersionedMessage | None <- fees of transactions locking its first 32 accounts
+            accounts: list[str] | None <- used instead when there is no message yet
         Returns:
             dict[str, float]: Priority fee levels
                 - "low": 25th percentile
@@ -131,17 +196,14 @@ class CobraSwaps:
         if msg is not None:
             accs = [str(k) for k in msg.account_keys[:32]]
         else:
-            accs = []
+            accs = [str(a) for a in accounts or []][:32]
 
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "getRecentPrioritizationFees",
-            "params": [accs],
-        }
-
-        async with self.session.post(self.ctx._provider.endpoint_uri, json=payload, timeout=4) as r:
-            rows = (await r.json()).get("result", [])
+        # no solders request class: sent raw, still through the gateway's hedging, failover and governor
+        try:
+            rows = await within(raw_request(self.ctx, "getRecentPrioritizationFees", [accs]), "getRecentPrioritizationFees") or []
+        except RPCException as e:
+            logging.info(f"Swaps | getRecentPrioritizationFees answered with an error: {e}")
+            rows = []
 
         vals = [row.get("prioritizationFee", 0) for row in rows if row.get("prioritizationFee")]
         if not vals:
@@ -187,6 +249,24 @@ class CobraSwaps:
             "turbo": 0.002,
         }
 
+    async def warm_priority_fees(self, pool: str | Pubkey) -> dict[str, float]:
+        """
+        Fetch the fee levels of transactions locking `pool` ahead of a trade on it.
+        A trade on the pool within FEE_ESTIMATE_TTL seconds uses them instead of fetching its own.
+        """
+        levels = await self.priority_fee_levels(accounts=[str(pool)])
+        self.fee_estimates[str(pool)] = (time.monotonic(), levels)
+        self.fee_estimates.move_to_end(str(pool))
+        while len(self.fee_estimates) > MAX_FEE_ESTIMATES:
+            self.fee_estimates.popitem(last=False)
+        return levels
+
+    def warmed_priority_fees(self, pool: str | Pubkey | None) -> dict[str, float] | None:
+        hit = self.fee_estimates.get(str(pool)) if pool is not None else None
+        if hit is None or time.monotonic() - hit[0] > FEE_ESTIMATE_TTL:
+            return None
+        return hit[1]
+
     async def get_price(self, mint: str | Pubkey, pool: str | Pubkey, dex: str):
         """
         Get the price of a mint.
@@ -197,6 +277,9 @@ class CobraSwaps:
         Returns:
             float: price
         """
+        return await self.inflight.do(("price", str(mint), str(pool), dex), self._get_price, mint, pool, dex)
+
+    async def _get_price(self, mint: str | Pubkey, pool: str | Pubkey, dex: str):
         if dex == SUPPORTED_DEXES["MeteoraDamm1"]:
             price = await self.router.damm_v1.core.get_price(mint, pool_addr=pool)
         elif dex == SUPPORTED_DEXES["MeteoraDamm2"]:
@@ -228,6 +311,152 @@ class CobraSwaps:
 
         return float(price)
 
+    async def _send_with_priority_fee(
+        self,
+        ixs: list,
+        keypair: Keypair,
+        blockhash,
+        versioned_message: MessageV0,
+        priority_fee_level: str,
+        sim: bool = False,
+        is_dlmm: bool = False,
+        label: str = "Swap",
+        pool: str | Pubkey | None = None,
+    ):
+        """
+        Append compute budget instructions priced at `priority_fee_level`, optionally simulate, send and confirm.
+        Fee levels warmed for `pool` (warm_priority_fees) are used while fresh.
+        Returns:
+            tuple: (tx_hash, success) | ("replay", False) when a DLMM simulation failed
+        """
+        priority_fee = self.warmed_priority_fees(pool) or await self.priority_fee_levels(versioned_message)
+        logging.info(f"Currently using: {priority_fee_level} | Low: {priority_fee['low']:.8f} | Medium: {priority_fee['medium']:.8f} | High: {priority_fee['high']:.8f} | Turbo: {priority_fee['turbo']:.8f}")
+        priority_fee = priority_fee[priority_fee_level]
+        if priority_fee is None:
+            priority_fee = 0.000005
+        
+        if priority_fee > 0.01:
+            raise Exception("CobraSwaps | Priority fee is too high (Over 0.01 SOL)")
+
+        if not ixs:
+            return (None, False)
+
+        lamports_fee = int(priority_fee * LAMPORTS_PER_SOL)
+        micro_lamports = compute_unit_price_from_total_fee(
+            lamports_fee,
+            compute_units=_DEFAULT_CU
+        )
+
+        ixs.append(set_compute_unit_limit(_DEFAULT_CU))
+        ixs.append(set_compute_unit_price(micro_lamports))
+        ver_msg = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
+        tx = VersionedTransaction(ver_msg, [keypair])
+
+        if sim:
+            simulate_resp = await self.ctx.simulate_transaction(tx)
+            if simulate_resp.value and simulate_resp.value.err:
+                if not is_dlmm:
+                    logging.info(f"Simulation result: {simulate_resp.value}")
+                    raise Exception(f"Simulation failed: {simulate_resp.value.err}")
+                else:
+                    return ("replay", False)
+
+        result = await self.ctx.send_transaction(tx, opts=TxOpts(skip_preflight=True, max_retries=0))
+        logging.info(f"Cobra | {label} transaction sent: {result.value}")
+        try:
+            ok = await self._await_confirm(result.value)
+        except DeadlineExceeded as e:
+            # already sent, it may still land: hand the signature back instead of failing blind
+            logging.warning(f"Cobra | {label} transaction {result.value} unconfirmed, {e}")
+            return (result.value, False)
+        logging.info(f"Cobra | {label} transaction confirmed: {ok}")
+        return (result.value, ok)
+
+    def _route_state(self, route: RouteResult | None, mint, pool, dex: str):
+        """
+        Pool snapshot of `route` when it describes this trade, else None.
+        """
+        if route is None or not route.matches(mint, pool, dex):
+            return None
+        return route.state
+
+    async def _pump_fun_terms(self, mint, pool, route: RouteResult | None, max_age: float):
+        """
+        (price, creator) of a PumpFun curve. A matching route snapshot supplies the creator,
+        and the price too while it is fresh.
+        """
+        curve = self._route_state(route, mint, pool, SUPPORTED_DEXES["PumpFun"])
+        if curve is not None and route.is_fresh(max_age):
+            price = curve_price(curve)
+        else:
+            price = await self.router.pump_fun.get_price(mint)
+        if curve is not None:
+            creator = curve_creator(curve)
+        else:
+            creator = await self.router.get_pump_fun_creator(self.ctx, str(pool))
+        return price, creator
+
+    async def _pumpswap_pool_data(self, mint, pool, route: RouteResult | None):
+        """
+        pool_data for the PumpSwap builders. Pool keys and decimals never change, so a matching route
+        snapshot supplies them at any age; the vault reserves are always read.
+        Returns:
+            tuple: (pool_keys, pool_type, pool_data)
+        """
+        snap = self._route_state(route, mint, pool, SUPPORTED_DEXES["PumpSwap"])
+        if snap is not None:
+            pool_keys, pool_type = snap["pool_keys"], snap["pool_type"]
+        else:
+            pool_keys, pool_type = await self.router.pump_swap_fetch_state(pool, self.ctx)
+        async def known(value):
+            return value
+
+        # reserves and decimals are independent reads: issued together they share one RPC batch
+        if snap is not None and route.decimals is not None:
+            decimals_base = known(route.decimals)
+        else:
+            decimals_base = self.router.get_decimals(mint)
+        if pool_keys["quote_mint"] == WSOL_MINT or pool_keys["quote_mint"] == str(mint):
+            decimals_quote = known(None)
+        else:
+            decimals_quote = self.router.get_decimals(pool_keys["quote_mint"])
+        (base_price, base_balance_tokens, quote_balance_sol), decimals_base, decimals_quote = await asyncio.gather(
+            self.router.pump_swap_fetch_reserves(pool_keys, self.ctx), decimals_base, decimals_quote
+        )
+        if pool_keys["quote_mint"] == WSOL_MINT:
+            decimals_quote = 9
+        elif pool_keys["quote_mint"] == str(mint):
+            decimals_quote = decimals_base
+
+        pool_data = {
+            "pool_pubkey": Pubkey.from_string(str(pool)),
+            "token_base": Pubkey.from_string(pool_keys["base_mint"]),
+            "token_quote": Pubkey.from_string(pool_keys["quote_mint"]),
+            "pool_base_token_account": pool_keys["pool_base_token_account"],
+            "pool_quote_token_account": pool_keys["pool_quote_token_account"],
+            "base_balance_tokens": base_balance_tokens,
+            "quote_balance_sol": quote_balance_sol,
+            "decimals_base": decimals_base,
+            "decimals_quote": decimals_quote,
+        }
+        if pool_type == "NEW":
+            pool_data["coin_creator"] = Pubkey.from_string(pool_keys["coin_creator"])
+        return pool_keys, pool_type, pool_data
+
+    async def _dbc_state(self, mint, pool, dex: str, route: RouteResult | None, max_age: float):
+        """
+        Virtual pool state for a DBC trade: the route snapshot while fresh, a re-read of the
+        known pool when stale, the full mint -> pool lookup without a route.
+        """
+        snap = self._route_state(route, mint, pool, dex)
+        if snap is not None and route.is_fresh(max_age):
+            return snap
+        if snap is not None:
+            _, state = await self.router.meteora_dbc.fetch_pool_state(pool)
+            return state
+        _, state = await self.router.meteora_dbc.fetch_state(mint)
+        return state
+
     async def buy(
         self, 
         mint: str | Pubkey, 
@@ -251,21 +480,31 @@ class CobraSwaps:
             priority_fee_level: str = "medium"
             dex: str = SUPPORTED_DEXES["RaydiumAMM"]
             **kwargs
+                return_instructions: bool
+                route: RouteResult <- from Router.find_route, skips the pool / decimals refetch when it matches
+                max_snapshot_age: float <- seconds the route's reserves may be used for pricing
+                deadline: float <- latency budget in seconds for the whole trade, every RPC call honours it
         Returns:
             tuple: (tx_hash, success)
         """
+        with deadline(kwargs.get("deadline"), "buy"):
+            return await self._buy(mint, pool, keypair, sol_amount, slippage, priority_fee_level, dex, **kwargs)
+
+    async def _buy(self, mint, pool, keypair: Keypair, sol_amount: float, slippage: float, priority_fee_level: str, dex: str, **kwargs):
         try:
+            # a PumpFun route whose curve the tracker saw migrate trades on the PumpSwap pool directly
+            dex, pool = self.router.migrations.redirect(mint, dex, pool)
             return_instructions = kwargs.get("return_instructions", False) == True
+            route = kwargs.get("route")
+            max_age = kwargs.get("max_snapshot_age", SNAPSHOT_MAX_AGE)
 
             ixs = []
             sim, is_dlmm = False, False
-            versioned_message = None
-            blockhash = (await self.ctx.get_latest_blockhash()).value.blockhash
+            blockhash_req = self._blockhash_soon()
 
             if dex == SUPPORTED_DEXES["MeteoraDamm1"]:
                 state = await self.router.damm_v1.core.fetch_pool_state(pool)
                 ixs = await self.router.damm_v1.buy(mint, state, int(sol_amount * LAMPORTS_PER_SOL), keypair=keypair, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["MeteoraDamm2"]:
                 state = await self.router.damm_v2.core.fetch_pool_state(pool)
                 swap_params = await self.router.damm_v2.build_swap_params(
@@ -276,108 +515,50 @@ class CobraSwaps:
                     keypair
                 )
                 ixs = await self.router.damm_v2.buy(swap_params, keypair=keypair, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["MeteoraDLMM"]:
                 sim, is_dlmm = True, True
                 state = await self.router.dlmm.core.fetch_pool_state(pool)
                 ixs = await self.router.dlmm.buy(mint, state, int(sol_amount * LAMPORTS_PER_SOL), keypair=keypair, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["MeteoraDBC"] or dex == SUPPORTED_DEXES["Believe"]:
-                _, state = await self.router.meteora_dbc.fetch_state(mint)
+                state = await self._dbc_state(mint, pool, dex, route, max_age)
                 ixs = await self.router.meteora_dbc.swap.buy(state, int(sol_amount * LAMPORTS_PER_SOL), 1, keypair=keypair, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["PumpFun"]:
-                price = await self.router.pump_fun.get_price(mint)
+                price, creator = await self._pump_fun_terms(mint, pool, route, max_age)
+                if price == "migrated":
+                    self.router.invalidate_route(mint, SUPPORTED_DEXES["PumpFun"])
+                    raise Exception(f"CobraSwaps | {mint} has migrated off PumpFun")
                 if price is None:
                     raise Exception(f"CobraSwaps | Price for {mint} is None")
                 token_amount = await self.router.pump_fun.lamports_to_tokens(int(sol_amount * LAMPORTS_PER_SOL), price)
-                creator = await self.router.get_pump_fun_creator(self.ctx, str(pool))
                 ixs = await self.router.pump_fun.pump_buy(mint, pool, int(sol_amount * LAMPORTS_PER_SOL), creator, keypair, token_amount, slippage=slippage, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["PumpSwap"]:
-                pool_keys, pool_type = await self.router.pump_swap_fetch_state(pool, self.ctx)
-                base_price, base_balance_tokens, quote_balance_sol = await self.router.pump_swap.fetch_pool_base_price(pool)
-                decimals_base = await self.router.get_decimals(mint)
-                decimals_quote = await self.router.get_decimals(pool_keys["quote_mint"])
-                pool_data = {
-                    "pool_pubkey": Pubkey.from_string(str(pool)),
-                    "token_base": Pubkey.from_string(pool_keys["base_mint"]),
-                    "token_quote": Pubkey.from_string(pool_keys["quote_mint"]),
-                    "pool_base_token_account": pool_keys["pool_base_token_account"],
-                    "pool_quote_token_account": pool_keys["pool_quote_token_account"],
-                    "base_balance_tokens": base_balance_tokens,
-                    "quote_balance_sol": quote_balance_sol,
-                    "decimals_base": decimals_base,
-                    "decimals_quote": decimals_quote,
-                }
-                if pool_type == "NEW":
-                    pool_data["coin_creator"] = Pubkey.from_string(pool_keys["coin_creator"])
+                pool_keys, pool_type, pool_data = await self._pumpswap_pool_data(mint, pool, route)
                 if str(pool_keys["base_mint"]) == "So11111111111111111111111111111111111111112":
                     ixs = await self.router.pump_swap.reversed_buy(pool_data, sol_amount, keypair, pool_type, slippage_pct=slippage, return_instructions=True)
                 else:
                     ixs = await self.router.pump_swap.buy(pool_data, sol_amount, keypair, pool_type, slippage_pct=slippage, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["RaydiumAMM"]:
                 ixs = await self.router.raydiumswap_v4.execute_buy_async(mint, sol_amount, slippage, 0, pool, keypair=keypair, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["RayCLMM"]:
-                state = await self.router.clmm_swap.core.async_fetch_pool_keys(pool)
                 ixs = await self.router.clmm_swap.execute_clmm_buy_async(mint, sol_amount, keypair, 1, 0, pool, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["RayCPMM"]:
-                state = await self.router.cpmm_swap.core.async_fetch_pool_keys(pool)
                 ixs = await self.router.cpmm_swap.execute_cpmm_buy_async(mint, sol_amount, keypair, slippage, 0, pool, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["Launchpad"]:
-                state = await self.router.launchlab_swap.core.async_fetch_pool_keys(pool)
                 ixs = await self.router.launchlab_swap.execute_lp_buy_async(mint, sol_amount, slippage, keypair, pool, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
 
             if return_instructions:
                 return ixs
 
-            if versioned_message is None:
-                raise Exception("CobraSwaps | No versioned message found")
-
-            priority_fee = await self.priority_fee_levels(versioned_message)
-            logging.info(f"Currently using: {priority_fee_level} | Low: {priority_fee['low']:.8f} | Medium: {priority_fee['medium']:.8f} | High: {priority_fee['high']:.8f} | Turbo: {priority_fee['turbo']:.8f}")
-            priority_fee = priority_fee[priority_fee_level]
-            if priority_fee is None:
-                priority_fee = 0.000005
-            
-            if priority_fee > 0.01:
-                raise Exception("CobraSwaps | Priority fee is too high (Over 0.01 SOL)")
-
-            if ixs:
-                lamports_fee = int(priority_fee * LAMPORTS_PER_SOL)
-                micro_lamports = compute_unit_price_from_total_fee(
-                    lamports_fee,
-                    compute_units=_DEFAULT_CU
-                )
+            if not ixs:
+                raise Exception(f"CobraSwaps | No instructions built for {dex}")
 
-                ixs.append(set_compute_unit_limit(_DEFAULT_CU))
-                ixs.append(set_compute_unit_price(micro_lamports))
-                ver_msg = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
-                tx = VersionedTransaction(ver_msg, [keypair])
-
-                if sim:
-                    simulate_resp = await self.ctx.simulate_transaction(tx)
-                    if simulate_resp.value and simulate_resp.value.err:
-                        if not is_dlmm:
-                            logging.info(f"Simulation result: {simulate_resp.value}")
-                            raise Exception(f"Simulation failed: {simulate_resp.value.err}")
-                        else:
-                            return ("replay", False)
-
-                result = await self.ctx.send_transaction(tx, opts=TxOpts(skip_preflight=True, max_retries=0))
-                logging.info(f"Cobra | Buy transaction sent: {result.value}")
-                ok = await self._await_confirm(result.value)
-                logging.info(f"Cobra | Buy transaction confirmed: {ok}")
-                return (result.value, ok)
+            # started before the venue's state reads, so it usually rides in the same RPC batch
+            blockhash = (await blockhash_req).value.blockhash
+            versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
 
-            return ixs
+            return await self._send_with_priority_fee(ixs, keypair, blockhash, versioned_message, priority_fee_level, sim, is_dlmm, "Buy", pool=pool)
         except Exception as e:
-            logging.error(f"CobraSwaps | Error buying: {e}")
+            logging.error(f"CobraSwaps | Error buying: {explain(e, 'building the buy')}")
             traceback.print_exc()
             return (None, False)
 
@@ -494,7 +675,7 @@ class CobraSwaps:
             res = await self.ctx.get_transaction(sig, commitment=Confirmed, max_supported_transaction_version=0)
             if res.value and res.value.transaction.meta.err is None:
                 return True
-            await asyncio.sleep(delay)
+            await deadline_sleep(delay, "confirmation")
         return False
 
     async def sell(
@@ -508,32 +689,41 @@ class CobraSwaps:
         dex: str = SUPPORTED_DEXES["RaydiumAMM"],
         **kwargs
     ):
+        """
+        Sell tokens for SOL across different DEX platforms
+        
+        Args:
+            mint: Token mint address to sell
+            pool: Pool address for the token
+            keypair: Keypair
+            sell_pct: Percentage of token balance to sell (0-100)
+            slippage: Slippage tolerance (0.01 = 1%)
+            priority_fee_level: Priority fee level ("low", "medium", "high")
+            dex: DEX to use for the swap
+            route: RouteResult <- from Router.find_route, skips the pool / decimals refetch when it matches
+            max_snapshot_age: float <- seconds the route's reserves may be used for pricing
+            deadline: float <- latency budget in seconds for the whole trade, every RPC call honours it
+        
+        Returns:
+            tuple: (transaction_signature, confirmation_status)
+        """
+        with deadline(kwargs.get("deadline"), "sell"):
+            return await self._sell(mint, pool, keypair, sell_pct, slippage, priority_fee_level, dex, **kwargs)
+
+    async def _sell(self, mint, pool, keypair: Keypair, sell_pct: float, slippage: float, priority_fee_level: str, dex: str, **kwargs):
         try:
-            """
-            Sell tokens for SOL across different DEX platforms
-            
-            Args:
-                mint: Token mint address to sell
-                pool: Pool address for the token
-                keypair: Keypair
-                sell_pct: Percentage of token balance to sell (0-100)
-                slippage: Slippage tolerance (0.01 = 1%)
-                priority_fee_level: Priority fee level ("low", "medium", "high")
-                dex: DEX to use for the swap
-            
-            Returns:
-                tuple: (transaction_signature, confirmation_status)
-            """
+            # a PumpFun route whose curve the tracker saw migrate trades on the PumpSwap pool directly
+            dex, pool = self.router.migrations.redirect(mint, dex, pool)
             return_instructions = kwargs.get("return_instructions", False) == True
+            route = kwargs.get("route")
+            max_age = kwargs.get("max_snapshot_age", SNAPSHOT_MAX_AGE)
             sim, is_dlmm = False, False
             ixs = []
-            versioned_message = None
-            blockhash = (await self.ctx.get_latest_blockhash()).value.blockhash
+            blockhash_req = self._blockhash_soon()
 
             if dex == SUPPORTED_DEXES["MeteoraDamm1"]:
                 state = await self.router.damm_v1.core.fetch_pool_state(pool)
                 ixs = await self.router.damm_v1.sell(mint, state, sell_pct, keypair=keypair, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["MeteoraDamm2"]:
                 if sell_pct is None or sell_pct <= 0:
                     raise ValueError("Percentage can't be 0 and is required for sell actions")
@@ -569,16 +759,13 @@ class CobraSwaps:
                     keypair
                 )
                 ixs = await self.router.damm_v2.sell(swap_params, keypair=keypair, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["MeteoraDLMM"]:
                 sim, is_dlmm = True, True
                 state = await self.router.dlmm.core.fetch_pool_state(pool)
                 ixs = await self.router.dlmm.sell(mint, state, sell_pct, keypair=keypair, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["MeteoraDBC"] or dex == SUPPORTED_DEXES["Believe"]:
-                _, state = await self.router.meteora_dbc.fetch_state(mint)
+                state = await self._dbc_state(mint, pool, dex, route, max_age)
                 ixs = await self.router.meteora_dbc.swap.sell(state, sell_pct, keypair=keypair, slippage_pct=slippage, return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["PumpFun"]:
                 token_pk = Pubkey.from_string(mint) if isinstance(mint, str) else mint
                 bal_resp = await self.ctx.get_token_accounts_by_owner_json_parsed(
@@ -594,106 +781,266 @@ class CobraSwaps:
                 sell_amount = token_balance * (sell_pct / 100)
                 token_amount = int(sell_amount * 10**6)
                 
-                price = await self.router.pump_fun.get_price(mint)
+                price, creator = await self._pump_fun_terms(mint, pool, route, max_age)
+                if price == "migrated":
+                    self.router.invalidate_route(mint, SUPPORTED_DEXES["PumpFun"])
                 if price is None or price == "NotOnPumpFun" or price == "migrated":
                     raise Exception(f"Cannot get price for {mint}")
                 
                 lamports_min_output = int(sell_amount * price * LAMPORTS_PER_SOL * float(1 - slippage/100))
-                creator = await self.router.get_pump_fun_creator(self.ctx, str(pool))
                 
                 ixs = await self.router.pump_fun.pump_sell(
                     mint, pool, token_amount, lamports_min_output, creator, keypair=keypair, return_instructions=True
                 )
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["PumpSwap"]:
-                pool_keys, pool_type = await self.router.pump_swap_fetch_state(pool, self.ctx)
-                base_price, base_balance_tokens, quote_balance_sol = await self.router.pump_swap.fetch_pool_base_price(pool)
-                decimals_base = await self.router.get_decimals(mint)
-                decimals_quote = await self.router.get_decimals(pool_keys["quote_mint"])
-                pool_data = {
-                    "pool_pubkey": Pubkey.from_string(str(pool)),
-                    "token_base": Pubkey.from_string(pool_keys["base_mint"]),
-                    "token_quote": Pubkey.from_string(pool_keys["quote_mint"]),
-                    "pool_base_token_account": pool_keys["pool_base_token_account"],
-                    "pool_quote_token_account": pool_keys["pool_quote_token_account"],
-                    "base_balance_tokens": base_balance_tokens,
-                    "quote_balance_sol": quote_balance_sol,
-                    "decimals_base": decimals_base,
-                    "decimals_quote": decimals_quote,
-                }
-                if pool_type == "NEW":
-                    pool_data["coin_creator"] = Pubkey.from_string(pool_keys["coin_creator"])
+                pool_keys, pool_type, pool_data = await self._pumpswap_pool_data(mint, pool, route)
 
                 if str(pool_keys["base_mint"]) == "So11111111111111111111111111111111111111112":
                     ixs = await self.router.pump_swap.reversed_sell(pool_data, sell_pct, keypair, pool_type, slippage_pct=slippage, debug_prints=True, return_instructions=True)
                 else:
                     ixs = await self.router.pump_swap.sell(pool_data, sell_pct, keypair, pool_type, slippage_pct=slippage, debug_prints=True, return_instructions=True)
                 print(ixs)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["RaydiumAMM"]:
-                ixs = await self.router.raydiumswap_v4.execute_sell_async(mint, keypair, int(sell_pct), int(slippage), return_instructions=True)
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
+                ixs = await self.router.raydiumswap_v4.execute_sell_async(mint, keypair, sell_pct, int(slippage), return_instructions=True)
             elif dex == SUPPORTED_DEXES["RayCLMM"]:
                 ixs = await self.router.clmm_swap.execute_clmm_sell_async(
-                    mint, keypair, int(sell_pct), int(slippage), pool_id=pool, return_instructions=True
+                    mint, keypair, sell_pct, int(slippage), pool_id=pool, return_instructions=True
                 )
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["RayCPMM"]:
                 ixs = await self.router.cpmm_swap.execute_cpmm_sell_async(
                     mint, keypair, sell_pct, slippage_pct=slippage, pool_hint=pool, return_instructions=True
                 )
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
             elif dex == SUPPORTED_DEXES["Launchpad"]:
                 ixs = await self.router.launchlab_swap.execute_lp_sell_async(
                     mint, keypair, sell_pct, slippage_pct=slippage, pool_id=pool, return_instructions=True
                 )
-                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
 
             if return_instructions:
                 return ixs
 
-            if versioned_message is None:
-                raise Exception("CobraSwaps | No versioned message found")
-
-            priority_fee = await self.priority_fee_levels(versioned_message)
-            logging.info(f"Currently using: {priority_fee_level} | Low: {priority_fee['low']:.8f} | Medium: {priority_fee['medium']:.8f} | High: {priority_fee['high']:.8f} | Turbo: {priority_fee['turbo']:.8f}")
-            priority_fee = priority_fee[priority_fee_level]
-            if priority_fee is None:
-                priority_fee = 0.000005
-            
-            if priority_fee > 0.01:
-                raise Exception("CobraSwaps | Priority fee is too high (Over 0.01 SOL)")
-
-            if ixs:
-                lamports_fee = int(priority_fee * LAMPORTS_PER_SOL)
-                micro_lamports = compute_unit_price_from_total_fee(
-                    lamports_fee,
-                    compute_units=_DEFAULT_CU
-                )
+            if not ixs:
+                raise Exception(f"CobraSwaps | No instructions built for {dex}")
 
-                ixs.append(set_compute_unit_limit(_DEFAULT_CU))
-                ixs.append(set_compute_unit_price(micro_lamports))
-                ver_msg = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
-                tx = VersionedTransaction(ver_msg, [keypair])
-
-                if sim:
-                    simulate_resp = await self.ctx.simulate_transaction(tx)
-                    if simulate_resp.value and simulate_resp.value.err:
-                        if not is_dlmm:
-                            logging.info(f"Simulation result: {simulate_resp.value}")
-                            raise Exception(f"Simulation failed: {simulate_resp.value.err}")
-                        else:
-                            return ("replay", False)
-
-                result = await self.ctx.send_transaction(tx, opts=TxOpts(skip_preflight=True, max_retries=0))
-                logging.info(f"Cobra | Sell transaction sent: {result.value}")
-                ok = await self._await_confirm(result.value)
-                logging.info(f"Cobra | Sell transaction confirmed: {ok}")
-                return (result.value, ok)
+            # started before the venue's state reads, so it usually rides in the same RPC batch
+            blockhash = (await blockhash_req).value.blockhash
+            versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
 
+            return await self._send_with_priority_fee(ixs, keypair, blockhash, versioned_message, priority_fee_level, sim, is_dlmm, "Sell", pool=pool)
+        except Exception as e:
+            logging.error(f"CobraSwaps | Error selling: {explain(e, 'building the sell')}")
+            traceback.print_exc()
             return (None, False)
+
+    async def plan_split(
+        self,
+        mint: str | Pubkey,
+        side: str,
+        amount: float,
+        venues: list[tuple] | None = None,
+        max_legs: int = 3,
+        steps: int = 20,
+        timeout: float | None = 2.0,
+    ) -> list[dict]:
+        """
+        Plan how to spread a trade over several pools of the same mint.
+
+        Args:
+            mint: str | Pubkey
+            side: "buy" | "sell"
+            amount: float <- SOL for buys, tokens (ui) for sells
+            venues: list[tuple] | None <- [(dex, pool), ...], None = every pool Router.collect_pools finds
+            max_legs: int <- at most this many pools get a share
+            steps: int <- allocation granularity (amount / steps)
+            timeout: float | None <- seconds for pool discovery
+        Returns:
+            list[dict]: [{"dex", "pool", "amount", "amount_out"}, ...] largest leg first, [] if no pool could be quoted
+        """
+        try:
+            mint = str(mint)
+            if venues is None:
+                venues = await self.router.collect_pools(mint, timeout=timeout)
+            curves = await asyncio.gather(*(self.router.quoter.pool_curve(dex, pool, mint) for dex, pool in venues))
+            curves = [c for c in curves if c is not None]
+            if not curves:
+                return []
+            # a spot price alone says nothing about depth: split over the pools with known reserves, and fall back
+            # to the single best-priced pool when there are none
+            exact = [c for c in curves if not c["approx"]]
+            if exact:
+                curves = exact
+            else:
+                curves = [min(curves, key=lambda c: c["price"]) if side == "buy" else max(curves, key=lambda c: c["price"])]
+
+            alloc = split_amount(curves, side, amount, steps)
+            if sum(1 for a in alloc if a > 0) > max_legs:
+                keep = sorted(range(len(curves)), key=lambda i: alloc[i], reverse=True)[:max_legs]
+                curves = [curves[i] for i in keep]
+                alloc = split_amount(curves, side, amount, steps)
+
+            legs = [
+                {
+                    "dex": curve["dex"],
+                    "pool": curve["pool"],
+                    "amount": a,
+                    "amount_out": quote_out(curve, side, a),
+                }
+                for curve, a in zip(curves, alloc) if a > 0
+            ]
+            legs.sort(key=lambda leg: leg["amount"], reverse=True)
+            logging.info(f"CobraSwaps | Split {side} of {amount} over {len(legs)} pool(s): " + ", ".join(f"{ADDR_TO_DEX.get(l['dex'], l['dex'])} {l['amount']:.6f}" for l in legs))
+            return legs
+        except Exception as e:
+            logging.error(f"CobraSwaps | Error planning split {side}: {e}")
+            traceback.print_exc()
+            return []
+
+    async def _send_legs(self, legs: list[dict], ix_lists: list, keypair: Keypair, priority_fee_level: str, label: str) -> list[dict]:
+        blockhash = (await self.ctx.get_latest_blockhash()).value.blockhash
+
+        async def send(ixs):
+            if not isinstance(ixs, list) or not ixs:
+                return (None, False)
+            try:
+                versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
+                return await self._send_with_priority_fee(ixs, keypair, blockhash, versioned_message, priority_fee_level, label=label)
+            except Exception as e:
+                logging.error(f"CobraSwaps | Error sending {label.lower()} leg: {e}")
+                traceback.print_exc()
+                return (None, False)
+
+        results = await asyncio.gather(*(send(ixs) for ixs in ix_lists))
+        return [{**leg, "sig": sig, "ok": ok} for leg, (sig, ok) in zip(legs, results)]
+
+    async def split_buy(
+        self,
+        mint: str | Pubkey,
+        keypair: Keypair,
+        sol_amount: float,
+        slippage: float = 10,
+        priority_fee_level: str = "medium",
+        max_legs: int = 3,
+        venues: list[tuple] | None = None,
+        **kwargs
+    ):
+        """
+        Buy a mint across up to `max_legs` pools, sized so the combined output beats any single pool.
+        Each leg is its own transaction (the venue builders wrap / unwrap SOL per swap), sent concurrently;
+        ATA creates are made idempotent and repeated per leg (independent_legs), so the legs land in any order.
+
+        Args:
+            mint: str | Pubkey
+            keypair: Keypair
+            sol_amount: float
+            slippage: float = 10
+            priority_fee_level: str = "medium"
+            max_legs: int = 3
+            venues: list[tuple] | None <- [(dex, pool), ...], None = discover
+            **kwargs <- return_instructions=True returns one instruction list per leg instead of sending
+        Returns:
+            list[dict]: [{"dex", "pool", "amount", "amount_out", "sig", "ok"}, ...]
+        """
+        try:
+            legs = await self.plan_split(mint, "buy", sol_amount, venues=venues, max_legs=max_legs)
+            if not legs:
+                logging.info(f"CobraSwaps | No pool to split a buy of {mint} over")
+                return []
+
+            ix_lists = independent_legs(list(await asyncio.gather(*(
+                self.buy(mint, leg["pool"], keypair, leg["amount"], slippage, priority_fee_level, dex=leg["dex"], return_instructions=True)
+                for leg in legs
+            ))), keypair.pubkey())
+            if kwargs.get("return_instructions", False) == True:
+                return ix_lists
+            return await self._send_legs(legs, ix_lists, keypair, priority_fee_level, "Buy")
+        except Exception as e:
+            logging.error(f"CobraSwaps | Error in split buy: {e}")
+            traceback.print_exc()
+            return []
+
+    async def split_sell(
+        self,
+        mint: str | Pubkey,
+        keypair: Keypair,
+        sell_pct: float = 100.0,
+        slippage: float = 10,
+        priority_fee_level: str = "medium",
+        max_legs: int = 3,
+        venues: list[tuple] | None = None,
+        **kwargs
+    ):
+        """
+        Sell `sell_pct` of the balance across up to `max_legs` pools.
+        Every leg's percentage is taken against the same balance, so the legs add up to `sell_pct`.
+        Legs go out concurrently and, like split_buy's, land in any order.
+
+        Args:
+            mint: str | Pubkey
+            keypair: Keypair
+            sell_pct: float = 100.0
+            slippage: float = 10
+            priority_fee_level: str = "medium"
+            max_legs: int = 3
+            venues: list[tuple] | None <- [(dex, pool), ...], None = discover
+            **kwargs <- return_instructions=True returns one instruction list per leg instead of sending
+        Returns:
+            list[dict]: [{"dex", "pool", "amount", "amount_out", "sig", "ok"}, ...]
+        """
+        try:
+            _, balance_raw, status = await self.get_balance(mint, keypair.pubkey())
+            if status != "success" or not balance_raw:
+                logging.info(f"CobraSwaps | Nothing to sell for {mint}: {status}")
+                return []
+
+            decimals = await self.router.get_decimals(mint)
+            amount = balance_raw / (10 ** decimals) * sell_pct / 100
+            legs = await self.plan_split(mint, "sell", amount, venues=venues, max_legs=max_legs)
+            if not legs:
+                logging.info(f"CobraSwaps | No pool to split a sell of {mint} over")
+                return []
+
+            ix_lists = independent_legs(list(await asyncio.gather(*(
+                self.sell(mint, leg["pool"], keypair, sell_pct * leg["amount"] / amount, slippage, priority_fee_level, dex=leg["dex"], return_instructions=True)
+                for leg in legs
+            ))), keypair.pubkey())
+            if kwargs.get("return_instructions", False) == True:
+                return ix_lists
+            return await self._send_legs(legs, ix_lists, keypair, priority_fee_level, "Sell")
+        except Exception as e:
+            logging.error(f"CobraSwaps | Error in split sell: {e}")
+            traceback.print_exc()
+            return []
+
+    async def two_hop(
+        self,
+        quote: dict,
+        keypair: Keypair,
+        slippage: float = 10,
+        priority_fee_level: str = "medium",
+        **kwargs
+    ):
+        """
+        Execute a two-hop quote (Router.best_quote(..., multihop=True) / MultiHop.quote entry with dex == TWO_HOP):
+        both legs go into one transaction, for the side and input amount it was quoted with.
+
+        Args:
+            quote: dict
+            keypair: Keypair
+            slippage: float = 10 <- percent for the whole route, split over the two legs
+            priority_fee_level: str = "medium"
+            **kwargs <- return_instructions=True returns the instruction list instead of sending
+        Returns:
+            tuple: (tx_hash, success)
+        """
+        try:
+            ixs = await self.router.multihop.build(quote, keypair.pubkey(), slippage)
+            if kwargs.get("return_instructions", False) == True:
+                return ixs
+            blockhash = (await self.ctx.get_latest_blockhash()).value.blockhash
+            versioned_message = MessageV0.try_compile(keypair.pubkey(), ixs, [], blockhash)
+            label = f"Two-hop {quote['side']} via {quote['via']}"
+            return await self._send_with_priority_fee(ixs, keypair, blockhash, versioned_message, priority_fee_level, label=label, pool=quote["legs"][-1]["pool"])
         except Exception as e:
-            logging.error(f"CobraSwaps | Error selling: {e}")
+            logging.error(f"CobraSwaps | Error in two-hop {quote.get('side')}: {explain(e, 'building the two-hop swap')}")
             traceback.print_exc()
             return (None, False)
 
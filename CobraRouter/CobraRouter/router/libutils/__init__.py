@@ -1,2 +1,18 @@
 from ._common import *
-from .cleaner import *
\ No newline at end of file
+from .cleaner import *
+from .route_cache import RouteCache
+from .singleflight import SingleFlight
+from .pool_index import PoolIndex
+from .mint_filter import MintFilter
+from .pda import PDARegistry, PDAS, find_program_address, static_pda
+from .probe_stats import ProbeStats
+from .route_result import RouteResult, SNAPSHOT_MAX_AGE
+from .deadline import Deadline, DeadlineExceeded, deadline, enforce_deadlines
+from .limiter import RpcLimiter, lane
+from .breaker import BreakerBoard, CircuitBreaker, CircuitOpen
+from .classifier import MintClassifier
+from .gateway import RpcGateway
+from .batcher import RpcBatcher
+from .governor import RpcGovernor
+from .account_cache import AccountCache, accounts_of
+from .mint_info import MintInfo, MintAuthorities, MintInfoService, mints_of
@@ -17,5 +17,6 @@ SUPPORTED_DEXES = {
 WSOL_MINT = "So11111111111111111111111111111111111111112"
 TOKEN_2022 = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
 TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+METADATA_PROGRAM_ID = Pubkey.from_string("metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s")
 
 ADDR_TO_DEX = {v: k for k, v in SUPPORTED_DEXES.items()}
\ No newline at end of file
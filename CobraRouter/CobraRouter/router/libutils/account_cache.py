@@ -0,0 +1,215 @@
+import asyncio, time
+from collections import OrderedDict
+from solana.rpc.commitment import Processed
+try:
+    from .deadline import within
+    from .limiter import current_lane
+    from .singleflight import detached, promote
+except:
+    from deadline import within
+    from limiter import current_lane
+    from singleflight import detached, promote
+
+# freshness classes: how long a cached copy of an account may be served
+STATIC = "static"       # fields that never change once the account exists: mint owner / decimals, pool keys, configs
+RESERVES = "reserves"   # state that moves with every trade: curves, pool prices, vault balances
+AUTHORITY = "authority" # state that changes now and then: mint / freeze authority, supply, metadata update authority
+
+RESERVES_MS = 400       # about one slot
+AUTHORITY_MS = 2_000    # a few slots: a revoke right after launch shows up within one detection window
+MAX_ACCOUNTS = 20_000
+CHUNK = 100             # getMultipleAccounts limit
+
+class AccountCache:
+    def __init__(
+        self,
+        reserves_ms: float = RESERVES_MS,
+        max_accounts: int = MAX_ACCOUNTS,
+        chunk: int = CHUNK,
+        authority_ms: float = AUTHORITY_MS,
+    ):
+        """
+        Shared cache of raw accounts keyed by pubkey, for every venue module reading through the same client.
+        Each entry keeps the context slot it was read at; a copy read at an older slot never replaces a newer one.
+        Reads name a freshness class (STATIC: kept until evicted, RESERVES: `reserves_ms`, AUTHORITY: `authority_ms`),
+        concurrent reads of the same account share one request and the misses of one call go out as chunked
+        getMultipleAccounts.
+        A shared read runs under no caller's deadline, in the best lane of its callers; each caller bounds its own wait,
+        and the read is cancelled once none of them waits for it any more.
+
+        Args:
+            reserves_ms: float <- how long a RESERVES read may be served from the cache, 0 = always read
+            max_accounts: int <- LRU size
+            chunk: int <- accounts per getMultipleAccounts
+            authority_ms: float <- how long an AUTHORITY read may be served from the cache
+        """
+        self.budgets = {STATIC: None, RESERVES: reserves_ms / 1000, AUTHORITY: authority_ms / 1000}
+        self.max_accounts = max_accounts
+        self.chunk = chunk
+        self.client = None
+        self._entries: OrderedDict = OrderedDict()  # Pubkey -> (Account | None, slot, monotonic)
+        self._inflight: dict = {}                    # Pubkey -> [task of the getMultipleAccounts reading it, its context, waiters]
+        self.stats = {"hits": 0, "misses": 0, "joined": 0, "expired": 0, "stale_writes": 0}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def attach(self, client):
+        """
+        Make this the cache of a solana AsyncClient (see accounts_of). Safe to call more than once.
+        """
+        provider = client._provider
+        if getattr(provider, "_cobra_accounts", None) is None:
+            provider._cobra_accounts = self
+            self.client = client
+        return client
+
+    def store(self, pubkey, account, slot: int | None, read_at: float | None = None) -> bool:
+        """
+        Record an account read elsewhere (detection batches, snapshots). Ignored when the cache holds a newer slot.
+        Returns:
+            bool: False when it was ignored
+        """
+        old = self._entries.get(pubkey)
+        if old is not None and slot is not None and old[1] is not None and slot < old[1]:
+            self.stats["stale_writes"] += 1
+            return False
+        self._entries[pubkey] = (account, slot, time.monotonic() if read_at is None else read_at)
+        self._entries.move_to_end(pubkey)
+        while len(self._entries) > self.max_accounts:
+            self._entries.popitem(last=False)
+        return True
+
+    def store_many(self, accounts: dict, slot: int | None, read_at: float | None = None):
+        for pk, acc in accounts.items():
+            self.store(pk, acc, slot, read_at)
+
+    def invalidate(self, pubkey):
+        self._entries.pop(pubkey, None)
+
+    def peek(self, pubkey, freshness: str = RESERVES, min_slot: int | None = None) -> tuple[bool, object]:
+        """
+        Returns:
+            tuple: (hit, Account | None), without any request
+        """
+        entry = self._entries.get(pubkey)
+        if entry is None:
+            return False, None
+        account, slot, read_at = entry
+        # a missing account may be created any time: never keep it longer than RESERVES
+        budget = self.budgets[freshness if account is not None else RESERVES]
+        if (budget is not None and time.monotonic() - read_at > budget) or (
+            min_slot is not None and (slot is None or slot < min_slot)
+        ):
+            self.stats["expired"] += 1
+            return False, None
+        self._entries.move_to_end(pubkey)
+        return True, account
+
+    async def _read(self, pubkeys: list) -> dict:
+        chunks = [pubkeys[i : i + self.chunk] for i in range(0, len(pubkeys), self.chunk)]
+        resps = await asyncio.gather(*(self.client.get_multiple_accounts(c, commitment=Processed) for c in chunks))
+        now = time.monotonic()
+        out = {}
+        for c, resp in zip(chunks, resps):
+            for pk, acc in zip(c, resp.value):
+                if not self.store(pk, acc, resp.context.slot, now):
+                    # a lagging node: the cache holds a newer copy, serve that one
+                    acc = self._entries[pk][0]
+                out[pk] = acc
+        return out
+
+    def _forget(self, pubkeys: list, task: asyncio.Future):
+        for pk in pubkeys:
+            entry = self._inflight.get(pk)
+            if entry is not None and entry[0] is task:
+                del self._inflight[pk]
+
+    async def get_many(self, pubkeys: list, freshness: str = RESERVES, min_slot: int | None = None) -> dict:
+        """
+        Args:
+            pubkeys: list[Pubkey]
+            freshness: str <- STATIC | RESERVES | AUTHORITY
+            min_slot: int | None <- cached copies read before this slot count as misses
+        Returns:
+            dict: {Pubkey: Account | None}
+        """
+        out, joined, missing = {}, {}, []
+        for pk in dict.fromkeys(pubkeys):
+            hit, account = self.peek(pk, freshness, min_slot)
+            if hit:
+                self.stats["hits"] += 1
+                out[pk] = account
+            elif pk in self._inflight:
+                # a read already on the wire started after the cached copy (if any) expired
+                self.stats["joined"] += 1
+                entry = self._inflight[pk]
+                promote(entry[1], current_lane())
+                joined.setdefault(entry[0], (entry, []))[1].append(pk)
+            else:
+                self.stats["misses"] += 1
+                missing.append(pk)
+
+        if missing:
+            # shared with later joiners: read outside this caller's deadline, which only bounds its own wait below
+            task, ctx = detached(self._read(missing))
+            entry = [task, ctx, 0]
+            for pk in missing:
+                self._inflight[pk] = entry
+            task.add_done_callback(lambda t: self._forget(missing, t))
+            joined[task] = (entry, missing)
+
+        # counted up front: a read this caller waits for later must not be dropped while it waits for another
+        for entry, _ in joined.values():
+            entry[2] += 1
+        try:
+            for task, (_entry, pks) in joined.items():
+                # shielded: a cancelled or timed-out caller does not cancel the read for the others
+                accounts = await within(asyncio.shield(task), "account read")
+                for pk in pks:
+                    out[pk] = accounts.get(pk)
+        finally:
+            for entry, _ in joined.values():
+                entry[2] -= 1
+                if entry[2] == 0 and not entry[0].done():
+                    entry[0].cancel()
+        return out
+
+    async def get(self, pubkey, freshness: str = RESERVES, min_slot: int | None = None):
+        """
+        Returns:
+            Account | None
+        """
+        return (await self.get_many([pubkey], freshness, min_slot)).get(pubkey)
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {accounts, hits, misses, joined, expired, stale_writes, hit_rate}
+        """
+        reads = self.stats["hits"] + self.stats["misses"] + self.stats["joined"]
+        return {
+            "accounts": len(self._entries),
+            **self.stats,
+            "hit_rate": round((self.stats["hits"] + self.stats["joined"]) / reads, 3) if reads else None,
+        }
+
+    async def close(self):
+        tasks = {entry[0] for entry in self._inflight.values()}
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._inflight.clear()
+        self._entries.clear()
+
+def accounts_of(client) -> AccountCache:
+    """
+    The AccountCache attached to `client`; one is created on first use, so modules used without a Router
+    still share reads through their client.
+    """
+    provider = client._provider
+    cache = getattr(provider, "_cobra_accounts", None)
+    if cache is None:
+        cache = AccountCache()
+        cache.attach(client)
+    return cache
@@ -0,0 +1,194 @@
+import asyncio, logging
+from solana.rpc.core import RPCException
+try:
+    from .limiter import LANES, current_lane
+    from .singleflight import detached
+except:
+    from limiter import LANES, current_lane
+    from singleflight import detached
+
+# cheap point reads worth batching; scans (getProgramAccounts) and sends always go out on their own
+BATCH_METHODS = (
+    "GetAccountInfo",
+    "GetMultipleAccounts",
+    "GetBalance",
+    "GetLatestBlockhash",
+    "GetTokenAccountBalance",
+    "GetTokenAccountsByOwner",
+    "GetTokenSupply",
+    "GetRecentPrioritizationFees",
+    "GetSignatureStatuses",
+    "GetSlot",
+    "GetMinimumBalanceForRentExemption",
+    "IsBlockhashValid",
+    "GetFeeForMessage",
+)
+
+MAX_BATCH = 20      # requests per JSON-RPC batch array, a full batch is sent right away
+TICKS = 2           # event-loop iterations a request waits for company when window == 0
+MAX_REJECTS = 3     # batches in a row the endpoint refused while single requests worked -> batching off
+
+class RpcBatcher:
+    def __init__(self, window: float = 0.0, max_batch: int = MAX_BATCH, methods: tuple = BATCH_METHODS):
+        """
+        Coalesces the independent reads of one solana AsyncClient into JSON-RPC batch requests: reads issued
+        within `window` seconds (or the same couple of event-loop ticks when 0) leave as one HTTP POST with
+        a batch array, and every caller gets its own result or RPC error back. A lone read is sent as is.
+        Endpoints that refuse batch arrays are detected and batching is switched off for them.
+        A batch goes out in the highest-priority lane among its reads and under none of their deadlines (each
+        caller still waits under its own); it is dropped once every caller has given up.
+
+        Args:
+            window: float <- seconds a read waits for others, 0 = only the reads issued in the same tick
+            max_batch: int <- requests per batch
+            methods: tuple <- batched methods (solders request class names), see BATCH_METHODS
+        """
+        self.window = window
+        self.max_batch = max_batch
+        self.methods = methods
+        self.enabled = True
+        self._single = None
+        self._batch = None
+        self._queue: list = []  # (body, parser, future, lane)
+        self._scheduled = False
+        self._rejects = 0
+        self._tasks: set = set()
+        self.stats = {"requests": 0, "batched": 0, "batches": 0, "singles": 0, "fallbacks": 0}
+
+    async def submit(self, body, parser):
+        loop = asyncio.get_running_loop()
+        fut = loop.create_future()
+        self._queue.append((body, parser, fut, current_lane()))
+        self.stats["requests"] += 1
+        if len(self._queue) >= self.max_batch:
+            self._flush()
+        elif not self._scheduled:
+            self._scheduled = True
+            if self.window > 0:
+                loop.call_later(self.window, self._flush)
+            else:
+                loop.call_soon(self._tick, TICKS - 1)
+        return await fut
+
+    def _tick(self, left: int):
+        if left > 0:
+            asyncio.get_running_loop().call_soon(self._tick, left - 1)
+        else:
+            self._flush()
+
+    def _flush(self):
+        self._scheduled = False
+        # callers cancelled (deadline) while waiting are left out
+        queue, self._queue = [q for q in self._queue if not q[2].done()], []
+        if not queue:
+            return
+        # one POST serves every caller in it: the lane of the most urgent one, nobody's deadline
+        task, _ctx = detached(self._dispatch(queue), min((q[3] for q in queue), key=LANES.__getitem__))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        def abandon(_fut):
+            # every caller cancelled (not answered): nobody is left to read the result
+            if all(q[2].cancelled() for q in queue):
+                task.cancel()
+        for q in queue:
+            q[2].add_done_callback(abandon)
+
+    @staticmethod
+    def _settle(fut, result=None, error: Exception | None = None):
+        if fut.done():
+            return
+        if error is not None:
+            fut.set_exception(error)
+        else:
+            fut.set_result(result)
+
+    async def _one(self, body, parser, fut) -> bool:
+        try:
+            self._settle(fut, await self._single(body, parser))
+            return True
+        except Exception as e:
+            self._settle(fut, error=e)
+            return False
+
+    async def _dispatch(self, queue: list):
+        try:
+            await self._send(queue)
+        finally:
+            for q in queue:
+                q[2].cancel()  # no-op once settled; wakes the callers when the batcher is closed mid-flight
+
+    async def _send(self, queue: list):
+        if len(queue) == 1:
+            self.stats["singles"] += 1
+            await self._one(*queue[0][:3])
+            return
+
+        self.stats["batches"] += 1
+        self.stats["batched"] += len(queue)
+        try:
+            results = await self._batch(tuple(q[0] for q in queue), tuple(q[1] for q in queue))
+            if len(results) != len(queue):
+                raise ValueError(f"batch of {len(queue)} answered with {len(results)} results")
+        except Exception as e:
+            # refused / unparsable batch: send the reads one by one so no caller pays for it
+            self.stats["fallbacks"] += 1
+            ok = await asyncio.gather(*(self._one(*q[:3]) for q in queue))
+            # every read worked on its own: the endpoint refused the batch, not one of its requests
+            if all(ok):
+                self._rejects += 1
+                if self._rejects >= MAX_REJECTS and self.enabled:
+                    self.enabled = False
+                    logging.warning(f"RpcBatcher | Endpoint refuses batch requests ({e}), sending reads one by one")
+            return
+
+        self._rejects = 0
+        for (_body, parser, fut, _lane), result in zip(queue, results):
+            if isinstance(result, parser):
+                self._settle(fut, result)
+            else:
+                # same as a single request answered with an error object
+                self._settle(fut, error=RPCException(result))
+
+    def attach(self, client):
+        """
+        Route the batchable reads of a solana AsyncClient through the batcher. Safe to call more than once on the
+        same client; one batcher serves one client. Attach after RpcGateway (a batch is then hedged as one read)
+        and before RpcLimiter, so every read still takes its own limiter slot.
+        """
+        provider = client._provider
+        if getattr(provider, "_cobra_batcher", None) is not None:
+            return client
+        make_batch_request = getattr(provider, "make_batch_request", None)
+        if make_batch_request is None:
+            return client
+
+        make_request = provider.make_request
+        self._single, self._batch = make_request, make_batch_request
+        async def make_request_batched(body, parser):
+            if not self.enabled or type(body).__name__ not in self.methods:
+                return await make_request(body, parser)
+            return await self.submit(body, parser)
+        provider.make_request = make_request_batched
+
+        provider._cobra_batcher = self
+        return client
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {enabled, requests, batched, batches, singles, fallbacks, reads_per_post}
+        """
+        posts = self.stats["batches"] + self.stats["singles"]
+        return {
+            "enabled": self.enabled,
+            **self.stats,
+            "reads_per_post": round((self.stats["batched"] + self.stats["singles"]) / posts, 2) if posts else None,
+        }
+
+    async def close(self):
+        for q in self._queue:
+            q[2].cancel()
+        self._queue = []
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
@@ -0,0 +1,217 @@
+import asyncio, logging, time
+from contextlib import contextmanager
+from contextvars import ContextVar
+try: from ._common import ADDR_TO_DEX
+except: from _common import ADDR_TO_DEX
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# RPC methods guarded per call; the core account reads are left alone so a flaky scan never blocks a trade
+BREAKER_METHODS = ("GetProgramAccounts",)
+
+class CircuitOpen(Exception):
+    """
+    Raised instead of running a probe / RPC whose breaker is open.
+    """
+
+class CircuitBreaker:
+    def __init__(self, name: str, threshold: int = 5, cooldown: float = 30.0, max_cooldown: float = 300.0):
+        """
+        closed -> open after `threshold` consecutive failures; open -> half_open after the cooldown,
+        where a single trial call decides between closed and open again (with a doubled cooldown).
+
+        Args:
+            name: str <- "probe:ray_cpmm", "rpc:GetProgramAccounts/RayCPMM", ...
+            threshold: int <- consecutive failures that open the breaker
+            cooldown: float <- seconds before the first trial call
+            max_cooldown: float <- cap of the doubled cooldown after failed trials
+        """
+        self.name = name
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.max_cooldown = max_cooldown
+        self.cooldown = cooldown
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_running = False
+        self.last_error: str | None = None
+        self.counters = {"calls": 0, "failures": 0, "trips": 0, "skipped": 0}
+
+    def allow(self) -> bool:
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self.state = HALF_OPEN
+            self.trial_running = False
+        if self.state == CLOSED:
+            return True
+        if self.state == HALF_OPEN and not self.trial_running:
+            self.trial_running = True
+            return True
+        self.counters["skipped"] += 1
+        return False
+
+    def success(self):
+        self.counters["calls"] += 1
+        self.failures = 0
+        self.trial_running = False
+        if self.state != CLOSED:
+            logging.info(f"Circuit {self.name} closed")
+        self.state = CLOSED
+        self.cooldown = self.base_cooldown
+
+    def failure(self, error: Exception | str | None = None):
+        self.counters["calls"] += 1
+        self.counters["failures"] += 1
+        self.failures += 1
+        if error is not None:
+            self.last_error = str(error)[:200] or type(error).__name__
+        if self.state == HALF_OPEN:
+            self.cooldown = min(self.cooldown * 2, self.max_cooldown)
+            self._trip()
+        elif self.state == CLOSED and self.failures >= self.threshold:
+            self._trip()
+
+    def release(self):
+        """
+        A trial call ended without a verdict (cancelled); let the next call try.
+        """
+        self.trial_running = False
+
+    def _trip(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.trial_running = False
+        self.counters["trips"] += 1
+        logging.warning(f"Circuit {self.name} open for {self.cooldown:.0f}s after {self.failures} failures: {self.last_error}")
+
+    def snapshot(self) -> dict:
+        retry_in = max(0.0, self.cooldown - (time.monotonic() - self.opened_at)) if self.state == OPEN else 0.0
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": retry_in,
+            "last_error": self.last_error,
+            **self.counters,
+        }
+
+# RPC failures seen by the probe running in the current task
+_rpc_errors: ContextVar[list | None] = ContextVar("cobra_rpc_errors", default=None)
+
+@contextmanager
+def track_rpc_errors():
+    """
+    Collect the RPC errors raised inside the block, including ones an adapter caught and turned into "not found".
+    """
+    errors = []
+    token = _rpc_errors.set(errors)
+    try:
+        yield errors
+    finally:
+        _rpc_errors.reset(token)
+
+class BreakerBoard:
+    def __init__(self, threshold: int = 5, cooldown: float = 30.0, methods: tuple = BREAKER_METHODS):
+        """
+        Circuit breakers of one Router, one per route probe and one per guarded RPC method (per program for getProgramAccounts).
+
+        Args:
+            threshold: int <- consecutive failures that open a breaker
+            cooldown: float <- seconds an open breaker waits before a trial call
+            methods: tuple <- RPC methods (solders request class names) guarded per call
+        """
+        self.threshold = threshold
+        self.base_cooldown = cooldown
+        self.methods = methods
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def get(self, name: str) -> CircuitBreaker:
+        b = self._breakers.get(name)
+        if b is None:
+            b = self._breakers[name] = CircuitBreaker(name, self.threshold, self.base_cooldown)
+        return b
+
+    def is_open(self, name: str) -> bool:
+        b = self._breakers.get(name)
+        return b is not None and b.state != CLOSED
+
+    async def guard(self, name: str, fn, *args, **kwargs):
+        """
+        Run probe `fn(*args, **kwargs)` under breaker `name`. The probe counts as failed when it raises
+        or when any RPC inside it failed, even if the adapter swallowed the error.
+        Raises:
+            CircuitOpen: the breaker is open, `fn` was not called
+        """
+        b = self.get(name)
+        if not b.allow():
+            raise CircuitOpen(f"{name} is open")
+        try:
+            with track_rpc_errors() as errors:
+                result = await fn(*args, **kwargs)
+        except (asyncio.CancelledError, asyncio.TimeoutError, CircuitOpen):
+            b.release()
+            raise
+        except Exception as e:
+            b.failure(e)
+            raise
+        if errors:
+            b.failure(errors[-1])
+        else:
+            b.success()
+        return result
+
+    @staticmethod
+    def _method_key(body) -> str:
+        method = type(body).__name__
+        program = getattr(body, "program", None)
+        if program is None:
+            return f"rpc:{method}"
+        return f"rpc:{method}/{ADDR_TO_DEX.get(str(program), str(program))}"
+
+    def attach(self, client):
+        """
+        Report every RPC error of a solana AsyncClient to the probe running it, and guard the methods in
+        `self.methods` with their own breakers. Safe to call more than once on the same client.
+        """
+        provider = client._provider
+        if getattr(provider, "_cobra_breakers", None) is not None:
+            return client
+
+        make_request = provider.make_request
+        async def make_request_guarded(body, parser):
+            guarded = type(body).__name__ in self.methods
+            b = self.get(self._method_key(body)) if guarded else None
+            if b is not None and not b.allow():
+                raise CircuitOpen(f"{b.name} is open")
+            try:
+                result = await make_request(body, parser)
+            except (asyncio.CancelledError, asyncio.TimeoutError):
+                if b is not None:
+                    b.release()
+                raise
+            except Exception as e:
+                errors = _rpc_errors.get()
+                if errors is not None:
+                    errors.append(e)
+                if b is not None:
+                    b.failure(e)
+                raise
+            if b is not None:
+                b.success()
+            return result
+        provider.make_request = make_request_guarded
+
+        provider._cobra_breakers = self
+        return client
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {name: {state, consecutive_failures, retry_in, last_error, calls, failures, trips, skipped}}
+        """
+        return {name: b.snapshot() for name, b in sorted(self._breakers.items())}
+
+    def degraded(self) -> list[str]:
+        return [name for name, b in sorted(self._breakers.items()) if b.state != CLOSED]
+
+    def reset(self):
+        self._breakers.clear()
@@ -0,0 +1,136 @@
+from collections import OrderedDict
+try:
+    from ._common import ADDR_TO_DEX
+    from .probe_stats import mint_suffix
+except:
+    from _common import ADDR_TO_DEX
+    from probe_stats import mint_suffix
+
+# launch platforms whose own route check also follows the migration, by ADDR_TO_DEX name
+PLATFORM_PROBES = {"PumpFun": "pump", "Launchpad": "launchpad", "Believe": "believe"}
+
+# vanity suffixes of the launch platforms (pump.fun "...pump", Launchlab/bonk "...bonk", Believe "...BLV...")
+SUFFIX_PROBES = {"pump": "pump", "bonk": "launchpad", "blv": "believe"}
+
+LEARN_MIN = 2   # routes an update authority must have had through one platform before it predicts that platform
+
+MATCH, NEUTRAL, CONFLICT = "match", "neutral", "conflict"
+
+class MintClassifier:
+    def __init__(self, max_authorities: int = 10_000, max_mints: int = 10_000):
+        """
+        Zero-RPC guess of a mint's launch platform. The race starts the guessed platform probe right away and
+        confirms it once the authority lookup lands.
+        Platform update authorities (ADDR_TO_DEX) name their platform outright. Other update authorities (launchpad
+        deployers, Believe) are learned from the races: once an authority's mints routed through the same platform
+        probe LEARN_MIN times in a row, its next mints are guessed as that platform as soon as the authority is known.
+        Before the lookup, a mint's own update authority seen before, else its vanity suffix, is the guess.
+
+        Args:
+            max_authorities: int <- update authorities whose platform is learned, LRU
+            max_mints: int <- mints whose update authority is remembered for the next guess, LRU
+        """
+        self.max_authorities = max_authorities
+        self.max_mints = max_mints
+        self._learned: OrderedDict[str, tuple[str, int]] = OrderedDict()  # update authority -> (probe, routes in a row)
+        self._mints: OrderedDict[str, str] = OrderedDict()                # mint -> update authority
+        self.counters = {
+            "predictions": 0,
+            "by_authority": 0,
+            "by_suffix": 0,
+            "confirmed": 0,
+            "discarded": 0,
+            "conflicts": 0,
+            "learned": 0,
+            "unlearned": 0,
+        }
+
+    def __len__(self):
+        return len(self._learned)
+
+    def remember(self, mint: str, authority: str | None):
+        """
+        Keep the update authority Router.get_mint_authority found for a mint, for the guess of its next detection.
+        """
+        if not authority:
+            return
+        mint = str(mint)
+        self._mints[mint] = authority
+        self._mints.move_to_end(mint)
+        while len(self._mints) > self.max_mints:
+            self._mints.popitem(last=False)
+
+    def learn(self, authority: str | None, probe: str | None):
+        """
+        Record the platform probe a mint of `authority` routed through; None when it routed through no platform
+        (the launch migrated, or it never was one), which weakens what was learned.
+        """
+        if not authority or authority == "INVALID" or ADDR_TO_DEX.get(authority) in PLATFORM_PROBES:
+            return
+        known = self._learned.get(authority)
+        if probe not in PLATFORM_PROBES.values():
+            if known is not None:
+                del self._learned[authority]
+                self.counters["unlearned"] += 1
+            return
+        count = known[1] + 1 if known is not None and known[0] == probe else 1
+        if count == LEARN_MIN:
+            self.counters["learned"] += 1
+        self._learned[authority] = (probe, count)
+        self._learned.move_to_end(authority)
+        while len(self._learned) > self.max_authorities:
+            self._learned.popitem(last=False)
+
+    def platform(self, authority: str | None) -> str | None:
+        """
+        Platform probe an update authority stands for: a platform's own authority, else a learned one.
+        """
+        if not authority:
+            return None
+        probe = PLATFORM_PROBES.get(ADDR_TO_DEX.get(authority))
+        if probe is not None:
+            return probe
+        known = self._learned.get(authority)
+        if known is not None and known[1] >= LEARN_MIN:
+            self._learned.move_to_end(authority)
+            return known[0]
+        return None
+
+    def predict(self, mint: str, authority: str | None = None) -> str | None:
+        """
+        Platform probe ("pump" | "launchpad" | "believe") the mint most likely routes through, None when there is no guess.
+        `authority` is the mint's update authority once looked up; before that the one seen for the mint last time is used.
+        """
+        mint = str(mint)
+        probe = self.platform(authority or self._mints.get(mint))
+        if probe is not None:
+            self.counters["predictions"] += 1
+            self.counters["by_authority"] += 1
+            return probe
+        if authority is not None:
+            return None
+        probe = SUFFIX_PROBES.get(mint_suffix(mint))
+        if probe is not None:
+            self.counters["predictions"] += 1
+            self.counters["by_suffix"] += 1
+        return probe
+
+    def verdict(self, probe: str, authority: str | None) -> str:
+        """
+        How the looked-up authority relates to the guessed platform probe:
+            match    <- the authority is (or was learned as) that platform
+            conflict <- the authority is (or was learned as) another platform, drop the guess
+            neutral  <- nothing known about the authority, only a found pool counts
+        """
+        actual = self.platform(authority)
+        if actual is None:
+            return NEUTRAL
+        return MATCH if actual == probe else CONFLICT
+
+    def snapshot(self) -> dict:
+        return {
+            "authorities": len(self._learned),
+            "trusted": sum(1 for _, count in self._learned.values() if count >= LEARN_MIN),
+            "mints": len(self._mints),
+            **self.counters,
+        }
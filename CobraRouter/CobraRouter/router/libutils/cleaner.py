@@ -11,7 +11,7 @@ from solana.rpc.commitment import Processed
 import logging
 RENT_EXEMPT     = 2039280
 SOL_DECIMALS    = 1e9
-WSOL_MINT       = Pubkey.from_string("So11111111111111111111111111111111111111112")
+WSOL_MINT_PK    = Pubkey.from_string("So11111111111111111111111111111111111111112")  # _common.WSOL_MINT is the str
 
 class Cleaner:
     __slots__ = ()
@@ -26,7 +26,7 @@ class Cleaner:
         tx = []
 
         bal_resp = await client.get_token_accounts_by_owner_json_parsed(
-            payer.pubkey(), TokenAccountOpts(mint=WSOL_MINT), Processed
+            payer.pubkey(), TokenAccountOpts(mint=WSOL_MINT_PK), Processed
         )
         if not bal_resp.value:
             raise RuntimeError("no balance")
@@ -0,0 +1,146 @@
+import asyncio, time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+class DeadlineExceeded(asyncio.TimeoutError):
+    """
+    Raised when a request runs out of its latency budget. The message names the request and the step it was in.
+    """
+
+class Deadline:
+    def __init__(self, seconds: float, label: str = "request"):
+        """
+        Latency budget of one request (a detect, a buy, a sell).
+
+        Args:
+            seconds: float <- budget from now
+            label: str <- shows up in DeadlineExceeded messages
+        """
+        self.budget = seconds
+        self.label = label
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return self.expires_at - time.monotonic()
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0
+
+    def exceeded(self, what: str) -> DeadlineExceeded:
+        return DeadlineExceeded(f"{self.label}: {self.budget:.2f}s deadline exceeded during {what}")
+
+_current: ContextVar[Deadline | None] = ContextVar("cobra_deadline", default=None)
+
+def current_deadline() -> Deadline | None:
+    return _current.get()
+
+@contextmanager
+def deadline(seconds: float | None, label: str = "request"):
+    """
+    Run the enclosed code (and every task it spawns) under a deadline of `seconds`.
+    A nested deadline never extends the outer one; None keeps whatever is already set.
+
+    Usage:
+        with deadline(1.5, "buy"):
+            await swaps.buy(...)
+    """
+    if seconds is None:
+        yield _current.get()
+        return
+    d = Deadline(seconds, label)
+    outer = _current.get()
+    if outer is not None and outer.expires_at <= d.expires_at:
+        d = outer
+    token = _current.set(d)
+    try:
+        yield d
+    finally:
+        _current.reset(token)
+
+def remaining(default: float | None = None) -> float | None:
+    """
+    Seconds left on the current deadline, `default` without one.
+    """
+    d = _current.get()
+    return default if d is None else max(0.0, d.remaining())
+
+def budget(timeout: float | None) -> float | None:
+    """
+    The smaller of `timeout` and the time left on the current deadline.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    return left if timeout is None else min(timeout, left)
+
+def check(what: str):
+    """
+    Raise DeadlineExceeded when the current deadline has already passed.
+    """
+    d = _current.get()
+    if d is not None and d.expired:
+        raise d.exceeded(what)
+
+def explain(e: Exception, what: str) -> Exception:
+    """
+    `e` itself, or the DeadlineExceeded behind it when the current deadline has passed
+    (adapters that swallow the timeout fail later with an unrelated error).
+    """
+    d = _current.get()
+    if isinstance(e, DeadlineExceeded) or d is None or not d.expired:
+        return e
+    return d.exceeded(what)
+
+async def within(aw, what: str = "operation"):
+    """
+    Await `aw`, cancelling it when the current deadline passes first.
+    """
+    d = _current.get()
+    if d is None:
+        return await aw
+    left = d.remaining()
+    if left <= 0:
+        if asyncio.iscoroutine(aw):
+            aw.close()
+        raise d.exceeded(what)
+    try:
+        return await asyncio.wait_for(aw, left)
+    except DeadlineExceeded:
+        raise
+    except asyncio.TimeoutError:
+        if d.expired:
+            raise d.exceeded(what) from None
+        raise
+
+async def deadline_sleep(delay: float, what: str = "retry delay"):
+    """
+    asyncio.sleep that fails right away instead of sleeping past the current deadline.
+    """
+    d = _current.get()
+    if d is not None and d.remaining() < delay:
+        raise d.exceeded(what)
+    await asyncio.sleep(delay)
+
+def enforce_deadlines(client):
+    """
+    Route every RPC of a solana AsyncClient through `within`, so each call made under a deadline
+    is cancelled when it passes. Safe to call more than once on the same client.
+    """
+    provider = client._provider
+    if getattr(provider, "_cobra_deadlines", False):
+        return client
+
+    make_request = provider.make_request
+    async def make_request_within(body, parser):
+        return await within(make_request(body, parser), type(body).__name__)
+    provider.make_request = make_request_within
+
+    make_batch_request = getattr(provider, "make_batch_request", None)
+    if make_batch_request is not None:
+        async def make_batch_request_within(reqs, parsers):
+            return await within(make_batch_request(reqs, parsers), "batch request")
+        provider.make_batch_request = make_batch_request_within
+
+    provider._cobra_deadlines = True
+    return client
@@ -0,0 +1,384 @@
+import asyncio, json, logging, time
+from collections import deque
+from urllib.parse import urlsplit
+import httpx
+from solana.exceptions import SolanaRpcException
+from solana.rpc.core import RPCException
+from solana.rpc.providers.async_http import AsyncHTTPProvider
+try:
+    from .breaker import CircuitBreaker, CLOSED
+    from .governor import RpcGovernor
+except:
+    from breaker import CircuitBreaker, CLOSED
+    from governor import RpcGovernor
+
+# never duplicated: a send goes to one endpoint at a time, the next one only after a transport failure
+SEND_METHODS = ("SendVersionedTransaction", "SendLegacyTransaction", "SendRawTransaction", "RequestAirdrop")
+
+# commitment forced per method (solders request class name), whatever the calling module passed
+COMMITMENT_POLICY = {
+    "GetLatestBlockhash": "confirmed",  # a finalized hash has ~13s less lifetime, a processed one may sit on a dropped fork
+    "SimulateTransaction": "processed",
+    "SendVersionedTransaction": "processed",  # preflight commitment, only used when preflight runs
+    "SendLegacyTransaction": "processed",
+    "SendRawTransaction": "processed",
+}
+
+EWMA_ALPHA = 0.2
+LATENCY_SAMPLES = 256   # per method, for the p95 behind the hedge delay
+MIN_SAMPLES = 20        # below this the hedge waits `default_delay`
+HEDGE_DELAY = 0.25
+MIN_HEDGE_DELAY = 0.03
+MAX_HEDGE_DELAY = 1.5
+
+# errors that say nothing about the request itself, so another endpoint may answer it
+TRANSPORT_ERRORS = (SolanaRpcException, httpx.HTTPError, asyncio.TimeoutError, OSError)
+
+def rate_limited(e: Exception) -> tuple[bool, float | None]:
+    """
+    (True, Retry-After seconds or None) when `e` comes from an HTTP 429, found through the exception chain
+    (solana-py wraps the httpx error in a SolanaRpcException).
+    """
+    while e is not None:
+        resp = getattr(e, "response", None)
+        if getattr(resp, "status_code", None) == 429:
+            try:
+                return True, float(resp.headers.get("retry-after"))
+            except (TypeError, ValueError):
+                return True, None
+        e = e.__cause__ or e.__context__
+    return False, None
+
+async def _post_raw(provider, payload: dict):
+    """
+    POST a JSON-RPC payload with the provider's own HTTP session and headers.
+    Returns:
+        the "result" of the answer; an error answer raises RPCException, an HTTP error status httpx.HTTPStatusError
+    """
+    kwargs = provider._build_common_request_kwargs()
+    resp = await provider.session.post(kwargs["url"], headers=kwargs["headers"], json=payload)
+    resp.raise_for_status()
+    data = resp.json()
+    if data.get("error") is not None:
+        raise RPCException(data["error"])
+    return data.get("result")
+
+async def raw_request(client, method: str, params: list | None = None):
+    """
+    A JSON-RPC method solders has no request class for (getRecentPrioritizationFees, ...), sent through the
+    client's RpcGateway when it has one, else to its endpoint.
+    Returns:
+        the "result" of the answer
+    """
+    gateway = getattr(client._provider, "_cobra_gateway", None)
+    if gateway is not None:
+        return await gateway.raw_request(method, params)
+    return await _post_raw(client._provider, {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []})
+
+def redact(url: str) -> str:
+    """
+    scheme://host/path of an endpoint, without the query string that usually carries the API key.
+    """
+    parts = urlsplit(str(url))
+    return f"{parts.scheme}://{parts.netloc}{parts.path}".rstrip("/")
+
+class Endpoint:
+    def __init__(self, url: str, timeout: float = 10.0, extra_headers: dict | None = None, limits: dict | None = None):
+        """
+        One RPC endpoint of the gateway: its own HTTP provider, latency EWMA, health breaker and rate governor.
+        """
+        self.url = url
+        self.name = redact(url)
+        self.provider = AsyncHTTPProvider(url, extra_headers=extra_headers, timeout=timeout)
+        self.breaker = CircuitBreaker(f"rpc:{self.name}", threshold=3, cooldown=5.0, max_cooldown=60.0)
+        self.governor = RpcGovernor(**(limits or {}))
+        self.ewma: float | None = None
+        self.counters = {"calls": 0, "wins": 0, "errors": 0, "cancelled": 0, "throttled": 0}
+
+    def observe(self, seconds: float):
+        self.ewma = seconds if self.ewma is None else self.ewma + EWMA_ALPHA * (seconds - self.ewma)
+
+    def rank(self) -> tuple:
+        # healthy endpoints first, then the fastest; unmeasured ones right after the measured healthy ones
+        return (self.breaker.state != CLOSED, self.ewma is None, self.ewma or 0.0)
+
+    def snapshot(self) -> dict:
+        return {
+            "ewma_ms": None if self.ewma is None else round(self.ewma * 1000, 1),
+            "state": self.breaker.state,
+            "last_error": self.breaker.last_error,
+            **self.counters,
+            "governor": self.governor.snapshot(),
+        }
+
+class RpcGateway:
+    def __init__(
+        self,
+        read_urls: list[str],
+        send_urls: list[str] | None = None,
+        commitment_policy: dict[str, str] | None = None,
+        hedge: bool = True,
+        default_delay: float = HEDGE_DELAY,
+        timeout: float = 10.0,
+        extra_headers: dict | None = None,
+        limits: dict | None = None,
+    ):
+        """
+        Multi-endpoint front of one solana AsyncClient. Reads go to the endpoint with the lowest latency EWMA and,
+        when they have not answered after the p95 latency of their method, are duplicated on the next endpoint
+        (first answer wins, the other is cancelled). Sends go to `send_urls` in order, failing over on transport
+        errors only. The commitment of the methods in the policy is rewritten before the request leaves.
+        Every request first takes credits from its endpoint's RpcGovernor (queueing when there are none), and a 429
+        slows that endpoint down and is retried there once before failing over.
+
+        Args:
+            read_urls: list[str] <- endpoints for every call except sends
+            send_urls: list[str] | None <- endpoints for sendTransaction, None = read_urls
+            commitment_policy: dict[str, str] | None <- {method: "processed" | "confirmed" | "finalized"}, merged over COMMITMENT_POLICY
+            hedge: bool <- duplicate slow reads on a second endpoint
+            default_delay: float <- hedge delay of a method until it has MIN_SAMPLES latencies
+            timeout: float <- HTTP timeout per endpoint request
+            extra_headers: dict | None <- sent to every endpoint
+            limits: dict | None <- RpcGovernor kwargs for every endpoint, e.g. {"credits_per_sec": 50, "method_rates": {"GetProgramAccounts": 5}}
+        """
+        urls = [u for u in dict.fromkeys(read_urls or []) if u]
+        if not urls:
+            raise ValueError("RpcGateway needs at least one read endpoint")
+        self._endpoints: dict[str, Endpoint] = {}
+        self.read = [self._endpoint(u, timeout, extra_headers, limits) for u in urls]
+        self.send = [self._endpoint(u, timeout, extra_headers, limits) for u in dict.fromkeys(send_urls or urls) if u]
+        self.commitment_policy = {**COMMITMENT_POLICY, **(commitment_policy or {})}
+        self.hedge = hedge
+        self.default_delay = default_delay
+        self._latency: dict[str, deque] = {}
+        self._p95: dict[str, float] = {}
+        self.stats = {"reads": 0, "sends": 0, "hedges": 0, "hedge_wins": 0, "failovers": 0, "rewritten": 0, "throttled": 0}
+
+    def _endpoint(self, url: str, timeout: float, extra_headers: dict | None, limits: dict | None) -> Endpoint:
+        ep = self._endpoints.get(url)
+        if ep is None:
+            ep = self._endpoints[url] = Endpoint(url, timeout, extra_headers, limits)
+        return ep
+
+    def hedge_delay(self, method: str) -> float:
+        """
+        Seconds a read of `method` runs alone before its duplicate is fired.
+        """
+        p95 = self._p95.get(method)
+        if p95 is None:
+            return self.default_delay
+        return min(MAX_HEDGE_DELAY, max(MIN_HEDGE_DELAY, p95))
+
+    def _record(self, method: str, seconds: float):
+        samples = self._latency.get(method)
+        if samples is None:
+            samples = self._latency[method] = deque(maxlen=LATENCY_SAMPLES)
+        samples.append(seconds)
+        # sorting 256 floats on every call is wasted work, every 16th sample is plenty for a hedge delay
+        if len(samples) >= MIN_SAMPLES and len(samples) % 16 == 0:
+            ordered = sorted(samples)
+            self._p95[method] = ordered[int(len(ordered) * 0.95) - 1]
+
+    def apply_policy(self, body):
+        """
+        `body` with the commitment of its method replaced by the policy's, `body` itself when nothing changes.
+        Only a commitment the request already carries is rewritten, never added.
+        """
+        method = type(body).__name__
+        wanted = self.commitment_policy.get(method)
+        if wanted is None:
+            return body
+        key = "preflightCommitment" if method in SEND_METHODS else "commitment"
+        try:
+            data = json.loads(body.to_json())
+            params = data.get("params") or []
+            config = params[-1] if params and isinstance(params[-1], dict) else None
+            if config is None or config.get(key) in (None, wanted):
+                return body
+            config[key] = wanted
+            body = type(body).from_json(json.dumps(data))
+            self.stats["rewritten"] += 1
+            return body
+        except Exception as e:
+            logging.debug(f"RpcGateway | Could not apply commitment policy to {method}: {e}")
+            return body
+
+    async def _attempt(self, ep: Endpoint, method: str, methods: list[str], fn, *args):
+        for retry in (False, True):
+            # queued here when the endpoint is out of credits; the latency below is the request's own
+            await ep.governor.acquire(methods)
+            ep.counters["calls"] += 1
+            start = time.monotonic()
+            try:
+                result = await fn(ep.provider, *args)
+            except asyncio.CancelledError:
+                ep.counters["cancelled"] += 1
+                ep.breaker.release()
+                raise
+            except TRANSPORT_ERRORS as e:
+                limited, retry_after = rate_limited(e)
+                if not limited:
+                    ep.counters["errors"] += 1
+                    ep.breaker.failure(e)
+                    raise
+                # throttled, not down: slow the endpoint down and queue once more behind the lower rate
+                ep.counters["throttled"] += 1
+                self.stats["throttled"] += 1
+                ep.governor.throttled(methods, retry_after)
+                ep.breaker.release()
+                if retry:
+                    raise
+                continue
+            except Exception:
+                # an RPC error answer: the endpoint is fine, the request is not
+                ep.breaker.success()
+                raise
+            elapsed = time.monotonic() - start
+            ep.observe(elapsed)
+            ep.breaker.success()
+            if method not in SEND_METHODS:
+                self._record(method, elapsed)
+            return result
+
+    def _ranked(self, endpoints: list[Endpoint]) -> list[Endpoint]:
+        return sorted(endpoints, key=Endpoint.rank)
+
+    @staticmethod
+    def _pick(pending: list[Endpoint], force: bool = False, methods: list[str] | None = None) -> Endpoint | None:
+        """
+        Take the first endpoint of `pending` its breaker lets through (an open one past its cooldown gets its
+        trial call here); with `force`, the first one regardless, so a request is never failed unsent.
+        With `methods`, only an endpoint that has the credits to send them right away.
+        """
+        for ep in pending:
+            if methods is not None and not ep.governor.ready(methods):
+                continue
+            if ep.breaker.allow():
+                pending.remove(ep)
+                return ep
+        return pending.pop(0) if force and pending else None
+
+    async def _send(self, method: str, methods: list[str], fn, *args):
+        self.stats["sends"] += 1
+        pending = list(self.send)
+        ep = self._pick(pending, force=True)
+        while True:
+            try:
+                return await self._attempt(ep, method, methods, fn, *args)
+            except TRANSPORT_ERRORS as e:
+                logging.warning(f"RpcGateway | {method} failed on {ep.name}: {e}")
+                ep = self._pick(pending)
+                if ep is None:
+                    raise
+                self.stats["failovers"] += 1
+
+    async def _read(self, method: str, methods: list[str], fn, *args):
+        self.stats["reads"] += 1
+        pending = self._ranked(self.read)
+        primary = self._pick(pending, force=True)
+        if not pending:
+            return await self._attempt(primary, method, methods, fn, *args)
+
+        delay = self.hedge_delay(method) if self.hedge else None
+        tasks: dict[asyncio.Task, Endpoint] = {}
+        def fire(ep):
+            tasks[asyncio.create_task(self._attempt(ep, method, methods, fn, *args))] = ep
+
+        fire(primary)
+        hedged = False
+        error = None
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, timeout=None if hedged else delay, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # primary slower than the method's p95: duplicate it once on the next endpoint with credits to spare
+                    hedged = True
+                    ep = self._pick(pending, methods=methods)
+                    if ep is not None:
+                        self.stats["hedges"] += 1
+                        fire(ep)
+                    continue
+                for task in done:
+                    ep = tasks.pop(task)
+                    e = task.exception()
+                    if e is None:
+                        ep.counters["wins"] += 1
+                        if ep is not primary:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+                    if not isinstance(e, TRANSPORT_ERRORS):
+                        raise e
+                    error = e
+                    logging.info(f"RpcGateway | {method} failed on {ep.name}: {e}")
+                if not tasks:
+                    ep = self._pick(pending)
+                    if ep is not None:
+                        self.stats["failovers"] += 1
+                        fire(ep)
+            raise error
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def request(self, body, parser):
+        """
+        Drop-in for provider.make_request: policy, then send or hedged read.
+        """
+        body = self.apply_policy(body)
+        method = type(body).__name__
+        call = self._send if method in SEND_METHODS else self._read
+        return await call(method, [method], lambda provider, b, p: provider.make_request(b, p), body, parser)
+
+    async def batch_request(self, reqs, parsers):
+        """
+        Drop-in for provider.make_batch_request. A batch holding a send is never duplicated.
+        """
+        reqs = tuple(self.apply_policy(b) for b in reqs)
+        call = self._send if any(type(b).__name__ in SEND_METHODS for b in reqs) else self._read
+        methods = [type(b).__name__ for b in reqs]
+        return await call("batch request", methods, lambda provider, r, p: provider.make_batch_request(r, p), reqs, parsers)
+
+    async def raw_request(self, method: str, params: list | None = None):
+        """
+        Hedged read of a JSON-RPC method without a solders request class, see raw_request. Its latency and
+        credits are kept under the capitalized method name, like the solders class names.
+        """
+        name = method[:1].upper() + method[1:]
+        payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []}
+        return await self._read(name, [name], _post_raw, payload)
+
+    def attach(self, client):
+        """
+        Route every RPC of a solana AsyncClient through the gateway. Safe to call more than once on the same client.
+        Attach before RpcLimiter / BreakerBoard / enforce_deadlines, so a hedged read holds one limiter slot and
+        its deadline covers both copies.
+        """
+        provider = client._provider
+        if getattr(provider, "_cobra_gateway", None) is not None:
+            return client
+        provider.make_request = self.request
+        if getattr(provider, "make_batch_request", None) is not None:
+            provider.make_batch_request = self.batch_request
+        provider._cobra_gateway = self
+        return client
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {"read": {endpoint: {...}}, "send": {endpoint: {...}}, "hedge_delay_ms": {method: ms}, **counters}
+        """
+        return {
+            "read": {ep.name: ep.snapshot() for ep in self.read},
+            "send": {ep.name: ep.snapshot() for ep in self.send},
+            "hedge_delay_ms": {m: round(self.hedge_delay(m) * 1000, 1) for m in self._latency},
+            **self.stats,
+        }
+
+    async def close(self):
+        for ep in self._endpoints.values():
+            try:
+                await ep.provider.session.aclose()
+            except Exception as e:
+                logging.info(f"RpcGateway | Error closing {ep.name}: {e}")
@@ -0,0 +1,221 @@
+import asyncio, heapq, itertools, logging, time
+from collections import deque
+try: from .limiter import LANES, current_lane
+except: from limiter import LANES, current_lane
+
+# credits one request costs, per method (solders request class name); rough averages of the common provider price lists
+DEFAULT_COSTS = {
+    "GetProgramAccounts": 10,
+    "GetTransaction": 5,
+    "GetSignaturesForAddress": 5,
+    "GetMultipleAccounts": 2,
+    "*": 1,
+}
+
+MIN_RATE = 2.0          # floor of a rate cut by 429s, per second
+BACKOFF = 0.6           # rate kept after a 429
+RECOVER_EVERY = 5.0     # seconds without a 429 between two rate increases
+RECOVER_STEP = 1.2
+LIFT_AFTER = 60.0       # an unconfigured limit learned from 429s is dropped after this long without one
+MAX_RETRY_AFTER = 10.0
+
+class TokenBucket:
+    def __init__(self, name: str, rate: float | None, burst: float | None = None):
+        """
+        Token bucket whose waiters are served by lane priority, then FIFO, and whose rate adapts to 429s:
+        cut to BACKOFF x the rate it was running at, raised by RECOVER_STEP every RECOVER_EVERY seconds without
+        one, up to the configured rate (or lifted entirely when none was configured).
+
+        Args:
+            name: str <- "credits" | method name
+            rate: float | None <- tokens per second, None = unlimited until a 429 says otherwise
+            burst: float | None <- bucket size, None = one second of `rate`
+        """
+        self.name = name
+        self.ceiling = rate
+        self.rate = rate
+        self.burst_setting = burst
+        self.tokens = self._burst()
+        self.updated = time.monotonic()
+        self.last_429 = 0.0
+        self.last_step = 0.0
+        self._spent: deque = deque()  # (monotonic, tokens) of the last second, for the observed rate
+        self._waiters: list = []      # (priority, seq, cost, future)
+        self._seq = itertools.count()
+        self._timer = None
+        self.counters = {"granted": 0, "queued": 0, "wait_ms": 0.0, "max_wait_ms": 0.0, "throttled": 0}
+
+    def _burst(self) -> float:
+        if self.rate is None:
+            return float("inf")
+        return self.burst_setting if self.burst_setting is not None and self.rate == self.ceiling else max(1.0, self.rate)
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w[3].done())
+
+    def observed_rate(self) -> float:
+        now = time.monotonic()
+        while self._spent and now - self._spent[0][0] > 1.0:
+            self._spent.popleft()
+        return sum(t for _, t in self._spent)
+
+    def _refill(self, now: float):
+        if self.rate is not None and now - self.last_429 > RECOVER_EVERY and now - self.last_step > RECOVER_EVERY:
+            self._recover(now)
+        if self.rate is None:
+            self.tokens = float("inf")
+        else:
+            self.tokens = min(self._burst(), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def _recover(self, now: float):
+        if self.last_429 == 0.0:
+            return  # never throttled: running at the configured rate
+        self.last_step = now
+        if self.ceiling is None and now - self.last_429 > LIFT_AFTER:
+            self.rate = None
+            logging.info(f"RpcGovernor | {self.name} limit lifted")
+            return
+        grown = self.rate * RECOVER_STEP
+        self.rate = grown if self.ceiling is None else min(self.ceiling, grown)
+
+    def _take(self, cost: float, now: float):
+        self.tokens -= cost
+        self._spent.append((now, cost))
+        self.counters["granted"] += 1
+
+    def ready(self, cost: float) -> bool:
+        now = time.monotonic()
+        self._refill(now)
+        return not self.waiting and self.tokens >= min(cost, self._burst())
+
+    async def acquire(self, cost: float, priority: int):
+        now = time.monotonic()
+        self._refill(now)
+        if not self.waiting and self.tokens >= min(cost, self._burst()):
+            self._take(cost, now)
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), cost, fut))
+        self.counters["queued"] += 1
+        self._schedule()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.tokens += cost  # granted after the cancel, never spent
+            else:
+                fut.cancel()
+            self._schedule()
+            raise
+        ms = (time.monotonic() - now) * 1000
+        self.counters["wait_ms"] += ms
+        self.counters["max_wait_ms"] = max(self.counters["max_wait_ms"], ms)
+
+    def _schedule(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        now = time.monotonic()
+        self._refill(now)
+        while self._waiters:
+            _prio, _seq, cost, fut = self._waiters[0]
+            if fut.done():
+                heapq.heappop(self._waiters)
+                continue
+            need = min(cost, self._burst())
+            if self.tokens < need:
+                self._timer = asyncio.get_running_loop().call_later((need - self.tokens) / self.rate, self._schedule)
+                return
+            heapq.heappop(self._waiters)
+            self._take(cost, now)
+            fut.set_result(None)
+
+    def throttle(self, retry_after: float | None = None):
+        """
+        The endpoint answered 429: slow down, and hold every request for `retry_after` seconds when it said so.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        base = self.rate if self.rate is not None else self.observed_rate()
+        self.rate = max(MIN_RATE, base * BACKOFF)
+        if self.ceiling is not None:
+            self.rate = min(self.rate, self.ceiling)
+        self.last_429 = now
+        self.counters["throttled"] += 1
+        pause = min(retry_after or 0.0, MAX_RETRY_AFTER)
+        # tokens owed for the pause: the bucket refills back to zero after `retry_after`
+        self.tokens = min(self.tokens, self._burst(), 0.0) - pause * self.rate
+        self.updated = now
+        logging.warning(f"RpcGovernor | {self.name} rate limited, now {self.rate:.1f}/s" + (f", paused {pause:.1f}s" if pause else ""))
+
+    def snapshot(self) -> dict:
+        return {
+            "rate": None if self.rate is None else round(self.rate, 1),
+            "ceiling": self.ceiling,
+            "tokens": None if self.rate is None else round(self.tokens, 1),
+            "waiting": self.waiting,
+            "observed": round(self.observed_rate(), 1),
+            **self.counters,
+            "wait_ms": round(self.counters["wait_ms"], 1),
+            "max_wait_ms": round(self.counters["max_wait_ms"], 1),
+        }
+
+class RpcGovernor:
+    def __init__(
+        self,
+        credits_per_sec: float | None = None,
+        burst: float | None = None,
+        method_rates: dict[str, float] | None = None,
+        costs: dict[str, float] | None = None,
+    ):
+        """
+        Client-side rate governor of one RPC endpoint: a credit bucket every request pays its method's cost into,
+        plus optional requests-per-second buckets for single methods. A request without credits queues (by lane,
+        trade first) instead of going out to fail; a 429 cuts the rates and a Retry-After pauses the endpoint.
+
+        Args:
+            credits_per_sec: float | None <- the plan's credit rate, None = unlimited until the first 429
+            burst: float | None <- credits that may go out at once, None = one second's worth
+            method_rates: dict[str, float] | None <- {method: requests per second}, e.g. {"GetProgramAccounts": 5}
+            costs: dict[str, float] | None <- {method: credits}, merged over DEFAULT_COSTS
+        """
+        self.costs = {**DEFAULT_COSTS, **(costs or {})}
+        self.credits = TokenBucket("credits", credits_per_sec, burst)
+        self.methods = {m: TokenBucket(m, r) for m, r in (method_rates or {}).items()}
+
+    def cost(self, methods: list[str]) -> float:
+        return sum(self.costs.get(m, self.costs["*"]) for m in methods)
+
+    def ready(self, methods: list[str]) -> bool:
+        """
+        True when a request of `methods` would go out right away.
+        """
+        return self.credits.ready(self.cost(methods)) and all(
+            self.methods[m].ready(1) for m in methods if m in self.methods
+        )
+
+    async def acquire(self, methods: list[str]):
+        """
+        Wait until the request (one method, or the entries of a batch) fits the buckets.
+        """
+        priority = LANES[current_lane()]
+        for m in methods:
+            bucket = self.methods.get(m)
+            if bucket is not None:
+                await bucket.acquire(1, priority)
+        await self.credits.acquire(self.cost(methods), priority)
+
+    def throttled(self, methods: list[str], retry_after: float | None = None):
+        """
+        Record a 429 for a request of `methods`.
+        """
+        self.credits.throttle(retry_after)
+        for m in dict.fromkeys(methods):
+            bucket = self.methods.get(m)
+            if bucket is not None:
+                bucket.throttle(retry_after)
+
+    def snapshot(self) -> dict:
+        return {"credits": self.credits.snapshot(), "methods": {m: b.snapshot() for m, b in self.methods.items()}}
@@ -0,0 +1,186 @@
+import asyncio, heapq, itertools, time
+from contextlib import contextmanager, asynccontextmanager
+from contextvars import ContextVar
+
+# lower value = served first
+LANES = {"trade": 0, "default": 1, "display": 2}
+
+# concurrent RPCs per method (solders request class name), "*" for every other method
+DEFAULT_CAPS = {
+    "GetProgramAccounts": 6,
+    "GetMultipleAccounts": 16,
+    "GetTokenAccountsByOwner": 8,
+    "batch request": 8,
+    "*": 48,
+}
+
+_lane: ContextVar[str] = ContextVar("cobra_lane", default="default")
+
+def current_lane() -> str:
+    return _lane.get()
+
+@contextmanager
+def lane(name: str | None):
+    """
+    Run the enclosed code (and every task it spawns) in priority lane `name` ("trade" | "default" | "display").
+    None keeps the current lane.
+
+    Usage:
+        with lane("display"):
+            await swaps.get_price(...)
+    """
+    if name is None:
+        yield _lane.get()
+        return
+    if name not in LANES:
+        raise ValueError(f"Unknown lane {name!r}, expected one of {list(LANES)}")
+    token = _lane.set(name)
+    try:
+        yield name
+    finally:
+        _lane.reset(token)
+
+class PriorityGate:
+    def __init__(self, cap: int):
+        """
+        Semaphore whose waiters are served by lane priority, then FIFO.
+
+        Args:
+            cap: int <- concurrent holders
+        """
+        self.cap = cap
+        self.active = 0
+        self.peak = 0
+        self._waiters: list = []  # (priority, seq, limit, future)
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for w in self._waiters if not w[3].done())
+
+    def _wake(self):
+        while self._waiters:
+            _prio, _seq, limit, fut = self._waiters[0]
+            if fut.done():
+                heapq.heappop(self._waiters)
+                continue
+            # waiters behind the head have the same or a lower limit, so they cannot go either
+            if self.active >= limit:
+                return
+            heapq.heappop(self._waiters)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            fut.set_result(None)
+
+    async def acquire(self, priority: int, limit: int) -> bool:
+        """
+        Wait for a slot; `limit` caps how many slots may be busy for this caller to get one.
+        Returns:
+            bool: True when the caller had to queue
+        """
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), limit, fut))
+        self._wake()
+        queued = not fut.done()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # the slot was handed over after the cancel
+            else:
+                fut.cancel()
+                self._wake()
+            raise
+        return queued
+
+    def release(self):
+        self.active -= 1
+        self._wake()
+
+class RpcLimiter:
+    def __init__(self, caps: dict[str, int] | None = None, display_share: float = 0.5):
+        """
+        Shared concurrency limiter for the RPC calls of one client, with per-method caps and priority lanes.
+        Trade requests queue ahead of default and display ones, and the display lane may only hold
+        `display_share` of a method's slots, so a price refresh never fills the slots a buy needs.
+
+        Args:
+            caps: dict[str, int] | None <- {method: concurrent calls}, merged over DEFAULT_CAPS
+            display_share: float <- fraction of each cap the display lane may use (at least one slot)
+        """
+        self.caps = {**DEFAULT_CAPS, **(caps or {})}
+        self.display_share = display_share
+        self._gates: dict[str, PriorityGate] = {}
+        self.stats = {
+            name: {"calls": 0, "queued": 0, "wait_ms": 0.0, "max_wait_ms": 0.0}
+            for name in LANES
+        }
+
+    def _gate(self, method: str) -> PriorityGate:
+        key = method if method in self.caps else "*"
+        gate = self._gates.get(key)
+        if gate is None:
+            gate = self._gates[key] = PriorityGate(self.caps[key])
+        return gate
+
+    @asynccontextmanager
+    async def slot(self, method: str):
+        """
+        Hold one slot of `method` in the current lane for the duration of the block.
+        """
+        name = _lane.get()
+        gate = self._gate(method)
+        limit = gate.cap
+        if name == "display":
+            limit = max(1, int(gate.cap * self.display_share))
+
+        s = self.stats[name]
+        s["calls"] += 1
+        start = time.monotonic()
+        if await gate.acquire(LANES[name], limit):
+            ms = (time.monotonic() - start) * 1000
+            s["queued"] += 1
+            s["wait_ms"] += ms
+            s["max_wait_ms"] = max(s["max_wait_ms"], ms)
+        try:
+            yield
+        finally:
+            gate.release()
+
+    def attach(self, client):
+        """
+        Route every RPC of a solana AsyncClient through the limiter. Safe to call more than once on the same client.
+        Attach before enforce_deadlines so time spent queued counts against the request's deadline.
+        """
+        provider = client._provider
+        if getattr(provider, "_cobra_limiter", None) is not None:
+            return client
+
+        make_request = provider.make_request
+        async def make_request_limited(body, parser):
+            async with self.slot(type(body).__name__):
+                return await make_request(body, parser)
+        provider.make_request = make_request_limited
+
+        make_batch_request = getattr(provider, "make_batch_request", None)
+        if make_batch_request is not None:
+            async def make_batch_request_limited(reqs, parsers):
+                async with self.slot("batch request"):
+                    return await make_batch_request(reqs, parsers)
+            provider.make_batch_request = make_batch_request_limited
+
+        provider._cobra_limiter = self
+        return client
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {"methods": {method: {cap, active, waiting, peak}}, "lanes": {lane: {calls, queued, wait_ms, max_wait_ms}}}
+        """
+        return {
+            "methods": {
+                method: {"cap": g.cap, "active": g.active, "waiting": g.waiting, "peak": g.peak}
+                for method, g in self._gates.items()
+            },
+            "lanes": {name: dict(s) for name, s in self.stats.items()},
+        }
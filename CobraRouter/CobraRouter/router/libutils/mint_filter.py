@@ -0,0 +1,341 @@
+import asyncio, hashlib, logging, math, mmap, os, struct, time, traceback
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.websocket_api import connect
+from solana.rpc.types import DataSliceOpts
+from solana.rpc.commitment import Confirmed
+from solders.pubkey import Pubkey # type: ignore
+try: from .pool_index import INDEXED_PROGRAMS
+except: from pool_index import INDEXED_PROGRAMS
+
+# route race probe -> INDEXED_PROGRAMS key of the program its getProgramAccounts scans read
+PROBE_PROGRAMS = {
+    "pumpswap": "pumpswap",
+    "ray_cpmm": "cpmm",
+    "damm_v1": "damm_v1",
+    "damm_v2": "damm_v2",
+    "dbc": "dbc",
+    "launchpad": "launchlab",
+}
+
+MAGIC = b"CBMF"
+VERSION = 1
+_HEADER = struct.Struct("<4sHHQQQd")  # magic, version, hashes, bits, capacity, count, updated_at (unix)
+DEFAULT_FP_RATE = 0.01
+MIN_CAPACITY = 1 << 16
+GROWTH = 2  # a rebuilt filter has room for this many times the mints it starts with
+
+class BloomFile:
+    def __init__(self, path: str, capacity: int | None = None, fp_rate: float = DEFAULT_FP_RATE):
+        """
+        Bloom filter of mints in a memory-mapped file; bits set by add() go straight to the mapping.
+        Opens `path` when it exists, else creates it sized for `capacity` mints at `fp_rate`.
+
+        Args:
+            path: str
+            capacity: int | None <- mints the new file is sized for (MIN_CAPACITY when None)
+            fp_rate: float <- false positive rate at `capacity`
+        """
+        self.path = path
+        if not os.path.exists(path):
+            capacity = max(int(capacity or MIN_CAPACITY), 1)
+            hashes, bits = self.geometry(capacity, fp_rate)
+            with open(path, "wb") as f:
+                f.write(_HEADER.pack(MAGIC, VERSION, hashes, bits, capacity, 0, time.time()))
+                f.truncate(_HEADER.size + (bits + 7) // 8)
+        self._valid = False
+        self._file = open(path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        magic, version, self.hashes, self.bits, self.capacity, self.count, self.updated_at = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION or len(self._mm) < _HEADER.size + (self.bits + 7) // 8:
+            self.close()
+            raise ValueError(f"{path} is not a mint filter file")
+        self._valid = True
+
+    @staticmethod
+    def geometry(capacity: int, fp_rate: float) -> tuple[int, int]:
+        """
+        Returns:
+            tuple: (hash count, bit count) of a Bloom filter holding `capacity` keys at `fp_rate`
+        """
+        bits = max(64, int(math.ceil(-capacity * math.log(fp_rate) / (math.log(2) ** 2))))
+        hashes = max(1, int(round(bits / capacity * math.log(2))))
+        return hashes, bits
+
+    def _positions(self, mint: str):
+        h1, h2 = struct.unpack("<QQ", hashlib.blake2b(str(mint).encode(), digest_size=16).digest())
+        h2 |= 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def __contains__(self, mint) -> bool:
+        mm, base = self._mm, _HEADER.size
+        return all(mm[base + (p >> 3)] & (1 << (p & 7)) for p in self._positions(mint))
+
+    def __len__(self):
+        return self.count
+
+    def add(self, mint) -> bool:
+        """
+        Returns:
+            bool: True when at least one bit was new (the mint was not in the filter)
+        """
+        mm, base, new = self._mm, _HEADER.size, False
+        for p in self._positions(mint):
+            i, bit = base + (p >> 3), 1 << (p & 7)
+            if not mm[i] & bit:
+                mm[i] |= bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    @property
+    def saturated(self) -> bool:
+        return self.count > self.capacity
+
+    def fp_estimate(self) -> float:
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def flush(self):
+        self.updated_at = time.time()
+        _HEADER.pack_into(self._mm, 0, MAGIC, VERSION, self.hashes, self.bits, self.capacity, self.count, self.updated_at)
+        self._mm.flush()
+
+    def close(self):
+        if not self._mm.closed:
+            if self._valid:
+                self.flush()
+            self._mm.close()
+        self._file.close()
+
+class MintFilter:
+    def __init__(
+        self,
+        client: AsyncClient,
+        ws_url: str | None,
+        path: str,
+        programs: list[str] | None = None,
+        fp_rate: float = DEFAULT_FP_RATE,
+        reconnect_delay: float = 3.0,
+    ):
+        """
+        Per-program Bloom filter of the mints that have a pool, one memory-mapped file per program in `path`.
+        The race skips the scan probes of a program whose filter rules the mint out. A filter only rules out
+        while it is live: its programSubscribe feed is connected and a sliced getProgramAccounts snapshot taken
+        after subscribing has been merged in, so a pool created at any point is never missed. Closed pools stay
+        in the filter (more false positives, never a false negative).
+
+        Args:
+            client: AsyncClient <- used for the snapshots
+            ws_url: str | None <- websocket endpoint for programSubscribe, None = build files only
+            path: str <- directory of the <program>.bloom files
+            programs: list[str] | None <- keys of INDEXED_PROGRAMS, None = all
+            fp_rate: float <- false positive rate new files are sized for
+            reconnect_delay: float <- seconds between reconnect attempts
+        """
+        self.client = client
+        self.ws_url = ws_url
+        self.path = path
+        self.programs = list(programs or INDEXED_PROGRAMS.keys())
+        self.fp_rate = fp_rate
+        self.reconnect_delay = reconnect_delay
+
+        os.makedirs(path, exist_ok=True)
+        self._filters: dict[str, BloomFile] = {}
+        self._live = {name: False for name in self.programs}
+        self._tasks: list[asyncio.Task] = []
+        self.stats = {"checks": 0, "ruled_out": 0, "not_live": 0, "updates": 0, "snapshots": 0, "rebuilds": 0}
+        for name in self.programs:
+            self._open(name)
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f"{name}.bloom")
+
+    def _open(self, name: str):
+        if not os.path.exists(self._file(name)):
+            return None
+        try:
+            self._filters[name] = BloomFile(self._file(name))
+        except Exception as e:
+            logging.error(f"MintFilter | Cannot open {self._file(name)}: {e}")
+        return self._filters.get(name)
+
+    def is_live(self, name: str) -> bool:
+        return self._live.get(name, False) and name in self._filters
+
+    def might_have(self, name: str, mint: str | Pubkey) -> bool:
+        """
+        False only when the live filter of program `name` proves the mint has no pool there.
+        """
+        self.stats["checks"] += 1
+        if not self.is_live(name):
+            self.stats["not_live"] += 1
+            return True
+        if str(mint) in self._filters[name]:
+            return True
+        self.stats["ruled_out"] += 1
+        return False
+
+    def ruled_out(self, probes, mint: str | Pubkey) -> list[str]:
+        """
+        Race probes (PROBE_PROGRAMS keys) that cannot find a pool for `mint`.
+        """
+        return [p for p in probes if p in PROBE_PROGRAMS and PROBE_PROGRAMS[p] in self._live and not self.might_have(PROBE_PROGRAMS[p], mint)]
+
+    async def _snapshot_mints(self, name: str) -> list[str]:
+        program_id, offsets = INDEXED_PROGRAMS[name]
+        lo = min(offsets)
+        resp = await self.client.get_program_accounts(
+            Pubkey.from_string(program_id),
+            commitment=Confirmed,
+            encoding="base64",
+            data_slice=DataSliceOpts(offset=lo, length=max(offsets) + 32 - lo),
+        )
+        mints = []
+        for acc in resp.value:
+            mints.extend(self._decode_mints(name, acc.account.data) or ())
+        self.stats["snapshots"] += 1
+        return mints
+
+    @staticmethod
+    def _decode_mints(name: str, data) -> tuple | None:
+        _, offsets = INDEXED_PROGRAMS[name]
+        lo = min(offsets)
+        data = bytes(data or b"")
+        if len(data) < max(offsets) + 32 - lo:
+            return None
+        return tuple(str(Pubkey.from_bytes(data[off - lo : off - lo + 32])) for off in offsets)
+
+    async def refresh(self, name: str) -> int:
+        """
+        Merge a fresh snapshot of program `name` into its filter, or rebuild the file (sized with
+        room to grow) when there is none yet or the merge overfilled it.
+        Returns:
+            int: mints in the filter
+        """
+        mints = await self._snapshot_mints(name)
+        bloom = self._filters.get(name)
+        if bloom is not None:
+            for m in mints:
+                bloom.add(m)
+        if bloom is None or bloom.saturated:
+            bloom = self._rebuild(name, mints)
+        bloom.flush()
+        logging.info(f"MintFilter | {name}: {bloom.count} mints, ~{bloom.fp_estimate():.2%} false positives")
+        return bloom.count
+
+    def _rebuild(self, name: str, mints: list[str]) -> BloomFile:
+        unique = set(mints)
+        tmp = f"{self._file(name)}.tmp"
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        fresh = BloomFile(tmp, capacity=max(MIN_CAPACITY, GROWTH * len(unique)), fp_rate=self.fp_rate)
+        for m in unique:
+            fresh.add(m)
+        fresh.close()
+        # the old mapping has to go before the file can be replaced (Windows)
+        old = self._filters.pop(name, None)
+        if old is not None:
+            old.close()
+        os.replace(tmp, self._file(name))
+        self.stats["rebuilds"] += 1
+        return self._open(name)
+
+    async def build(self) -> dict:
+        """
+        Build or refresh every program's file from snapshots, without subscribing. For offline builds;
+        the files only rule mints out once a running MintFilter has caught them up.
+        Returns:
+            dict: {program: mints}
+        """
+        return {name: await self.refresh(name) for name in self.programs}
+
+    def _apply(self, name: str, msg):
+        try:
+            value = msg.result.value
+            acc = value.account
+            if acc is None or acc.lamports == 0:
+                return
+            bloom = self._filters.get(name)
+            for m in self._decode_mints(name, acc.data) or ():
+                if bloom is not None:
+                    bloom.add(m)
+            self.stats["updates"] += 1
+        except AttributeError:
+            pass  # not a program notification
+
+    async def _run_program(self, name: str):
+        program_id, offsets = INDEXED_PROGRAMS[name]
+        lo = min(offsets)
+        while True:
+            try:
+                async with connect(self.ws_url) as ws:
+                    await ws.program_subscribe(
+                        Pubkey.from_string(program_id),
+                        commitment=Confirmed,
+                        encoding="base64",
+                        data_slice=DataSliceOpts(offset=lo, length=max(offsets) + 32 - lo),
+                    )
+                    await ws.recv()  # subscription id
+
+                    # pools created while the snapshot downloads arrive here, add them afterwards
+                    buffered = []
+                    snap = asyncio.create_task(self.refresh(name))
+                    while not snap.done():
+                        recv = asyncio.create_task(ws.recv())
+                        done, _ = await asyncio.wait({snap, recv}, return_when=asyncio.FIRST_COMPLETED)
+                        if recv in done:
+                            buffered.extend(recv.result())
+                        else:
+                            recv.cancel()
+                    snap.result()
+                    for msg in buffered:
+                        self._apply(name, msg)
+                    self._live[name] = True
+
+                    async for msgs in ws:
+                        for msg in msgs:
+                            self._apply(name, msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"MintFilter | {name} subscription dropped: {e}")
+                traceback.print_exc()
+            self._live[name] = False
+            await asyncio.sleep(self.reconnect_delay)
+
+    def start(self):
+        """
+        Start one catch-up snapshot + subscription task per program. Every probe runs until its program is live.
+        """
+        if self._tasks or not self.ws_url:
+            return
+        self._tasks = [asyncio.create_task(self._run_program(name), name=f"mint_filter_{name}") for name in self.programs]
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {"programs": {program: {live, mints, capacity, bits, fp_estimate}}, **stats}
+        """
+        programs = {}
+        for name in self.programs:
+            bloom = self._filters.get(name)
+            programs[name] = {
+                "live": self.is_live(name),
+                "mints": bloom.count if bloom else 0,
+                "capacity": bloom.capacity if bloom else 0,
+                "bytes": (bloom.bits + 7) // 8 if bloom else 0,
+                "fp_estimate": bloom.fp_estimate() if bloom else None,
+            }
+        return {"programs": programs, **self.stats}
+
+    async def close(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for name in self.programs:
+            self._live[name] = False
+        for bloom in self._filters.values():
+            bloom.close()
+        self._filters.clear()
@@ -0,0 +1,226 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from solders.pubkey import Pubkey # type: ignore
+try:
+    from ._common import METADATA_PROGRAM_ID
+    from .pda import find_program_address
+    from .account_cache import accounts_of, STATIC, AUTHORITY
+except:
+    from _common import METADATA_PROGRAM_ID
+    from pda import find_program_address
+    from account_cache import accounts_of, STATIC, AUTHORITY
+
+MAX_MINTS = 100_000
+
+# SPL mint layout, shared by Token-2022 mints (extensions follow byte 82)
+MINT_SIZE = 82
+
+@dataclass(frozen=True)
+class MintInfo:
+    """
+    The facts of a mint that never change once it exists: decimals and token program.
+    """
+    mint: str
+    decimals: int
+    token_program: Pubkey
+
+@dataclass(frozen=True)
+class MintAuthorities:
+    """
+    Mint / freeze authority, supply and Metaplex metadata update authority as of one read. All of them change
+    (revokes, mints and burns, metadata transfers), so they are never memoized, only cached as AUTHORITY accounts.
+    """
+    mint: str
+    decimals: int
+    mint_authority: str | None
+    freeze_authority: str | None
+    supply: int
+    is_initialized: bool
+    update_authority: str | None = None
+
+    def authority_info(self) -> dict:
+        """
+        Same dict Router.get_mint_authority used to build from a jsonParsed read.
+        """
+        return {
+            "info": {
+                "decimals": self.decimals,
+                "freezeAuthority": self.freeze_authority,
+                "isInitialized": self.is_initialized,
+                "mintAuthority": self.mint_authority,
+                "supply": str(self.supply),
+            },
+            "updateAuthority": self.update_authority,
+            "mint": self.mint,
+        }
+
+def metadata_pda(mint: Pubkey) -> Pubkey:
+    return find_program_address([b"metadata", bytes(METADATA_PROGRAM_ID), bytes(mint)], METADATA_PROGRAM_ID)[0]
+
+def _coption_pubkey(data: bytes, offset: int) -> str | None:
+    if int.from_bytes(data[offset : offset + 4], "little") == 0:
+        return None
+    return str(Pubkey.from_bytes(data[offset + 4 : offset + 36]))
+
+def _mint_data(mint: str, account) -> bytes:
+    data = bytes(account.data)
+    if len(data) < MINT_SIZE:
+        raise ValueError(f"{mint} is not a mint account ({len(data)} bytes)")
+    return data
+
+def decode_mint(mint: str, account) -> MintInfo:
+    """
+    Decode the static facts of a raw mint account without jsonParsed.
+    """
+    data = _mint_data(mint, account)
+    return MintInfo(mint=str(mint), decimals=data[44], token_program=account.owner)
+
+def decode_authorities(mint: str, account, metadata=None) -> MintAuthorities:
+    """
+    Decode the authorities and supply of a raw mint account (and its metadata account, if any).
+    """
+    data = _mint_data(mint, account)
+    update_authority = None
+    if metadata is not None:
+        meta = bytes(metadata.data)
+        if len(meta) >= 1 + 32:
+            update_authority = str(Pubkey.from_bytes(meta[1:33]))
+    return MintAuthorities(
+        mint=str(mint),
+        decimals=data[44],
+        mint_authority=_coption_pubkey(data, 0),
+        freeze_authority=_coption_pubkey(data, 46),
+        supply=int.from_bytes(data[36:44], "little"),
+        is_initialized=bool(data[45]),
+        update_authority=update_authority,
+    )
+
+class MintInfoService:
+    def __init__(self, accounts=None, max_mints: int = MAX_MINTS):
+        """
+        One place for mint facts. Decimals and token program (MintInfo) never change: the mint accounts of every
+        unknown mint in a call go out in one getMultipleAccounts and are decoded from raw bytes and memoized for
+        good. Authorities and supply (MintAuthorities) do change: they are decoded from the mint account and its
+        metadata PDA read as AUTHORITY accounts, so a copy is served for at most the cache's authority budget.
+        Both go through the shared AccountCache, so reads in flight are joined and detection batches count.
+
+        Args:
+            accounts: AccountCache | None <- set by attach when None
+            max_mints: int <- memo size, LRU
+        """
+        self.accounts = accounts
+        self.max_mints = max_mints
+        self._memo: OrderedDict[str, MintInfo] = OrderedDict()
+        self.stats = {"hits": 0, "fetched": 0, "missing": 0, "authority_reads": 0}
+
+    def __len__(self):
+        return len(self._memo)
+
+    def attach(self, client):
+        """
+        Make this the mint service of a solana AsyncClient (see mints_of). Safe to call more than once.
+        """
+        provider = client._provider
+        if getattr(provider, "_cobra_mints", None) is None:
+            provider._cobra_mints = self
+            if self.accounts is None:
+                self.accounts = accounts_of(client)
+        return client
+
+    def cached(self, mint: str | Pubkey) -> MintInfo | None:
+        info = self._memo.get(str(mint))
+        if info is not None:
+            self._memo.move_to_end(str(mint))
+        return info
+
+    def remember(self, info: MintInfo):
+        self._memo[info.mint] = info
+        self._memo.move_to_end(info.mint)
+        while len(self._memo) > self.max_mints:
+            self._memo.popitem(last=False)
+
+    async def get_many(self, mints: list[str | Pubkey]) -> dict[str, MintInfo | None]:
+        """
+        Returns:
+            dict: {mint str: MintInfo | None (no mint account)}
+        """
+        out, unknown = {}, []
+        for mint in dict.fromkeys(str(m) for m in mints):
+            info = self.cached(mint)
+            if info is not None:
+                self.stats["hits"] += 1
+                out[mint] = info
+            else:
+                unknown.append(mint)
+        if not unknown:
+            return out
+
+        pks = [Pubkey.from_string(m) for m in unknown]
+        accounts = await self.accounts.get_many(pks, STATIC)
+        for mint, pk in zip(unknown, pks):
+            account = accounts.get(pk)
+            if account is None:
+                # not memoized: the mint may not exist yet
+                self.stats["missing"] += 1
+                out[mint] = None
+                continue
+            info = decode_mint(mint, account)
+            self.stats["fetched"] += 1
+            self.remember(info)
+            out[mint] = info
+        return out
+
+    async def get(self, mint: str | Pubkey) -> MintInfo | None:
+        return (await self.get_many([mint]))[str(mint)]
+
+    async def authorities_many(self, mints: list[str | Pubkey]) -> dict[str, MintAuthorities | None]:
+        """
+        Mint and metadata accounts of all `mints` in one getMultipleAccounts, served from the account cache while
+        younger than its AUTHORITY budget. Fills the MintInfo memo on the way.
+        Returns:
+            dict: {mint str: MintAuthorities | None (no mint account)}
+        """
+        mints = list(dict.fromkeys(str(m) for m in mints))
+        pks = [Pubkey.from_string(m) for m in mints]
+        metas = [metadata_pda(pk) for pk in pks]
+        accounts = await self.accounts.get_many(pks + metas, AUTHORITY)
+        self.stats["authority_reads"] += 1
+        out = {}
+        for mint, pk, meta in zip(mints, pks, metas):
+            account = accounts.get(pk)
+            if account is None:
+                out[mint] = None
+                continue
+            if self.cached(mint) is None:
+                self.remember(decode_mint(mint, account))
+            out[mint] = decode_authorities(mint, account, accounts.get(meta))
+        return out
+
+    async def authorities(self, mint: str | Pubkey) -> MintAuthorities | None:
+        return (await self.authorities_many([mint]))[str(mint)]
+
+    async def decimals(self, mint: str | Pubkey) -> int | None:
+        info = await self.get(mint)
+        return info.decimals if info is not None else None
+
+    async def token_program(self, mint: str | Pubkey) -> Pubkey | None:
+        info = await self.get(mint)
+        return info.token_program if info is not None else None
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {mints, hits, fetched, missing, authority_reads}
+        """
+        return {"mints": len(self._memo), **self.stats}
+
+def mints_of(client) -> MintInfoService:
+    """
+    The MintInfoService attached to `client`; one is created on first use, like accounts_of.
+    """
+    provider = client._provider
+    service = getattr(provider, "_cobra_mints", None)
+    if service is None:
+        service = MintInfoService()
+        service.attach(client)
+    return service
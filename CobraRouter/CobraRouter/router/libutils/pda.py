@@ -0,0 +1,79 @@
+from collections import OrderedDict
+from solders.pubkey import Pubkey # type: ignore
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+class PDARegistry:
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Memoized Pubkey.find_program_address.
+        Static PDAs (program authorities, event authorities) are pinned and never evicted,
+        per-user / per-pool derivations live in an LRU of `max_entries`.
+
+        Args:
+            max_entries: int
+        """
+        self.max_entries = max_entries
+        self._static: dict[tuple, tuple[Pubkey, int]] = {}
+        self._lru: OrderedDict[tuple, tuple[Pubkey, int]] = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    def __len__(self):
+        return len(self._static) + len(self._lru)
+
+    @staticmethod
+    def _key(seeds, program_id: Pubkey) -> tuple:
+        return (bytes(program_id), tuple(bytes(s) for s in seeds))
+
+    def find(self, seeds, program_id: Pubkey) -> tuple[Pubkey, int]:
+        """
+        Same result as Pubkey.find_program_address(seeds, program_id), derived once per (seeds, program).
+        Returns:
+            tuple: (pda, bump)
+        """
+        key = self._key(seeds, program_id)
+        hit = self._static.get(key)
+        if hit is not None:
+            self.stats["hits"] += 1
+            return hit
+        hit = self._lru.get(key)
+        if hit is not None:
+            self._lru.move_to_end(key)
+            self.stats["hits"] += 1
+            return hit
+
+        self.stats["misses"] += 1
+        out = Pubkey.find_program_address(list(seeds), program_id)
+        self._lru[key] = out
+        while len(self._lru) > self.max_entries:
+            self._lru.popitem(last=False)
+            self.stats["evictions"] += 1
+        return out
+
+    def static(self, seeds, program_id: Pubkey) -> Pubkey:
+        """
+        Derive a PDA that never changes (no user / pool in its seeds) and pin it.
+        """
+        key = self._key(seeds, program_id)
+        out = self._static.get(key)
+        if out is None:
+            out = self._lru.pop(key, None) or Pubkey.find_program_address(list(seeds), program_id)
+            self._static[key] = out
+        return out[0]
+
+    def clear(self):
+        """
+        Drop the LRU part, pinned PDAs stay.
+        """
+        self._lru.clear()
+
+PDAS = PDARegistry()
+
+def find_program_address(seeds, program_id: Pubkey) -> tuple[Pubkey, int]:
+    """
+    Drop-in for Pubkey.find_program_address backed by the shared PDARegistry.
+    """
+    return PDAS.find(seeds, program_id)
+
+def static_pda(seeds, program_id: Pubkey) -> Pubkey:
+    return PDAS.static(seeds, program_id)
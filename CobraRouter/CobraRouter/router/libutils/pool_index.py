@@ -0,0 +1,200 @@
+import asyncio, logging, traceback
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.websocket_api import connect
+from solana.rpc.types import DataSliceOpts
+from solana.rpc.commitment import Confirmed
+from solders.pubkey import Pubkey # type: ignore
+
+# program name -> (program id, offsets of the mint fields inside the pool account)
+INDEXED_PROGRAMS = {
+    "cpmm": ("CPMMoo8L3F4NbTegBCKVNunggL7H1ZpdTHKxQB5qKP1C", (168, 200)),
+    "damm_v1": ("Eo7WjKq67rjJQSZxS6z3YkapzY3eMj6Xy8X5EQVn5UaB", (40, 72)),
+    "damm_v2": ("cpamdpZCGKUy5JxQXB4dcpGPiikHawvSWAd6mEn1sGG", (168, 200)),
+    "dbc": ("dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN", (136,)),
+    "launchlab": ("LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj", (205, 237)),
+    "pumpswap": ("pAMMBay6oceH9fJKBRHGP5D4bD4sWpmSwMn52FMfXEA", (43, 75)),
+}
+
+class PoolIndex:
+    def __init__(
+        self,
+        client: AsyncClient,
+        ws_url: str,
+        programs: list[str] | None = None,
+        reconnect_delay: float = 3.0,
+    ):
+        """
+        In-memory mint -> pools index per program, built from one sliced getProgramAccounts
+        snapshot and kept current with programSubscribe notifications.
+
+        Args:
+            client: AsyncClient <- used for the snapshots
+            ws_url: str <- websocket endpoint for programSubscribe
+            programs: list[str] | None <- keys of INDEXED_PROGRAMS, None = all
+            reconnect_delay: float <- seconds between reconnect attempts
+        """
+        self.client = client
+        self.ws_url = ws_url
+        self.programs = list(programs or INDEXED_PROGRAMS.keys())
+        self.reconnect_delay = reconnect_delay
+
+        self._pools = {name: {} for name in self.programs}      # pool -> mints (offset order)
+        self._by_mint = {name: {} for name in self.programs}    # mint -> set(pool)
+        self._ready = {name: False for name in self.programs}
+        self._tasks: list[asyncio.Task] = []
+        self.stats = {"lookups": 0, "hits": 0, "cold": 0, "updates": 0, "snapshots": 0}
+
+    @staticmethod
+    def _slice(offsets: tuple) -> tuple[int, int]:
+        lo = min(offsets)
+        return lo, max(offsets) + 32 - lo
+
+    def _decode_mints(self, name: str, data: bytes) -> tuple | None:
+        _, offsets = INDEXED_PROGRAMS[name]
+        lo, length = self._slice(offsets)
+        data = bytes(data)
+        if len(data) < length:
+            return None
+        return tuple(str(Pubkey.from_bytes(data[off - lo : off - lo + 32])) for off in offsets)
+
+    def _upsert(self, name: str, pool: str, data: bytes | None):
+        mints = self._decode_mints(name, data) if data else None
+        old = self._pools[name].pop(pool, None)
+        if old:
+            for m in old:
+                pools = self._by_mint[name].get(m)
+                if pools:
+                    pools.discard(pool)
+                    if not pools:
+                        del self._by_mint[name][m]
+        if mints is None:
+            return
+        self._pools[name][pool] = mints
+        for m in mints:
+            self._by_mint[name].setdefault(m, set()).add(pool)
+
+    def is_ready(self, name: str) -> bool:
+        return self._ready.get(name, False)
+
+    def lookup(self, name: str, mint: str | Pubkey) -> list[str] | None:
+        """
+        Returns:
+            list[str] | None: pools holding `mint`, None when the program index is cold (caller should scan)
+        """
+        self.stats["lookups"] += 1
+        if not self._ready.get(name, False):
+            self.stats["cold"] += 1
+            return None
+        self.stats["hits"] += 1
+        return sorted(self._by_mint[name].get(str(mint), ()))
+
+    def lookup_pair(self, name: str, mint: str | Pubkey, other: str | Pubkey) -> list[str] | None:
+        """
+        Pools holding both `mint` and `other`. Walks the smaller of the two pool sets, so pairing a token with
+        wSOL / USDC costs the token's pools, not every quote pool.
+        Returns:
+            list[str] | None: pools of the pair, None when the program index is cold (caller should scan)
+        """
+        self.stats["lookups"] += 1
+        if not self._ready.get(name, False):
+            self.stats["cold"] += 1
+            return None
+        self.stats["hits"] += 1
+        by_mint, mint, other = self._by_mint[name], str(mint), str(other)
+        pools_a, pools_b = by_mint.get(mint, ()), by_mint.get(other, ())
+        if len(pools_b) < len(pools_a):
+            pools_a, mint, other = pools_b, other, mint
+        return sorted(p for p in pools_a if other in self._pools[name][p])
+
+    def pool_mints(self, name: str, pool: str | Pubkey) -> tuple | None:
+        """
+        Mints stored in a pool account, in the order of the program's mint offsets.
+        """
+        return self._pools.get(name, {}).get(str(pool))
+
+    async def snapshot(self, name: str):
+        """
+        Replace the index for a program with a fresh sliced getProgramAccounts snapshot.
+        """
+        program_id, offsets = INDEXED_PROGRAMS[name]
+        lo, length = self._slice(offsets)
+        resp = await self.client.get_program_accounts(
+            Pubkey.from_string(program_id),
+            commitment=Confirmed,
+            encoding="base64",
+            data_slice=DataSliceOpts(offset=lo, length=length),
+        )
+        self._pools[name] = {}
+        self._by_mint[name] = {}
+        for acc in resp.value:
+            self._upsert(name, str(acc.pubkey), acc.account.data)
+        self.stats["snapshots"] += 1
+        logging.info(f"PoolIndex | {name}: {len(self._pools[name])} pools indexed")
+
+    async def _run_program(self, name: str):
+        program_id, offsets = INDEXED_PROGRAMS[name]
+        lo, length = self._slice(offsets)
+        while True:
+            try:
+                async with connect(self.ws_url) as ws:
+                    await ws.program_subscribe(
+                        Pubkey.from_string(program_id),
+                        commitment=Confirmed,
+                        encoding="base64",
+                        data_slice=DataSliceOpts(offset=lo, length=length),
+                    )
+                    await ws.recv()  # subscription id
+
+                    # buffer deltas that arrive while the snapshot downloads, replay them afterwards
+                    buffered = []
+                    snap = asyncio.create_task(self.snapshot(name))
+                    while not snap.done():
+                        recv = asyncio.create_task(ws.recv())
+                        done, _ = await asyncio.wait({snap, recv}, return_when=asyncio.FIRST_COMPLETED)
+                        if recv in done:
+                            buffered.extend(recv.result())
+                        else:
+                            # let the cancelled recv finish, or the next one finds it still waiting
+                            recv.cancel()
+                            await asyncio.gather(recv, return_exceptions=True)
+                    snap.result()
+                    for msg in buffered:
+                        self._apply(name, msg)
+                    self._ready[name] = True
+
+                    async for msgs in ws:
+                        for msg in msgs:
+                            self._apply(name, msg)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logging.error(f"PoolIndex | {name} subscription dropped: {e}")
+                traceback.print_exc()
+            self._ready[name] = False
+            await asyncio.sleep(self.reconnect_delay)
+
+    def _apply(self, name: str, msg):
+        try:
+            value = msg.result.value
+            acc = value.account
+            data = acc.data if acc is not None and acc.lamports > 0 else None
+            self._upsert(name, str(value.pubkey), data)
+            self.stats["updates"] += 1
+        except AttributeError:
+            pass  # not a program notification
+
+    def start(self):
+        """
+        Start one snapshot + subscription task per program. Lookups fall back to scans until each is ready.
+        """
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._run_program(name), name=f"pool_index_{name}") for name in self.programs]
+
+    async def close(self):
+        for t in self._tasks:
+            t.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for name in self.programs:
+            self._ready[name] = False
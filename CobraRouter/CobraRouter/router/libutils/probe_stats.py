@@ -0,0 +1,127 @@
+try: from ._common import ADDR_TO_DEX
+except: from _common import ADDR_TO_DEX
+
+# answered from the batched getMultipleAccounts prefetch, no extra RPC of their own
+CHEAP_PROBES = ("pump", "ray_clmm", "dlmm")
+
+# first-wave guesses per mint suffix until enough races have been recorded
+SUFFIX_PRIORS = {
+    "pump": ("pumpswap",),
+    "bonk": ("launchpad",),
+    "blv": ("believe", "dbc"),
+}
+
+def mint_suffix(mint: str) -> str:
+    mint = str(mint)
+    if mint.endswith("pump"):
+        return "pump"
+    if mint.endswith("bonk"):
+        return "bonk"
+    if "BLV" in mint:
+        return "blv"
+    return "other"
+
+class ProbeStats:
+    def __init__(
+        self,
+        wave_budget: float = 0.4,
+        min_samples: int = 5,
+        min_hit_rate: float = 0.2,
+        max_learned: int = 3,
+        ewma_alpha: float = 0.2,
+    ):
+        """
+        Per-probe hit rates and latencies of the route race, grouped by mint features,
+        and the wave plan derived from them.
+
+        Args:
+            wave_budget: float <- seconds the first wave gets before the remaining probes launch anyway
+            min_samples: int <- races a probe needs within a feature group before its hit rate is trusted
+            min_hit_rate: float <- probes at or above this rate go in the first wave
+            max_learned: int <- at most this many learned probes join the first wave
+            ewma_alpha: float <- weight of the newest latency sample
+        """
+        self.wave_budget = wave_budget
+        self.min_samples = min_samples
+        self.min_hit_rate = min_hit_rate
+        self.max_learned = max_learned
+        self.ewma_alpha = ewma_alpha
+
+        self._groups: dict[tuple, dict[str, dict]] = {}
+        self.counters = {
+            "races": 0,
+            "staged_races": 0,
+            "second_waves": 0,
+            "probes_launched": 0,
+            "probes_skipped": 0,
+            "probes_filtered": 0,
+        }
+
+    @staticmethod
+    def features(mint: str, authority: str | None, has_curve: bool) -> tuple:
+        """
+        (suffix, authority venue, pump.fun curve exists) of a mint.
+        """
+        if authority is None:
+            auth = "none"
+        else:
+            auth = ADDR_TO_DEX.get(authority, "other")
+        return (mint_suffix(mint), auth, bool(has_curve))
+
+    def plan(self, key: tuple, names: list[str]) -> tuple[list[str], list[str]]:
+        """
+        Split the probes into a first and second wave for a mint with features `key`.
+        With nothing learned and no suffix prior every probe goes in the first wave.
+        Returns:
+            tuple: (first_wave, second_wave)
+        """
+        group = self._groups.get(key, {})
+        ranked = sorted(
+            (
+                (s["hits"] / s["runs"], name)
+                for name, s in group.items()
+                if s["runs"] >= self.min_samples and name in names
+            ),
+            reverse=True,
+        )
+        learned = [name for rate, name in ranked if rate >= self.min_hit_rate][: self.max_learned]
+        if not learned:
+            learned = [name for name in SUFFIX_PRIORS.get(key[0], ()) if name in names]
+        if not learned:
+            return list(names), []
+
+        first = list(dict.fromkeys([n for n in names if n in CHEAP_PROBES] + learned))
+        second = [n for n in names if n not in first]
+        return first, second
+
+    def record(self, key: tuple, name: str, hit: bool, latency: float, error: bool = False):
+        """
+        Record one finished (not cancelled) probe run.
+        """
+        s = self._groups.setdefault(key, {}).setdefault(
+            name, {"runs": 0, "hits": 0, "errors": 0, "latency_ms": None}
+        )
+        s["runs"] += 1
+        s["hits"] += 1 if hit else 0
+        s["errors"] += 1 if error else 0
+        ms = latency * 1000
+        s["latency_ms"] = ms if s["latency_ms"] is None else (1 - self.ewma_alpha) * s["latency_ms"] + self.ewma_alpha * ms
+
+    def snapshot(self) -> dict:
+        """
+        Returns:
+            dict: {"counters": {...}, "groups": {"suffix/authority/curve": {probe: {runs, hits, errors, hit_rate, latency_ms}}}}
+        """
+        groups = {}
+        for key, probes in self._groups.items():
+            label = f"{key[0]}/{key[1]}/{'curve' if key[2] else 'no_curve'}"
+            groups[label] = {
+                name: {**s, "hit_rate": s["hits"] / s["runs"] if s["runs"] else 0.0}
+                for name, s in probes.items()
+            }
+        return {"counters": dict(self.counters), "groups": groups}
+
+    def reset(self):
+        self._groups.clear()
+        for k in self.counters:
+            self.counters[k] = 0
@@ -0,0 +1,359 @@
+import asyncio, json, os, sqlite3, threading, time, logging, traceback
+from collections import OrderedDict
+try: from ._common import SUPPORTED_DEXES
+except: from _common import SUPPORTED_DEXES
+
+# Venues whose pool moves somewhere else once the curve completes / the pool migrates.
+MIGRATING_DEXES = {
+    SUPPORTED_DEXES["PumpFun"],
+    SUPPORTED_DEXES["Launchpad"],
+    SUPPORTED_DEXES["MeteoraDBC"],
+    SUPPORTED_DEXES["Believe"],
+}
+
+DEFAULT_TTL = 6 * 60 * 60       # settled AMM pools
+MIGRATING_TTL = 60              # bonding curves, re-checked often
+NEGATIVE_TTL = 15               # "no pool" answers
+FLUSH_INTERVAL = 2.0            # seconds between writes of the file / sqlite backends
+DEFAULT_MAX_ENTRIES = 10_000
+
+class _MemoryBackend:
+    """
+    No persistence, everything lives in the RouteCache LRU.
+    """
+    def load(self) -> dict:
+        return {}
+
+    def put(self, mint: str, entry: tuple):
+        pass
+
+    def delete(self, mint: str):
+        pass
+
+    def clear(self):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+class _DeferredBackend:
+    """
+    Collects changes in memory and writes them in batches, at most one every `flush_interval` seconds, in a worker
+    thread so the event loop never waits on the disk. Without a running loop it writes inline instead.
+    Subclasses implement `_take` (on the loop: the batch to write, None if nothing changed) and `_write(batch)`.
+    """
+    def __init__(self, flush_interval: float):
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._last_flush = 0.0
+
+    def _take(self):
+        raise NotImplementedError
+
+    def _write(self, batch):
+        raise NotImplementedError
+
+    def _write_locked(self, batch):
+        with self._lock:
+            try:
+                self._write(batch)
+            except Exception as e:
+                logging.error(f"RouteCache | Failed to write cached routes: {e}")
+                traceback.print_exc()
+
+    async def _flush_later(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            batch = self._take()
+            if batch is None:
+                return
+            await asyncio.to_thread(self._write_locked, batch)
+
+    def _changed(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # scripts without an event loop: nothing to block, write inline (still coalesced by flush_interval)
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self.flush()
+            return
+        self._task = loop.create_task(self._flush_later())
+
+    def flush(self):
+        """
+        Write pending changes now, on the calling thread.
+        """
+        batch = self._take()
+        if batch is not None:
+            self._write_locked(batch)
+        self._last_flush = time.monotonic()
+
+    def close(self):
+        if self._task is not None and not self._task.done():
+            # a batch the task already handed to its thread is written first: _lock keeps the order
+            self._task.cancel()
+        self._task = None
+        self.flush()
+
+class _FileBackend(_DeferredBackend):
+    """
+    JSON file snapshot, rewritten whole on each flush.
+    """
+    def __init__(self, path: str, flush_interval: float = FLUSH_INTERVAL):
+        super().__init__(flush_interval)
+        self.path = path
+        self._data = {}
+        self._dirty = False
+
+    def load(self) -> dict:
+        try:
+            if not os.path.exists(self.path):
+                return {}
+            with open(self.path, "r") as f:
+                raw = json.load(f)
+            self._data = {k: tuple(v) for k, v in raw.items()}
+            return dict(self._data)
+        except Exception as e:
+            logging.error(f"RouteCache | Failed to load {self.path}: {e}")
+            return {}
+
+    def _take(self):
+        if not self._dirty:
+            return None
+        self._dirty = False
+        # the copy is dumped in the worker thread while the loop keeps changing _data
+        return dict(self._data)
+
+    def _write(self, data: dict):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(data, f)
+        os.replace(tmp, self.path)
+
+    def put(self, mint: str, entry: tuple):
+        self._data[mint] = entry
+        self._dirty = True
+        self._changed()
+
+    def delete(self, mint: str):
+        if self._data.pop(mint, None) is not None:
+            self._dirty = True
+            self._changed()
+
+    def clear(self):
+        self._data = {}
+        self._dirty = True
+        self._changed()
+
+class _SQLiteBackend(_DeferredBackend):
+    """
+    SQLite table keyed by mint. Changes since the last flush are written in one transaction.
+    """
+    def __init__(self, path: str, flush_interval: float = FLUSH_INTERVAL):
+        super().__init__(flush_interval)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS routes ("
+            "mint TEXT PRIMARY KEY, dex TEXT, pool TEXT, expires_at REAL)"
+        )
+        self.conn.commit()
+        self._pending: dict[str, tuple | None] = {}  # mint -> entry, None = delete
+        self._cleared = False
+
+    def load(self) -> dict:
+        try:
+            rows = self.conn.execute("SELECT mint, dex, pool, expires_at FROM routes").fetchall()
+            return {mint: (dex, pool, expires_at) for mint, dex, pool, expires_at in rows}
+        except Exception as e:
+            logging.error(f"RouteCache | Failed to load sqlite cache: {e}")
+            return {}
+
+    def _take(self):
+        if not self._pending and not self._cleared:
+            return None
+        batch = (self._cleared, self._pending)
+        self._pending, self._cleared = {}, False
+        return batch
+
+    def _write(self, batch: tuple):
+        cleared, changes = batch
+        if cleared:
+            self.conn.execute("DELETE FROM routes")
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO routes (mint, dex, pool, expires_at) VALUES (?, ?, ?, ?)",
+            [(mint, *entry) for mint, entry in changes.items() if entry is not None],
+        )
+        self.conn.executemany(
+            "DELETE FROM routes WHERE mint = ?",
+            [(mint,) for mint, entry in changes.items() if entry is None],
+        )
+        self.conn.commit()
+
+    def put(self, mint: str, entry: tuple):
+        self._pending[mint] = entry
+        self._changed()
+
+    def delete(self, mint: str):
+        self._pending[mint] = None
+        self._changed()
+
+    def clear(self):
+        self._pending, self._cleared = {}, True
+        self._changed()
+
+    def close(self):
+        super().close()
+        with self._lock:
+            self.conn.close()
+
+_BACKENDS = {
+    "memory": _MemoryBackend,
+    "file": _FileBackend,
+    "sqlite": _SQLiteBackend,
+}
+
+class RouteCache:
+    def __init__(
+        self,
+        backend: str = "memory",
+        path: str | None = None,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        migrating_ttl: float = MIGRATING_TTL,
+        negative_ttl: float = NEGATIVE_TTL,
+        flush_interval: float = FLUSH_INTERVAL,
+    ):
+        """
+        mint -> (dex, pool) cache with TTLs, LRU eviction and negative entries.
+
+        Args:
+            backend: "memory" | "file" | "sqlite"
+            path: str | None <- required for "file" and "sqlite"
+            max_entries: int
+            ttl: float <- seconds, settled AMM pools
+            migrating_ttl: float <- seconds, PumpFun / Launchpad / DBC curves
+            negative_ttl: float <- seconds, mints without a pool
+            flush_interval: float <- seconds between batched writes of the "file" / "sqlite" backends
+        """
+        if backend not in _BACKENDS:
+            raise ValueError(f"RouteCache | Unknown backend: {backend}")
+        if backend != "memory" and not path:
+            raise ValueError(f"RouteCache | Backend '{backend}' requires a path")
+
+        self.backend = _BACKENDS[backend](path, flush_interval) if path and backend != "memory" else _MemoryBackend()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.migrating_ttl = migrating_ttl
+        self.negative_ttl = negative_ttl
+        self.stats = {"hits": 0, "negative_hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+        self._entries: OrderedDict[str, tuple] = OrderedDict()
+        now = time.time()
+        for mint, entry in self.backend.load().items():
+            if entry[2] > now:
+                self._entries[mint] = entry
+        self._evict()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, mint):
+        return self.get(mint) is not None
+
+    def _ttl_for(self, dex: str | None) -> float:
+        if dex is None:
+            return self.negative_ttl
+        if dex in MIGRATING_DEXES:
+            return self.migrating_ttl
+        return self.ttl
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            mint, _ = self._entries.popitem(last=False)
+            self.backend.delete(mint)
+            self.stats["evictions"] += 1
+
+    def get(self, mint: str):
+        """
+        Returns:
+            tuple | None: (dex, pool) on a hit, (None, None) on a negative hit, None on a miss
+        """
+        mint = str(mint)
+        entry = self._entries.get(mint)
+        if entry is None:
+            self.stats["misses"] += 1
+            return None
+        dex, pool, expires_at = entry
+        if expires_at <= time.time():
+            self._entries.pop(mint, None)
+            self.backend.delete(mint)
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(mint)
+        if dex is None:
+            self.stats["negative_hits"] += 1
+        else:
+            self.stats["hits"] += 1
+        return (dex, pool)
+
+    def put(self, mint: str, dex: str | None, pool: str | None):
+        """
+        Store a route. dex=None stores a negative entry.
+        """
+        try:
+            mint = str(mint)
+            pool = str(pool) if pool is not None else None
+            entry = (dex, pool, time.time() + self._ttl_for(dex))
+            self._entries[mint] = entry
+            self._entries.move_to_end(mint)
+            self.backend.put(mint, entry)
+            self._evict()
+        except Exception as e:
+            logging.error(f"RouteCache | Failed to store route for {mint}: {e}")
+            traceback.print_exc()
+
+    def put_negative(self, mint: str):
+        self.put(mint, None, None)
+
+    def invalidate(self, mint: str, dex: str | None = None) -> bool:
+        """
+        Drop a cached route. If `dex` is given, only drop it when the cached route is on that dex.
+        """
+        mint = str(mint)
+        entry = self._entries.get(mint)
+        if entry is None:
+            return False
+        if dex is not None and entry[0] != dex:
+            return False
+        self._entries.pop(mint, None)
+        self.backend.delete(mint)
+        self.stats["invalidations"] += 1
+        logging.info(f"RouteCache | Invalidated route for {mint}")
+        return True
+
+    def clear(self):
+        self._entries.clear()
+        self.backend.clear()
+
+    def flush(self):
+        """
+        Write changes the file / sqlite backend has not written yet. Normally they go out every `FLUSH_INTERVAL`
+        seconds, off the event loop; call this before handing the file to someone else.
+        """
+        try:
+            self.backend.flush()
+        except Exception as e:
+            logging.error(f"RouteCache | Error flushing backend: {e}")
+
+    def close(self):
+        try:
+            self.backend.close()
+        except Exception as e:
+            logging.error(f"RouteCache | Error closing backend: {e}")
@@ -0,0 +1,51 @@
+import time
+from dataclasses import dataclass, field
+from typing import Any
+from solders.pubkey import Pubkey # type: ignore
+
+# seconds a pool snapshot may be used for the reserve-dependent parts of a trade (price, min out)
+SNAPSHOT_MAX_AGE = 2.0
+
+@dataclass
+class RouteResult:
+    """
+    A detected route plus what detection read on the way: the decoded pool state, the mint's decimals
+    and token program, and the slot / time the accounts were read at.
+    Unpacks like the old `(dex, pool)` tuple.
+
+    state per venue:
+        PumpFun             BondingCurveState
+        PumpSwap            {"pool_keys": dict, "pool_type": "NEW" | "OLD"}
+        MeteoraDBC/Believe  virtual pool dict (same as MeteoraDBC.fetch_state)
+        other venues        None
+    """
+    mint: str
+    dex: str | None
+    pool: str | None
+    state: Any = None
+    decimals: int | None = None
+    token_program: Pubkey | None = None
+    slot: int | None = None
+    fetched_at: float = field(default_factory=time.monotonic)
+
+    def __iter__(self):
+        return iter((self.dex, self.pool))
+
+    @property
+    def found(self) -> bool:
+        return self.dex is not None and self.pool is not None
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def is_fresh(self, max_age: float = SNAPSHOT_MAX_AGE) -> bool:
+        """
+        True while the pool snapshot is recent enough to price a trade from.
+        """
+        return self.state is not None and self.age() <= max_age
+
+    def matches(self, mint, pool, dex: str) -> bool:
+        """
+        True when this result describes the (mint, pool, dex) a trade was asked for.
+        """
+        return self.found and self.mint == str(mint) and str(self.pool) == str(pool) and self.dex == dex
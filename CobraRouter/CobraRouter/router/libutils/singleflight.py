@@ -0,0 +1,79 @@
+import asyncio, contextvars
+try:
+    from .deadline import _current as _deadline, within
+    from .limiter import LANES, _lane, current_lane
+except:
+    from deadline import _current as _deadline, within
+    from limiter import LANES, _lane, current_lane
+
+def detached(coro, lane_name: str | None = None) -> tuple[asyncio.Task, contextvars.Context]:
+    """
+    Start `coro` as work shared by several callers: outside every caller's deadline (each caller bounds its own
+    wait with `within`) and in lane `lane_name`, the current lane by default.
+    Returns:
+        tuple: (task, context of the task, for promote)
+    """
+    ctx = contextvars.copy_context()
+    ctx.run(_deadline.set, None)
+    ctx.run(_lane.set, lane_name or current_lane())
+    try:
+        task = asyncio.get_running_loop().create_task(coro, context=ctx)
+    except TypeError:
+        # Python < 3.11: the task runs in a copy of ctx, promote cannot reach it
+        task = ctx.run(asyncio.ensure_future, coro)
+    return task, ctx
+
+def promote(ctx: contextvars.Context, lane_name: str):
+    """
+    Move a detached task up to `lane_name` when that lane is served first. Requests it makes from now on use it;
+    tasks it already spawned keep their lane.
+    """
+    if LANES[lane_name] < LANES[ctx.get(_lane, "default")]:
+        try:
+            ctx.run(_lane.set, lane_name)
+        except RuntimeError:
+            pass  # promoted from inside the task itself: it already runs in that lane
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into one in-flight task.
+    Callers that arrive while the task runs await its result instead of starting their own.
+    """
+    def __init__(self):
+        self._inflight: dict = {}  # key -> [task, context, waiters]
+        self.stats = {"calls": 0, "shared": 0}
+
+    def __len__(self):
+        return len(self._inflight)
+
+    def _forget(self, key, task: asyncio.Future):
+        entry = self._inflight.get(key)
+        if entry is not None and entry[0] is task:
+            del self._inflight[key]
+
+    async def do(self, key, fn, *args, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` once per key at a time and hand every waiting caller the same result.
+        The task runs in the highest-priority lane among its callers and under none of their deadlines: each
+        caller waits under its own, and a cancelled or timed-out caller does not cancel the task for the others.
+        The task is cancelled once no caller waits for it any more.
+        """
+        self.stats["calls"] += 1
+        entry = self._inflight.get(key)
+        if entry is not None:
+            self.stats["shared"] += 1
+            promote(entry[1], current_lane())
+        else:
+            task, ctx = detached(fn(*args, **kwargs))
+            entry = [task, ctx, 0]
+            self._inflight[key] = entry
+            task.add_done_callback(lambda t: self._forget(key, t))
+
+        task = entry[0]
+        entry[2] += 1
+        try:
+            return await within(asyncio.shield(task), "shared request")
+        finally:
+            entry[2] -= 1
+            if entry[2] == 0 and not task.done():
+                task.cancel()
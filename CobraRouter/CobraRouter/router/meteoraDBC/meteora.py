@@ -2,13 +2,15 @@
 import json
 import asyncio
 
-try: from .state import fetch_virtual_pool, VirtualPoolLayout, price_from_sqrt, get_price;
-except: from state import fetch_virtual_pool, VirtualPoolLayout, price_from_sqrt, get_price;
-try: from .pool import find_pool;
-except: from pool import find_pool;
+try: from .state import fetch_virtual_pool, parse_virtual_pool, VirtualPoolLayout, price_from_sqrt, get_price;
+except: from state import fetch_virtual_pool, parse_virtual_pool, VirtualPoolLayout, price_from_sqrt, get_price;
+try: from .pool import find_pool, remember_config, derive_pool_candidates;
+except: from pool import find_pool, remember_config, derive_pool_candidates;
 try: from .swap  import MeteoraDBCSwap;
 except: from swap  import MeteoraDBCSwap;
 import logging
+try: from ..libutils.deadline import deadline_sleep
+except: from libutils.deadline import deadline_sleep
 try:
     from solana.rpc.async_api import AsyncClient
     from solders.keypair import Keypair # type: ignore
@@ -20,25 +22,36 @@ except Exception as e:
 class MeteoraDBC:
     def __init__(self, async_client: AsyncClient):
         self.client = async_client
+        self.pool_index = None
         self.swap = MeteoraDBCSwap(self.client)
         self.virtual_pool_layout = VirtualPoolLayout
         self.price_from_sqrt = price_from_sqrt
         self.find_pool = find_pool # UU
+        self.derive_pool_candidates = derive_pool_candidates
         self.get_price = get_price
+        self.parse_virtual_pool = parse_virtual_pool
 
-    async def fetch_state(self, mint: str | Pubkey):
+    async def fetch_state(self, mint: str | Pubkey, prefetched: dict | None = None):
         try:
             mint = str(mint) if isinstance(mint, Pubkey) else mint
-            pool_addr = await find_pool(mint, self.client)
+            pool_addr = await find_pool(mint, self.client, index=self.pool_index, prefetched=prefetched)
             if not pool_addr:
                 return None, "NO_ACC"
-            state = await fetch_virtual_pool(pool_addr, self.client)
-            state["_pubkey"] = pool_addr
-            return (pool_addr, state)
+            return await self.fetch_pool_state(pool_addr)
         except RuntimeError as e:
             logging.info(f"Error: {e}")
             return None, "NO_ACC"
 
+    async def fetch_pool_state(self, pool_addr: str | Pubkey):
+        """
+        Same as fetch_state for an already known pool, without the pool lookup.
+        """
+        pool_addr = str(pool_addr)
+        state = await fetch_virtual_pool(pool_addr, self.client)
+        remember_config(state["config"])
+        state["_pubkey"] = pool_addr
+        return (pool_addr, state)
+
     async def buy(self, mint: str, sol_amount: float, fee_sol: float = 0.00001):
         try:
             sol_lams = int(sol_amount * 1e9)
@@ -48,7 +61,7 @@ class MeteoraDBC:
                 return "migrated"
 
             if state == "NO_ACC":
-                await asyncio.sleep(0.2)
+                await deadline_sleep(0.2)
                 pool, state = await self.fetch_state(mint)
                 if state == "NO_ACC":
                     raise RuntimeError(f"No account found for mint {mint}")
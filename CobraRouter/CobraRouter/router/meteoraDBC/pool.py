@@ -1,14 +1,64 @@
 import logging
+from collections import OrderedDict
 from solana.rpc.types import MemcmpOpts, DataSliceOpts
 from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Confirmed
 from solders.pubkey import Pubkey # type: ignore
+try: from ..libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
 import solana.exceptions
 
 DBC  = Pubkey.from_string("dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN")
+WSOL_MINT = Pubkey.from_string("So11111111111111111111111111111111111111112")
 BASE_MINT_OFFSET = 136
+CONFIG_OFFSET = 72
+MAX_KNOWN_CONFIGS = 256
 
-async def pools_for_mint(mint_pk: str, ctx: AsyncClient):
+# pool configs seen in decoded pools, most recent last. Launchpads reuse a handful of configs,
+# so the pool PDA of a new mint can usually be derived from one of them.
+_known_configs: OrderedDict[Pubkey, None] = OrderedDict()
+
+def remember_config(config: str | Pubkey):
+    config = Pubkey.from_string(config) if isinstance(config, str) else config
+    _known_configs[config] = None
+    _known_configs.move_to_end(config)
+    while len(_known_configs) > MAX_KNOWN_CONFIGS:
+        _known_configs.popitem(last=False)
+
+def derive_pool_address(config: Pubkey, base_mint: Pubkey, quote_mint: Pubkey = WSOL_MINT) -> Pubkey:
+    """
+    Virtual pool PDA: [b"pool", config, larger mint, smaller mint].
+    """
+    hi, lo = sorted([bytes(base_mint), bytes(quote_mint)], reverse=True)
+    return find_program_address([b"pool", bytes(config), hi, lo], DBC)[0]
+
+def derive_pool_candidates(mint_pk: str | Pubkey) -> list[Pubkey]:
+    """
+    wSOL virtual pool PDA of a mint under every known config, most recently seen config first.
+    """
+    mint_pk = Pubkey.from_string(mint_pk) if isinstance(mint_pk, str) else mint_pk
+    return [derive_pool_address(cfg, mint_pk) for cfg in reversed(_known_configs)]
+
+async def pools_for_mint(mint_pk: str, ctx: AsyncClient, index=None, prefetched: dict | None = None):
     try:
+        if index is not None:
+            indexed = index.lookup("dbc", mint_pk)
+            if indexed is not None:
+                return indexed
+
+        candidates = derive_pool_candidates(mint_pk)
+        if candidates:
+            if prefetched is not None and all(pk in prefetched for pk in candidates):
+                accounts = [prefetched[pk] for pk in candidates]
+            else:
+                accounts = []
+                for i in range(0, len(candidates), 100):
+                    resp = await ctx.get_multiple_accounts(candidates[i : i + 100], commitment=Confirmed)
+                    accounts += resp.value
+            found = [str(pk) for pk, acc in zip(candidates, accounts) if acc is not None and acc.owner == DBC]
+            if found:
+                return found
+
         resp = await ctx.get_program_accounts(
             DBC,
             commitment="confirmed",
@@ -18,13 +68,17 @@ async def pools_for_mint(mint_pk: str, ctx: AsyncClient):
             filters=[MemcmpOpts(offset=BASE_MINT_OFFSET,
                                 bytes=str(mint_pk))]
         )
+        for acc in resp.value:
+            data = bytes(acc.account.data)
+            if len(data) >= CONFIG_OFFSET + 32:
+                remember_config(Pubkey.from_bytes(data[CONFIG_OFFSET : CONFIG_OFFSET + 32]))
         return [str(acc.pubkey) for acc in resp.value]
     except solana.exceptions.SolanaRpcException:
         logging.info(f"Error in pools_for_mint: We don't know the cause yet, but it's probably because the pool is not found, or the RPC is rate limited.")
         return []
 
-async def find_pool(mint_pk: str, ctx: AsyncClient):
-    pools = await pools_for_mint(mint_pk, ctx)
+async def find_pool(mint_pk: str, ctx: AsyncClient, index=None, prefetched: dict | None = None):
+    pools = await pools_for_mint(mint_pk, ctx, index=index, prefetched=prefetched)
     if len(pools) == 0:
         return None
-    return pools[0]
\ No newline at end of file
+    return pools[0]
@@ -10,6 +10,10 @@ from solana.rpc.commitment import Processed, Confirmed
 
 from solders.pubkey import Pubkey # type: ignore
 from solana.rpc.async_api import AsyncClient
+try: from ..libutils.account_cache import accounts_of, STATIC, RESERVES
+except: from libutils.account_cache import accounts_of, STATIC, RESERVES
+try: from ..libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 
 def le_bytes_to_int(b: bytes) -> int:
     return int.from_bytes(b, "little")
@@ -134,14 +138,11 @@ async def get_decimals(mint: str | Pubkey, ctx: AsyncClient) -> int:
             return 9
         
         mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-        mint_info = await ctx.get_account_info_json_parsed(
-            mint,
-            commitment=Processed
-        )
+        mint_info = await mints_of(ctx).get(mint)
         if not mint_info:
             logging.info("Error: Failed to fetch mint info (tried to fetch token decimals).")
             return None
-        dec_base = mint_info.value.data.parsed['info']['decimals']
+        dec_base = mint_info.decimals
         return int(dec_base)
     except Exception as e:
         logging.error(f"Error getting decimals for mint: {e}")
@@ -166,16 +167,22 @@ def migration_quote_amount(threshold: int, fee_pct: int) -> tuple[int,int]:
 
 async def fetch_virtual_pool(pool_addr: str | Pubkey, ctx: AsyncClient):
     pk = pool_addr if isinstance(pool_addr, Pubkey) else Pubkey.from_string(pool_addr)
-    acc = (await ctx.get_account_info(pk, encoding="base64", commitment=Processed)).value
+    acc = await accounts_of(ctx).get(pk, RESERVES)
     if acc is None:
         raise RuntimeError(f"account not found {pool_addr}")
 
-    if isinstance(acc.data, bytes):
-        blob = acc.data
-    elif isinstance(acc.data, tuple):
-        blob = base64.b64decode(acc.data[0])
+    return parse_virtual_pool(acc.data)
+
+def parse_virtual_pool(data) -> dict:
+    """
+    Decode raw virtual pool account data (bytes or a base64 tuple).
+    """
+    if isinstance(data, bytes):
+        blob = data
+    elif isinstance(data, tuple):
+        blob = base64.b64decode(data[0])
     else:
-        raise TypeError(f"unexpected data field type: {type(acc.data)}")
+        raise TypeError(f"unexpected data field type: {type(data)}")
 
     blob = blob[8:]
     parsed = VirtualPoolLayout.parse(blob)
@@ -202,7 +209,7 @@ async def get_price(pool_addr: str | Pubkey, ctx: AsyncClient):
 
 async def fetch_pool_config(pool_addr: str, ctx: AsyncClient):
     pk   = Pubkey.from_string(pool_addr)
-    acc  = (await ctx.get_account_info(pk, encoding="base64", commitment=Confirmed)).value
+    acc  = await accounts_of(ctx).get(pk, STATIC)
     if acc is None:
         raise RuntimeError(f"PoolConfig account {pool_addr} not found")
 
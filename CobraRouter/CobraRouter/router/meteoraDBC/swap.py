@@ -6,6 +6,10 @@ import struct
 import base64
 from solana.rpc.async_api import AsyncClient
 from solders.pubkey      import Pubkey      # type: ignore                        
+try: from ..libutils.pda import find_program_address, static_pda
+except: from libutils.pda import find_program_address, static_pda
+try: from ..libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 from solders.instruction import AccountMeta, Instruction       # type: ignore     
 from spl.token.instructions import (
     get_associated_token_address,
@@ -36,7 +40,7 @@ def compute_unit_price_from_total_fee(
 DBC_PROGRAM_ID     = Pubkey.from_string("dbcij3LWUppWqq96dh6gJWwBifmcGfLSB5D4DuSMaqN")
 POOL_AUTHORITY_PDA = Pubkey.from_string("FhVo3mqL8PW5pH5U2CN4XE33DokiyZnUwuGpH2hmHLuM")
 EVENT_AUTH_SEED    = b"__event_authority"
-EVENT_AUTHORITY_PDA, _ = Pubkey.find_program_address([EVENT_AUTH_SEED], DBC_PROGRAM_ID)
+EVENT_AUTHORITY_PDA = static_pda([EVENT_AUTH_SEED], DBC_PROGRAM_ID)
 
 SWAP_DISCRIM = bytes([248, 198, 158, 145, 225, 117, 135, 200])
 UNIT_COMPUTE_BUDGET = 200_000
@@ -51,10 +55,10 @@ class MeteoraDBCSwap:
 
     async def _mint_owner(self, mint: Pubkey) -> Pubkey:
         try:
-            info = await self.client.get_account_info(mint, commitment=Confirmed)
-            if info.value is None:
+            info = await mints_of(self.client).get(mint)
+            if info is None:
                 raise RuntimeError("mint account missing")
-            return info.value.owner
+            return info.token_program
         except Exception as e:
             traceback.print_exc()
             logging.info(f"Failed to get token program id: {e}")
@@ -1,4 +1,8 @@
 from solders.pubkey import Pubkey # type: ignore
+try: from ..libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
+try: from ..libutils.account_cache import accounts_of, RESERVES
+except: from libutils.account_cache import accounts_of, RESERVES
 from solders.keypair import Keypair # type: ignore
 import asyncio
 from solana.rpc.async_api import AsyncClient
@@ -36,6 +40,7 @@ DammV1PoolState = cStruct(
 class DAMM1Core:
     def __init__(self, client: AsyncClient):
         self.client = client
+        self.pool_index = None
 
     async def build_swap_instruction(
         self, 
@@ -230,19 +235,19 @@ class DAMM1Core:
     async def derive_vault_address(self, mint: str | Pubkey) -> Pubkey:
         mint = mint if isinstance(mint, Pubkey) else Pubkey.from_string(mint)
         seeds = [b"vault", mint.__bytes__(), VAULT_BASE_ID.__bytes__()]
-        pool_pda, _ = Pubkey.find_program_address(seeds, VAULT_PROGRAM_ID)
+        pool_pda, _ = find_program_address(seeds, VAULT_PROGRAM_ID)
         return pool_pda
 
     async def derive_token_vault_address(self, vault: str | Pubkey) -> Pubkey:
         vault = vault if isinstance(vault, Pubkey) else Pubkey.from_string(vault)
         seeds = [b"token_vault", vault.__bytes__()]
-        pool_pda, _ = Pubkey.find_program_address(seeds, VAULT_PROGRAM_ID)
+        pool_pda, _ = find_program_address(seeds, VAULT_PROGRAM_ID)
         return pool_pda
 
     async def derive_lp_mint_address(self, vault: str | Pubkey) -> Pubkey:
         vault = vault if isinstance(vault, Pubkey) else Pubkey.from_string(vault)
         seeds = [b"lp_mint", vault.__bytes__()]
-        pool_pda, _ = Pubkey.find_program_address(seeds, VAULT_PROGRAM_ID)
+        pool_pda, _ = find_program_address(seeds, VAULT_PROGRAM_ID)
         return pool_pda
 
     async def async_get_pool_reserves(self, vault_a: Pubkey, vault_b: Pubkey):
@@ -268,11 +273,11 @@ class DAMM1Core:
         """
         try:
             pool_addr = pool_addr if isinstance(pool_addr, Pubkey) else Pubkey.from_string(pool_addr)
-            resp = await self.client.get_account_info_json_parsed(pool_addr, commitment=Confirmed)
-            if not resp or not resp.value or not resp.value.data:
+            acc = await accounts_of(self.client).get(pool_addr, RESERVES)
+            if acc is None or not acc.data:
                 raise Exception("Invalid account response")
 
-            raw_data = resp.value.data
+            raw_data = acc.data
             parsed = DammV1PoolState.parse(raw_data[8:]) # type: ignore
 
             pdict = self.convert_pool_keys(parsed)
@@ -295,17 +300,21 @@ class DAMM1Core:
         found_pools = []
         best_pool = None
         try:
-            resp = await self.client.get_program_accounts(
-                DAMM_V1_PROGRAM_ID,
-                commitment=Confirmed,
-                encoding="base64",
-                data_slice=DataSliceOpts(offset=0, length=target_offset + 32),
-                filters=[
-                    MemcmpOpts(offset=target_offset, bytes=mint_str)
-                ]
-            )
-            
-            found_pools.extend(str(acc.pubkey) for acc in resp.value[:limit])
+            indexed = self.pool_index.lookup("damm_v1", mint_str) if self.pool_index is not None else None
+            if indexed is not None:
+                found_pools.extend(indexed[:limit])
+            else:
+                resp = await self.client.get_program_accounts(
+                    DAMM_V1_PROGRAM_ID,
+                    commitment=Confirmed,
+                    encoding="base64",
+                    data_slice=DataSliceOpts(offset=0, length=target_offset + 32),
+                    filters=[
+                        MemcmpOpts(offset=target_offset, bytes=mint_str)
+                    ]
+                )
+                
+                found_pools.extend(str(acc.pubkey) for acc in resp.value[:limit])
             
             found_pools = list(set(found_pools))
             
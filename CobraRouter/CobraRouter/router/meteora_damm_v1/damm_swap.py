@@ -9,6 +9,8 @@ from solders.transaction import Transaction, VersionedTransaction # type: ignore
 from solders.message import MessageV0 # type: ignore
 try: from damm_core import DAMM1Core, TOKEN_PROGRAM_ID
 except: from .damm_core import DAMM1Core, TOKEN_PROGRAM_ID
+try: from ..libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 from solana.rpc.types import TxOpts, TokenAccountOpts
 from solders.compute_budget import set_compute_unit_limit, set_compute_unit_price # type: ignore
 import logging
@@ -32,10 +34,10 @@ class MeteoraDamm1:
 
     async def _mint_owner(self, mint: Pubkey) -> Pubkey:
         try:
-            info = await self.client.get_account_info(mint, commitment=Processed)
-            if info.value is None:
+            info = await mints_of(self.client).get(mint)
+            if info is None:
                 raise RuntimeError("mint account missing")
-            return info.value.owner
+            return info.token_program
         except Exception as e:
             traceback.print_exc()
             logging.info(f"Failed to get token program id: {e}")
@@ -161,14 +163,11 @@ class MeteoraDamm1:
             if percentage > 100:
                 raise ValueError("Percentage can't be greater than 100")
 
-            mint_info = await self.client.get_account_info_json_parsed(
-                Pubkey.from_string(base_mint) if isinstance(base_mint, str) else base_mint,
-                commitment=Processed
-            )
+            mint_info = await mints_of(self.client).get(Pubkey.from_string(base_mint) if isinstance(base_mint, str) else base_mint)
             if not mint_info:
                 logging.info("Error: Failed to fetch mint info (tried to fetch token decimals).")
                 return
-            dec_base = mint_info.value.data.parsed['info']['decimals']
+            dec_base = mint_info.decimals
 
             token_pk = Pubkey.from_string(base_mint) if isinstance(base_mint, str) else base_mint
             bal_resp = await self.client.get_token_accounts_by_owner_json_parsed(
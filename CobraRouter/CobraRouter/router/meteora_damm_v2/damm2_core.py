@@ -2,6 +2,12 @@ import solana.exceptions
 from solana.rpc.async_api import AsyncClient
 from solders.keypair import Keypair # type: ignore
 from solders.pubkey import Pubkey # type: ignore
+try: from ..libutils.pda import find_program_address, static_pda
+except: from libutils.pda import find_program_address, static_pda
+try: from ..libutils.account_cache import accounts_of, RESERVES
+except: from libutils.account_cache import accounts_of, RESERVES
+try: from ..libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 from solders.instruction import Instruction, AccountMeta # type: ignore
 from spl.token.constants import TOKEN_PROGRAM_ID
 from spl.token.instructions import get_associated_token_address
@@ -17,6 +23,9 @@ import logging
 WSOL_MINT = Pubkey.from_string("So11111111111111111111111111111111111111112")
 CP_AMM_PROGRAM_ID = Pubkey.from_string("cpamdpZCGKUy5JxQXB4dcpGPiikHawvSWAd6mEn1sGG")
 TOKEN_PROGRAM_ID = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+POOL_AUTHORITY = static_pda([b"pool_authority"], CP_AMM_PROGRAM_ID)
+EVENT_AUTHORITY = static_pda([b"__event_authority"], CP_AMM_PROGRAM_ID)
+STATIC_CONFIG_COUNT = 32  # config indexes tried when deriving pool addresses
 
 PUBKEY = Bytes(32)
 
@@ -134,6 +143,7 @@ class DAMM2SwapBuilder:
 class DAMM2Core:
     def __init__(self, client: AsyncClient):
         self.client = client
+        self.pool_index = None
 
     def get_first_key(self, key1: Pubkey, key2: Pubkey) -> bytes:
         """get the lexicographically larger key buffer"""
@@ -151,13 +161,11 @@ class DAMM2Core:
         return buf1
     
     def derive_pool_authority(self) -> Pubkey:
-        seeds = [b"pool_authority"]
-        pda, _ = Pubkey.find_program_address(seeds, CP_AMM_PROGRAM_ID)
-        return pda
+        return POOL_AUTHORITY
     
     def derive_config_address(self, index: int) -> Pubkey:
         seeds = [b"config", index.to_bytes(8, 'little')]
-        pda, _ = Pubkey.find_program_address(seeds, CP_AMM_PROGRAM_ID)
+        pda, _ = find_program_address(seeds, CP_AMM_PROGRAM_ID)
         return pda
     
     def derive_pool_address(self, config: Pubkey, token_a_mint: Pubkey, token_b_mint: Pubkey) -> Pubkey:
@@ -167,7 +175,7 @@ class DAMM2Core:
             self.get_first_key(token_a_mint, token_b_mint),
             self.get_second_key(token_a_mint, token_b_mint)
         ]
-        pda, _ = Pubkey.find_program_address(seeds, CP_AMM_PROGRAM_ID)
+        pda, _ = find_program_address(seeds, CP_AMM_PROGRAM_ID)
         return pda
     
     def derive_customizable_pool_address(self, token_a_mint: Pubkey, token_b_mint: Pubkey) -> Pubkey:
@@ -176,12 +184,23 @@ class DAMM2Core:
             self.get_first_key(token_a_mint, token_b_mint),
             self.get_second_key(token_a_mint, token_b_mint)
         ]
-        pda, _ = Pubkey.find_program_address(seeds, CP_AMM_PROGRAM_ID)
+        pda, _ = find_program_address(seeds, CP_AMM_PROGRAM_ID)
         return pda
     
+    def derive_pool_candidates(self, mint: str | Pubkey, quote_mint: Pubkey = WSOL_MINT) -> list[Pubkey]:
+        """
+        Every (mint, quote) pool address derivable without a scan: the customizable pool and
+        one pool per static config index. None of them are checked for existence.
+        """
+        mint = mint if isinstance(mint, Pubkey) else Pubkey.from_string(mint)
+        candidates = [self.derive_customizable_pool_address(mint, quote_mint)]
+        for index in range(STATIC_CONFIG_COUNT):
+            candidates.append(self.derive_pool_address(self.derive_config_address(index), mint, quote_mint))
+        return candidates
+
     def derive_token_vault_address(self, token_mint: Pubkey, pool: Pubkey) -> Pubkey:
         seeds = [b"token_vault", token_mint.__bytes__(), pool.__bytes__()]
-        pda, _ = Pubkey.find_program_address(seeds, CP_AMM_PROGRAM_ID)
+        pda, _ = find_program_address(seeds, CP_AMM_PROGRAM_ID)
         return pda
     
     def derive_pool_vaults(self, token_a_mint: Pubkey, token_b_mint: Pubkey, pool: Pubkey) -> Tuple[Pubkey, Pubkey]:
@@ -190,24 +209,22 @@ class DAMM2Core:
         return vault_a, vault_b
     
     def derive_event_authority(self) -> Pubkey:
-        seeds = [b"__event_authority"]
-        pda, _ = Pubkey.find_program_address(seeds, CP_AMM_PROGRAM_ID)
-        return pda
+        return EVENT_AUTHORITY
 
     async def fetch_pool_state(self, pool_address: str | Pubkey) -> dict:
         pool_pubkey = pool_address if isinstance(pool_address, Pubkey) else Pubkey.from_string(pool_address)
         
         try:
-            account_info = await self.client.get_account_info(pool_pubkey, encoding="base64")
-            if account_info.value is None:
+            account = await accounts_of(self.client).get(pool_pubkey, RESERVES)
+            if account is None:
                 raise ValueError(f"Pool account not found: {pool_pubkey}")
             
-            if isinstance(account_info.value.data, bytes):
-                blob = account_info.value.data
-            elif isinstance(account_info.value.data, tuple):
-                blob = base64.b64decode(account_info.value.data[0])
+            if isinstance(account.data, bytes):
+                blob = account.data
+            elif isinstance(account.data, tuple):
+                blob = base64.b64decode(account.data[0])
             else:
-                raise TypeError(f"Unexpected data field type: {type(account_info.value.data)}")
+                raise TypeError(f"Unexpected data field type: {type(account.data)}")
             
             blob = blob[8:]
             parsed = PrunedPoolLayout.parse(blob)
@@ -243,14 +260,11 @@ class DAMM2Core:
     async def get_decimals(self, mint: str | Pubkey) -> int:
         try:
             mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            mint_info = await self.client.get_account_info_json_parsed(
-                mint,
-                commitment=Processed
-            )
+            mint_info = await mints_of(self.client).get(mint)
             if not mint_info:
                 logging.info("Error: Failed to fetch mint info (tried to fetch token decimals).")
                 return None
-            dec_base = mint_info.value.data.parsed['info']['decimals']
+            dec_base = mint_info.decimals
             return int(dec_base)
         except Exception as e:
             logging.error(f"Error getting decimals for mint: {e}")
@@ -338,9 +352,11 @@ class DAMM2Core:
             traceback.print_exc()
             return 0.0, 0.0
 
-    async def find_pools_by_mint(self, mint: str | Pubkey, sol_amount: float = 0.01, limit: int = 10) -> str | None:
+    async def find_pools_by_mint(self, mint: str | Pubkey, sol_amount: float = 0.01, limit: int = 10, prefetched: dict | None = None) -> str | None:
         """
         Find the best pool for a given mint with sufficient liquidity.
+        Candidates come from the pool index, then the derivable pool PDAs (read from `prefetched`
+        when it holds them), then a getProgramAccounts scan.
         Returns:
             Pool address string or None if no suitable pool found
         """
@@ -348,21 +364,35 @@ class DAMM2Core:
         mint = mint if isinstance(mint, Pubkey) else Pubkey.from_string(mint)
         found_pools = []
         best_pool = None
+        derived = False
         try:
             target_offsets = [168, 200] # 168 is offset of token_a_mint, 200 is offset of token_b_mint
             
-            for target_offset in target_offsets:
-                resp = await self.client.get_program_accounts(
-                    CP_AMM_PROGRAM_ID,
-                    commitment="confirmed",
-                    encoding="base64",
-                    data_slice=DataSliceOpts(offset=0, length=target_offset + 32),
-                    filters=[
-                        MemcmpOpts(offset=target_offset, bytes=mint_str)
-                    ]
-                )
-                
-                found_pools.extend(str(acc.pubkey) for acc in resp.value[:limit])
+            indexed = self.pool_index.lookup("damm_v2", mint_str) if self.pool_index is not None else None
+            if indexed is not None:
+                found_pools.extend(indexed[:limit])
+            else:
+                candidates = self.derive_pool_candidates(mint)
+                if prefetched is not None and all(pk in prefetched for pk in candidates):
+                    accounts = [prefetched[pk] for pk in candidates]
+                else:
+                    accounts = (await self.client.get_multiple_accounts(candidates, commitment=Processed)).value
+                found_pools.extend(str(pk) for pk, acc in zip(candidates, accounts) if acc is not None)
+                derived = bool(found_pools)
+
+                if not found_pools:
+                    for target_offset in target_offsets:
+                        resp = await self.client.get_program_accounts(
+                            CP_AMM_PROGRAM_ID,
+                            commitment="confirmed",
+                            encoding="base64",
+                            data_slice=DataSliceOpts(offset=0, length=target_offset + 32),
+                            filters=[
+                                MemcmpOpts(offset=target_offset, bytes=mint_str)
+                            ]
+                        )
+                        
+                        found_pools.extend(str(acc.pubkey) for acc in resp.value[:limit])
             
             found_pools = list(set(found_pools))
             
@@ -416,6 +446,9 @@ class DAMM2Core:
                     logging.info(f"Error processing pool {pool_addr}: {e}")
                     continue
 
+            if best_pool is None and derived:
+                # the derived pools exist but none is usable, scan for the others
+                return await self.find_pools_by_mint(mint, sol_amount, limit, prefetched={pk: None for pk in candidates})
             return best_pool
         except solana.exceptions.SolanaRpcException:
             logging.info(f"Error in pool_scanning: We don't know the cause yet, but it's probably because the pool is not found, or the RPC is rate limited.")
@@ -18,6 +18,10 @@ from solders.system_program import CreateAccountWithSeedParams, create_account_w
 import logging
 try: from damm2_core import DAMM2Core, SwapParams, DAMM2SwapBuilder, TOKEN_PROGRAM_ID, WSOL_MINT;
 except: from .damm2_core import DAMM2Core, SwapParams, DAMM2SwapBuilder, TOKEN_PROGRAM_ID, WSOL_MINT;
+try: from ..libutils.deadline import deadline_sleep
+except: from libutils.deadline import deadline_sleep
+try: from ..libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 
 RENT_EXEMPT     = 2039280
 ACCOUNT_SIZE    = 165
@@ -31,10 +35,10 @@ class MeteoraDamm2:
     
     async def _mint_owner(self, mint: Pubkey) -> Pubkey:
         try:
-            info = await self.client.get_account_info(mint, commitment=Processed)
-            if info.value is None:
+            info = await mints_of(self.client).get(mint)
+            if info is None:
                 raise RuntimeError("mint account missing")
-            return info.value.owner
+            return info.token_program
         except Exception as e:
             traceback.print_exc()
             logging.info(f"Failed to get token program id: {e}")
@@ -93,16 +97,13 @@ class MeteoraDamm2:
                 if percentage > 100:
                     raise ValueError("Percentage can't be greater than 100")
 
-                mint_info = await self.client.get_account_info_json_parsed(
-                    Pubkey.from_string(base_mint) if isinstance(base_mint, str) else base_mint,
-                    commitment=Processed
-                )
+                mint_info = await mints_of(self.client).get(Pubkey.from_string(base_mint) if isinstance(base_mint, str) else base_mint)
                 if not mint_info:
                     logging.info("Error: Failed to fetch mint info (tried to fetch token decimals).")
                     return
-                dec_base = mint_info.value.data.parsed['info']['decimals']
+                dec_base = mint_info.decimals
 
-                await asyncio.sleep(0.1) # sleeper
+                await deadline_sleep(0.1) # sleeper
 
                 token_pk = Pubkey.from_string(base_mint) if isinstance(base_mint, str) else base_mint
                 bal_resp = await self.client.get_token_accounts_by_owner_json_parsed(
@@ -4,6 +4,8 @@ import itertools
 from typing import List, Sequence
 
 from solders.pubkey import Pubkey # type: ignore
+try: from ..libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Processed
 
@@ -42,13 +44,13 @@ def bin_id_to_array_index(bin_id: int) -> int:
 
 def derive_bin_array_pda(lb_pair: Pubkey, index: int) -> Pubkey:
     seed_idx = _u64_le_bytes(index)
-    return Pubkey.find_program_address(
+    return find_program_address(
         [b"bin_array", bytes(lb_pair), seed_idx],
         DLMM_PROGRAM_ID,
     )[0]
 
 def derive_bitmap_ext_pda(lb_pair: Pubkey) -> Pubkey:
-    return Pubkey.find_program_address([b"bitmap", bytes(lb_pair)], DLMM_PROGRAM_ID)[0]
+    return find_program_address([b"bitmap", bytes(lb_pair)], DLMM_PROGRAM_ID)[0]
 
 class DLMMBin:
     __slots__ = ()
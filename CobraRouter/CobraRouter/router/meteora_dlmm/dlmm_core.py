@@ -2,6 +2,12 @@ import asyncio, struct, base64, traceback, json
 from asyncpg.pool import logging
 from solders.keypair import Keypair # type: ignore
 from solders.pubkey import Pubkey # type: ignore
+try: from ..libutils.pda import find_program_address, static_pda
+except: from libutils.pda import find_program_address, static_pda
+try: from ..libutils.account_cache import accounts_of, RESERVES
+except: from libutils.account_cache import accounts_of, RESERVES
+try: from ..libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 from solders.instruction import Instruction, AccountMeta # type: ignore
 from solana.rpc.commitment import Processed
 from solana.rpc.async_api import AsyncClient
@@ -148,6 +154,7 @@ async def _gather_exists(client: AsyncClient, pks: list[Pubkey]) -> set[Pubkey]:
 class DLMMCore:
     def __init__(self, client: AsyncClient):
         self.client = client
+        self._preset_cache = None
 
     async def build_swap_instruction(              
         self,
@@ -211,7 +218,7 @@ class DLMMCore:
         lb_pair = lb_pair if isinstance(lb_pair, Pubkey) else Pubkey.from_string(lb_pair)
         token_mint = token_mint if isinstance(token_mint, Pubkey) else Pubkey.from_string(token_mint)
         seeds = [lb_pair.__bytes__(), token_mint.__bytes__()]
-        return Pubkey.find_program_address(seeds, DLMM_PROGRAM_ID)[0]
+        return find_program_address(seeds, DLMM_PROGRAM_ID)[0]
 
     def convert_pool_keys(self, parsed) -> dict:
         return {
@@ -242,11 +249,11 @@ class DLMMCore:
         """
         try:
             pool_addr = pool_addr if isinstance(pool_addr, Pubkey) else Pubkey.from_string(pool_addr)
-            resp = await self.client.get_account_info_json_parsed(pool_addr, commitment="confirmed")
-            if not resp or not resp.value or not resp.value.data:
+            acc = await accounts_of(self.client).get(pool_addr, RESERVES)
+            if acc is None or not acc.data:
                 raise Exception("Invalid account response")
 
-            raw_data = resp.value.data
+            raw_data = acc.data
             parsed = LbPairLayout.parse(raw_data[8:])
             pdict = self.convert_pool_keys(parsed)
             pdict["pool"] = str(pool_addr)
@@ -259,14 +266,11 @@ class DLMMCore:
     async def get_decimals(self, mint: str | Pubkey) -> int:
         try:
             mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            mint_info = await self.client.get_account_info_json_parsed(
-                mint,
-                commitment=Processed
-            )
+            mint_info = await mints_of(self.client).get(mint)
             if not mint_info:
                 logging.info("Error: Failed to fetch mint info (tried to fetch token decimals).")
                 return None
-            dec_base = mint_info.value.data.parsed['info']['decimals']
+            dec_base = mint_info.decimals
             return int(dec_base)
         except Exception as e:
             logging.error(f"Error getting decimals for mint: {e}")
@@ -370,17 +374,36 @@ class DLMMCore:
 
         return existing[:depth]
 
-    async def find_dlmm_pools_by_mint(
+    async def _live_presets(self, max_preset_index: int = 256) -> list[Pubkey]:
+        """
+        preset_parameter2 accounts that exist on-chain, resolved once per client.
+        """
+        if self._preset_cache is not None and self._preset_cache[0] == max_preset_index:
+            return self._preset_cache[1]
+
+        preset_pks: list[Pubkey] = []
+        for idx in range(max_preset_index):
+            seed_idx = idx.to_bytes(2, "little")
+            pk = static_pda(
+                [PRESET2_TAG, seed_idx],
+                DLMM_PROGRAM_ID,
+            )
+            preset_pks.append(pk)
+
+        preset_pks = sorted(await _gather_exists(self.client, preset_pks), key=lambda pk: bytes(pk))
+        self._preset_cache = (max_preset_index, preset_pks)
+        return preset_pks
+
+    async def derive_pool_candidates(
         self,
         mint_a: str | Pubkey,
         mint_b: str | Pubkey | None = None,
         max_preset_index: int = 256
-    ) -> list[str]:
+    ) -> list[Pubkey]:
         """
-        Return every live DLMM LbPair that trades (mint_a, mint_b).
+        Every LbPair address (mint_a, mint_b) could live at. None of them are checked for existence.
         If mint_b is None the second side defaults to wSOL.
         """
-
         m0 = mint_a if isinstance(mint_a, Pubkey) else Pubkey.from_string(mint_a)
         m1 = mint_b if mint_b else WSOL_MINT
         m1 = m1 if isinstance(m1, Pubkey) else Pubkey.from_string(m1)
@@ -388,25 +411,14 @@ class DLMMCore:
 
         candidates: list[Pubkey] = []
 
-        preset_pks: list[Pubkey] = []
-        for idx in range(max_preset_index):
-            seed_idx = idx.to_bytes(2, "little")
-            pk, _ = Pubkey.find_program_address(
-                [PRESET2_TAG, seed_idx],
-                DLMM_PROGRAM_ID,
-            )
-            preset_pks.append(pk)
-
-        preset_pks = list(await _gather_exists(self.client, preset_pks))
-
-        for preset in preset_pks:
-            pool, _ = Pubkey.find_program_address(
+        for preset in await self._live_presets(max_preset_index):
+            pool, _ = find_program_address(
                 [preset.__bytes__(), t0.__bytes__(), t1.__bytes__()],
                 DLMM_PROGRAM_ID,
             )
             candidates.append(pool)
 
-        pool_ilm, _ = Pubkey.find_program_address(
+        pool_ilm, _ = find_program_address(
             [ILM_BASE_KEY.__bytes__(), t0.__bytes__(), t1.__bytes__()],
             DLMM_PROGRAM_ID,
         )
@@ -415,23 +427,43 @@ class DLMMCore:
         BIN_STEPS = (1, 5, 10, 20, 25, 50, 100, 200, 400)
         for bs in BIN_STEPS:
             bs_bytes = bs.to_bytes(2, "little")
-            preset, _ = Pubkey.find_program_address(
+            preset = static_pda(
                 [PRESET_TAG, bs_bytes],
                 DLMM_PROGRAM_ID,
             )
-            pool, _ = Pubkey.find_program_address(
+            pool, _ = find_program_address(
                 [preset.__bytes__(), t0.__bytes__(), t1.__bytes__()],
                 DLMM_PROGRAM_ID,
             )
             candidates.append(pool)
 
-            pool2, _ = Pubkey.find_program_address(
+            pool2, _ = find_program_address(
                 [t0.__bytes__(), t1.__bytes__(), bs_bytes],
                 DLMM_PROGRAM_ID,
             )
             candidates.append(pool2)
 
-        existing = await _gather_exists(self.client, candidates)
+        return candidates
+
+    async def find_dlmm_pools_by_mint(
+        self,
+        mint_a: str | Pubkey,
+        mint_b: str | Pubkey | None = None,
+        max_preset_index: int = 256,
+        prefetched: dict | None = None
+    ) -> list[str]:
+        """
+        Return every live DLMM LbPair that trades (mint_a, mint_b).
+        If mint_b is None the second side defaults to wSOL.
+        `prefetched` is a {Pubkey: account | None} map from a batched getMultipleAccounts;
+        when it covers every candidate no extra RPC call is made.
+        """
+        candidates = await self.derive_pool_candidates(mint_a, mint_b, max_preset_index)
+
+        if prefetched is not None and all(pk in prefetched for pk in candidates):
+            existing = {pk for pk in candidates if prefetched[pk] is not None}
+        else:
+            existing = await _gather_exists(self.client, candidates)
 
         return [str(pk) for pk in sorted(existing, key=lambda pk: bytes(pk))]
 
@@ -1,4 +1,5 @@
 from .pump_fun import PumpFun
 from .pump_bond import *
 from .migration_source import *
-__all__ = ['PumpFun', 'check_has_migrated', 'get_associated_bonding_curve_address', 'get_bonding_curve_state', 'get_creator', 'find_migration_source', 'find_pumpswap_pools']
\ No newline at end of file
+from .migration_tracker import MigrationTracker, curve_progress
+__all__ = ['PumpFun', 'check_has_migrated', 'get_associated_bonding_curve_address', 'get_bonding_curve_state', 'parse_bonding_curve_state', 'curve_price', 'curve_creator', 'get_creator', 'find_migration_source', 'find_pumpswap_pools', 'derive_canonical_pumpswap_pool', 'MigrationTracker', 'curve_progress']
\ No newline at end of file
@@ -6,21 +6,62 @@ from solana.rpc.async_api import AsyncClient
 from solana.rpc.types import MemcmpOpts
 from solana.exceptions import SolanaRpcException
 from solana.rpc.commitment import Confirmed
+try: from ..libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
 
 PUMPSWAP_AMM_ID   = Pubkey.from_string("pAMMBay6oceH9fJKBRHGP5D4bD4sWpmSwMn52FMfXEA")
+PUMP_FUN_ID       = Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P")
+WSOL_MINT         = Pubkey.from_string("So11111111111111111111111111111111111111112")
 BASE_MINT_OFFSET  = 43
 QUOTE_MINT_OFFSET = 75
 
 RAYDIUM_POOL_INFO = "https://api-v3.raydium.io/pools/info/mint"
 
+def derive_canonical_pumpswap_pool(mint: str | Pubkey) -> Pubkey:
+    """
+    PumpSwap pool a completed pump.fun curve migrates into: index 0, created by the
+    pump.fun pool-authority PDA of the mint, quoted in wSOL.
+    """
+    mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
+    pool_authority = find_program_address([b"pool-authority", bytes(mint)], PUMP_FUN_ID)[0]
+    return find_program_address(
+        [b"pool", (0).to_bytes(2, "little"), bytes(pool_authority), bytes(mint), bytes(WSOL_MINT)],
+        PUMPSWAP_AMM_ID,
+    )[0]
+
 async def find_pumpswap_pools(
     client: AsyncClient,
     base_mint: str,
     quote_mint: Optional[str] = None,
+    index=None,
+    prefetched: Optional[dict] = None,
+    derive: bool = True,
 ) -> List[Dict[str, Any]]:
     try:
-        """On-chain lookup of PumpSwapAMM pools for base (and optional quote)."""
+        """On-chain lookup of PumpSwapAMM pools for base (and optional quote).
+        With a warm PoolIndex the lookup is answered locally and "account" is None.
+        With `derive` the canonical migration pool is read first (from `prefetched` when it holds it)
+        and the getProgramAccounts scan only runs when it does not exist."""
         base_pk = Pubkey.from_string(base_mint) if isinstance(base_mint, str) else base_mint
+        if index is not None:
+            # with a quote mint, walk the pools of the rarer side: WSOL alone holds most PumpSwap pools
+            indexed = (index.lookup_pair("pumpswap", base_pk, quote_mint) if quote_mint
+                       else index.lookup("pumpswap", base_pk))
+            if indexed is not None:
+                out = []
+                for pool in indexed:
+                    base, quote = index.pool_mints("pumpswap", pool)
+                    if base == str(base_pk) and (not quote_mint or quote == str(quote_mint)):
+                        out.append({"pubkey": pool, "account": None})
+                return out
+        if derive and base_pk != WSOL_MINT and (not quote_mint or str(quote_mint) == str(WSOL_MINT)):
+            canonical = derive_canonical_pumpswap_pool(base_pk)
+            if prefetched is not None and canonical in prefetched:
+                acc = prefetched[canonical]
+            else:
+                acc = (await client.get_account_info(canonical, commitment=Confirmed)).value
+            if acc is not None and acc.owner == PUMPSWAP_AMM_ID:
+                return [{"pubkey": str(canonical), "account": acc}]
         filters = [MemcmpOpts(offset=BASE_MINT_OFFSET, bytes=str(base_pk))]
         if quote_mint:
             quote_pk = Pubkey.from_string(quote_mint) if isinstance(quote_mint, str) else quote_mint
@@ -56,19 +97,25 @@ async def find_migration_source(
     ctx: AsyncClient,
     base_mint: str,
     quote_mint: Optional[str] = None,
+    index=None,
+    prefetched: Optional[dict] = None,
+    session: Optional[aiohttp.ClientSession] = None,
 ) -> Dict[str, Any]:
     """
     1) Try PumpSwap on-chain.
     2) If it finds at least one pool, return that.
-    3) Otherwise fall back to Raydium HTTP.
+    3) Otherwise fall back to Raydium HTTP, on `session` when given.
     """
-    ps_pools = await find_pumpswap_pools(ctx, base_mint, quote_mint)
+    ps_pools = await find_pumpswap_pools(ctx, base_mint, quote_mint, index=index, prefetched=prefetched)
 
     if ps_pools:
         return {"source": "pumpswap", "result": ps_pools}
 
-    async with aiohttp.ClientSession() as session:
+    if session is not None and not session.closed:
         ry = await find_raydium_pools(session, base_mint)
+    else:
+        async with aiohttp.ClientSession() as session:
+            ry = await find_raydium_pools(session, base_mint)
 
     data = ry.get("data", {})
     if data.get("count", 0) > 0:
@@ -0,0 +1,222 @@
+import asyncio, logging, time
+from collections import OrderedDict
+from solders.pubkey import Pubkey # type: ignore
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.commitment import Processed
+try: from ..libutils._common import SUPPORTED_DEXES
+except: from libutils._common import SUPPORTED_DEXES
+from .pump_bond import parse_bonding_curve_state, get_associated_bonding_curve_address
+from .migration_source import derive_canonical_pumpswap_pool, PUMPSWAP_AMM_ID
+
+COMPLETE_SOL_RESERVES = 85_000_000_000  # lamports in real_sol_reserves when a curve completes (~85 SOL)
+WATCH_PROGRESS = 0.85   # curves at or above this progress are watched
+HOT_PROGRESS = 0.97     # any watched curve above this switches the poll to `fast_interval`
+POLL_INTERVAL = 2.0
+FAST_INTERVAL = 0.4
+PENDING_TTL = 120.0     # seconds a completed curve waits for its PumpSwap pool before it is dropped
+IDLE_TTL = 30 * 60      # seconds a watched curve may sit without completing
+MAX_WATCHED = 512
+MAX_MIGRATED = 10_000
+
+def curve_progress(bc_state) -> float:
+    """
+    Bonding curve progress in [0, 1] from real_sol_reserves, 1.0 once the curve is complete.
+    """
+    if bc_state is None:
+        return 0.0
+    if bc_state.complete:
+        return 1.0
+    return min(1.0, bc_state.real_sol_reserves / COMPLETE_SOL_RESERVES)
+
+class MigrationTracker:
+    def __init__(
+        self,
+        client: AsyncClient,
+        route_cache,
+        watch_progress: float = WATCH_PROGRESS,
+        hot_progress: float = HOT_PROGRESS,
+        interval: float = POLL_INTERVAL,
+        fast_interval: float = FAST_INTERVAL,
+        max_watched: int = MAX_WATCHED,
+    ):
+        """
+        Watches pump.fun curves close to completion and moves their cached route to the canonical PumpSwap
+        pool as soon as `complete` flips, so a trade at migration time never runs find_migration_source.
+        Watched curves and their pre-derived pools are polled together with batched getMultipleAccounts;
+        the poll starts with the first watched curve and stops when none is left.
+
+        Args:
+            client: AsyncClient
+            route_cache: RouteCache <- flipped from PumpFun to PumpSwap on migration
+            watch_progress: float <- curve progress (real_sol_reserves) from which a curve is watched
+            hot_progress: float <- progress from which the poll runs every `fast_interval`
+            interval: float <- seconds between polls
+            fast_interval: float <- seconds between polls while a curve is about to complete
+            max_watched: int <- watched curves, least recently seen dropped first
+        """
+        self.client = client
+        self.route_cache = route_cache
+        self.watch_progress = watch_progress
+        self.hot_progress = hot_progress
+        self.interval = interval
+        self.fast_interval = fast_interval
+        self.max_watched = max_watched
+
+        self._watched: OrderedDict[str, dict] = OrderedDict()  # mint -> {curve, pool, progress, seen, completed_at}
+        self._migrated: OrderedDict[str, str] = OrderedDict()  # mint -> PumpSwap pool
+        self._task: asyncio.Task | None = None
+        self.stats = {"watched": 0, "polls": 0, "flipped": 0, "expired": 0, "redirects": 0, "errors": 0}
+
+    def __len__(self):
+        return len(self._watched)
+
+    def migrated_pool(self, mint: str) -> str | None:
+        """
+        PumpSwap pool a tracked curve migrated into, None when the tracker has not seen it migrate.
+        """
+        pool = self._migrated.get(str(mint))
+        if pool is not None:
+            self._migrated.move_to_end(str(mint))
+        return pool
+
+    def redirect(self, mint, dex: str, pool):
+        """
+        (dex, pool) to trade on: a PumpFun route of a curve that migrated is swapped for its PumpSwap pool.
+        """
+        if dex != SUPPORTED_DEXES["PumpFun"]:
+            return dex, pool
+        migrated = self.migrated_pool(mint)
+        if migrated is None:
+            return dex, pool
+        self.stats["redirects"] += 1
+        return SUPPORTED_DEXES["PumpSwap"], migrated
+
+    def observe(self, mint: str, bc_state) -> bool:
+        """
+        Feed a decoded curve of `mint`. Curves past `watch_progress` are watched, with their destination pool
+        derived right away; a completed one is kept until its pool shows up.
+        Returns:
+            bool: True when the curve is watched
+        """
+        mint = str(mint)
+        if bc_state is None or mint in self._migrated:
+            return False
+        progress = curve_progress(bc_state)
+        entry = self._watched.get(mint)
+        if entry is None:
+            if progress < self.watch_progress:
+                return False
+            mint_pk = Pubkey.from_string(mint)
+            entry = self._watched[mint] = {
+                "curve": get_associated_bonding_curve_address(mint_pk)[0],
+                "pool": derive_canonical_pumpswap_pool(mint_pk),
+                "progress": progress,
+                "completed_at": None,
+            }
+            self.stats["watched"] += 1
+            while len(self._watched) > self.max_watched:
+                self._watched.popitem(last=False)
+        entry["progress"] = progress
+        entry["seen"] = time.monotonic()
+        if bc_state.complete and entry["completed_at"] is None:
+            entry["completed_at"] = time.monotonic()
+        self._watched.move_to_end(mint)
+        self._ensure_running()
+        return True
+
+    def mark_migrated(self, mint: str, pool: str):
+        """
+        Record a PumpSwap pool found for a completed curve outside the tracker (find_migration_source).
+        """
+        self._flip(str(mint), str(pool))
+
+    def _flip(self, mint: str, pool: str):
+        self._watched.pop(mint, None)
+        self._migrated[mint] = pool
+        self._migrated.move_to_end(mint)
+        while len(self._migrated) > MAX_MIGRATED:
+            self._migrated.popitem(last=False)
+        self.route_cache.invalidate(mint, SUPPORTED_DEXES["PumpFun"])
+        self.route_cache.put(mint, SUPPORTED_DEXES["PumpSwap"], pool)
+        self.stats["flipped"] += 1
+        logging.info(f"MigrationTracker | {mint} migrated -> PumpSwap {pool}")
+
+    def _ensure_running(self):
+        if self._task is not None and not self._task.done():
+            return
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        self._task = asyncio.create_task(self._run(), name="pump_migration_tracker")
+
+    async def poll(self):
+        """
+        One pass over the watched curves: read every curve and pre-derived pool, flip the completed ones
+        whose pool exists and drop the ones that went stale.
+        """
+        mints = list(self._watched)
+        accounts = []
+        for mint in mints:
+            entry = self._watched[mint]
+            accounts += [entry["curve"], entry["pool"]]
+        chunks = [accounts[i : i + 100] for i in range(0, len(accounts), 100)]
+        resps = await asyncio.gather(*(self.client.get_multiple_accounts(c, commitment=Processed) for c in chunks))
+        found = {}
+        for c, resp in zip(chunks, resps):
+            found.update(zip(c, resp.value))
+        self.stats["polls"] += 1
+
+        now = time.monotonic()
+        for mint in mints:
+            entry = self._watched.get(mint)
+            if entry is None:
+                continue
+            pool_acc = found.get(entry["pool"])
+            if pool_acc is not None and pool_acc.owner == PUMPSWAP_AMM_ID:
+                # the migration creates the pool in the same transaction that completes the curve
+                self._flip(mint, str(entry["pool"]))
+                continue
+            curve_acc = found.get(entry["curve"])
+            bc_state = parse_bonding_curve_state(curve_acc.data) if curve_acc is not None else None
+            if bc_state is not None:
+                progress = curve_progress(bc_state)
+                if progress > entry["progress"]:
+                    entry["seen"] = now
+                entry["progress"] = progress
+                if bc_state.complete and entry["completed_at"] is None:
+                    entry["completed_at"] = now
+                    self.route_cache.invalidate(mint, SUPPORTED_DEXES["PumpFun"])
+            if entry["completed_at"] is not None:
+                expired = now - entry["completed_at"] > PENDING_TTL
+            else:
+                expired = bc_state is None or now - entry["seen"] > IDLE_TTL
+            if expired:
+                self._watched.pop(mint, None)
+                self.stats["expired"] += 1
+
+    async def _run(self):
+        while self._watched:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.stats["errors"] += 1
+                logging.error(f"MigrationTracker | Poll failed: {e}")
+            hot = any(e["progress"] >= self.hot_progress for e in self._watched.values())
+            await asyncio.sleep(self.fast_interval if hot else self.interval)
+
+    def snapshot(self) -> dict:
+        return {
+            "watching": len(self._watched),
+            "migrated": len(self._migrated),
+            "running": self._task is not None and not self._task.done(),
+            **self.stats,
+        }
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
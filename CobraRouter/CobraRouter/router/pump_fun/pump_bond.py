@@ -4,6 +4,8 @@ from typing import Final
 import struct
 from solana.rpc.async_api import AsyncClient
 from solders.pubkey import Pubkey # type: ignore
+try: from ..libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
 from solana.rpc.commitment import Processed
 
 DISCRIMINATOR: Final[bytes] = struct.pack("<Q", 6966180631402821399)
@@ -24,7 +26,7 @@ class BondingCurveState:
 
 def get_associated_bonding_curve_address(mint: Pubkey, program_id: Pubkey = Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P")) -> tuple[Pubkey, int]:
     # by derive
-    return Pubkey.find_program_address(
+    return find_program_address(
         [
             b"bonding-curve",
             bytes(mint)
@@ -32,16 +34,35 @@ def get_associated_bonding_curve_address(mint: Pubkey, program_id: Pubkey = Pubk
         program_id
     )
 
+def parse_bonding_curve_state(data: bytes) -> BondingCurveState | None:
+    try:
+        data = bytes(data)
+        if data[:8] != DISCRIMINATOR:
+            raise ValueError("Invalid curve state discriminator")
+        return BondingCurveState(data)
+    except Exception as e:
+        return None
+
+def curve_price(bc_state: BondingCurveState):
+    """
+    SOL price of one token from the virtual reserves, "migrated" once they are drained.
+    """
+    vtr = bc_state.virtual_token_reserves / 1e6
+    vsr = bc_state.virtual_sol_reserves / 1e9
+    if vsr == 0 or vtr == 0:
+        return "migrated"
+    return vsr / vtr
+
+def curve_creator(bc_state: BondingCurveState) -> str:
+    return base58.b58encode(bc_state.creator).decode("utf-8")
+
 async def get_bonding_curve_state(conn: AsyncClient, curve_address: Pubkey) -> BondingCurveState:
     try:
         response = await conn.get_account_info(curve_address, commitment=Processed)
         if not response.value or not response.value.data:
             raise ValueError("Invalid curve state: No data")
 
-        data = response.value.data
-        if data[:8] != DISCRIMINATOR:
-            raise ValueError("Invalid curve state discriminator")
-        return BondingCurveState(data)
+        return parse_bonding_curve_state(response.value.data)
     except Exception as e:  
         return None
     
@@ -52,8 +73,7 @@ async def get_creator(conn: AsyncClient, bonding_curve: str):
     )
     if bc_state is None:
         return False
-    creator = bc_state.creator
-    return base58.b58encode(creator).decode("utf-8")
+    return curve_creator(bc_state)
 
 async def check_has_migrated(ac: AsyncClient, bc: Pubkey) -> bool:
     bc_state = await get_bonding_curve_state(
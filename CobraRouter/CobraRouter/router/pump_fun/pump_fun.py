@@ -2,6 +2,12 @@ from decimal import Decimal
 from solders.transaction import VersionedTransaction # type: ignore
 from solders.keypair import Keypair # type: ignore
 from solders.pubkey import Pubkey as Pubkey # type: ignore
+try: from ..libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
+try: from ..libutils.account_cache import accounts_of, RESERVES
+except: from libutils.account_cache import accounts_of, RESERVES
+try: from ..libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.types import TxOpts
 from solders.instruction import AccountMeta, Instruction # type: ignore
@@ -23,8 +29,11 @@ from construct import Struct as cStruct, Byte, Int16ul, Int64ul, Bytes
 from solana.rpc.commitment import Processed, Confirmed # type: ignore
 from solders.message    import MessageV0 # type: ignore
 from spl.token.instructions import close_account, CloseAccountParams, get_associated_token_address
+try: from ..libutils.deadline import deadline_sleep
+except: from libutils.deadline import deadline_sleep
 
 PUMP_FUN = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+PUMP_FUN_PROGRAM_ID = Pubkey.from_string(PUMP_FUN)
 GLOBAL_VOLUME_ACCUMULATOR = "Hq2wp8uJ9jCPsYgNHex8RtqdvMPfVGoYwjvF1ATiwn2Y"
 FEE_CONFIG = "8Wf5TiAheLUqBrKXeYg2JtAFFMWtKdG2BSFgqUcPVwTt"
 FEE_PROGRAM = "pfeeUxB6jkeY1Hxd7CsFCAjcbHA9rWtchMGdZ6VojVZ"
@@ -120,17 +129,17 @@ class PumpFun:
         self.async_client = async_client
 
     def _derive_uva_pda(self, payer: Pubkey):
-        user_acc, _ = Pubkey.find_program_address(
-            [b"user_volume_accumulator", bytes(payer)], Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P")
+        user_acc, _ = find_program_address(
+            [b"user_volume_accumulator", bytes(payer)], PUMP_FUN_PROGRAM_ID
         )
         return user_acc
 
     async def _mint_owner(self, mint: Pubkey) -> Pubkey:
         try:
-            info = await self.async_client.get_account_info(mint, commitment=Confirmed)
-            if info.value is None:
+            info = await mints_of(self.async_client).get(mint)
+            if info is None:
                 raise RuntimeError("mint account missing")
-            return info.value.owner
+            return info.token_program
         except Exception as e:
             traceback.print_exc()
             logging.info(f"Failed to get token program id: {e}")
@@ -152,12 +161,12 @@ class PumpFun:
         """
         pool = Pubkey.from_string(pool)
 
-        resp = await self.async_client.get_account_info_json_parsed(pool, commitment=Processed)
-        if not resp or not resp.value or not resp.value.data:
+        acc = await accounts_of(self.async_client).get(pool, RESERVES)
+        if acc is None or not acc.data:
             return "NotOnPumpFun", None
 
         pool_type = NEW_POOL_TYPE
-        raw_data = resp.value.data
+        raw_data = acc.data
         try:
             parsed = PumpFunNewPoolState.parse(raw_data[8:])
         except Exception as e:
@@ -246,7 +255,7 @@ class PumpFun:
             AccountMeta(pubkey=Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"), is_signer=False, is_writable=False), # tokenProgram
             AccountMeta(pubkey=Pubkey.from_string(str(vault)), is_signer=False, is_writable=True), # vault
             AccountMeta(pubkey=Pubkey.from_string("Ce6TQqeHC9p8KetsN6JsjHK7UTZk7nasjjnr7XxXp9F1"), is_signer=False, is_writable=False), # eventAuthority
-            AccountMeta(pubkey=Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"), is_signer=False, is_writable=False),   # program
+            AccountMeta(pubkey=PUMP_FUN_PROGRAM_ID, is_signer=False, is_writable=False),   # program
             AccountMeta(pubkey=Pubkey.from_string(GLOBAL_VOLUME_ACCUMULATOR), is_signer=False, is_writable=True), # globalVolumeAccumulator
             AccountMeta(pubkey=self._derive_uva_pda(buyer), is_signer=False, is_writable=True), # userVolumeAccumulator
             AccountMeta(pubkey=Pubkey.from_string(FEE_CONFIG), is_signer=False, is_writable=False), # feeConfig
@@ -254,7 +263,7 @@ class PumpFun:
         ]
 
         return Instruction(
-            program_id=Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"),
+            program_id=PUMP_FUN_PROGRAM_ID,
             accounts=accounts,
             data=instruction_data
         )
@@ -297,13 +306,13 @@ class PumpFun:
             AccountMeta(pubkey=Pubkey.from_string(str(vault)), is_signer=False, is_writable=True),  # vault
             AccountMeta(pubkey=Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"), is_signer=False, is_writable=False), # tokenProgram
             AccountMeta(pubkey=Pubkey.from_string("Ce6TQqeHC9p8KetsN6JsjHK7UTZk7nasjjnr7XxXp9F1"), is_signer=False, is_writable=False),  # eventAuthority
-            AccountMeta(pubkey=Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"), is_signer=False, is_writable=False),    # program
+            AccountMeta(pubkey=PUMP_FUN_PROGRAM_ID, is_signer=False, is_writable=False),    # program
             AccountMeta(pubkey=Pubkey.from_string(FEE_CONFIG), is_signer=False, is_writable=False), # feeConfig
             AccountMeta(pubkey=Pubkey.from_string(FEE_PROGRAM), is_signer=False, is_writable=False), # feeProgram
         ]
 
         return Instruction(
-            program_id=Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"),
+            program_id=PUMP_FUN_PROGRAM_ID,
             accounts=accounts,
             data=instruction_data
         )
@@ -348,9 +357,9 @@ class PumpFun:
         return instructions
 
     def get_creator_vault(self, creator):
-        creator_vault_pda, _ = Pubkey.find_program_address(
+        creator_vault_pda, _ = find_program_address(
             [b"creator-vault", bytes(Pubkey.from_string(creator))],
-            Pubkey.from_string(PUMP_FUN)
+            PUMP_FUN_PROGRAM_ID
         )
         return creator_vault_pda
 
@@ -557,7 +566,7 @@ class PumpFun:
                         result = data['result']
                         return result
 
-                await asyncio.sleep(0.5)
+                await deadline_sleep(0.5)
                 attempt += 1
         except Exception as e:
             logging.error(f"Error: {e}")
@@ -14,6 +14,8 @@ from enum import Enum
 from typing import Optional, Tuple
 
 from solana.rpc.commitment import Processed
+try: from ...libutils.account_cache import accounts_of, STATIC
+except: from libutils.account_cache import accounts_of, STATIC
 from solders.instruction import AccountMeta, Instruction  # type: ignore
 from solders.pubkey import Pubkey  # type: ignore
 from construct import (
@@ -150,12 +152,12 @@ class RaydiumCore:
     
         try:
             pool_id = pool_address
-            account_info = await self.async_client.get_account_info_json_parsed(pool_id, commitment=Processed)
-            pool_data = account_info.value.data
+            account = await accounts_of(self.async_client).get(pool_id, STATIC)
+            pool_data = account.data
             decoded_pool = AMM_SCHEME.parse(pool_data)
             market_id = Pubkey.from_bytes(decoded_pool.serum_market)
-            market_info = await self.async_client.get_account_info_json_parsed(market_id, commitment=Processed)
-            decoded_market = MARKET_SCHEME.parse(market_info.value.data)
+            market = await accounts_of(self.async_client).get(market_id, STATIC)
+            decoded_market = MARKET_SCHEME.parse(market.data)
             vault_nonce = decoded_market.vault_signer_nonce
             
             ray_auth = Pubkey.from_string("5Q544fKrFoe6tsEbD7S8EmxGTJYAKtTVhAW5Q5pge4j1")
@@ -34,6 +34,8 @@ try: from v4_amm_api import fetch_pool_info
 except: from .v4_amm_api import fetch_pool_info
 
 from solana.rpc.async_api import AsyncClient
+try: from ...libutils.deadline import deadline_sleep, DeadlineExceeded
+except: from libutils.deadline import deadline_sleep, DeadlineExceeded
 
 logging.basicConfig(level=logging.INFO)
 
@@ -110,7 +112,7 @@ class RaydiumSwap:
                     return False
             except Exception:
                 attempt += 1
-                await asyncio.sleep(retry_delay)
+                await deadline_sleep(retry_delay)
         logging.info("Max attempts reached. Transaction confirmation failed.")
         return None
 
@@ -132,18 +134,27 @@ class RaydiumSwap:
             traceback.print_exc()
             return None
 
-    async def execute_buy_async(self, mint_address: str = "", sol_amount: float = 0.0001, slippage_percentage: int = 5, fee: int = 1000000, pool = None, keypair: Keypair = None, return_instructions: bool = False) -> bool:
-        try:
+    async def _lookup_pool_key(self, mint_address: str, attempts: int = 3, delay: float = 3) -> Optional[str]:
+        """
+        Pool id of a mint from the Raydium API, retried `attempts` times, `delay` seconds apart
+        (never past the current deadline).
+        """
+        for attempt in range(attempts):
             try:
-                if not pool:
-                    pool_info = fetch_pool_info(mint_address) # TODO: fix this shi, change to what we use in cpmm
-                    pool_key = pool_info["data"]["data"][0]["id"]
-                else:
-                    pool_key = pool
+                pool_info = fetch_pool_info(mint_address) # TODO: fix this shi, change to what we use in cpmm
+                return pool_info["data"]["data"][0]["id"]
             except IndexError:
-                logging.info(f"Pool key could not be found for {mint_address}. Trying again...")
-                await asyncio.sleep(3)
-                return await self.execute_buy_async(mint_address, sol_amount, slippage_percentage, fee)
+                if attempt + 1 < attempts:
+                    logging.info(f"Pool key could not be found for {mint_address}. Trying again...")
+                    await deadline_sleep(delay, "AMM v4 pool lookup")
+        logging.info(f"Pool key could not be found for {mint_address}.")
+        return None
+
+    async def execute_buy_async(self, mint_address: str = "", sol_amount: float = 0.0001, slippage_percentage: int = 5, fee: int = 1000000, pool = None, keypair: Keypair = None, return_instructions: bool = False) -> bool:
+        try:
+            pool_key = pool if pool else await self._lookup_pool_key(mint_address)
+            if pool_key is None:
+                return False
 
             sol_lamports = int(sol_amount * SOL_DECIMALS)
             keys = await self.raydium_core.async_fetch_pool_keys(pool_key)
@@ -254,23 +265,22 @@ class RaydiumSwap:
             logging.info("Transaction successful!" if confirmed else "Transaction failed.")
             return (confirmed, txn_signature.value)
 
+        except DeadlineExceeded:
+            raise
         except Exception as err:
             logging.info("Error occurred during transaction:", err)
             traceback.print_exc()
             return False
 
-    async def execute_sell_async(self, mint_address: str, keypair: Keypair, sell_pct: int = 100, slippage_percentage: int = 5, fee: int = 1000000, return_instructions: bool = False) -> bool:
+    async def execute_sell_async(self, mint_address: str, keypair: Keypair, sell_pct: float = 100, slippage_percentage: int = 5, fee: int = 1000000, return_instructions: bool = False) -> bool:
         try:
-            if not (1 <= sell_pct <= 100):
+            # fractional: the legs of a split sell are exact shares of the balance
+            if not (0 < sell_pct <= 100):
                 return False
 
-            try:
-                pool_info = fetch_pool_info(mint_address)
-                pool_key = pool_info["data"]["data"][0]["id"]
-            except IndexError:
-                logging.info(f"Pool key could not be found for {mint_address}. Trying again...")
-                await asyncio.sleep(3)
-                return await self.execute_sell_async(mint_address, sell_pct, slippage_percentage, fee)
+            pool_key = await self._lookup_pool_key(mint_address)
+            if pool_key is None:
+                return False
 
             keys = await self.raydium_core.async_fetch_pool_keys(pool_key)
             if keys is None:
@@ -373,6 +383,8 @@ class RaydiumSwap:
             logging.info("Transaction successful!" if confirmed else "Transaction failed.")
             return (confirmed, txn_signature.value)
 
+        except DeadlineExceeded:
+            raise
         except Exception as err:
             logging.info(f"Error occurred during transaction: {err}")
             return False
@@ -6,6 +6,12 @@ from typing import Optional, Tuple
 
 from asyncpg.pool import logging
 from solders.pubkey import Pubkey # type: ignore
+try: from ...libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
+try: from ...libutils.account_cache import accounts_of, STATIC, RESERVES
+except: from libutils.account_cache import accounts_of, STATIC, RESERVES
+try: from ...libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 from solders.system_program import ID as SYS_PROGRAM_ID
 from solders.instruction import Instruction, AccountMeta # type: ignore
 from solana.rpc.async_api import AsyncClient
@@ -86,7 +92,7 @@ class ClmmCore:
 
         for cfg in _AMM_CONFIGS:
             seeds = [_POOL_SEED, bytes(cfg), bytes(mints_ordered[0]), bytes(mints_ordered[1])]
-            pool, _bump = Pubkey.find_program_address(seeds, CLMM_PROGRAM_ID)
+            pool, _bump = find_program_address(seeds, CLMM_PROGRAM_ID)
             if await self._pool_exists(pool):
                 return pool
         return None
@@ -95,11 +101,11 @@ class ClmmCore:
         """
         Fetch the raw 'liquidity' (u128) field from the on-chain pool account.
         """
-        acc = await self.client.get_account_info(pool_id, commitment="confirmed")
-        if acc.value is None:
+        acc = await accounts_of(self.client).get(pool_id, RESERVES)
+        if acc is None:
             raise RuntimeError(f"Pool {pool_id} not found")
 
-        data = acc.value.data
+        data = acc.data
         if isinstance(data, str):
             import base64
             data = base64.b64decode(data)
@@ -107,15 +113,13 @@ class ClmmCore:
         liq = int.from_bytes(data[237:253], "little", signed=False)
         return liq
 
-    async def find_pool_by_mint_with_min_liquidity(
+    def derive_pool_candidates(
         self,
         mint_a: Pubkey | str,
         mint_b: Pubkey | str | None = None,
-        min_liquidity: int = 0,
-    ) -> Pubkey | None:
+    ) -> list[Pubkey]:
         """
-        Like find_pool_by_mint, but only returns the first pool whose 
-        on-chain liquidity >= min_liquidity.
+        Pool PDA for (mint_a, mint_b) under every known AMM config, in _AMM_CONFIGS order.
         """
         mint_a = mint_a if isinstance(mint_a, Pubkey) else Pubkey.from_string(mint_a)
         mint_b = (
@@ -126,13 +130,37 @@ class ClmmCore:
         # order lexically, as Raydium seeds them
         m0, m1 = sorted([mint_a, mint_b], key=lambda pk: bytes(pk))
 
+        pools = []
         for cfg in _AMM_CONFIGS:
-            seeds = [b"pool", bytes(cfg), bytes(m0), bytes(m1)]
-            pool, _bump = Pubkey.find_program_address(seeds, CLMM_PROGRAM_ID)
-            if not await self._pool_exists(pool):
-                continue
+            seeds = [_POOL_SEED, bytes(cfg), bytes(m0), bytes(m1)]
+            pool, _bump = find_program_address(seeds, CLMM_PROGRAM_ID)
+            pools.append(pool)
+        return pools
+
+    async def find_pool_by_mint_with_min_liquidity(
+        self,
+        mint_a: Pubkey | str,
+        mint_b: Pubkey | str | None = None,
+        min_liquidity: int = 0,
+        prefetched: dict | None = None,
+    ) -> Pubkey | None:
+        """
+        Like find_pool_by_mint, but only returns the first pool whose 
+        on-chain liquidity >= min_liquidity.
+        `prefetched` is a {Pubkey: account | None} map from a batched getMultipleAccounts;
+        pools found in it are not read again.
+        """
+        for pool in self.derive_pool_candidates(mint_a, mint_b):
+            if prefetched is not None and pool in prefetched:
+                acc = prefetched[pool]
+                if acc is None:
+                    continue
+                liq = int.from_bytes(bytes(acc.data)[237:253], "little", signed=False)
+            else:
+                if not await self._pool_exists(pool):
+                    continue
+                liq = await self.async_fetch_pool_liquidity(pool)
 
-            liq = await self.async_fetch_pool_liquidity(pool)
             if liq >= min_liquidity:
                 return pool
 
@@ -140,10 +168,10 @@ class ClmmCore:
 
     async def async_fetch_pool_keys(self, pool_id: Pubkey) -> Optional[ClmmPoolKeys]:
         """Very light decode"""
-        acc = await self.client.get_account_info(pool_id, commitment="confirmed")
-        if acc.value is None:
+        acc = await accounts_of(self.client).get(pool_id, STATIC)
+        if acc is None:
             return None
-        data = acc.value.data
+        data = acc.data
         if isinstance(data, str):
             import base64
             data = base64.b64decode(data)
@@ -168,14 +196,11 @@ class ClmmCore:
     async def get_decimals(self, mint: str | Pubkey) -> int:
         try:
             mint = Pubkey.from_string(mint) if isinstance(mint, str) else mint
-            mint_info = await self.client.get_account_info_json_parsed(
-                mint,
-                commitment=Processed
-            )
+            mint_info = await mints_of(self.client).get(mint)
             if not mint_info:
                 logging.info("Error: Failed to fetch mint info (tried to fetch token decimals).")
                 return None
-            dec_base = mint_info.value.data.parsed['info']['decimals']
+            dec_base = mint_info.decimals
             return int(dec_base)
         except Exception as e:
             logging.error(f"Error getting decimals for mint: {e}")
@@ -216,16 +241,21 @@ class ClmmCore:
             if strict_mint and Pubkey.from_string(str(strict_mint)) != token_mint:
                 raise ValueError("requested mint is not the pool’s non-SOL token")
 
-            res_a, res_b = await self.async_get_pool_reserves(keys)
+            (res_a, res_b), (sqrt_price_x64, dec_a, dec_b) = await asyncio.gather(
+                self.async_get_pool_reserves(keys), self.async_fetch_pool_sqrt_price(pool_pk)
+            )
 
             sol_reserve, token_reserve = (res_a, res_b) if sol_is_a else (res_b, res_a)
 
-            if sol_reserve == 0 or token_reserve == 0:
-                raise ValueError("zero vault balance – cannot price")
+            if sqrt_price_x64 == 0:
+                raise ValueError("zero sqrt price – cannot price")
 
-            token_dec = await self.get_decimals(token_mint)
-            scale = 10 ** (token_dec - 9)
-            sol_per_token  = sol_reserve / token_reserve
+            # vault balances are not the curve of a concentrated pool: price from sqrt_price_x64 (mint_b per mint_a, raw units)
+            price_raw = (sqrt_price_x64 / (1 << 64)) ** 2
+            if sol_is_a:
+                sol_per_token = 1 / price_raw * 10 ** (dec_b - dec_a)
+            else:
+                sol_per_token = price_raw * 10 ** (dec_a - dec_b)
 
             return {
                 "pool":          str(pool_pk),
@@ -239,12 +269,25 @@ class ClmmCore:
             traceback.print_exc()
             return None
 
+    async def async_fetch_pool_sqrt_price(self, pool_id: Pubkey) -> tuple[int, int, int]:
+        """
+        Returns:
+            tuple: (sqrt_price_x64, mint_decimals_0, mint_decimals_1) from the pool account
+        """
+        acc = await accounts_of(self.client).get(pool_id, RESERVES)
+        if acc is None:
+            raise RuntimeError("Pool account not found")
+
+        data = bytes(acc.data)
+        sqrt_price_x64 = int.from_bytes(data[253:269], "little", signed=False)
+        return sqrt_price_x64, data[233], data[234]
+
     async def async_fetch_pool_tickinfo(self, pool_id: Pubkey) -> tuple[int, int]:
-        acc = await self.client.get_account_info(pool_id, commitment="confirmed")
-        if acc.value is None:
+        acc = await accounts_of(self.client).get(pool_id, RESERVES)
+        if acc is None:
             raise RuntimeError("Pool account not found")
 
-        data = acc.value.data
+        data = acc.data
         if isinstance(data, str):
             import base64
             data = base64.b64decode(data)
@@ -264,7 +307,7 @@ class ClmmCore:
             )
         """
         seed_tag = b"pool_tick_array_bitmap_extension"
-        pda, _ = Pubkey.find_program_address(
+        pda, _ = find_program_address(
             [seed_tag, bytes(pool_id)],
             CLMM_PROGRAM_ID,
         )
@@ -26,6 +26,10 @@ except: from clmm_core import ClmmCore, CLMM_PROGRAM_ID, WSOL_MINT, TOKEN_PROGRA
 try: from .ticks import RaydiumFuckingTicks;
 except: from ticks import RaydiumFuckingTicks;
 import logging
+try: from ...libutils.deadline import deadline_sleep
+except: from libutils.deadline import deadline_sleep
+try: from ...libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 RENT_EXEMPT   = 5039280
 ACCOUNT_SIZE  = 165
 SOL_DECIMALS  = 1e9
@@ -135,10 +139,10 @@ class RaydiumClmmSwap:
         return round(estimated_sol * impact_factor, 9)
 
     async def _mint_owner(self, mint: Pubkey) -> Pubkey:
-        info = await self.client.get_account_info(mint, commitment=Processed)
-        if info.value is None:
+        info = await mints_of(self.client).get(mint)
+        if info is None:
             raise RuntimeError("mint account missing")
-        return info.value.owner
+        return info.token_program
 
     async def _get_or_create_ata(self, owner: Pubkey, mint: Pubkey):
         token_prog = await self._mint_owner(mint)
@@ -162,7 +166,7 @@ class RaydiumClmmSwap:
                                                     max_supported_transaction_version=0)
             if res.value and res.value.transaction.meta.err is None:
                 return True
-            await asyncio.sleep(delay)
+            await deadline_sleep(delay)
         return False
 
     async def _wrap_sol_temp(
@@ -291,7 +295,7 @@ class RaydiumClmmSwap:
         self,
         token_mint: str,
         keypair: Keypair,
-        sell_pct: int = 100,
+        sell_pct: float = 100,
         slippage_pct: int = 5,
         fee_micro_lamports: int = 1_000_000,
         pool_id: Optional[str] = None,
@@ -315,14 +319,11 @@ class RaydiumClmmSwap:
         if not bal_resp.value:
             raise RuntimeError("no balance")
 
-        mint_info = await self.client.get_account_info_json_parsed(
-            Pubkey.from_string(token_mint),
-            commitment=Processed
-        )
+        mint_info = await mints_of(self.client).get(Pubkey.from_string(token_mint))
         if not mint_info:
             logging.info("Error: Failed to fetch mint info (tried to fetch token decimals).")
             return
-        dec_base = mint_info.value.data.parsed['info']['decimals']
+        dec_base = mint_info.decimals
 
         ui_bal = float(bal_resp.value[0].account.data.parsed["info"]["tokenAmount"]["uiAmount"] or 0)
         if ui_bal <= 0:
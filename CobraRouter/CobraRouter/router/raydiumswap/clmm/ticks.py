@@ -1,6 +1,8 @@
 #!/usr/bin/env python3
 import struct, asyncio
 from solders.pubkey import Pubkey # type: ignore
+try: from ...libutils.pda import find_program_address
+except: from libutils.pda import find_program_address
 try: from raydium_apiv3 import RaydiumAPI
 except: from .raydium_apiv3 import RaydiumAPI
 import logging
@@ -27,7 +29,7 @@ class RaydiumFuckingTicks:
 
     def derive_tick_array_pda(self, pool_id: Pubkey, start_tick: int) -> Pubkey:
         be = struct.pack(">i", start_tick)
-        pda, _ = Pubkey.find_program_address(
+        pda, _ = find_program_address(
             [TICK_ARRAY_SEED, bytes(pool_id), be],
             CLMM_PROGRAM_ID
         )
@@ -7,6 +7,10 @@ import solana.exceptions
 from solana.rpc.async_api import AsyncClient
 from solana.rpc.commitment import Processed
 from solders.pubkey import Pubkey # type: ignore
+try: from ...libutils.pda import find_program_address, static_pda
+except: from libutils.pda import find_program_address, static_pda
+try: from ...libutils.account_cache import accounts_of, STATIC
+except: from libutils.account_cache import accounts_of, STATIC
 from solders.instruction import Instruction, AccountMeta # type: ignore
 from solana.exceptions import SolanaRpcException
 from solana.rpc.types import (
@@ -15,6 +19,8 @@ from solana.rpc.types import (
 )
 from construct import Bytes, Int8ul, Int64ul, Struct as cStruct
 import logging
+try: from ...libutils.deadline import deadline_sleep, check, DeadlineExceeded
+except: from libutils.deadline import deadline_sleep, check, DeadlineExceeded
 
 CPMM_PROGRAM_ID = Pubkey.from_string("CPMMoo8L3F4NbTegBCKVNunggL7H1ZpdTHKxQB5qKP1C")
 WSOL_MINT        = Pubkey.from_string("So11111111111111111111111111111111111111112")
@@ -22,6 +28,7 @@ WSOL_MINT        = Pubkey.from_string("So111111111111111111111111111111111111111
 AUTH_SEED        = b"vault_and_lp_mint_auth_seed"
 POOL_VAULT_SEED  = b"pool_vault"
 OBSERVATION_SEED = b"observation"
+CPMM_AUTHORITY   = static_pda([AUTH_SEED], CPMM_PROGRAM_ID)
 SWAP_BASE_IN_DISCRIM = bytes([0x8f, 0xbe, 0x5a, 0xda, 0xc4, 0x1e, 0x33, 0xde])
 
 CPMM_POOL_LAYOUT = cStruct(
@@ -71,15 +78,16 @@ class CpmmPoolKeys:
 class RaydiumCpmmCore:
     def __init__(self, async_client):
         self.client = async_client
+        self.pool_index = None
 
     async def async_fetch_pool_keys(self, pool_id: str | Pubkey) -> Optional[CpmmPoolKeys]:
         pool_pk = pool_id if isinstance(pool_id, Pubkey) else Pubkey.from_string(pool_id)
         try:
-            acc = await self.client.get_account_info_json_parsed(pool_pk, commitment=Processed)
-            decoded = CPMM_POOL_LAYOUT.parse(acc.value.data)
+            acc = await accounts_of(self.client).get(pool_pk, STATIC)
+            decoded = CPMM_POOL_LAYOUT.parse(acc.data)
 
-            authority, _ = Pubkey.find_program_address([AUTH_SEED], CPMM_PROGRAM_ID)
-            obs_pda, _   = Pubkey.find_program_address([OBSERVATION_SEED, bytes(pool_pk)], CPMM_PROGRAM_ID)
+            authority    = CPMM_AUTHORITY
+            obs_pda, _   = find_program_address([OBSERVATION_SEED, bytes(pool_pk)], CPMM_PROGRAM_ID)
 
             return CpmmPoolKeys(
                 program_id     = CPMM_PROGRAM_ID,
@@ -127,28 +135,37 @@ class RaydiumCpmmCore:
         try:
             mint_pk = mint if isinstance(mint, Pubkey) else Pubkey.from_string(mint)
 
+            if self.pool_index is not None:
+                indexed = self.pool_index.lookup("cpmm", mint_pk)
+                if indexed is not None:
+                    return indexed[:limit]
+
             MINT_A_OFFSET = 168
             MINT_B_OFFSET = 200
 
             slice_opt = DataSliceOpts(offset=0, length=MINT_B_OFFSET + 32)  # just enough for the second mint
 
-            pools = []
-            for off in (MINT_B_OFFSET, MINT_A_OFFSET):
-                resp = await self.client.get_program_accounts(
-                    CPMM_PROGRAM_ID,
-                    commitment="finalized",
-                    encoding="base64",
-                    data_slice=slice_opt,
-                    filters=[MemcmpOpts(offset=off, bytes=str(mint_pk))]
-                )
-                if resp.value:
-                    pools.extend(str(acc.pubkey) for acc in resp.value[:limit])
-            return pools
-        except solana.exceptions.SolanaRpcException as e:
-            logging.info(f"Error in find_cpmm_pools_by_mint: We don't know the cause yet, but it's probably because the pool is not found, or the RPC is rate limited.")
-            if retry:
-                return []
-            return await self.find_cpmm_pools_by_mint(mint, limit + 1000, retry=True)
+            attempts = 1 if retry else 2
+            for attempt in range(attempts):
+                try:
+                    pools = []
+                    for off in (MINT_B_OFFSET, MINT_A_OFFSET):
+                        resp = await self.client.get_program_accounts(
+                            CPMM_PROGRAM_ID,
+                            commitment="finalized",
+                            encoding="base64",
+                            data_slice=slice_opt,
+                            filters=[MemcmpOpts(offset=off, bytes=str(mint_pk))]
+                        )
+                        if resp.value:
+                            pools.extend(str(acc.pubkey) for acc in resp.value[:limit])
+                    return pools
+                except solana.exceptions.SolanaRpcException as e:
+                    logging.info(f"Error in find_cpmm_pools_by_mint: We don't know the cause yet, but it's probably because the pool is not found, or the RPC is rate limited.")
+                    check("find_cpmm_pools_by_mint retry")
+            return []
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logging.info(f"Error in find_cpmm_pools_by_mint: {e}")
             traceback.print_exc()
@@ -199,9 +216,11 @@ class RaydiumCpmmCore:
                         break
                     else:
                         logging.info(f"❌ Insufficient liquidity (need {required_tokens:,.6f} tokens, {sol_amount} SOL)")
-                await asyncio.sleep(0.1)
+                await deadline_sleep(0.1, "find_suitable_pool")
                 
             return (best_pool, keys)
+        except DeadlineExceeded:
+            raise
         except solana.exceptions.SolanaRpcException:
             logging.info(f"Error in find_suitable_pool: We don't know the cause yet, but it's probably because the pool is not found, or the RPC is rate limited.")
             return None
@@ -24,6 +24,10 @@ import logging
 
 try: from cpmm_core import RaydiumCpmmCore, WSOL_MINT
 except: from .cpmm_core import RaydiumCpmmCore, WSOL_MINT
+try: from ...libutils.deadline import deadline_sleep
+except: from libutils.deadline import deadline_sleep
+try: from ...libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 
 RENT_EXEMPT     = 2039280
 ACCOUNT_SIZE    = 165
@@ -38,10 +42,10 @@ class RaydiumCpmmSwap:
 
     async def _mint_owner(self, mint: Pubkey) -> Pubkey:
         try:
-            info = await self.client.get_account_info(mint, commitment=Processed)
-            if info.value is None:
+            info = await mints_of(self.client).get(mint)
+            if info is None:
                 raise RuntimeError("mint account missing")
-            return info.value.owner
+            return info.token_program
         except Exception as e:
             traceback.print_exc()
             logging.info(f"Failed to get token program id: {e}")
@@ -341,7 +345,7 @@ class RaydiumCpmmSwap:
             res = await self.client.get_transaction(sig, commitment=Confirmed, max_supported_transaction_version=0)
             if res.value and res.value.transaction.meta.err is None:
                 return True
-            await asyncio.sleep(delay)
+            await deadline_sleep(delay)
         return False
 
     async def close(self):
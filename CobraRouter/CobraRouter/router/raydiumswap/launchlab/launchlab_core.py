@@ -4,16 +4,24 @@ from typing import Optional, Tuple
 import logging
 from solana.rpc.commitment import Processed, Confirmed
 from solders.pubkey import Pubkey # type: ignore
+try: from ...libutils.pda import find_program_address, static_pda
+except: from libutils.pda import find_program_address, static_pda
+try: from ...libutils.account_cache import accounts_of, RESERVES
+except: from libutils.account_cache import accounts_of, RESERVES
 from construct import Bytes, Int8ul, Int64ul, Struct as cStruct
 from solana.rpc.types import MemcmpOpts, DataSliceOpts
 import solana.exceptions
 LAUNCHPAD_PROGRAM_ID = Pubkey.from_string("LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj")
+WSOL_MINT            = Pubkey.from_string("So11111111111111111111111111111111111111112")
 
 AUTH_SEED         = b"vault_auth_seed"
 POOL_SEED        = b"pool"
 POOL_VAULT_SEED  = b"pool_vault"
 EVENT_AUTH_SEED  = b"__event_authority"
 
+LAUNCHPAD_AUTHORITY       = static_pda([AUTH_SEED], LAUNCHPAD_PROGRAM_ID)
+LAUNCHPAD_EVENT_AUTHORITY = static_pda([EVENT_AUTH_SEED], LAUNCHPAD_PROGRAM_ID)
+
 LAUNCHPAD_POOL_LAYOUT = cStruct(
     "padding"          / Bytes(8),
     "epoch"            / Int64ul,
@@ -76,10 +84,36 @@ class LaunchpadPoolKeys:
 class RaydiumLaunchpadCore:
     def __init__(self, client):
         self.client = client
+        self.pool_index = None
+
+    def derive_pool_address(self, mint_a: str | Pubkey, mint_b: str | Pubkey = WSOL_MINT) -> Pubkey:
+        """
+        Launchpad pool PDA for (base mint, quote mint).
+        """
+        mint_a = mint_a if isinstance(mint_a, Pubkey) else Pubkey.from_string(mint_a)
+        mint_b = mint_b if isinstance(mint_b, Pubkey) else Pubkey.from_string(mint_b)
+        return find_program_address([POOL_SEED, bytes(mint_a), bytes(mint_b)], LAUNCHPAD_PROGRAM_ID)[0]
 
-    async def find_launchpad_pool_by_mint(self, mint: str) -> str | None:
+    async def find_launchpad_pool_by_mint(self, mint: str, prefetched: dict | None = None) -> str | None:
+        """
+        Launchpad pool of a mint: pool index, then the derived wSOL pool PDA (read from `prefetched`
+        when it holds it), then a getProgramAccounts scan.
+        """
         try:
-            mint_pk = Pubkey.from_string(mint)
+            mint_pk = Pubkey.from_string(str(mint))
+
+            if self.pool_index is not None:
+                indexed = self.pool_index.lookup("launchlab", mint_pk)
+                if indexed is not None:
+                    return indexed[0] if indexed else None
+
+            pda = self.derive_pool_address(mint_pk)
+            if prefetched is not None and pda in prefetched:
+                acc = prefetched[pda]
+            else:
+                acc = (await self.client.get_account_info(pda, commitment=Confirmed)).value
+            if acc is not None:
+                return str(pda)
 
             MINT_A_OFFSET = 205
             MINT_B_OFFSET = 237
@@ -104,12 +138,18 @@ class RaydiumLaunchpadCore:
             traceback.print_exc()
             return None
 
+    @staticmethod
+    def status_has_migrated(data: bytes) -> bool:
+        """
+        Whether a raw Launchpad pool account has migrated (status 2).
+        """
+        return LAUNCHPAD_STATUS_LAYOUT.parse(bytes(data)).status == 2
+
     async def launchpad_check_has_migrated(self, pool_id: str | Pubkey) -> bool:
         pool_pk = pool_id if isinstance(pool_id, Pubkey) else Pubkey.from_string(pool_id)
         try:
-            acc = await self.client.get_account_info_json_parsed(pool_pk, commitment=Processed)
-            raw = LAUNCHPAD_STATUS_LAYOUT.parse(acc.value.data)
-            return raw.status == 2
+            acc = await accounts_of(self.client).get(pool_pk, RESERVES)
+            return self.status_has_migrated(acc.data)
         except Exception as e:
             traceback.print_exc()
             return False
@@ -117,10 +157,10 @@ class RaydiumLaunchpadCore:
     async def async_fetch_pool_keys(self, pool_id: str | Pubkey) -> Optional[LaunchpadPoolKeys]:
         pool_pk = pool_id if isinstance(pool_id, Pubkey) else Pubkey.from_string(pool_id)
         try:
-            acc = await self.client.get_account_info_json_parsed(pool_pk, commitment=Processed)
-            raw = LAUNCHPAD_POOL_LAYOUT.parse(acc.value.data)
-            auth, _      = Pubkey.find_program_address([AUTH_SEED], LAUNCHPAD_PROGRAM_ID)
-            evt_auth, _  = Pubkey.find_program_address([EVENT_AUTH_SEED], LAUNCHPAD_PROGRAM_ID)
+            acc = await accounts_of(self.client).get(pool_pk, RESERVES)
+            raw = LAUNCHPAD_POOL_LAYOUT.parse(acc.data)
+            auth         = LAUNCHPAD_AUTHORITY
+            evt_auth     = LAUNCHPAD_EVENT_AUTHORITY
 
             return LaunchpadPoolKeys(
                 program_id   = LAUNCHPAD_PROGRAM_ID,
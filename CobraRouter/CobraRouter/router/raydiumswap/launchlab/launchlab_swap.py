@@ -23,6 +23,10 @@ from solders.instruction import Instruction, AccountMeta # type: ignore
 
 try: from launchlab_core import RaydiumLaunchpadCore;
 except: from .launchlab_core import RaydiumLaunchpadCore
+try: from ...libutils.deadline import deadline_sleep
+except: from libutils.deadline import deadline_sleep
+try: from ...libutils.mint_info import mints_of
+except: from libutils.mint_info import mints_of
 
 RENT_EXEMPT     = 2039280
 ACCOUNT_SIZE    = 165
@@ -40,10 +44,10 @@ class RaydiumLaunchpadSwap:
 
     async def _mint_owner(self, mint: Pubkey) -> Pubkey:
         try:
-            info = await self.client.get_account_info(mint, commitment=Processed)
-            if info.value is None:
+            info = await mints_of(self.client).get(mint)
+            if info is None:
                 raise RuntimeError("mint account missing")
-            return info.value.owner
+            return info.token_program
         except Exception as e:
             traceback.print_exc()
             logging.info(f"Failed to get token program id: {e}")
@@ -310,7 +314,7 @@ class RaydiumLaunchpadSwap:
             res = await self.client.get_transaction(sig, commitment=Confirmed, max_supported_transaction_version=0)
             if res.value and res.value.transaction.meta.err is None:
                 return True
-            await asyncio.sleep(delay)
+            await deadline_sleep(delay)
         return False
 
     async def close(self):
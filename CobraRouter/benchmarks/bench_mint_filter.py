@@ -0,0 +1,75 @@
+"""
+Benchmark for the per-program mint filters (libutils.mint_filter).
+
+Builds one filter file per program from synthetic pool mints, then replays a detect workload and counts the
+getProgramAccounts calls the scan probes make with and without the filters. Every probe is counted as if it
+ran to the end (the race may stop earlier on a hit), so the numbers are per fully-raced detect.
+    pools      mints with a pool, per program
+    hit share  share of detected mints that have a pool on one of the filtered programs
+
+    python benchmarks/bench_mint_filter.py [pools_per_program] [detects] [hit_share]
+"""
+import asyncio, os, random, sys, tempfile, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CobraRouter", "router"))
+
+from solders.keypair import Keypair # type: ignore
+from libutils.mint_filter import MintFilter, PROBE_PROGRAMS
+
+# getProgramAccounts calls a probe makes when the mint has no pool on its program (PDA checks not counted)
+SCAN_CALLS = {
+    "pumpswap": 2,   # base = mint scan, then base = wSOL scan
+    "ray_cpmm": 2,   # mint A and mint B offsets
+    "damm_v1": 1,
+    "damm_v2": 2,    # after the derived pool candidates miss
+    "dbc": 1,        # after the derived config pools miss
+    "launchpad": 2,  # after the derived pool misses
+}
+
+def main(pools: int = 20_000, detects: int = 5_000, hit_share: float = 0.2):
+    rng = random.Random(7)
+    programs = sorted(set(PROBE_PROGRAMS.values()))
+    by_program = {name: [str(Keypair().pubkey()) for _ in range(pools)] for name in programs}
+
+    with tempfile.TemporaryDirectory() as path:
+        mf = MintFilter(None, None, path)
+        start = time.perf_counter()
+        for name, mints in by_program.items():
+            mf._rebuild(name, mints).flush()
+        build_s = time.perf_counter() - start
+        mf._live = dict.fromkeys(mf.programs, True)  # benchmark only: treat the files as caught up
+
+        workload = []
+        for _ in range(detects):
+            if rng.random() < hit_share:
+                name = rng.choice(programs)
+                workload.append((rng.choice(by_program[name]), name))
+            else:
+                workload.append((str(Keypair().pubkey()), None))
+
+        calls_raw = calls_filtered = false_negatives = false_positives = 0
+        start = time.perf_counter()
+        for mint, home in workload:
+            ruled_out = set(mf.ruled_out(SCAN_CALLS, mint))
+            for probe, cost in SCAN_CALLS.items():
+                calls_raw += cost
+                if probe not in ruled_out:
+                    calls_filtered += cost
+                    if PROBE_PROGRAMS[probe] != home:
+                        false_positives += 1
+                elif PROBE_PROGRAMS[probe] == home:
+                    false_negatives += 1
+        check_us = (time.perf_counter() - start) / detects * 1e6
+
+        size = sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+        misses = detects * len(SCAN_CALLS) - sum(1 for _, home in workload if home is not None)
+        print(f"filters: {len(programs)} programs x {pools} mints, {size / 1024:.0f} KiB on disk, built in {build_s:.2f}s")
+        print(f"getProgramAccounts per detect: {calls_raw / detects:.2f} -> {calls_filtered / detects:.2f} (avoided {(calls_raw - calls_filtered) / detects:.2f})")
+        print(f"filter checks: {check_us:.1f} us per detect, false positives {false_positives / max(misses, 1):.2%} of misses, false negatives {false_negatives}")
+        asyncio.run(mf.close())
+
+if __name__ == "__main__":
+    main(
+        int(sys.argv[1]) if len(sys.argv) > 1 else 20_000,
+        int(sys.argv[2]) if len(sys.argv) > 2 else 5_000,
+        float(sys.argv[3]) if len(sys.argv) > 3 else 0.2,
+    )
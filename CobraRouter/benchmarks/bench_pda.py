@@ -0,0 +1,100 @@
+"""
+Microbenchmark for the PDA registry (libutils.pda).
+
+Replays the program-address derivations a `detect()` and a PumpFun/PumpSwap `buy()` perform and
+times them three ways:
+    raw        Pubkey.find_program_address every time (previous behaviour)
+    new mint   registry warm on static PDAs, first time seeing this mint / user
+    repeat     registry warm, same mint / user again (re-detect, sell after buy, ...)
+
+    python benchmarks/bench_pda.py [iterations]
+"""
+import os, sys, time
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CobraRouter", "router"))
+
+from solders.pubkey import Pubkey # type: ignore
+from solders.keypair import Keypair # type: ignore
+from libutils import SUPPORTED_DEXES, WSOL_MINT, METADATA_PROGRAM_ID
+from libutils.pda import PDARegistry
+
+WSOL = Pubkey.from_string(WSOL_MINT)
+PUMP_FUN = Pubkey.from_string("6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P")
+PUMPSWAP = Pubkey.from_string(SUPPORTED_DEXES["PumpSwap"])
+CLMM = Pubkey.from_string(SUPPORTED_DEXES["RayCLMM"])
+DLMM = Pubkey.from_string(SUPPORTED_DEXES["MeteoraDLMM"])
+CPMM = Pubkey.from_string(SUPPORTED_DEXES["RayCPMM"])
+DAMM_V2 = Pubkey.from_string(SUPPORTED_DEXES["MeteoraDamm2"])
+LAUNCHLAB = Pubkey.from_string("LanMV9sAd7wArD4vJFi2qDdfnVhFxYSUg6eADduJ3uj")
+ILM_BASE_KEY = Pubkey.from_string("MFGQxwAmB91SwuYX36okv2Qmdc9aMuHTwWGUrp4AtB1")
+CLMM_CONFIGS = [Pubkey.find_program_address([b"amm_config", i.to_bytes(2, "big")], CLMM)[0] for i in range(13)]
+BIN_STEPS = (1, 5, 10, 20, 25, 50, 100, 200, 400)
+
+def detect_seeds(find, mint: Pubkey) -> list:
+    t0, t1 = sorted([mint, WSOL], key=bytes)
+    out = [
+        ([b"metadata", bytes(METADATA_PROGRAM_ID), bytes(mint)], METADATA_PROGRAM_ID),
+        ([b"bonding-curve", bytes(mint)], PUMP_FUN),
+    ]
+    for cfg in CLMM_CONFIGS:
+        out.append(([b"pool", bytes(cfg), bytes(t0), bytes(t1)], CLMM))
+    for idx in range(256):
+        preset = find([b"preset_parameter2", idx.to_bytes(2, "little")], DLMM)[0]
+        out.append(([bytes(preset), bytes(t0), bytes(t1)], DLMM))
+    out.append(([bytes(ILM_BASE_KEY), bytes(t0), bytes(t1)], DLMM))
+    for bs in BIN_STEPS:
+        preset = find([b"preset_parameter", bs.to_bytes(2, "little")], DLMM)[0]
+        out.append(([bytes(preset), bytes(t0), bytes(t1)], DLMM))
+        out.append(([bytes(t0), bytes(t1), bs.to_bytes(2, "little")], DLMM))
+    return out
+
+def buy_seeds(mint: Pubkey, user: Pubkey, creator: Pubkey, pool: Pubkey) -> list:
+    return [
+        ([b"bonding-curve", bytes(mint)], PUMP_FUN),
+        ([b"user_volume_accumulator", bytes(user)], PUMP_FUN),
+        ([b"creator-vault", bytes(creator)], PUMP_FUN),
+        ([b"user_volume_accumulator", bytes(user)], PUMPSWAP),
+        ([b"creator_vault", bytes(creator)], PUMPSWAP),
+        ([b"vault_auth_seed"], LAUNCHLAB),
+        ([b"__event_authority"], LAUNCHLAB),
+        ([b"vault_and_lp_mint_auth_seed"], CPMM),
+        ([b"observation", bytes(pool)], CPMM),
+        ([b"pool_authority"], DAMM_V2),
+        ([b"__event_authority"], DAMM_V2),
+    ]
+
+def _time(fn, iterations: int) -> float:
+    start = time.perf_counter()
+    for i in range(iterations):
+        fn(i)
+    return (time.perf_counter() - start) / iterations * 1e6
+
+def main(iterations: int = 20):
+    raw = lambda seeds, program: Pubkey.find_program_address(list(seeds), program)
+    mints = [Keypair().pubkey() for _ in range(iterations)]
+    users = [Keypair().pubkey() for _ in range(iterations)]
+    creator, pool = Keypair().pubkey(), Keypair().pubkey()
+
+    reg = PDARegistry()
+    for seeds, program in buy_seeds(mints[0], users[0], creator, pool):
+        if len(seeds) == 1:
+            reg.static(seeds, program)
+    detect_seeds(lambda seeds, program: (reg.static(seeds, program), 0), mints[0])  # pins the DLMM presets
+
+    def run_detect(find, mint, user):
+        for seeds, program in detect_seeds(find, mint):
+            find(seeds, program)
+
+    def run_buy(find, mint, user):
+        for seeds, program in buy_seeds(mint, user, creator, pool):
+            find(seeds, program)
+
+    print(f"{'':<10}{'raw us':>12}{'new mint us':>14}{'repeat us':>12}")
+    for name, fn in (("detect", run_detect), ("buy", run_buy)):
+        t_raw = _time(lambda i: fn(raw, mints[i], users[i]), iterations)
+        t_new = _time(lambda i: fn(reg.find, mints[i], users[i]), iterations)
+        t_rep = _time(lambda i: fn(reg.find, mints[i], users[i]), iterations)
+        print(f"{name:<10}{t_raw:>12.1f}{t_new:>14.1f}{t_rep:>12.1f}   saved per call: {t_raw - t_new:.1f} us (new) / {t_raw - t_rep:.1f} us (repeat)")
+    print(f"registry: {len(reg)} entries, stats={reg.stats}")
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
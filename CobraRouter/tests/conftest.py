@@ -0,0 +1,80 @@
+"""
+Shared helpers for the router tests: the router directory on sys.path (like the benchmarks) and a local
+stand-in JSON-RPC server, so the RPC layers run against real HTTP instead of mocked providers.
+"""
+import asyncio, base64, os, sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "CobraRouter", "router"))
+
+from aiohttp import web
+
+class HttpStatus:
+    """
+    Returned by a handler to answer a single request with a bare HTTP status (429, 503, ...) instead of a result.
+    """
+    def __init__(self, status: int, headers: dict | None = None):
+        self.status = status
+        self.headers = headers or {}
+
+class StandInRpc:
+    def __init__(self, handlers: dict, delay: float = 0.0):
+        """
+        Local JSON-RPC server. `handlers` maps a method to fn(params) -> result | HttpStatus.
+        Batch arrays are answered entry by entry, or refused with a JSON-RPC error while `refuse_batches` is set.
+
+        Args:
+            handlers: dict[str, callable]
+            delay: float <- seconds before every answer
+        """
+        self.handlers = handlers
+        self.delay = delay
+        self.refuse_batches = False
+        self.calls: list[str] = []  # method of every request, batch entries included
+        self.posts = 0
+        self._runner = None
+        self.url = None
+
+    def _answer(self, req: dict) -> dict:
+        self.calls.append(req["method"])
+        result = self.handlers[req["method"]](req.get("params") or [])
+        return {"jsonrpc": "2.0", "result": result, "id": req["id"]}
+
+    async def _post(self, request):
+        self.posts += 1
+        body = await request.json()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if isinstance(body, list):
+            if self.refuse_batches:
+                return web.json_response({"jsonrpc": "2.0", "error": {"code": -32600, "message": "batch requests are disabled"}, "id": None})
+            return web.json_response([self._answer(req) for req in body])
+        answer = self._answer(body)
+        if isinstance(answer["result"], HttpStatus):
+            return web.Response(status=answer["result"].status, headers=answer["result"].headers)
+        return web.json_response(answer)
+
+    async def __aenter__(self):
+        app = web.Application()
+        app.router.add_post("/", self._post)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self._runner.cleanup()
+
+def account_json(data: bytes, owner: str, lamports: int = 1_000_000) -> dict:
+    return {
+        "data": [base64.b64encode(data).decode(), "base64"],
+        "executable": False,
+        "lamports": lamports,
+        "owner": owner,
+        "rentEpoch": 0,
+        "space": len(data),
+    }
+
+def with_context(value, slot: int = 1) -> dict:
+    return {"context": {"slot": slot}, "value": value}
@@ -0,0 +1,147 @@
+import asyncio
+import pytest
+from solana.rpc.async_api import AsyncClient
+from solders.pubkey import Pubkey # type: ignore
+
+from conftest import StandInRpc, account_json, with_context
+from libutils.account_cache import AccountCache, STATIC, RESERVES, AUTHORITY
+from libutils.deadline import deadline, within, DeadlineExceeded
+
+SYSTEM = "11111111111111111111111111111111"
+
+class Chain:
+    """
+    getMultipleAccounts of a ledger whose accounts and slot the test sets; unknown accounts do not exist.
+    """
+    def __init__(self, slot: int = 100):
+        self.slot = slot
+        self.data: dict[str, bytes] = {}
+
+    def __call__(self, params):
+        return with_context([account_json(self.data[pk], SYSTEM) if pk in self.data else None for pk in params[0]], self.slot)
+
+async def cached_client(rpc: StandInRpc, **kwargs) -> tuple[AsyncClient, AccountCache]:
+    client = AsyncClient(rpc.url)
+    cache = AccountCache(**kwargs)
+    cache.attach(client)
+    return client, cache
+
+def test_an_older_slot_never_replaces_a_newer_copy():
+    cache = AccountCache()
+    pk = Pubkey.new_unique()
+    cache.store(pk, "new", 10)
+    cache.store(pk, "old", 9)
+    assert cache.peek(pk) == (True, "new") and cache.stats["stale_writes"] == 1
+    # same or newer slot replaces it
+    cache.store(pk, "newer", 10)
+    assert cache.peek(pk) == (True, "newer") and cache.stats["stale_writes"] == 1
+
+def test_a_lagging_read_does_not_overwrite_what_a_snapshot_stored():
+    async def run():
+        chain = Chain(slot=90)
+        async with StandInRpc({"getMultipleAccounts": chain}) as rpc:
+            client, cache = await cached_client(rpc)
+            pk = Pubkey.new_unique()
+            chain.data[str(pk)] = b"lagging"
+            cache.store(pk, "from the stream", 95)
+            # min_slot makes the cached copy a miss, the node answering from slot 90 neither replaces it nor is served
+            assert await cache.get(pk, min_slot=96) == "from the stream"
+            assert rpc.posts == 1 and cache.stats["stale_writes"] == 1
+            assert cache.peek(pk) == (True, "from the stream")
+            await client.close()
+    asyncio.run(run())
+
+def test_min_slot_turns_an_older_copy_into_a_miss():
+    async def run():
+        chain = Chain(slot=120)
+        async with StandInRpc({"getMultipleAccounts": chain}) as rpc:
+            client, cache = await cached_client(rpc)
+            pk = Pubkey.new_unique()
+            chain.data[str(pk)] = b"fresh"
+            cache.store(pk, "at 100", 100)
+            assert await cache.get(pk, STATIC, min_slot=100) == "at 100"
+            assert rpc.posts == 0
+            assert (await cache.get(pk, STATIC, min_slot=101)).data == b"fresh"
+            assert rpc.posts == 1 and cache.stats["expired"] == 1
+            assert cache._entries[pk][1] == 120
+            await client.close()
+    asyncio.run(run())
+
+def test_freshness_classes_expire_on_their_own_budgets():
+    async def run():
+        cache = AccountCache(reserves_ms=50, authority_ms=150)
+        pk, gone = Pubkey.new_unique(), Pubkey.new_unique()
+        cache.store(pk, "account", 1)
+        cache.store(gone, None, 1)
+        assert cache.peek(pk, RESERVES)[0] and cache.peek(gone, STATIC)[0]
+        await asyncio.sleep(0.08)
+        assert not cache.peek(pk, RESERVES)[0] and cache.peek(pk, AUTHORITY)[0] and cache.peek(pk, STATIC)[0]
+        # a missing account may be created any time: it expires with RESERVES whatever the class
+        assert not cache.peek(gone, STATIC)[0]
+        await asyncio.sleep(0.1)
+        assert not cache.peek(pk, AUTHORITY)[0] and cache.peek(pk, STATIC)[0]
+    asyncio.run(run())
+
+def test_concurrent_reads_share_one_request():
+    async def run():
+        chain = Chain()
+        async with StandInRpc({"getMultipleAccounts": chain}, delay=0.05) as rpc:
+            client, cache = await cached_client(rpc)
+            a, b = Pubkey.new_unique(), Pubkey.new_unique()
+            chain.data[str(a)] = b"a"
+            first, second, both = await asyncio.gather(cache.get(a), cache.get(a), cache.get_many([a, b]))
+            assert first.data == second.data == both[a].data == b"a" and both[b] is None
+            # one read of `a`, joined twice; `b` was not on the wire and went out on its own
+            assert rpc.posts == 2 and cache.stats["joined"] == 2 and cache.stats["misses"] == 2
+            assert not cache._inflight
+            await client.close()
+    asyncio.run(run())
+
+def test_a_short_deadline_fails_only_its_own_caller():
+    async def run():
+        chain = Chain()
+        async with StandInRpc({"getMultipleAccounts": chain}, delay=0.15) as rpc:
+            client, cache = await cached_client(rpc)
+            pk = Pubkey.new_unique()
+            chain.data[str(pk)] = b"shared"
+            async def hurried():
+                with deadline(0.03):
+                    return await within(cache.get(pk))
+            hurried_read, patient_read = await asyncio.gather(hurried(), cache.get(pk), return_exceptions=True)
+            assert isinstance(hurried_read, DeadlineExceeded)
+            assert patient_read.data == b"shared" and rpc.posts == 1
+            # the read the hurried caller started still landed in the cache
+            assert cache.peek(pk)[0]
+            await client.close()
+    asyncio.run(run())
+
+def test_a_read_nobody_waits_for_is_cancelled():
+    async def run():
+        async with StandInRpc({"getMultipleAccounts": Chain()}, delay=0.3) as rpc:
+            client, cache = await cached_client(rpc)
+            a, b = Pubkey.new_unique(), Pubkey.new_unique()
+            async def hurried(pubkeys):
+                with deadline(0.03):
+                    return await within(cache.get_many(pubkeys))
+            # the second caller joins the read of `a` and starts its own for `b`: both reads lose every waiter
+            results = await asyncio.gather(hurried([a]), hurried([a, b]), return_exceptions=True)
+            assert all(isinstance(r, DeadlineExceeded) for r in results)
+            assert rpc.posts == 2 and cache.stats["joined"] == 1
+            await asyncio.sleep(0.01)
+            # both reads were cancelled before they landed
+            assert not cache._inflight and len(cache) == 0
+            await client.close()
+    asyncio.run(run())
+
+def test_close_cancels_reads_in_flight():
+    async def run():
+        async with StandInRpc({"getMultipleAccounts": Chain()}, delay=1) as rpc:
+            client, cache = await cached_client(rpc)
+            read = asyncio.ensure_future(cache.get(Pubkey.new_unique()))
+            await asyncio.sleep(0.05)
+            await cache.close()
+            with pytest.raises(asyncio.CancelledError):
+                await read
+            assert not cache._inflight and len(cache) == 0
+            await client.close()
+    asyncio.run(run())
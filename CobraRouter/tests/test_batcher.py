@@ -0,0 +1,120 @@
+import asyncio
+from solana.rpc.async_api import AsyncClient
+from solana.rpc.core import RPCException
+from solders.keypair import Keypair # type: ignore
+
+from conftest import StandInRpc, with_context
+from libutils.batcher import RpcBatcher, MAX_REJECTS
+from libutils.deadline import deadline, within, DeadlineExceeded
+from libutils.limiter import lane, current_lane
+
+HANDLERS = {
+    "getSlot": lambda params: 42,
+    "getBalance": lambda params: with_context(1_000),
+    "getProgramAccounts": lambda params: [],
+}
+
+def batched(rpc: StandInRpc, **kwargs) -> tuple[AsyncClient, RpcBatcher]:
+    client = AsyncClient(rpc.url)
+    batcher = RpcBatcher(**kwargs)
+    batcher.attach(client)
+    return client, batcher
+
+def test_reads_of_one_tick_share_a_post():
+    async def run():
+        async with StandInRpc(HANDLERS) as rpc:
+            client, batcher = batched(rpc)
+            pk = Keypair().pubkey()
+            slot, balance, scan = await asyncio.gather(client.get_slot(), client.get_balance(pk), client.get_program_accounts(pk))
+            assert (slot.value, balance.value, scan.value) == (42, 1_000, [])
+            # getProgramAccounts is never batched: one batch of two reads plus the scan
+            assert rpc.posts == 2 and sorted(rpc.calls) == ["getBalance", "getProgramAccounts", "getSlot"]
+            assert batcher.snapshot()["batches"] == 1 and batcher.snapshot()["batched"] == 2
+            # a lone read goes out as it is
+            assert (await client.get_slot()).value == 42
+            assert batcher.stats["singles"] == 1 and rpc.posts == 3
+            await client.close()
+    asyncio.run(run())
+
+def test_refused_batches_fall_back_then_switch_batching_off():
+    async def run():
+        async with StandInRpc(HANDLERS) as rpc:
+            rpc.refuse_batches = True
+            client, batcher = batched(rpc)
+            for n in range(MAX_REJECTS):
+                assert batcher.enabled
+                slots = await asyncio.gather(client.get_slot(), client.get_slot())
+                # every caller still got its answer, from the single-request fallback
+                assert [s.value for s in slots] == [42, 42]
+                assert batcher.stats["fallbacks"] == n + 1
+            assert not batcher.enabled
+            posts = rpc.posts
+            await asyncio.gather(client.get_slot(), client.get_slot())
+            assert rpc.posts == posts + 2 and batcher.stats["batches"] == MAX_REJECTS
+            await client.close()
+    asyncio.run(run())
+
+def test_a_failing_read_in_the_fallback_does_not_count_as_a_refusal():
+    async def run():
+        handlers = {**HANDLERS, "getBalance": lambda params: {"bad": "shape"}}
+        async with StandInRpc(handlers) as rpc:
+            rpc.refuse_batches = True
+            client, batcher = batched(rpc)
+            for _ in range(MAX_REJECTS):
+                slot, balance = await asyncio.gather(client.get_slot(), client.get_balance(Keypair().pubkey()), return_exceptions=True)
+                assert slot.value == 42 and isinstance(balance, Exception)
+            # the endpoint may be refusing the bad read rather than batches: batching stays on
+            assert batcher.enabled and batcher._rejects == 0
+            await client.close()
+    asyncio.run(run())
+
+def test_an_error_entry_fails_only_its_caller():
+    async def run():
+        async with StandInRpc(HANDLERS) as rpc:
+            client, batcher = batched(rpc)
+            real = batcher._batch
+            async def one_error(reqs, parsers):
+                results = list(await real(reqs, parsers))
+                results[0] = object()  # what solana-py hands back for an error object in the array
+                return tuple(results)
+            batcher._batch = one_error
+            first, second = await asyncio.gather(client.get_slot(), client.get_slot(), return_exceptions=True)
+            assert isinstance(first, RPCException) and second.value == 42
+            await client.close()
+    asyncio.run(run())
+
+def test_batch_runs_in_its_most_urgent_lane_without_a_callers_deadline():
+    async def run():
+        async with StandInRpc(HANDLERS, delay=0.1) as rpc:
+            client, batcher = batched(rpc)
+            seen = []
+            real = batcher._batch
+            async def spy(reqs, parsers):
+                seen.append(current_lane())
+                return await real(reqs, parsers)
+            batcher._batch = spy
+
+            async def read(lane_name, seconds):
+                with lane(lane_name), deadline(seconds):
+                    return await within(client.get_slot())
+            display, trade = await asyncio.gather(read("display", 0.03), read("trade", 2), return_exceptions=True)
+            # the display caller's short deadline failed only its own wait, the batch still answered the trade caller
+            assert isinstance(display, DeadlineExceeded) and trade.value == 42
+            assert seen == ["trade"]
+            await client.close()
+    asyncio.run(run())
+
+def test_batch_is_dropped_when_every_caller_gave_up():
+    async def run():
+        async with StandInRpc(HANDLERS, delay=0.3) as rpc:
+            client, batcher = batched(rpc)
+            async def read():
+                with deadline(0.02):
+                    return await within(client.get_slot())
+            results = await asyncio.gather(read(), read(), return_exceptions=True)
+            assert all(isinstance(r, DeadlineExceeded) for r in results)
+            await asyncio.sleep(0)
+            assert not batcher._tasks
+            await batcher.close()
+            await client.close()
+    asyncio.run(run())
@@ -0,0 +1,109 @@
+import asyncio, time
+import pytest
+from solana.rpc.async_api import AsyncClient
+from solders.pubkey import Pubkey # type: ignore
+
+from conftest import StandInRpc
+from libutils.breaker import CircuitBreaker, BreakerBoard, CircuitOpen, CLOSED, OPEN, HALF_OPEN
+
+def down(params):
+    raise RuntimeError("node down")  # the stand-in answers HTTP 500
+
+def test_breaker_opens_half_opens_and_closes():
+    b = CircuitBreaker("probe:test", threshold=3, cooldown=0.05)
+    for _ in range(2):
+        assert b.allow()
+        b.failure(ValueError("boom"))
+    assert b.state == CLOSED
+    # a success resets the streak
+    b.success()
+    for _ in range(3):
+        b.failure(ValueError("boom"))
+    assert b.state == OPEN and b.counters["trips"] == 1 and b.last_error == "boom"
+    assert not b.allow() and b.counters["skipped"] == 1
+
+    time.sleep(0.06)
+    # one trial call goes through, the others are still skipped while it runs
+    assert b.allow() and b.state == HALF_OPEN
+    assert not b.allow()
+    b.success()
+    assert b.state == CLOSED and b.allow()
+
+def test_a_failed_trial_doubles_the_cooldown_up_to_the_cap():
+    b = CircuitBreaker("probe:test", threshold=1, cooldown=0.05, max_cooldown=0.15)
+    b.failure("down")
+    for expected in (0.1, 0.15, 0.15):
+        b.opened_at -= b.cooldown
+        assert b.allow() and b.state == HALF_OPEN
+        b.failure("still down")
+        assert b.state == OPEN and b.cooldown == pytest.approx(expected)
+    # closing restores the base cooldown
+    b.opened_at -= b.cooldown
+    assert b.allow()
+    b.success()
+    assert b.cooldown == 0.05
+
+def test_a_cancelled_trial_lets_the_next_call_try():
+    async def run():
+        board = BreakerBoard(threshold=1, cooldown=0)
+        async def fail():
+            raise RuntimeError("down")
+        with pytest.raises(RuntimeError):
+            await board.guard("probe:test", fail)
+        b = board.get("probe:test")
+        trial = asyncio.ensure_future(board.guard("probe:test", asyncio.sleep, 1))
+        await asyncio.sleep(0)
+        assert b.state == HALF_OPEN and b.trial_running
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        assert not b.trial_running
+        assert await board.guard("probe:test", asyncio.sleep, 0, "up") == "up"
+        assert b.state == CLOSED and board.degraded() == []
+    asyncio.run(run())
+
+def test_a_swallowed_rpc_error_still_fails_the_probe():
+    async def run():
+        async with StandInRpc({"getBalance": down}) as rpc:
+            client = AsyncClient(rpc.url)
+            board = BreakerBoard(threshold=2, cooldown=30)
+            board.attach(client)
+            board.attach(client)
+            async def probe():
+                try:
+                    await client.get_balance(Pubkey.new_unique())
+                except Exception:
+                    return None  # adapters turn RPC errors into "no pool"
+            for _ in range(2):
+                assert await board.guard("probe:test", probe) is None
+            assert board.is_open("probe:test") and board.degraded() == ["probe:test"]
+            with pytest.raises(CircuitOpen):
+                await board.guard("probe:test", probe)
+            assert rpc.posts == 2
+            snap = board.snapshot()["probe:test"]
+            assert snap["state"] == OPEN and snap["retry_in"] > 0 and snap["skipped"] == 1
+            await client.close()
+    asyncio.run(run())
+
+def test_guarded_methods_trip_per_program():
+    async def run():
+        async with StandInRpc({"getProgramAccounts": down, "getSlot": down}) as rpc:
+            client = AsyncClient(rpc.url)
+            board = BreakerBoard(threshold=1, cooldown=30)
+            board.attach(client)
+            program, other = Pubkey.new_unique(), Pubkey.new_unique()
+            with pytest.raises(Exception):
+                await client.get_program_accounts(program)
+            with pytest.raises(CircuitOpen):
+                await client.get_program_accounts(program)
+            # another program has its own breaker, unguarded methods have none
+            with pytest.raises(Exception) as e:
+                await client.get_program_accounts(other)
+            assert not isinstance(e.value, CircuitOpen)
+            for _ in range(2):
+                with pytest.raises(Exception) as e:
+                    await client.get_slot()
+                assert not isinstance(e.value, CircuitOpen)
+            assert board.degraded() == sorted([f"rpc:GetProgramAccounts/{program}", f"rpc:GetProgramAccounts/{other}"])
+            assert rpc.posts == 4
+            await client.close()
+    asyncio.run(run())
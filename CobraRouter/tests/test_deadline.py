@@ -0,0 +1,69 @@
+import asyncio, time
+import pytest
+
+from libutils.deadline import deadline, within, deadline_sleep, remaining, budget, explain, DeadlineExceeded
+
+def test_within_cancels_the_awaited_work_at_the_deadline():
+    async def run():
+        cancelled = asyncio.Event()
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        start = time.monotonic()
+        with deadline(0.05, "buy"):
+            with pytest.raises(DeadlineExceeded, match="buy: 0.05s deadline exceeded during quote"):
+                await within(slow(), "quote")
+        assert time.monotonic() - start < 0.5 and cancelled.is_set()
+        # without a deadline within just awaits
+        assert await within(asyncio.sleep(0, "done")) == "done"
+    asyncio.run(run())
+
+def test_within_fails_right_away_once_the_deadline_passed():
+    async def run():
+        with deadline(0.01):
+            await asyncio.sleep(0.02)
+            coro = asyncio.sleep(1)
+            with pytest.raises(DeadlineExceeded):
+                await within(coro, "late call")
+            # the coroutine was closed, not left un-awaited
+            assert coro.cr_frame is None
+    asyncio.run(run())
+
+def test_a_plain_timeout_inside_the_budget_is_not_a_deadline():
+    async def run():
+        with deadline(5):
+            with pytest.raises(asyncio.TimeoutError) as e:
+                await within(asyncio.wait_for(asyncio.sleep(1), 0.01))
+            assert not isinstance(e.value, DeadlineExceeded)
+    asyncio.run(run())
+
+def test_deadline_sleep_never_sleeps_past_the_deadline():
+    async def run():
+        with deadline(0.1, "sell"):
+            start = time.monotonic()
+            await deadline_sleep(0.02)
+            with pytest.raises(DeadlineExceeded, match="during retry delay"):
+                await deadline_sleep(0.5)
+            assert time.monotonic() - start < 0.1
+        # without a deadline it is asyncio.sleep
+        await deadline_sleep(0.01)
+    asyncio.run(run())
+
+def test_nested_deadlines_never_extend_the_outer_one():
+    with deadline(0.1, "outer") as outer:
+        with deadline(10, "inner") as inner:
+            assert inner is outer and remaining() <= 0.1
+        with deadline(0.01, "inner") as inner:
+            assert inner is not outer and budget(1) <= 0.01
+        with deadline(None) as kept:
+            assert kept is outer
+    assert remaining() is None and budget(2) == 2
+
+def test_explain_names_the_deadline_behind_an_unrelated_error():
+    error = ConnectionError("reset")
+    assert explain(error, "send") is error
+    with deadline(0):
+        assert isinstance(explain(error, "send"), DeadlineExceeded)
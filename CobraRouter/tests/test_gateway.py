@@ -0,0 +1,139 @@
+import asyncio, socket
+import pytest
+from solana.rpc.async_api import AsyncClient
+from solana.exceptions import SolanaRpcException
+
+from conftest import StandInRpc, HttpStatus
+from libutils.gateway import RpcGateway, raw_request
+
+def slot(n: int):
+    return {"getSlot": lambda params: n}
+
+def dead_url() -> str:
+    # a port nobody listens on: connection refused, a transport error
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+async def gateway_client(gateway: RpcGateway) -> AsyncClient:
+    return gateway.attach(AsyncClient(gateway.read[0].url))
+
+def test_slow_read_is_hedged_on_the_next_endpoint():
+    async def run():
+        async with StandInRpc(slot(1), delay=0.5) as slow, StandInRpc(slot(2)) as fast:
+            gateway = RpcGateway([slow.url, fast.url], default_delay=0.05)
+            client = await gateway_client(gateway)
+            assert (await client.get_slot()).value == 2
+            assert gateway.stats["hedges"] == 1 and gateway.stats["hedge_wins"] == 1
+            primary, backup = gateway.read
+            assert primary.counters["cancelled"] == 1 and backup.counters["wins"] == 1
+            # the faster endpoint now ranks first and answers before the hedge delay: no duplicate
+            assert (await client.get_slot()).value == 2
+            assert gateway.stats["hedges"] == 1 and slow.posts == 1
+            await gateway.close()
+    asyncio.run(run())
+
+def test_no_hedge_when_disabled():
+    async def run():
+        async with StandInRpc(slot(1), delay=0.1) as slow, StandInRpc(slot(2)) as fast:
+            gateway = RpcGateway([slow.url, fast.url], hedge=False, default_delay=0.01)
+            client = await gateway_client(gateway)
+            assert (await client.get_slot()).value == 1
+            assert gateway.stats["hedges"] == 0 and fast.posts == 0
+            await gateway.close()
+    asyncio.run(run())
+
+def test_read_fails_over_from_a_dead_endpoint():
+    async def run():
+        async with StandInRpc(slot(7)) as alive:
+            gateway = RpcGateway([dead_url(), alive.url], hedge=False)
+            client = await gateway_client(gateway)
+            assert (await client.get_slot()).value == 7
+            dead = gateway.read[0]
+            assert gateway.stats["failovers"] == 1 and dead.counters["errors"] == 1
+            # the live endpoint now has a latency and ranks first: the dead one is not tried again
+            for _ in range(3):
+                assert (await client.get_slot()).value == 7
+            assert dead.counters["calls"] == 1 and gateway.stats["failovers"] == 1
+            await gateway.close()
+    asyncio.run(run())
+
+def test_every_read_endpoint_down_raises_the_transport_error():
+    async def run():
+        gateway = RpcGateway([dead_url(), dead_url()], hedge=False)
+        client = await gateway_client(gateway)
+        with pytest.raises(SolanaRpcException):
+            await client.get_slot()
+        assert gateway.stats["failovers"] == 1
+        # three transport failures in a row open an endpoint's breaker
+        for _ in range(2):
+            with pytest.raises(SolanaRpcException):
+                await client.get_slot()
+        assert all(ep.breaker.state != "closed" for ep in gateway.read)
+        await gateway.close()
+    asyncio.run(run())
+
+def test_429_slows_the_endpoint_and_retries_it_once():
+    answers = iter([HttpStatus(429, {"Retry-After": "0.2"}), 5])
+
+    async def run():
+        async with StandInRpc({"getSlot": lambda params: next(answers)}) as rpc:
+            gateway = RpcGateway([rpc.url], limits={"credits_per_sec": 100})
+            client = await gateway_client(gateway)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            assert (await client.get_slot()).value == 5
+            # the retry waited out Retry-After in the governor, on the same endpoint
+            assert loop.time() - start >= 0.15
+            ep = gateway.read[0]
+            assert ep.counters["throttled"] == 1 and ep.counters["errors"] == 0 and rpc.posts == 2
+            credits = ep.governor.credits
+            assert credits.counters["throttled"] == 1 and credits.rate < 100
+            assert ep.breaker.state == "closed"
+            await gateway.close()
+    asyncio.run(run())
+
+def test_429_twice_fails_over():
+    async def run():
+        throttled = {"getSlot": lambda params: HttpStatus(429)}
+        async with StandInRpc(throttled) as busy, StandInRpc(slot(3)) as spare:
+            gateway = RpcGateway([busy.url, spare.url], hedge=False)
+            client = await gateway_client(gateway)
+            assert (await client.get_slot()).value == 3
+            assert busy.posts == 2 and gateway.read[0].counters["throttled"] == 2
+            assert gateway.stats["failovers"] == 1
+            await gateway.close()
+    asyncio.run(run())
+
+def test_sends_fail_over_in_order_and_are_never_hedged():
+    sig = "5VERv8NMvzbJMEkV8xnrLkEaWRtSz9CosKDYjCJjBRnbJLgp8uirBgmQpjKhoR4tjF3ZpRzrFmBV6UjKdiSZkQUW"
+
+    async def run():
+        sends = {"sendTransaction": lambda params: sig}
+        async with StandInRpc(slot(1)) as reads, StandInRpc(sends, delay=0.3) as first, StandInRpc(sends) as second:
+            gateway = RpcGateway([reads.url], send_urls=[dead_url(), first.url, second.url], default_delay=0.01)
+            client = await gateway_client(gateway)
+            resp = await client.send_raw_transaction(b"\x01" * 64)
+            assert str(resp.value) == sig
+            # the dead endpoint failed over to the next one, which was slow but never duplicated
+            assert gateway.stats["sends"] == 1 and gateway.stats["failovers"] == 1 and gateway.stats["hedges"] == 0
+            assert first.posts == 1 and second.posts == 0 and reads.posts == 0
+            await gateway.close()
+    asyncio.run(run())
+
+def test_raw_methods_fail_over_through_the_gateway():
+    rows = [{"slot": 9, "prioritizationFee": 5000}]
+
+    async def run():
+        async with StandInRpc({"getRecentPrioritizationFees": lambda params: rows}) as alive:
+            gateway = RpcGateway([dead_url(), alive.url], hedge=False)
+            client = await gateway_client(gateway)
+            assert await raw_request(client, "getRecentPrioritizationFees", [[]]) == rows
+            assert gateway.stats["failovers"] == 1 and gateway.read[1].governor.credits.counters["granted"] == 1
+            # without a gateway it goes straight to the client's endpoint
+            plain = AsyncClient(alive.url)
+            assert await raw_request(plain, "getRecentPrioritizationFees", [[]]) == rows
+            assert alive.posts == 2
+            await plain.close()
+            await gateway.close()
+    asyncio.run(run())
@@ -0,0 +1,105 @@
+import asyncio, time
+import pytest
+
+from libutils.governor import TokenBucket, RpcGovernor, BACKOFF, MIN_RATE
+from libutils.limiter import lane
+
+def test_burst_goes_out_then_requests_queue_at_the_rate():
+    async def run():
+        bucket = TokenBucket("credits", 20, burst=3)
+        start = time.monotonic()
+        for _ in range(3):
+            await bucket.acquire(1, 1)
+        assert time.monotonic() - start < 0.02 and bucket.counters["queued"] == 0
+        # the fourth one waits for a token: 1 / 20 s
+        await bucket.acquire(1, 1)
+        assert time.monotonic() - start >= 0.04
+        assert bucket.counters["queued"] == 1 and bucket.counters["granted"] == 4
+    asyncio.run(run())
+
+def test_waiters_are_served_trade_first_then_in_order():
+    async def run():
+        bucket = TokenBucket("credits", 50, burst=1)
+        await bucket.acquire(1, 1)
+        served = []
+        async def wait(name, priority):
+            await bucket.acquire(1, priority)
+            served.append(name)
+        waiters = [wait("display", 2), wait("default 1", 1), wait("trade", 0), wait("default 2", 1)]
+        await asyncio.gather(*waiters)
+        assert served == ["trade", "default 1", "default 2", "display"]
+    asyncio.run(run())
+
+def test_429_cuts_the_rate_and_retry_after_pauses():
+    async def run():
+        bucket = TokenBucket("credits", 100)
+        bucket.throttle(0.2)
+        assert bucket.rate == pytest.approx(100 * BACKOFF) and bucket.counters["throttled"] == 1
+        assert not bucket.ready(1)
+        start = time.monotonic()
+        await bucket.acquire(1, 0)
+        assert time.monotonic() - start >= 0.18
+        # repeated 429s never push the rate below the floor
+        for _ in range(20):
+            bucket.throttle()
+        assert bucket.rate == MIN_RATE
+    asyncio.run(run())
+
+def test_an_unconfigured_limit_is_learned_from_the_observed_rate():
+    async def run():
+        bucket = TokenBucket("credits", None)
+        for _ in range(10):
+            await bucket.acquire(1, 1)
+        assert bucket.ready(1_000)
+        bucket.throttle()
+        assert bucket.rate == pytest.approx(10 * BACKOFF)
+        assert bucket.ceiling is None
+    asyncio.run(run())
+
+def test_a_cancelled_waiter_does_not_hold_the_queue():
+    async def run():
+        bucket = TokenBucket("credits", 10, burst=1)
+        await bucket.acquire(1, 1)
+        gone = asyncio.ensure_future(bucket.acquire(1, 0))
+        await asyncio.sleep(0)
+        gone.cancel()
+        await asyncio.gather(gone, return_exceptions=True)
+        assert bucket.waiting == 0
+        # the next request gets the token the cancelled one would have taken: ~0.1 s, not ~0.2 s
+        start = time.monotonic()
+        await bucket.acquire(1, 1)
+        assert time.monotonic() - start < 0.15 and bucket.counters["granted"] == 2
+    asyncio.run(run())
+
+def test_governor_charges_method_costs_and_method_buckets():
+    async def run():
+        governor = RpcGovernor(credits_per_sec=20, burst=20, method_rates={"GetProgramAccounts": 1}, costs={"GetSlot": 3})
+        assert governor.cost(["GetProgramAccounts", "GetMultipleAccounts", "GetBalance", "GetSlot"]) == 10 + 2 + 1 + 3
+        assert governor.ready(["GetProgramAccounts"])
+        await governor.acquire(["GetProgramAccounts"])
+        # credits are left, but the method bucket allows one scan per second
+        assert governor.credits.tokens >= 9 and not governor.ready(["GetProgramAccounts"])
+        assert governor.ready(["GetBalance"])
+        # a batch pays for every entry in it: 5 x 2 credits empty the bucket
+        await governor.acquire(["GetMultipleAccounts"] * 5)
+        assert not governor.ready(["GetMultipleAccounts"])
+    asyncio.run(run())
+
+def test_governor_queues_by_the_callers_lane_and_throttles_every_bucket():
+    async def run():
+        governor = RpcGovernor(credits_per_sec=50, burst=1, method_rates={"GetSlot": 100})
+        await governor.acquire(["GetBalance"])
+        served = []
+        async def read(lane_name):
+            with lane(lane_name):
+                await governor.acquire(["GetBalance"])
+            served.append(lane_name)
+        await asyncio.gather(read("display"), read("default"), read("trade"))
+        assert served == ["trade", "default", "display"]
+
+        governor.throttled(["GetSlot", "GetSlot"], retry_after=0.1)
+        assert governor.credits.counters["throttled"] == 1 and governor.methods["GetSlot"].counters["throttled"] == 1
+        assert not governor.ready(["GetBalance"])
+        snap = governor.snapshot()
+        assert snap["credits"]["rate"] == pytest.approx(50 * BACKOFF) and snap["methods"]["GetSlot"]["rate"] == pytest.approx(100 * BACKOFF)
+    asyncio.run(run())
@@ -0,0 +1,88 @@
+import asyncio
+import pytest
+from solana.rpc.async_api import AsyncClient
+
+from conftest import StandInRpc
+from libutils.limiter import RpcLimiter, PriorityGate, lane, current_lane
+
+def test_queued_callers_are_served_trade_first_then_in_order():
+    async def run():
+        limiter = RpcLimiter(caps={"GetBalance": 1})
+        served = []
+        release = asyncio.Event()
+        async def hold():
+            async with limiter.slot("GetBalance"):
+                await release.wait()
+        async def call(lane_name, tag):
+            with lane(lane_name):
+                async with limiter.slot("GetBalance"):
+                    served.append(tag)
+        holder = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        callers = [asyncio.ensure_future(call(name, tag)) for name, tag in
+                   [("display", "display"), ("default", "default 1"), ("trade", "trade"), ("default", "default 2")]]
+        await asyncio.sleep(0.01)
+        assert served == [] and limiter.snapshot()["methods"]["GetBalance"]["waiting"] == 4
+        release.set()
+        await asyncio.gather(holder, *callers)
+        assert served == ["trade", "default 1", "default 2", "display"]
+        assert limiter.stats["trade"]["queued"] == 1 and limiter.stats["display"]["queued"] == 1
+    asyncio.run(run())
+
+def test_display_lane_leaves_slots_for_trades():
+    async def run():
+        limiter = RpcLimiter(caps={"GetBalance": 4}, display_share=0.5)
+        release = asyncio.Event()
+        async def call(lane_name):
+            with lane(lane_name):
+                async with limiter.slot("GetBalance"):
+                    await release.wait()
+        displays = [asyncio.ensure_future(call("display")) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        gate = limiter.snapshot()["methods"]["GetBalance"]
+        assert gate["active"] == 2 and gate["waiting"] == 2
+        # a trade gets one of the slots the display lane may not use
+        trade = asyncio.ensure_future(call("trade"))
+        await asyncio.sleep(0.01)
+        assert limiter.snapshot()["methods"]["GetBalance"]["active"] == 3
+        release.set()
+        await asyncio.gather(trade, *displays)
+        assert limiter.snapshot()["methods"]["GetBalance"]["peak"] == 3
+    asyncio.run(run())
+
+def test_a_cancelled_waiter_gives_its_turn_away():
+    async def run():
+        gate = PriorityGate(1)
+        await gate.acquire(1, 1)
+        gone = asyncio.ensure_future(gate.acquire(0, 1))
+        behind = asyncio.ensure_future(gate.acquire(1, 1))
+        await asyncio.sleep(0)
+        gone.cancel()
+        await asyncio.gather(gone, return_exceptions=True)
+        gate.release()
+        assert await behind and gate.active == 1 and gate.waiting == 0
+    asyncio.run(run())
+
+def test_lane_is_scoped_and_checked():
+    assert current_lane() == "default"
+    with lane("trade"):
+        with lane(None):
+            assert current_lane() == "trade"
+    assert current_lane() == "default"
+    with pytest.raises(ValueError):
+        with lane("urgent"):
+            pass
+
+def test_attached_client_goes_through_the_method_cap():
+    async def run():
+        async with StandInRpc({"getSlot": lambda params: 7}, delay=0.05) as rpc:
+            client = AsyncClient(rpc.url)
+            limiter = RpcLimiter(caps={"GetSlot": 1})
+            limiter.attach(client)
+            limiter.attach(client)
+            slots = await asyncio.gather(*(client.get_slot() for _ in range(3)))
+            assert [s.value for s in slots] == [7, 7, 7]
+            snap = limiter.snapshot()
+            assert snap["methods"]["GetSlot"]["peak"] == 1 and snap["lanes"]["default"]["queued"] == 2
+            await client.close()
+    asyncio.run(run())
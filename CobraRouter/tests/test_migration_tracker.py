@@ -0,0 +1,117 @@
+import asyncio, struct
+from solana.rpc.async_api import AsyncClient
+from solders.pubkey import Pubkey # type: ignore
+
+from conftest import StandInRpc, account_json, with_context
+from libutils.route_cache import RouteCache
+from libutils._common import SUPPORTED_DEXES
+from pump_fun import migration_tracker
+from pump_fun.migration_tracker import MigrationTracker, COMPLETE_SOL_RESERVES
+from pump_fun.pump_bond import DISCRIMINATOR, parse_bonding_curve_state
+
+PUMP_FUN, PUMP_SWAP = SUPPORTED_DEXES["PumpFun"], SUPPORTED_DEXES["PumpSwap"]
+PUMP_FUN_ID = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+PUMPSWAP_ID = "pAMMBay6oceH9fJKBRHGP5D4bD4sWpmSwMn52FMfXEA"
+
+def curve_bytes(progress: float, complete: bool = False) -> bytes:
+    real_sol = int(COMPLETE_SOL_RESERVES * progress)
+    return DISCRIMINATOR + struct.pack("<QQQQQ?", 1_000_000_000, 30_000_000_000 + real_sol, 800_000_000, real_sol, 1_000_000_000, complete) + bytes(32)
+
+def curve(progress: float, complete: bool = False):
+    return parse_bonding_curve_state(curve_bytes(progress, complete))
+
+class Ledger:
+    """
+    getMultipleAccounts of the accounts the test puts on chain; the others do not exist.
+    """
+    def __init__(self):
+        self.accounts: dict[str, tuple[bytes, str]] = {}
+
+    def __call__(self, params):
+        return with_context([account_json(*self.accounts[pk]) if pk in self.accounts else None for pk in params[0]])
+
+    def set_curve(self, tracker: MigrationTracker, mint: str, progress: float, complete: bool = False):
+        self.accounts[str(tracker._watched[mint]["curve"])] = (curve_bytes(progress, complete), PUMP_FUN_ID)
+
+def test_a_watched_curve_is_flipped_to_its_pumpswap_pool():
+    async def run():
+        ledger = Ledger()
+        async with StandInRpc({"getMultipleAccounts": ledger}) as rpc:
+            client, routes = AsyncClient(rpc.url), RouteCache()
+            tracker = MigrationTracker(client, routes, interval=60, fast_interval=60)
+            mint = str(Pubkey.new_unique())
+            routes.put(mint, PUMP_FUN, "curve")
+
+            assert not tracker.observe(mint, curve(0.5)) and len(tracker) == 0
+            assert tracker.observe(mint, curve(0.9))
+            ledger.set_curve(tracker, mint, 0.95)
+            # the first watched curve starts the poll
+            await asyncio.sleep(0.05)
+            assert tracker.stats["polls"] == 1 and tracker.snapshot()["running"]
+            assert tracker._watched[mint]["progress"] == 0.95 and routes.get(mint) == (PUMP_FUN, "curve")
+
+            # complete, pool not there yet: the PumpFun route is dropped and the curve waits for its pool
+            ledger.set_curve(tracker, mint, 1.0, complete=True)
+            await tracker.poll()
+            assert tracker._watched[mint]["completed_at"] is not None and routes.get(mint) is None
+
+            pool = str(tracker._watched[mint]["pool"])
+            ledger.accounts[pool] = (bytes(300), PUMPSWAP_ID)
+            await tracker.poll()
+            assert len(tracker) == 0 and tracker.stats["flipped"] == 1
+            assert routes.get(mint) == (PUMP_SWAP, pool) and tracker.migrated_pool(mint) == pool
+            # a migrated mint is not watched again
+            assert not tracker.observe(mint, curve(1.0, complete=True))
+
+            await tracker.close()
+            assert not tracker.snapshot()["running"]
+            await client.close()
+    asyncio.run(run())
+
+def test_stale_curves_expire(monkeypatch):
+    monkeypatch.setattr(migration_tracker, "IDLE_TTL", 0.05)
+    monkeypatch.setattr(migration_tracker, "PENDING_TTL", 0.05)
+    async def run():
+        ledger = Ledger()
+        async with StandInRpc({"getMultipleAccounts": ledger}) as rpc:
+            client = AsyncClient(rpc.url)
+            tracker = MigrationTracker(client, RouteCache(), interval=60, fast_interval=60)
+            moving, idle, pending, gone = (str(Pubkey.new_unique()) for _ in range(4))
+            for mint in (moving, idle, pending, gone):
+                tracker.observe(mint, curve(0.9))
+            ledger.set_curve(tracker, moving, 0.95)
+            ledger.set_curve(tracker, idle, 0.9)
+            ledger.set_curve(tracker, pending, 1.0, complete=True)
+            await tracker.poll()
+            # a curve account that no longer exists is dropped right away
+            assert set(tracker._watched) == {moving, idle, pending} and tracker.stats["expired"] == 1
+
+            await asyncio.sleep(0.08)
+            ledger.set_curve(tracker, moving, 0.96)
+            await tracker.poll()
+            # IDLE_TTL without progress, PENDING_TTL without a pool
+            assert set(tracker._watched) == {moving} and tracker.stats["expired"] == 3
+            await tracker.close()
+            await client.close()
+    asyncio.run(run())
+
+def test_redirect_only_moves_pumpfun_routes_of_migrated_curves():
+    tracker = MigrationTracker(None, RouteCache())
+    mint, other = str(Pubkey.new_unique()), str(Pubkey.new_unique())
+    assert tracker.redirect(mint, PUMP_FUN, "curve") == (PUMP_FUN, "curve")
+    tracker.mark_migrated(mint, "pool")
+    assert tracker.redirect(mint, PUMP_FUN, "curve") == (PUMP_SWAP, "pool")
+    assert tracker.redirect(mint, SUPPORTED_DEXES["RaydiumAMM"], "amm") == (SUPPORTED_DEXES["RaydiumAMM"], "amm")
+    assert tracker.redirect(other, PUMP_FUN, "curve") == (PUMP_FUN, "curve")
+    assert tracker.stats["redirects"] == 1 and tracker.route_cache.get(mint) == (PUMP_SWAP, "pool")
+
+def test_the_least_recently_seen_curve_is_dropped_at_max_watched():
+    # no running loop: observe only records, the poll is not started
+    tracker = MigrationTracker(None, RouteCache(), max_watched=2)
+    a, b, c = (str(Pubkey.new_unique()) for _ in range(3))
+    tracker.observe(a, curve(0.9))
+    tracker.observe(b, curve(0.9))
+    tracker.observe(a, curve(0.91))
+    tracker.observe(c, curve(0.9))
+    assert list(tracker._watched) == [a, c] and tracker.stats["watched"] == 3
+    assert not tracker.snapshot()["running"]
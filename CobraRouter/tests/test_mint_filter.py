@@ -0,0 +1,93 @@
+import asyncio
+import pytest
+from solana.rpc.async_api import AsyncClient
+from solders.pubkey import Pubkey # type: ignore
+
+from conftest import StandInRpc, account_json
+from libutils.mint_filter import BloomFile, MintFilter, MIN_CAPACITY
+from libutils.pool_index import INDEXED_PROGRAMS
+
+CPMM_ID, (OFF_A, OFF_B) = INDEXED_PROGRAMS["cpmm"]
+WSOL = "So11111111111111111111111111111111111111112"
+
+def test_every_added_mint_is_found(tmp_path):
+    bloom = BloomFile(str(tmp_path / "cpmm.bloom"), capacity=2_000, fp_rate=0.01)
+    added = [str(Pubkey.new_unique()) for _ in range(2_000)]
+    assert all(bloom.add(m) for m in added[:10])
+    for m in added[10:]:
+        bloom.add(m)
+    # no false negatives, and false positives near the rate the file was sized for
+    assert all(m in bloom for m in added)
+    others = [str(Pubkey.new_unique()) for _ in range(5_000)]
+    assert sum(m in bloom for m in others) / len(others) < 0.03
+    assert 0.005 < bloom.fp_estimate() < 0.02 and not bloom.saturated
+    bloom.close()
+
+    # the bits and the count survive a reopen
+    bloom = BloomFile(str(tmp_path / "cpmm.bloom"))
+    assert all(m in bloom for m in added) and len(bloom) >= 1_990
+    assert not bloom.add(added[0])
+    bloom.close()
+
+def test_a_foreign_file_is_refused(tmp_path):
+    path = tmp_path / "cpmm.bloom"
+    path.write_bytes(b"not a filter" * 10)
+    with pytest.raises(ValueError):
+        BloomFile(str(path))
+
+def pool_slice(mint_a: str, mint_b: str) -> bytes:
+    lo = min(OFF_A, OFF_B)
+    data = bytearray(max(OFF_A, OFF_B) + 32 - lo)
+    data[OFF_A - lo : OFF_A - lo + 32] = bytes(Pubkey.from_string(mint_a))
+    data[OFF_B - lo : OFF_B - lo + 32] = bytes(Pubkey.from_string(mint_b))
+    return bytes(data)
+
+def test_only_a_live_filter_rules_a_mint_out(tmp_path):
+    async def run():
+        listed = [str(Pubkey.new_unique()) for _ in range(50)]
+        pools = [{"pubkey": str(Pubkey.new_unique()), "account": account_json(pool_slice(m, WSOL), CPMM_ID)} for m in listed]
+        async with StandInRpc({"getProgramAccounts": lambda params: pools}) as rpc:
+            client = AsyncClient(rpc.url)
+            filters = MintFilter(client, None, str(tmp_path), programs=["cpmm"])
+            unlisted = str(Pubkey.new_unique())
+            # no file yet, then a file that has not caught up: every probe still runs
+            assert filters.ruled_out(["ray_cpmm"], unlisted) == []
+            assert await filters.build() == {"cpmm": 51}
+            assert filters.ruled_out(["ray_cpmm"], unlisted) == [] and filters.stats["not_live"] == 2
+
+            filters._live["cpmm"] = True
+            assert all(filters.might_have("cpmm", m) for m in listed + [WSOL])
+            # probes without a filter (or of programs not loaded) are never ruled out
+            assert filters.ruled_out(["ray_cpmm", "pumpswap", "ray_amm"], unlisted) == ["ray_cpmm"]
+            snap = filters.snapshot()
+            assert snap["programs"]["cpmm"]["live"] and snap["programs"]["cpmm"]["capacity"] == MIN_CAPACITY
+            await filters.close()
+
+            # a restart reopens the file but waits for the catch-up before ruling out again
+            filters = MintFilter(client, None, str(tmp_path), programs=["cpmm"])
+            assert filters.ruled_out(["ray_cpmm"], unlisted) == [] and filters.snapshot()["programs"]["cpmm"]["mints"] == 51
+            await filters.close()
+            await client.close()
+    asyncio.run(run())
+
+def test_an_overfilled_filter_is_rebuilt_with_room_to_grow(tmp_path, monkeypatch):
+    async def run():
+        listed = [str(Pubkey.new_unique()) for _ in range(300)]
+        pools = [{"pubkey": str(Pubkey.new_unique()), "account": account_json(pool_slice(m, WSOL), CPMM_ID)} for m in listed]
+        async with StandInRpc({"getProgramAccounts": lambda params: pools[:100]}) as rpc:
+            client = AsyncClient(rpc.url)
+            filters = MintFilter(client, None, str(tmp_path), programs=["cpmm"])
+            assert await filters.refresh("cpmm") == 101
+            assert filters._filters["cpmm"].capacity == 2 * 101
+
+            rpc.handlers["getProgramAccounts"] = lambda params: pools
+            # count is what add() saw as new: a mint whose bits all collide is not counted, so allow a few
+            assert 290 <= await filters.refresh("cpmm") <= 301
+            bloom = filters._filters["cpmm"]
+            # the rebuild is sized from the unique mints of the snapshot
+            assert bloom.capacity == 2 * 301 and not bloom.saturated and filters.stats["rebuilds"] == 2
+            assert all(m in bloom for m in listed)
+            await filters.close()
+            await client.close()
+    monkeypatch.setattr("libutils.mint_filter.MIN_CAPACITY", 128)
+    asyncio.run(run())
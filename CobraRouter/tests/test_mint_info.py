@@ -0,0 +1,114 @@
+import asyncio
+import pytest
+from solana.rpc.async_api import AsyncClient
+from solders.account import Account # type: ignore
+from solders.pubkey import Pubkey # type: ignore
+
+from conftest import StandInRpc, account_json, with_context
+from libutils.account_cache import AccountCache
+from libutils.mint_info import MintInfoService, decode_mint, decode_authorities, metadata_pda, mints_of
+
+TOKEN_PROGRAM = Pubkey.from_string("TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA")
+TOKEN_2022 = Pubkey.from_string("TokenzQdBNbLqP5VEhdkAS6EPFLC1PHnBqCXEpPxuEb")
+METADATA_PROGRAM = "metaqbxxUerdq28cj1RbAWkYQm3ybzjb6a8bt518x1s"
+AUTHORITY = "9WzDXwBbmkg8ZTbNMqUxvQRAyrZzDsGYdLVL9zYtAWWM"
+UPDATE_AUTHORITY = "Gv1TqTFNBDjbPvSaVyGy1D9rnD2n6CAr9F1Zz8uLnXLJ"
+
+# SPL mint: mint authority Some(AUTHORITY), supply 1_000_000_000_000_000, 6 decimals, initialized, no freeze authority
+MINT_BYTES = (
+    bytes.fromhex("01000000") + bytes(Pubkey.from_string(AUTHORITY))
+    + bytes.fromhex("0080c6a47e8d0300")
+    + bytes.fromhex("06" "01")
+    + bytes.fromhex("00000000") + bytes(32)
+)
+# the same mint after the authority was revoked and a freeze authority set, as a Token-2022 mint with extensions
+REVOKED_BYTES = (
+    bytes.fromhex("00000000") + bytes(32)
+    + bytes.fromhex("0080c6a47e8d0300")
+    + bytes.fromhex("09" "01")
+    + bytes.fromhex("01000000") + bytes(Pubkey.from_string(AUTHORITY))
+    + bytes(83)
+)
+# Metaplex metadata: key, then the update authority
+METADATA_BYTES = bytes([4]) + bytes(Pubkey.from_string(UPDATE_AUTHORITY)) + bytes(32) + bytes(100)
+
+def account(data: bytes, owner: Pubkey = TOKEN_PROGRAM) -> Account:
+    return Account(lamports=1_461_600, data=data, owner=owner)
+
+def test_decode_mint_reads_decimals_and_token_program():
+    assert len(MINT_BYTES) == 82
+    info = decode_mint("mint", account(MINT_BYTES))
+    assert (info.mint, info.decimals, info.token_program) == ("mint", 6, TOKEN_PROGRAM)
+    info = decode_mint("mint", account(REVOKED_BYTES, TOKEN_2022))
+    assert (info.decimals, info.token_program) == (9, TOKEN_2022)
+    with pytest.raises(ValueError):
+        decode_mint("mint", account(MINT_BYTES[:81]))
+
+def test_decode_authorities_reads_the_coptions_supply_and_metadata():
+    auth = decode_authorities("mint", account(MINT_BYTES), account(METADATA_BYTES, Pubkey.from_string(METADATA_PROGRAM)))
+    assert auth.mint_authority == AUTHORITY and auth.freeze_authority is None
+    assert auth.supply == 1_000_000_000_000_000 and auth.decimals == 6 and auth.is_initialized
+    assert auth.update_authority == UPDATE_AUTHORITY
+
+    auth = decode_authorities("mint", account(REVOKED_BYTES, TOKEN_2022))
+    assert auth.mint_authority is None and auth.freeze_authority == AUTHORITY and auth.update_authority is None
+    assert auth.authority_info() == {
+        "info": {"decimals": 9, "freezeAuthority": AUTHORITY, "isInitialized": True, "mintAuthority": None, "supply": "1000000000000000"},
+        "updateAuthority": None,
+        "mint": "mint",
+    }
+
+class Ledger:
+    def __init__(self):
+        self.accounts: dict[str, tuple[bytes, str]] = {}
+        self.reads: list[list[str]] = []
+
+    def __call__(self, params):
+        self.reads.append(params[0])
+        return with_context([account_json(*self.accounts[pk]) if pk in self.accounts else None for pk in params[0]])
+
+def test_unknown_mints_go_out_in_one_read_and_are_memoized():
+    async def run():
+        ledger = Ledger()
+        async with StandInRpc({"getMultipleAccounts": ledger}) as rpc:
+            client = AsyncClient(rpc.url)
+            AccountCache(reserves_ms=20).attach(client)
+            service = mints_of(client)
+            assert mints_of(client) is service
+            usdc_like, token_2022, unborn = (str(Pubkey.new_unique()) for _ in range(3))
+            ledger.accounts[usdc_like] = (MINT_BYTES, str(TOKEN_PROGRAM))
+            ledger.accounts[token_2022] = (REVOKED_BYTES, str(TOKEN_2022))
+
+            infos = await service.get_many([usdc_like, token_2022, unborn, usdc_like])
+            assert infos[usdc_like].decimals == 6 and infos[token_2022].token_program == TOKEN_2022 and infos[unborn] is None
+            assert len(ledger.reads) == 1 and sorted(ledger.reads[0]) == sorted([usdc_like, token_2022, unborn])
+            # decimals are memoized for good, a missing mint is asked for again once the cached miss expires
+            ledger.accounts[unborn] = (MINT_BYTES, str(TOKEN_PROGRAM))
+            await asyncio.sleep(0.03)
+            assert await service.decimals(usdc_like) == 6 and len(ledger.reads) == 1
+            assert await service.decimals(unborn) == 6 and len(ledger.reads) == 2
+            assert service.snapshot() == {"mints": 3, "hits": 1, "fetched": 3, "missing": 1, "authority_reads": 0}
+            await client.close()
+    asyncio.run(run())
+
+def test_authorities_read_the_mint_and_its_metadata_together():
+    async def run():
+        ledger = Ledger()
+        async with StandInRpc({"getMultipleAccounts": ledger}) as rpc:
+            client = AsyncClient(rpc.url)
+            cache = AccountCache(authority_ms=10_000)
+            cache.attach(client)
+            service = MintInfoService(cache)
+            service.attach(client)
+            mint = Pubkey.new_unique()
+            ledger.accounts[str(mint)] = (MINT_BYTES, str(TOKEN_PROGRAM))
+            ledger.accounts[str(metadata_pda(mint))] = (METADATA_BYTES, METADATA_PROGRAM)
+
+            auth = await service.authorities(mint)
+            assert auth.mint_authority == AUTHORITY and auth.update_authority == UPDATE_AUTHORITY
+            assert ledger.reads == [[str(mint), str(metadata_pda(mint))]]
+            # the mint read filled the memo, the next authority check is served from the account cache
+            assert (await service.get(mint)).decimals == 6
+            assert (await service.authorities(mint)) == auth and len(ledger.reads) == 1
+            await client.close()
+    asyncio.run(run())
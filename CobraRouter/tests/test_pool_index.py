@@ -0,0 +1,127 @@
+import asyncio, json
+from solana.rpc.async_api import AsyncClient
+from solders.keypair import Keypair # type: ignore
+from websockets.asyncio.server import serve
+
+from conftest import StandInRpc, account_json
+from libutils.pool_index import PoolIndex, INDEXED_PROGRAMS
+from pump_fun.migration_source import find_pumpswap_pools
+
+CPMM_ID, (OFF_A, OFF_B) = INDEXED_PROGRAMS["cpmm"]
+WSOL = "So11111111111111111111111111111111111111112"
+
+def key() -> str:
+    return str(Keypair().pubkey())
+
+def sliced(mint_a: str, mint_b: str) -> bytes:
+    # what the dataSlice (offset 168, 64 bytes) of a CPMM pool returns: both mints back to back
+    from solders.pubkey import Pubkey # type: ignore
+    return bytes(Pubkey.from_string(mint_a)) + bytes(Pubkey.from_string(mint_b))
+
+class StandInWs:
+    """
+    programSubscribe endpoint: confirms the subscription, then sends what is put on `push` until None.
+    """
+    def __init__(self):
+        self.push: asyncio.Queue = asyncio.Queue()
+        self.subscribed = asyncio.Event()
+
+    async def _handle(self, ws):
+        req = json.loads(await ws.recv())
+        assert req["method"] == "programSubscribe" and req["params"][0] == CPMM_ID
+        assert req["params"][1]["dataSlice"] == {"offset": OFF_A, "length": OFF_B + 32 - OFF_A}
+        await ws.send(json.dumps({"jsonrpc": "2.0", "result": 7, "id": req["id"]}))
+        self.subscribed.set()
+        while (item := await self.push.get()) is not None:
+            pool, data, lamports = item
+            await ws.send(json.dumps({
+                "jsonrpc": "2.0",
+                "method": "programNotification",
+                "params": {
+                    "subscription": 7,
+                    "result": {"context": {"slot": 2}, "value": {"pubkey": pool, "account": account_json(data, CPMM_ID, lamports)}},
+                },
+            }))
+
+    async def __aenter__(self):
+        self._server = await serve(self._handle, "127.0.0.1", 0).__aenter__()
+        port = self._server.sockets[0].getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.push.put(None)
+        self._server.close()
+        await self._server.wait_closed()
+
+async def wait_for(cond, timeout: float = 3.0):
+    async def poll():
+        while not cond():
+            await asyncio.sleep(0.01)
+    await asyncio.wait_for(poll(), timeout)
+
+def test_snapshot_then_deltas():
+    token, usdc = key(), key()
+    wsol_pools = {key(): (WSOL, key()) for _ in range(50)}
+    pool_tok, pool_usdc = key(), key()
+    snapshot = {**wsol_pools, pool_tok: (WSOL, token), pool_usdc: (token, usdc)}
+
+    async def run():
+        rpc_handlers = {"getProgramAccounts": lambda params: [
+            {"pubkey": pool, "account": account_json(sliced(*mints), CPMM_ID)} for pool, mints in snapshot.items()
+        ]}
+        async with StandInRpc(rpc_handlers) as rpc, StandInWs() as ws:
+            client = AsyncClient(rpc.url)
+            index = PoolIndex(client, ws.url, programs=["cpmm"], reconnect_delay=0.05)
+            assert index.lookup("cpmm", token) is None  # cold: the caller scans
+
+            index.start()
+            await wait_for(lambda: index.is_ready("cpmm"))
+            assert rpc.calls == ["getProgramAccounts"]
+            assert index.lookup("cpmm", token) == sorted([pool_tok, pool_usdc])
+            assert index.lookup_pair("cpmm", WSOL, token) == [pool_tok]
+            assert index.lookup_pair("cpmm", token, usdc) == [pool_usdc]
+            assert index.pool_mints("cpmm", pool_tok) == (WSOL, token)
+
+            # a pool created after the snapshot, then the first one closed
+            pool_new = key()
+            await ws.push.put((pool_new, sliced(token, WSOL), 1_000_000))
+            await wait_for(lambda: pool_new in (index.lookup("cpmm", token) or ()))
+            assert index.lookup_pair("cpmm", WSOL, token) == sorted([pool_tok, pool_new])
+            await ws.push.put((pool_tok, b"", 0))
+            await wait_for(lambda: pool_tok not in index.lookup("cpmm", token))
+            assert index.pool_mints("cpmm", pool_tok) is None
+            assert index.stats["updates"] == 2 and rpc.calls == ["getProgramAccounts"]
+
+            await index.close()
+            assert index.lookup("cpmm", token) is None
+            await client.close()
+    asyncio.run(run())
+
+def test_lookup_pair_walks_the_rarer_side():
+    index = PoolIndex(None, "ws://unused", programs=["pumpswap"])
+    index._ready["pumpswap"] = True
+    token = key()
+    for _ in range(1000):
+        index._pools["pumpswap"][key()] = (key(), WSOL)
+    pool = key()
+    index._pools["pumpswap"][pool] = (token, WSOL)
+    for p, mints in index._pools["pumpswap"].items():
+        for m in mints:
+            index._by_mint["pumpswap"].setdefault(m, set()).add(p)
+
+    class Counting(dict):
+        reads = 0
+        def __getitem__(self, k):
+            Counting.reads += 1
+            return super().__getitem__(k)
+    index._pools["pumpswap"] = Counting(index._pools["pumpswap"])
+    assert index.lookup_pair("pumpswap", WSOL, token) == [pool]
+    assert index.lookup_pair("pumpswap", token, WSOL) == [pool]
+    assert Counting.reads == 2
+
+    # find_pumpswap_pools answers from the index, both base / quote orders, with no client
+    found = asyncio.run(find_pumpswap_pools(None, token, WSOL, index=index, derive=False))
+    assert found == [{"pubkey": pool, "account": None}]
+    assert asyncio.run(find_pumpswap_pools(None, WSOL, token, index=index, derive=False)) == []
+    assert Counting.reads == 4
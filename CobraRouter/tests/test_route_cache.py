@@ -0,0 +1,115 @@
+import asyncio, json, os, sqlite3, time
+import pytest
+
+from libutils.route_cache import RouteCache
+from libutils._common import SUPPORTED_DEXES
+
+MINT, OTHER = "Mint111111111111111111111111111111111111111", "Mint222222222222222222222222222222222222222"
+POOL = "Pool111111111111111111111111111111111111111"
+PUMP_SWAP, PUMP_FUN = SUPPORTED_DEXES["PumpSwap"], SUPPORTED_DEXES["PumpFun"]
+
+@pytest.fixture(params=["memory", "file", "sqlite"])
+def backend(request, tmp_path):
+    return request.param, str(tmp_path / f"routes.{request.param}")
+
+def open_cache(backend, **kwargs) -> RouteCache:
+    name, path = backend
+    return RouteCache(name, path if name != "memory" else None, **kwargs)
+
+def test_routes_expire_on_their_venues_ttl(backend):
+    cache = open_cache(backend, ttl=60, migrating_ttl=0.05)
+    cache.put(MINT, PUMP_SWAP, POOL)
+    cache.put(OTHER, PUMP_FUN, POOL)
+    assert cache.get(MINT) == (PUMP_SWAP, POOL) and cache.get(OTHER) == (PUMP_FUN, POOL)
+    time.sleep(0.08)
+    # the bonding curve is re-checked, the settled pool is still served
+    assert cache.get(OTHER) is None and cache.get(MINT) == (PUMP_SWAP, POOL)
+    assert cache.stats["hits"] == 3 and cache.stats["misses"] == 1
+    cache.close()
+
+def test_negative_entries_answer_until_they_expire(backend):
+    cache = open_cache(backend, negative_ttl=0.05)
+    cache.put_negative(MINT)
+    assert cache.get(MINT) == (None, None) and cache.stats["negative_hits"] == 1
+    # a negative entry does not hide a route found later
+    cache.put(OTHER, None, None)
+    cache.put(OTHER, PUMP_SWAP, POOL)
+    assert cache.get(OTHER) == (PUMP_SWAP, POOL)
+    time.sleep(0.08)
+    assert cache.get(MINT) is None
+    cache.close()
+
+def test_invalidate_only_drops_the_route_on_that_dex(backend):
+    cache = open_cache(backend)
+    cache.put(MINT, PUMP_FUN, POOL)
+    assert not cache.invalidate(MINT, PUMP_SWAP) and cache.get(MINT) == (PUMP_FUN, POOL)
+    assert cache.invalidate(MINT, PUMP_FUN) and cache.get(MINT) is None
+    cache.close()
+
+def test_least_recently_used_routes_are_evicted(backend):
+    cache = open_cache(backend, max_entries=2)
+    cache.put("a", PUMP_SWAP, POOL)
+    cache.put("b", PUMP_SWAP, POOL)
+    cache.get("a")
+    cache.put("c", PUMP_SWAP, POOL)
+    assert "b" not in cache and "a" in cache and "c" in cache and cache.stats["evictions"] == 1
+    cache.close()
+
+@pytest.mark.parametrize("name", ["file", "sqlite"])
+def test_routes_survive_a_restart(name, tmp_path):
+    backend = (name, str(tmp_path / f"routes.{name}"))
+    cache = open_cache(backend, negative_ttl=60)
+    cache.put(MINT, PUMP_SWAP, POOL)
+    cache.put_negative(OTHER)
+    cache.put("dropped", PUMP_FUN, POOL)
+    cache.invalidate("dropped")
+    cache.close()
+
+    cache = open_cache(backend)
+    assert cache.get(MINT) == (PUMP_SWAP, POOL) and cache.get(OTHER) == (None, None)
+    assert "dropped" not in cache and len(cache) == 2
+    cache.close()
+
+@pytest.mark.parametrize("name", ["file", "sqlite"])
+def test_expired_routes_are_not_reloaded(name, tmp_path):
+    backend = (name, str(tmp_path / f"routes.{name}"))
+    cache = open_cache(backend, migrating_ttl=0.05)
+    cache.put(MINT, PUMP_FUN, POOL)
+    cache.put(OTHER, PUMP_SWAP, POOL)
+    cache.close()
+    time.sleep(0.08)
+    cache = open_cache(backend)
+    assert cache.get(MINT) is None and cache.get(OTHER) == (PUMP_SWAP, POOL)
+    cache.close()
+
+def stored(name: str, path: str) -> set:
+    if not os.path.exists(path):
+        return set()
+    if name == "file":
+        with open(path) as f:
+            return set(json.load(f))
+    conn = sqlite3.connect(path)
+    try:
+        return {mint for (mint,) in conn.execute("SELECT mint FROM routes")}
+    finally:
+        conn.close()
+
+@pytest.mark.parametrize("name", ["file", "sqlite"])
+def test_writes_are_batched_off_the_event_loop(name, tmp_path):
+    async def run():
+        path = str(tmp_path / f"routes.{name}")
+        cache = RouteCache(name, path, flush_interval=0.05)
+        for i in range(100):
+            cache.put(f"mint{i}", PUMP_SWAP, POOL)
+        cache.invalidate("mint0")
+        # nothing is written from the caller, the batch goes out after flush_interval
+        assert stored(name, path) == set()
+        await asyncio.sleep(0.15)
+        assert stored(name, path) == {f"mint{i}" for i in range(1, 100)}
+
+        cache.clear()
+        cache.put(MINT, PUMP_SWAP, POOL)
+        cache.flush()
+        assert stored(name, path) == {MINT}
+        cache.close()
+    asyncio.run(run())
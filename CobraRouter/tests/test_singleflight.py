@@ -0,0 +1,70 @@
+import asyncio
+
+from libutils.singleflight import SingleFlight
+from libutils.deadline import deadline, within, current_deadline, DeadlineExceeded
+from libutils.limiter import lane, current_lane
+
+def test_concurrent_calls_share_one_run():
+    async def run():
+        flight, runs = SingleFlight(), []
+        async def detect(mint):
+            runs.append(mint)
+            await asyncio.sleep(0.02)
+            return f"route of {mint}"
+        results = await asyncio.gather(*(flight.do(m, detect, m) for m in ["a", "a", "b", "a"]))
+        assert results == ["route of a", "route of a", "route of b", "route of a"]
+        assert runs == ["a", "b"] and flight.stats == {"calls": 4, "shared": 2} and len(flight) == 0
+        # once done, the next call runs again
+        assert await flight.do("a", detect, "a") == "route of a" and runs == ["a", "b", "a"]
+    asyncio.run(run())
+
+def test_every_caller_gets_the_error():
+    async def run():
+        flight = SingleFlight()
+        async def broken():
+            await asyncio.sleep(0.01)
+            raise ValueError("no pool")
+        results = await asyncio.gather(flight.do("k", broken), flight.do("k", broken), return_exceptions=True)
+        assert all(isinstance(r, ValueError) for r in results) and len(flight) == 0
+    asyncio.run(run())
+
+def test_the_work_runs_outside_the_first_callers_deadline_and_in_the_best_lane():
+    async def run():
+        flight, seen = SingleFlight(), []
+        async def detect():
+            seen.append((current_deadline(), current_lane()))
+            await asyncio.sleep(0.1)
+            seen.append((current_deadline(), current_lane()))
+            return "route"
+        async def hurried():
+            with lane("display"), deadline(0.02):
+                return await within(flight.do("k", detect))
+        async def trade():
+            await asyncio.sleep(0.01)
+            with lane("trade"):
+                return await flight.do("k", detect)
+        hurried_result, trade_result = await asyncio.gather(hurried(), trade(), return_exceptions=True)
+        # the display caller timed out alone, the trade caller got the result of the same run
+        assert isinstance(hurried_result, DeadlineExceeded) and trade_result == "route"
+        assert seen == [(None, "display"), (None, "trade")]
+    asyncio.run(run())
+
+def test_work_nobody_waits_for_is_cancelled():
+    async def run():
+        flight, cancelled = SingleFlight(), asyncio.Event()
+        async def slow():
+            try:
+                await asyncio.sleep(1)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+        callers = [asyncio.ensure_future(flight.do("k", slow)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        callers[0].cancel()
+        await asyncio.sleep(0.01)
+        assert not cancelled.is_set() and len(flight) == 1
+        callers[1].cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0.01)
+        assert cancelled.is_set() and len(flight) == 0
+    asyncio.run(run())
@@ -17,6 +17,10 @@ try: from CobraRouter.CobraRouter.router.libutils._common import ADDR_TO_DEX; #
 except: from CobraRouter.router.libutils._common import ADDR_TO_DEX; # type: ignore
 try: from CobraRouter.CobraRouter.router.libutils.cleaner import Cleaner; # type: ignore
 except: from CobraRouter.router.libutils.cleaner import Cleaner; # type: ignore
+try: from CobraRouter.CobraRouter.router.libutils.route_cache import RouteCache; # type: ignore
+except: from CobraRouter.router.libutils.route_cache import RouteCache; # type: ignore
+try: from CobraRouter.CobraRouter.router.libutils.limiter import lane; # type: ignore
+except: from CobraRouter.router.libutils.limiter import lane; # type: ignore
 
 print(f"""
 {cc.BRIGHT}{cc.LIGHT_BLACK}{cc.BG_WHITE}                                             {cc.RESET}
@@ -47,6 +51,18 @@ HTTP_RPC = os.getenv("HTTP_RPC")
 load_dotenv(dotenv_path=Path.cwd() / "secrets.env", override=False)
 
 RUN_AS_CLI = os.getenv("RUN_AS_CLI")
+ROUTE_CACHE_BACKEND = os.getenv("ROUTE_CACHE_BACKEND", "memory")
+ROUTE_CACHE_PATH = os.getenv("ROUTE_CACHE_PATH")
+POOL_INDEX_WS = os.getenv("POOL_INDEX_WS")
+MINT_FILTER_WS = os.getenv("MINT_FILTER_WS")
+MINT_FILTER_DIR = os.getenv("MINT_FILTER_DIR", "mint_filters")
+RPC_URLS = [u.strip() for u in os.getenv("RPC_URLS", "").split(",") if u.strip()]
+SEND_RPC_URLS = [u.strip() for u in os.getenv("SEND_RPC_URLS", "").split(",") if u.strip()]
+RPC_CREDITS_PER_SEC = os.getenv("RPC_CREDITS_PER_SEC")
+ACCOUNT_CACHE_MS = os.getenv("ACCOUNT_CACHE_MS")
+RPC_METHOD_RATES = dict(
+    (m.strip(), float(r)) for m, r in (pair.split("=") for pair in os.getenv("RPC_METHOD_RATES", "").split(",") if "=" in pair)
+)
 
 class CLISettings:
     SLIPPAGE = int(os.getenv("SLIPPAGE"))
@@ -55,7 +71,9 @@ class CLISettings:
 class Cobra:
     def __init__(self, session: aiohttp.ClientSession):
         self.cleaner = Cleaner()
-        self.router = CobraRouter(HTTP_RPC, session)
+        route_cache = RouteCache(ROUTE_CACHE_BACKEND, ROUTE_CACHE_PATH) if ROUTE_CACHE_PATH else None
+        rate_limits = {"credits_per_sec": float(RPC_CREDITS_PER_SEC) if RPC_CREDITS_PER_SEC else None, "method_rates": RPC_METHOD_RATES}
+        self.router = CobraRouter(HTTP_RPC, session, route_cache=route_cache, rpc_urls=RPC_URLS, send_urls=SEND_RPC_URLS or None, rate_limits=rate_limits, reserves_ms=float(ACCOUNT_CACHE_MS) if ACCOUNT_CACHE_MS else None)
         try: self.keypair = Keypair.from_base58_string(os.getenv("PRIVATE_KEY"));
         except: self.keypair = None
         if RUN_AS_CLI == "False":
@@ -144,8 +162,21 @@ class Cobra:
             if mints:
                 mints_dict = {}
                 to_sell = set()
-                for mint in mints:
-                    price = await self.router.get_price(str(mint), use_cache=True)
+                routes = await self.router.detect_many([str(m) for m in mints], use_cache=True, lane="display")
+
+                async def price_of(mint):
+                    dex, pool = routes.get(mint, (None, None))
+                    if not dex or not pool:
+                        return None
+                    try:
+                        with lane("display"):
+                            return await self.router.swaps.get_price(mint, pool, dex)
+                    except Exception as e:
+                        logging.error(f"[-] Error getting price for {mint}: {e}")
+                        return None
+
+                prices = await asyncio.gather(*(price_of(str(m)) for m in mints))
+                for mint, price in zip(mints, prices):
                     if not price:
                         to_sell.add(str(mint))
                         continue
@@ -216,7 +247,8 @@ class Cobra:
         """
         action: "buy" or "sell"
         """
-        dex, pool = await self.router.detect(mint)
+        route = await self.router.detect_route(mint)
+        dex, pool = route
         if not dex or not pool:
             logging.error("[-] No pool found. Please try again.")
             return
@@ -230,7 +262,8 @@ class Cobra:
                 dex=dex,
                 keypair=self.keypair, 
                 sol_amount_in=amount,
-                sell_pct=amount
+                sell_pct=amount,
+                route=route,
             )
         return info
 
@@ -245,6 +278,10 @@ class Cobra:
     async def run(self):
         try:
             logging.info("Initializing Cobra, pass RUN_AS_CLI=True to the secrets.env to run as CLI...")
+            if POOL_INDEX_WS:
+                self.router.enable_pool_index(POOL_INDEX_WS)
+            elif MINT_FILTER_WS:
+                self.router.enable_mint_filter(MINT_FILTER_WS, MINT_FILTER_DIR)
             await asyncio.gather(
                 self.net.run() if self.net is not None else self.loop(),
                 self.CLI() if RUN_AS_CLI == "True" else self.loop(),